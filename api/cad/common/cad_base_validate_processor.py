@@ -21,7 +21,6 @@
 # SOFTWARE.
 
 # Python標準ライブラリ
-import pickle
 from abc import abstractmethod
 import re
 from importlib import import_module
@@ -34,6 +33,7 @@ Point = getattr(import_module("shapely.geometry"), "Point")
 Polygon = getattr(import_module("shapely.geometry"), "Polygon")
 LineString = getattr(import_module("shapely.geometry"), "LineString")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 from common.base_validate_processor import BaseValidateProcessor
 from common.error_code_list import ErrorCodeList
 import cad.common.cad_utils as CU
@@ -466,7 +466,7 @@ class CadBaseValidateProcessor(BaseValidateProcessor):
         :rtype: tuple[bool, Any]
         """
         try:
-            return True, pickle.loads(input_data)
+            return True, GCP.deserialize_content(input_data)
         except:
             self.validate_logger.write_log(ErrorCodeList.EC00015)
             return False, None
@@ -28,6 +28,8 @@ from importlib import import_module
 np = import_module("numpy")
 pd = import_module("pandas")
 gpd = import_module("geopandas")
+shapely = import_module("shapely")
+STRtree = getattr(import_module("shapely"), "STRtree")
 sjoin = getattr(import_module("geopandas.tools"), "sjoin")
 unary_union = getattr(import_module("shapely.ops"), "unary_union")
 Point = getattr(import_module("shapely.geometry"), "Point")
@@ -72,6 +74,63 @@ def process_spatial_operations(
     return pairs_results
 
 
+def get_geometry_array(geo_series):
+    """
+    GeoSeriesからshapelyのベクトル演算に渡すジオメトリのndarrayを取得する。
+
+    :param geo_series: ジオメトリのコレクション
+    :type geo_series: geopandas.GeoSeries
+
+    :return: ジオメトリのndarray（dtype=object）
+    :rtype: numpy.ndarray
+    """
+    return np.asarray(geo_series.values, dtype=object)
+
+
+def get_findex_array(fid_series):
+    """
+    FID列（(FID, Findex)のタプル）からFindexのndarrayを取得する。
+
+    :param fid_series: FID列
+    :type fid_series: pandas.Series
+
+    :return: Findexのndarray
+    :rtype: numpy.ndarray
+    """
+    return np.array([float(fid[1]) for fid in fid_series], dtype=np.float64)
+
+
+def query_spatial_index_pairs(tree_geometries, input_geometries, predicate, distance=None):
+    """
+    tree_geometriesからSTRtreeを構築し、input_geometriesで一括問い合わせを行い
+    predicateを満たすジオメトリのインデックスのペアを取得する。
+
+    :param tree_geometries: STRtreeに格納するジオメトリのndarray
+    :type tree_geometries: numpy.ndarray
+    :param input_geometries: 問い合わせに使用するジオメトリのndarray
+    :type input_geometries: numpy.ndarray
+    :param predicate: 判定に使用する空間述語（intersects, dwithin等）
+    :type predicate: str
+    :param distance: predicateがdwithinの場合の距離
+    :type distance: float
+
+    :return: input_geometries側のインデックスとtree_geometries側のインデックスの配列。
+        input側、tree側の順で昇順にソートされている（総当たりで判定した場合と同じ順序）
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    tree = STRtree(tree_geometries)
+
+    if distance is None:
+        input_indices, tree_indices = tree.query(input_geometries, predicate=predicate)
+    else:
+        input_indices, tree_indices = tree.query(input_geometries, predicate=predicate, distance=distance)
+
+    # STRtreeの返却順はツリー内の格納順のため、元の総当たりの順序に並び替える
+    sort_order = np.lexsort((tree_indices, input_indices))
+
+    return input_indices[sort_order], tree_indices[sort_order]
+
+
 def perform_intersects(main_geo_df, sub_geo_df, tolerance):
     """
     Intersects 操作を実行する関数
@@ -295,37 +354,41 @@ def perform_distance(main_geo_df, sub_geo_df, distance):
         # 探索範囲値が負の数のとき、サブジオメトリ全てを包括するジオメトリを探索基準として取得
         target_main_geoseries = main_geo_df['geometry'].apply(lambda x: expanded_geometry)
 
-    pairs_results_with_distance = []  # 処理結果格納先
+    # メイン、サブのFindexとジオメトリを取得
+    main_findex_array = get_findex_array(main_geo_df["FID"])
+    sub_findex_array = get_findex_array(sub_geo_df["FID"])
+    main_geometries = get_geometry_array(main_geo_df.geometry)
+    sub_geometries = get_geometry_array(sub_geo_df.geometry)
 
-    for idx, main_geom in target_main_geoseries.items():
+    # サブジオメトリのSTRtreeに探索基準を一括で問い合わせ、探索範囲内にあるメインとサブのペアを取得
+    main_indices, sub_indices = query_spatial_index_pairs(
+        sub_geometries, get_geometry_array(target_main_geoseries), "intersects"
+    )
 
-        target_sub_geo_df = sub_geo_df[
-            sub_geo_df.geometry.apply(
-                lambda geom: geom.intersects(main_geom)
-            )
-        ]
+    # ペアごとのメインジオメトリとサブジオメトリの距離を一括で算出
+    distance_array = shapely.distance(sub_geometries[sub_indices], main_geometries[main_indices])
+
+    # メインジオメトリごとのペアの範囲を取得
+    pair_starts = np.searchsorted(main_indices, np.arange(len(main_geometries)), side="left")
+    pair_ends = np.searchsorted(main_indices, np.arange(len(main_geometries)), side="right")
 
-        if target_sub_geo_df.empty:
+    sub_findex_list = sub_findex_array[sub_indices].tolist()
+    distance_list = distance_array.tolist()
+
+    pairs_results_with_distance = []  # 処理結果格納先
+
+    for main_fidx, pair_start, pair_end in zip(main_findex_array.tolist(), pair_starts, pair_ends):
+
+        if pair_start == pair_end:
             # 探索範囲内にサブジオメトリが存在しない場合nanを格納する
-            pair_nan = (float(main_geo_df.loc[idx, 'FID'][1]), np.nan)
-            pairs_results_with_distance.append(pair_nan)
+            pairs_results_with_distance.append((main_fidx, np.nan))
         else:
-            # サブFindexと、メインジオメトリとサブジオメトリの距離を取得
-            distance_results = target_sub_geo_df.apply(
-                lambda sub_row: (
-                    float(sub_row["FID"][1]),
-                    sub_row["geometry"].distance(main_geo_df.loc[idx, 'geometry']),
-                ),
-                axis=1,
+            # メインFindexとサブFindex、メインジオメトリとサブジオメトリの距離を結合する
+            pairs_results_with_distance.extend(
+                (main_fidx, (sub_findex_list[pair_index], distance_list[pair_index]))
+                for pair_index in range(pair_start, pair_end)
             )
 
-            # メインFindexと距離情報を結合する
-            distance_pairs = [
-                (float(main_geo_df.loc[idx, 'FID'][1]), dist_and_sub_fidx)
-                for dist_and_sub_fidx in distance_results.tolist()
-            ]
-            pairs_results_with_distance = pairs_results_with_distance + distance_pairs
-
     return pairs_results_with_distance, target_main_geoseries
 
 
@@ -479,32 +542,58 @@ def perform_touches_endpoint(main_geo_df, sub_geo_df, tolerance):
     # サブジオメトリとの交点の座標が追加されたメインジオメトリ
     new_main_geometries = []
 
+    # サブジオメトリの端点をサブジオメトリの順、始点・終点の順に並べて取得
+    sub_geometries = get_geometry_array(sub_geo_df.geometry)
+    sub_fid_list = sub_geo_df.FID.tolist()
+    end_points = np.empty(len(sub_geometries) * 2, dtype=object)
+    end_points[0::2] = shapely.get_point(sub_geometries, 0)
+    end_points[1::2] = shapely.get_point(sub_geometries, -1)
+
+    # 端点のSTRtree
+    end_point_tree = STRtree(end_points)
+
     # メインジオメトリとサブジオメトリの端点の交点を取得して処理を行う
     for main_geom in main_geo_df.geometry:
-        for sub_geom, sub_fid in zip(sub_geo_df.geometry, sub_geo_df.FID):
-            for coord_idx in [0, -1]:
-                # サブジオメトリの端点を取得
-                end_point = Point(sub_geom.coords[coord_idx])
 
-                # サブジオメトリの端点にバッファを入れて交差を確認
-                buffer_end_point = end_point.buffer(tolerance)
-                is_intersect = main_geom.intersects(buffer_end_point)
+        # 許容探索範囲内にある端点を候補として取得し、総当たりで判定した場合と同じ順序に並べる
+        candidate_indices = sorted(
+            end_point_tree.query(main_geom, predicate="dwithin", distance=tolerance).tolist()
+        )
+        candidate_position = 0
+
+        while candidate_position < len(candidate_indices):
+            end_point_index = candidate_indices[candidate_position]
+            candidate_position += 1
+
+            # サブジオメトリの端点を取得
+            end_point = end_points[end_point_index]
+
+            # サブジオメトリの端点にバッファを入れて交差を確認
+            buffer_end_point = end_point.buffer(tolerance)
+            if not main_geom.intersects(buffer_end_point):
+                continue
 
-                if is_intersect:
-                    # 交差判定されたサブジオメトリの端点をリストに追加
-                    sub_point_list.append((sub_fid[1], end_point))
+            # 交差判定されたサブジオメトリの端点をリストに追加
+            sub_point_list.append((sub_fid_list[end_point_index // 2][1], end_point))
 
-                    # メインジオメトリに交点を追加
-                    main_geom = insert_point_into_line(main_geom, end_point)
+            # メインジオメトリに交点を追加
+            main_geom = insert_point_into_line(main_geom, end_point)
+
+            # 交点の追加でメインジオメトリの形状が変わるため、未判定の端点の候補を取り直す
+            next_indices = end_point_tree.query(main_geom, predicate="dwithin", distance=tolerance)
+            candidate_indices = candidate_indices[:candidate_position] + sorted(
+                set(candidate_indices[candidate_position:])
+                | set(next_indices[next_indices > end_point_index].tolist())
+            )
 
         # 交点追加後のメインジオメトリをリストに追加
         new_main_geometries.append(main_geom)
 
     # サブ側のLineStringのジオメトリの端点をMultiPointにし、バッファを入れてMultiPolygonにする
-    sub_geo_df.geometry = [
-        MultiPoint([Point(geom.coords[0]), Point(geom.coords[-1])]).buffer(tolerance)
-        for geom in sub_geo_df.geometry
-    ]
+    sub_geo_df.geometry = shapely.buffer(
+        shapely.multipoints(end_points, indices=np.repeat(np.arange(len(sub_geometries)), 2)),
+        tolerance,
+    )
 
     # メインとサブのGeoDataFrameを空間結合し、ペアリング情報を取得
     pairs_results_side_main = process_spatial_operations(
@@ -560,47 +649,63 @@ def perform_cascade_touches(main_geo_df, sub_geo_df, tolerance):
         main_gdf["geometry"] = main_gdf["geometry"].buffer(buffer)
         sub_gdf["geometry"] = sub_gdf["geometry"].buffer(buffer)
 
+        main_findex_array = get_findex_array(main_gdf["FID"])
+        sub_findex_array = get_findex_array(sub_gdf["FID"])
+        main_geometries = get_geometry_array(main_gdf.geometry)
+        sub_geometries = get_geometry_array(sub_gdf.geometry)
+
+        # メインジオメトリと交差しているサブジオメトリのペアを一括で取得
+        main_indices, main_sub_indices = query_spatial_index_pairs(
+            sub_geometries, main_geometries, "intersects"
+        )
+        main_starts = np.searchsorted(main_indices, np.arange(len(main_geometries)), side="left")
+        main_ends = np.searchsorted(main_indices, np.arange(len(main_geometries)), side="right")
+
+        # サブジオメトリ同士で交差しているペアを一括で取得し、サブジオメトリ別の隣接リストにする
+        sub_indices, neighbor_indices = query_spatial_index_pairs(
+            sub_geometries, sub_geometries, "intersects"
+        )
+        neighbor_starts = np.searchsorted(sub_indices, np.arange(len(sub_geometries)), side="left")
+        neighbor_ends = np.searchsorted(sub_indices, np.arange(len(sub_geometries)), side="right")
+
         # メインジオメトリ別の接触するサブジオメトリのFIDのリスト
         touched_pairs = []  # メインジオメトリ別段別
         flattened_touched_pairs = []  # メインジオメトリ別
 
         # メインジオメトリごとにループ処理
-        for idx, main_geom in enumerate(main_gdf.geometry):
+        for idx in range(len(main_geometries)):
             # ループ中のメインジオメトリのFindex
-            main_fidx = float(main_gdf["FID"].values[idx][1])
+            main_fidx = float(main_findex_array[idx])
 
             # FIDのリストを初期化
             record_touches = []  # 段別のFIDのリスト
             flattened_touched = []  # FIDのリスト
 
-            # 現在のメインジオメトリと交差してるサブジオメトリを抽出
-            current_intersects_gdf = sub_geo_df[sub_gdf.intersects(main_geom)]
+            # 現在のメインジオメトリと交差してるサブジオメトリ
+            current_indices = main_sub_indices[main_starts[idx]:main_ends[idx]]
 
-            # 接触が確認されていないサブジオメトリ
-            unchecked_gdf = sub_gdf
+            # 接触が確認済みのサブジオメトリ
+            is_checked = np.zeros(len(sub_geometries), dtype=bool)
 
-            while not current_intersects_gdf.empty:
-                # サブのGeoDataFrameから接触未確認のデータのみ抽出
-                unchecked_gdf = unchecked_gdf[
-                    ~unchecked_gdf["FID"].isin(current_intersects_gdf["FID"])
-                ].dropna()
+            while len(current_indices) > 0:
+                # 直近で交差判定されたサブジオメトリを接触確認済みにする
+                is_checked[current_indices] = True
 
                 # 直近で交差判定されたサブジオメトリのFIDをリスト形式で取得
-                intersects_fid_fsf = [
-                    float(fid[1]) for fid in current_intersects_gdf["FID"].values
-                ]
+                intersects_fid_fsf = sub_findex_array[current_indices].tolist()
 
                 # 接触判定Findexリストに追加
                 record_touches.append(intersects_fid_fsf)
                 flattened_touched = flattened_touched + intersects_fid_fsf
 
-                # 直近で交差判定されたサブジオメトリを1つにまとめる
-                unary_geo = unary_union(current_intersects_gdf.geometry)
+                # 直近で交差判定されたサブジオメトリと交差しているサブジオメトリを隣接リストから取得
+                next_indices = np.unique(np.concatenate([
+                    neighbor_indices[neighbor_starts[current_index]:neighbor_ends[current_index]]
+                    for current_index in current_indices
+                ]))
 
-                # 接触が確認されていないサブジオメトリのうち、直近で接触が確認されたものと交差しているもの(1つ上の段)を抽出
-                current_intersects_gdf = unchecked_gdf[
-                    unchecked_gdf.intersects(unary_geo)
-                ]
+                # 接触が確認されていないもの(1つ上の段)を抽出
+                current_indices = next_indices[~is_checked[next_indices]]
 
             # 各メインジオメトリに対する接触結果を保存
             if len(flattened_touched) > 0:
@@ -654,28 +759,27 @@ def perform_most_intersects(main_geo_df, sub_geo_df, tolerance):
     :return pairs_results: 演算結果のペアリング情報
     :rtype: list[tuple[float, float]]
     """
-    def calculate_intersection_area(m_geom, s_geom):
+    def calculate_intersection_areas(m_geom, s_geoms):
         """
-        ジオメトリ同士の交差面積を算出する。
+        メイン側ジオメトリと各サブ側ジオメトリの交差面積を一括で算出する。
 
         :param m_geom: メイン側ジオメトリ
         :type m_geom: shapely.geometry.base.BaseGeometry
-        :param s_geom: サブ側ジオメトリ
-        :type s_geom: shapely.geometry.base.BaseGeometry
+        :param s_geoms: サブ側ジオメトリのndarray
+        :type s_geoms: numpy.ndarray
 
-        :return: 交差面積（長さ）
-        :rtype: float
+        :return: 交差面積（長さ）のndarray
+        :rtype: numpy.ndarray
         """
-        intersection_area = m_geom.intersection(s_geom)
-        if isinstance(intersection_area, Polygon):
-            # 交差面積がポリゴンの場合
-            return intersection_area.area
-        elif isinstance(intersection_area, LineString):
-            # 交差面積がラインの場合
-            return intersection_area.length
-        else:
-            # 交差面積がポリゴン、ライン以外の場合
-            return 0
+        intersection_areas = shapely.intersection(m_geom, s_geoms)
+        type_ids = shapely.get_type_id(intersection_areas)
+
+        # 交差面積がポリゴンの場合は面積、ラインの場合は長さ、それ以外の場合は0
+        return np.where(
+            type_ids == shapely.GeometryType.POLYGON,
+            shapely.area(intersection_areas),
+            np.where(type_ids == shapely.GeometryType.LINESTRING, shapely.length(intersection_areas), 0.0),
+        )
 
     if tolerance < 0:
         raise ValueError(f"Unsupported tolerance: {tolerance}")
@@ -693,6 +797,16 @@ def perform_most_intersects(main_geo_df, sub_geo_df, tolerance):
         grouped_pairing_dict[key].append(value)
     grouped_pairing_list = [(key, values) for key, values in grouped_pairing_dict.items()]
 
+    # Findexからジオメトリの位置を引く辞書（メインは先頭の位置、サブはDataFrame順の位置のリスト）
+    main_geometries = get_geometry_array(main_geo_df.geometry)
+    sub_geometries = get_geometry_array(sub_geo_df.geometry)
+    main_position_dict = {}
+    for position, fid in enumerate(main_geo_df["FID"]):
+        main_position_dict.setdefault(fid[1], position)
+    sub_position_dict = defaultdict(list)
+    for position, fid in enumerate(sub_geo_df["FID"]):
+        sub_position_dict[fid[1]].append(position)
+
     most_intersects_results = []  # 最も交差部分の多いペアの格納先
 
     for pair in grouped_pairing_list:
@@ -703,13 +817,19 @@ def perform_most_intersects(main_geo_df, sub_geo_df, tolerance):
             continue
 
         # 同じメインに紐づくサブが複数の場合
-        main_geom = main_geo_df[main_geo_df["FID"].apply(lambda x: x[1] == main_fidx)].geometry.tolist()[0]
-        sub_geoms = sub_geo_df[sub_geo_df["FID"].apply(lambda x: x[1] in sub_fidx_list)].geometry.tolist()
+        main_geom = main_geometries[main_position_dict[main_fidx]]
+        sub_positions = sorted(
+            position for sub_fidx in set(sub_fidx_list) for position in sub_position_dict[sub_fidx]
+        )
+        sub_geoms = sub_geometries[sub_positions].tolist()
 
         # メインとサブの交差面積（長さ）をリスト形式で取得
-        intersection_area_list = [calculate_intersection_area(main_geom, sub_geoms[i]) for i in range(len(sub_fidx_list))]
+        intersection_area_list = calculate_intersection_areas(
+            main_geom, np.array([sub_geoms[i] for i in range(len(sub_fidx_list))], dtype=object)
+        ).tolist()
         # 交差面積（長さ）が最大の値を持つインデックスを取得
-        max_area_indices = [i for i, value in enumerate(intersection_area_list) if value == max(intersection_area_list)]
+        max_area = max(intersection_area_list)
+        max_area_indices = [i for i, value in enumerate(intersection_area_list) if value == max_area]
 
         # 最大交差面積（長さ）を持つサブが複数か単一かで処理を分岐
         if len(max_area_indices) == 1:
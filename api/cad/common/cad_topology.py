@@ -0,0 +1,573 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Python標準ライブラリ
+import heapq
+from collections import deque
+from importlib import import_module
+
+# 外部ライブラリの動的インポート
+np = import_module("numpy")
+KDTree = getattr(import_module("scipy.spatial"), "KDTree")
+csr_matrix = getattr(import_module("scipy.sparse"), "csr_matrix")
+connected_components = getattr(import_module("scipy.sparse.csgraph"), "connected_components")
+
+import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+
+# ノードをまとめる方法
+# component: 閾値以内で連鎖的に繋がる座標をすべて同一ノードとする（単連結クラスタリング）
+# greedy   : 未処理の座標から順に閾値以内の座標をまとめ、その重心を同一ノードとする
+SNAP_COMPONENT = "component"
+SNAP_GREEDY = "greedy"
+
+
+def relabel_by_first_appearance(labels):
+    """
+    ラベルを、入力順で最初に出現した順の連番に振り直す。
+
+    :param labels: 各要素のラベル。
+    :type labels: numpy.ndarray
+
+    :return: 振り直したラベルと、ラベルごとに最初に出現した要素のインデックス。
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    labels = np.asarray(labels)
+    unique_labels, first_index, inverse = np.unique(labels, return_index=True, return_inverse=True)
+
+    order = np.argsort(first_index, kind="stable")
+    new_label_array = np.empty(len(unique_labels), dtype=np.int64)
+    new_label_array[order] = np.arange(len(unique_labels))
+
+    return new_label_array[inverse.ravel()], first_index[order]
+
+
+def label_components(row, col, node_count):
+    """
+    ノードの組み合わせから連結成分を求め、ノードごとのラベルを返す。
+    ラベルは最小のノード番号が小さい連結成分から順に0からの連番となる。
+
+    :param row: 組み合わせの一方のノード番号。
+    :type row: numpy.ndarray
+    :param col: 組み合わせのもう一方のノード番号。
+    :type col: numpy.ndarray
+    :param node_count: ノード数。
+    :type node_count: int
+
+    :return: 連結成分の数と、ノードごとのラベル。
+    :rtype: tuple[int, numpy.ndarray]
+    """
+    row = np.asarray(row, dtype=np.int64)
+    col = np.asarray(col, dtype=np.int64)
+
+    graph = csr_matrix(
+        (np.ones(len(row), dtype=np.int8), (row, col)), shape=(node_count, node_count)
+    )
+
+    return connected_components(csgraph=graph, directed=False, return_labels=True)
+
+
+def group_indices(labels):
+    """
+    ラベルごとに要素のインデックスをまとめる。
+
+    :param labels: 各要素のラベル（0からの連番）。
+    :type labels: numpy.ndarray
+
+    :return: ラベル順の、要素のインデックス（昇順）の配列のリスト。
+    :rtype: list[numpy.ndarray]
+    """
+    _, sort_index_array, offset_array = NSP.get_sorted_group_index(labels)
+
+    return [
+        sort_index_array[offset_array[i]:offset_array[i + 1]]
+        for i in range(len(offset_array) - 1)
+    ]
+
+
+def greedy_clusters(points, tolerance):
+    """
+    未処理の座標から順に、その座標から閾値以内の座標をまとめて重心を求める。
+    閾値以内の座標の探索はすべての座標に対して一括で行う。
+
+    :param points: 座標の配列。
+    :type points: numpy.ndarray
+    :param tolerance: 同一とみなす距離の閾値。
+    :type tolerance: float
+
+    :return: まとめた座標の重心の配列と、まとめた座標のインデックスのリスト。
+    :rtype: tuple[numpy.ndarray, list[list[int]]]
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return np.empty((0, points.shape[1] if points.ndim == 2 else 2)), []
+
+    neighbor_lists = KDTree(points).query_ball_point(points, r=tolerance)
+
+    processed = np.zeros(len(points), dtype=bool)
+    centroid_list = []
+    member_list = []
+
+    for i, neighbors in enumerate(neighbor_lists):
+        if processed[i]:
+            continue
+
+        # 処理済みの座標も含めて重心を求める
+        centroid_list.append(points[neighbors].mean(axis=0))
+        member_list.append(neighbors)
+        processed[neighbors] = True
+
+    return np.array(centroid_list), member_list
+
+
+def snap_points(points, tolerance=0.0, method=SNAP_COMPONENT):
+    """
+    閾値以内の座標を同一のノードにまとめる。
+    ノード番号は入力順で最初に出現した順の連番となる。
+
+    :param points: 座標の配列。
+    :type points: numpy.ndarray
+    :param tolerance: 同一とみなす距離の閾値。0以下の場合は座標が完全に一致するもののみをまとめる。
+    :type tolerance: float
+    :param method: まとめ方（SNAP_COMPONENT、SNAP_GREEDY）。
+    :type method: str
+
+    :return: 座標ごとのノード番号と、ノードの座標の配列。
+        SNAP_COMPONENTはまとめた座標の平均、SNAP_GREEDYは最も近い重心をノードの座標とする。
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+
+    :raises ValueError: まとめ方が不正な場合に発生する。
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int64), points.reshape(0, points.shape[1] if points.ndim == 2 else 2)
+
+    if tolerance <= 0:
+        # 座標が完全に一致するもののみをまとめる
+        _, inverse = np.unique(points, axis=0, return_inverse=True)
+        labels, first_index = relabel_by_first_appearance(inverse.ravel())
+
+        return labels, points[first_index]
+
+    if method == SNAP_COMPONENT:
+        pairs = KDTree(points).query_pairs(tolerance, output_type="ndarray")
+        _, component_labels = label_components(pairs[:, 0], pairs[:, 1], len(points))
+        labels, _ = relabel_by_first_appearance(component_labels)
+
+        # ノードごとの座標の平均
+        counts = np.bincount(labels)
+        node_coordinates = np.column_stack([
+            np.bincount(labels, weights=points[:, axis]) / counts
+            for axis in range(points.shape[1])
+        ])
+
+        return labels, node_coordinates
+
+    if method == SNAP_GREEDY:
+        centroids, _ = greedy_clusters(points, tolerance)
+        _, labels = KDTree(centroids).query(points, k=1)
+
+        return np.asarray(labels, dtype=np.int64), centroids
+
+    raise ValueError(f"Unsupported snap method: {method}")
+
+
+class LineNetwork:
+    """
+    線分（エッジ）と端点（ノード）からなるネットワーク。
+    エッジはノード番号の配列で保持し、ノードの次数、ノードに接続するエッジの索引（CSR形式）を1度だけ作成する。
+    エッジの削除は有効フラグと次数の更新のみで行うため、定数時間で完了する。
+
+    :param edge_nodes: エッジごとの始点、終点のノード番号の配列（エッジ数×2）。
+    :type edge_nodes: numpy.ndarray
+    :param node_coordinates: ノードの座標の配列。
+    :type node_coordinates: numpy.ndarray
+    :param keep_loops: 始点と終点が同一ノードのエッジを有効とするかどうか。
+    :type keep_loops: bool
+    :param edge_ids: エッジごとのID（GeoNdarrayのIDなど）。
+    :type edge_ids: numpy.ndarray
+    """
+
+    def __init__(self, edge_nodes, node_coordinates, keep_loops=True, edge_ids=None):
+        self.edge_nodes = np.asarray(edge_nodes, dtype=np.int64).reshape(-1, 2)
+        self.node_coordinates = np.asarray(node_coordinates, dtype=np.float64)
+        self.edge_ids = edge_ids
+        self.node_count = len(self.node_coordinates)
+        self.edge_count = len(self.edge_nodes)
+
+        self.edge_active = np.ones(self.edge_count, dtype=bool)
+        if not keep_loops:
+            self.edge_active &= self.edge_nodes[:, 0] != self.edge_nodes[:, 1]
+
+        # 有効なエッジの端点の数（始点と終点が同一ノードのエッジは2と数える）
+        self.degree = np.bincount(
+            self.edge_nodes[self.edge_active].ravel(), minlength=self.node_count
+        )
+
+        # ノードに接続するエッジの索引（CSR形式）
+        flat_nodes = self.edge_nodes.ravel()
+        self._incidence_edges = np.argsort(flat_nodes, kind="stable") // 2
+        self._incidence_indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(flat_nodes, minlength=self.node_count))]
+        )
+
+        # ノードの組み合わせをキーとしたエッジの辞書（必要になった時点で作成する）
+        self._pair_edge_dict = None
+
+    @classmethod
+    def from_endpoints(cls, start_points, end_points, tolerance=0.0, method=SNAP_COMPONENT,
+                       keep_loops=True, edge_ids=None):
+        """
+        エッジごとの始点、終点の座標からネットワークを作成する。
+        ノード番号は始点、終点の順に交互に並べた座標で最初に出現した順となる。
+
+        :param start_points: エッジごとの始点の座標の配列。
+        :type start_points: numpy.ndarray
+        :param end_points: エッジごとの終点の座標の配列。
+        :type end_points: numpy.ndarray
+        :param tolerance: 同一ノードとみなす距離の閾値。
+        :type tolerance: float
+        :param method: ノードのまとめ方（SNAP_COMPONENT、SNAP_GREEDY）。
+        :type method: str
+        :param keep_loops: 始点と終点が同一ノードのエッジを有効とするかどうか。
+        :type keep_loops: bool
+        :param edge_ids: エッジごとのID。
+        :type edge_ids: numpy.ndarray
+
+        :return: 作成したネットワーク。
+        :rtype: LineNetwork
+        """
+        start_points = np.asarray(start_points, dtype=np.float64)
+        end_points = np.asarray(end_points, dtype=np.float64)
+        dimension = start_points.shape[1] if start_points.ndim == 2 else 2
+
+        points = np.stack([start_points, end_points], axis=1).reshape(-1, dimension)
+        labels, node_coordinates = snap_points(points, tolerance, method)
+
+        return cls(labels.reshape(-1, 2), node_coordinates, keep_loops, edge_ids)
+
+    @classmethod
+    def from_geo_ndarray(cls, geo_ndarray, tolerance=0.0, method=SNAP_COMPONENT,
+                         segments=True, keep_loops=True):
+        """
+        GeoNdarray（[ID, x, y]または[ID, x, y, z]）からネットワークを作成する。
+        同一IDの構成点は連続して並んでいる必要がある。
+
+        :param geo_ndarray: GeoNdarray。
+        :type geo_ndarray: numpy.ndarray
+        :param tolerance: 同一ノードとみなす距離の閾値。
+        :type tolerance: float
+        :param method: ノードのまとめ方（SNAP_COMPONENT、SNAP_GREEDY）。
+        :type method: str
+        :param segments: Trueの場合は隣り合う構成点の組をエッジとし、Falseの場合はIDごとの始点と終点をエッジとする。
+        :type segments: bool
+        :param keep_loops: 始点と終点が同一ノードのエッジを有効とするかどうか。
+        :type keep_loops: bool
+
+        :return: 作成したネットワーク。edge_idsには各エッジのIDを格納する。
+        :rtype: LineNetwork
+        """
+        geo_ndarray = np.asarray(geo_ndarray, dtype=np.float64)
+        id_array = geo_ndarray[:, 0]
+        coordinates = geo_ndarray[:, 1:]
+
+        if segments:
+            # 隣り合う構成点が同一IDの場合のみエッジとする
+            is_same_id = id_array[1:] == id_array[:-1]
+            start_points = coordinates[:-1][is_same_id]
+            end_points = coordinates[1:][is_same_id]
+            edge_ids = id_array[:-1][is_same_id]
+        else:
+            # IDが切り替わる位置から始点と終点を求める
+            start_index = np.flatnonzero(np.r_[True, id_array[1:] != id_array[:-1]])
+            end_index = np.r_[start_index[1:] - 1, len(id_array) - 1]
+            start_points = coordinates[start_index]
+            end_points = coordinates[end_index]
+            edge_ids = id_array[start_index]
+
+        return cls.from_endpoints(start_points, end_points, tolerance, method, keep_loops, edge_ids)
+
+    def endpoint_degree(self):
+        """
+        エッジごとの始点、終点の次数を返す。
+
+        :return: エッジごとの始点、終点のノードの次数（エッジ数×2）。
+        :rtype: numpy.ndarray
+        """
+        return self.degree[self.edge_nodes]
+
+    def incident_edges(self, node):
+        """
+        ノードに接続する有効なエッジを返す。
+
+        :param node: ノード番号。
+        :type node: int
+
+        :return: エッジ番号の配列（昇順）。
+        :rtype: numpy.ndarray
+        """
+        edges = self._incidence_edges[self._incidence_indptr[node]:self._incidence_indptr[node + 1]]
+
+        return np.unique(edges[self.edge_active[edges]])
+
+    def neighbors(self, node):
+        """
+        有効なエッジで接続する隣接ノードを返す（同一ノードのみを結ぶエッジは除く）。
+
+        :param node: ノード番号。
+        :type node: int
+
+        :return: 隣接ノード番号の配列（昇順、重複なし）。
+        :rtype: numpy.ndarray
+        """
+        edge_nodes = self.edge_nodes[self.incident_edges(node)]
+        other_nodes = np.where(edge_nodes[:, 0] == node, edge_nodes[:, 1], edge_nodes[:, 0])
+
+        return np.unique(other_nodes[other_nodes != node])
+
+    def _get_pair_edge_dict(self):
+        if self._pair_edge_dict is None:
+            self._pair_edge_dict = {}
+            for edge, (u, v) in enumerate(self.edge_nodes.tolist()):
+                key = (u, v) if u <= v else (v, u)
+                self._pair_edge_dict.setdefault(key, []).append(edge)
+
+        return self._pair_edge_dict
+
+    def edges_between(self, u, v):
+        """
+        2つのノードを結ぶ有効なエッジを返す。
+
+        :param u: ノード番号。
+        :type u: int
+        :param v: ノード番号。
+        :type v: int
+
+        :return: エッジ番号のリスト。
+        :rtype: list[int]
+        """
+        key = (u, v) if u <= v else (v, u)
+
+        return [edge for edge in self._get_pair_edge_dict().get(key, []) if self.edge_active[edge]]
+
+    def multiplicity(self, u, v):
+        """
+        2つのノードを結ぶ有効なエッジの本数を返す。
+
+        :param u: ノード番号。
+        :type u: int
+        :param v: ノード番号。
+        :type v: int
+
+        :return: エッジの本数。
+        :rtype: int
+        """
+        return len(self.edges_between(u, v))
+
+    def remove_edge(self, edge):
+        """
+        エッジを無効にし、端点の次数を更新する。
+
+        :param edge: エッジ番号。
+        :type edge: int
+
+        :return: エッジを無効にした場合はTrue、既に無効だった場合はFalse。
+        :rtype: bool
+        """
+        if not self.edge_active[edge]:
+            return False
+
+        self.edge_active[edge] = False
+        u, v = self.edge_nodes[edge]
+        self.degree[u] -= 1
+        self.degree[v] -= 1
+
+        return True
+
+    def remove_edges_between(self, u, v, remove_all=False):
+        """
+        2つのノードを結ぶ有効なエッジを1本、またはすべて無効にする。
+
+        :param u: ノード番号。
+        :type u: int
+        :param v: ノード番号。
+        :type v: int
+        :param remove_all: Trueの場合はすべて、Falseの場合は1本のみ無効にする。
+        :type remove_all: bool
+
+        :return: 無効にしたエッジの本数。
+        :rtype: int
+        """
+        key = (u, v) if u <= v else (v, u)
+        edges = self._get_pair_edge_dict().get(key, [])
+
+        removed_count = 0
+        # 無効にしたエッジはリストから取り除き、次回の探索対象としない
+        while edges:
+            edge = edges.pop()
+            if self.remove_edge(edge):
+                removed_count += 1
+                if not remove_all:
+                    break
+
+        return removed_count
+
+    def adjacency_matrix(self):
+        """
+        有効なエッジから、ノード間のエッジの本数を値とする対称な隣接行列を作成する。
+        同一ノードのみを結ぶエッジは含めない。
+
+        :return: 隣接行列。
+        :rtype: scipy.sparse.csr_matrix
+        """
+        edge_nodes = self.edge_nodes[self.edge_active]
+        edge_nodes = edge_nodes[edge_nodes[:, 0] != edge_nodes[:, 1]]
+
+        row = np.concatenate([edge_nodes[:, 0], edge_nodes[:, 1]])
+        col = np.concatenate([edge_nodes[:, 1], edge_nodes[:, 0]])
+
+        # 同一ノード間の重複は合計され、エッジの本数となる
+        return csr_matrix(
+            (np.ones(len(row), dtype=np.int64), (row, col)),
+            shape=(self.node_count, self.node_count),
+        )
+
+    def connected_components(self):
+        """
+        有効なエッジで連結したノードのグループを求める。
+
+        :return: 連結成分の数と、ノードごとのラベル。
+        :rtype: tuple[int, numpy.ndarray]
+        """
+        edge_nodes = self.edge_nodes[self.edge_active]
+
+        return label_components(edge_nodes[:, 0], edge_nodes[:, 1], self.node_count)
+
+    def trace_chains(self, start_node, stop_nodes):
+        """
+        始点ノードから、停止ノード以外の隣接ノードを経由する経路をたどる。
+        経路は停止ノードに到達するか、先に進めなくなった時点で終了する。
+        停止ノード以外のノードは分岐がない（隣接ノードが2つ以下）ことを想定している。
+
+        :param start_node: 始点ノード番号。
+        :type start_node: int
+        :param stop_nodes: 経路を終了するノード番号の集合。
+        :type stop_nodes: set[int]
+
+        :return: 経路ごとの(終点ノード番号, ノード番号のリスト, 経由したエッジの本数の合計)のリスト。
+            終点ノード番号は停止ノードに到達しなかった場合はNoneとする。
+        :rtype: list[tuple[int | None, list[int], int]]
+        """
+        chain_list = []
+
+        for first_node in self.neighbors(start_node).tolist():
+            if first_node in stop_nodes:
+                continue
+
+            path = [start_node, first_node]
+            weight = self.multiplicity(start_node, first_node)
+            previous_node = start_node
+            current_node = first_node
+            end_node = None
+
+            while True:
+                next_nodes = [node for node in self.neighbors(current_node).tolist() if node != previous_node]
+                if not next_nodes:
+                    break
+
+                next_node = next_nodes[0]
+                weight += self.multiplicity(current_node, next_node)
+                path.append(next_node)
+
+                if next_node in stop_nodes:
+                    end_node = next_node
+                    break
+
+                # 始点以外の停止ノードに戻った場合や、経路が閉じた場合は終了する
+                if next_node in path[:-1]:
+                    break
+
+                previous_node, current_node = current_node, next_node
+
+            chain_list.append((end_node, path, weight))
+
+        return chain_list
+
+    def shortest_distances(self, start_node, limit=np.inf):
+        """
+        始点ノードから各ノードまでの最短経路の長さを求める。
+        ノード間のエッジの本数を重みとし、scipy.sparse.csgraph.dijkstraに隣接行列を渡した場合と同じ長さとなる。
+        隣接行列を作成せず、limitまでの範囲のノードのみ探索する。
+
+        :param start_node: 始点ノード番号。
+        :type start_node: int
+        :param limit: 探索する経路の長さの上限。
+        :type limit: float
+
+        :return: key=ノード番号 value=最短経路の長さの辞書（limitを超えるノードは含めない）。
+        :rtype: dict[int, int]
+        """
+        distance_dict = {start_node: 0}
+        heap = [(0, start_node)]
+        visited = set()
+
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in visited:
+                continue
+            visited.add(node)
+
+            for next_node in self.neighbors(node).tolist():
+                next_distance = distance + self.multiplicity(node, next_node)
+                if next_distance > limit:
+                    continue
+                if next_distance < distance_dict.get(next_node, np.inf):
+                    distance_dict[next_node] = next_distance
+                    heapq.heappush(heap, (next_distance, next_node))
+
+        return distance_dict
+
+    def prune_dangles(self):
+        """
+        次数が1のノードに接続するエッジ（行き止まり）を、なくなるまで繰り返し無効にする。
+
+        :return: 無効にしたエッジ番号のリスト。
+        :rtype: list[int]
+        """
+        removed_edges = []
+        queue = deque(np.flatnonzero(self.degree == 1).tolist())
+
+        while queue:
+            node = queue.popleft()
+            if self.degree[node] != 1:
+                continue
+
+            for edge in self.incident_edges(node).tolist():
+                if not self.remove_edge(edge):
+                    continue
+                removed_edges.append(edge)
+
+                u, v = self.edge_nodes[edge]
+                other_node = v if u == node else u
+                if self.degree[other_node] == 1:
+                    queue.append(other_node)
+
+        return removed_edges
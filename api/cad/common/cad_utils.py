@@ -31,11 +31,9 @@ from importlib import import_module
 pd = import_module("pandas")
 gpd = import_module("geopandas")
 np = import_module("numpy")
-Point = getattr(import_module("shapely.geometry"), "Point")
-Polygon = getattr(import_module("shapely.geometry"), "Polygon")
-LineString = getattr(import_module("shapely.geometry"), "LineString")
 
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
 
 
 def encode_value(text):
@@ -85,62 +83,83 @@ def get_number_from_string(s: str, num_type: type = float):
         raise ValueError(f"'{s}' を {num_type.__name__} に変換できませんでした")
 
 
-def field_set_file_to_dataframe(field_set_file, is_decode=True):
+def _validate_pickle_loads(byte_data):
+    """
+    バイトデータがpickle.loadsによるデシリアライズ処理が可能かを確認し
+    可能な場合はデシリアライズした値を返す。
+
+    :param byte_data: デシリアライズ処理対象データ
+    :type byte_data: bytes
+
+    :return: デシリアライズ処理後のインプットデータ。デシリアライズできなかった場合は入力データをそのまま返す。
+    :rtype: Any
+    """
+    try:
+        # デシリアライズを実施
+        deserialized_data = pickle.loads(byte_data)
+        return deserialized_data
+    except (pickle.UnpicklingError, EOFError, TypeError, MemoryError) as e:
+        # デシリアライズできなかった場合、入力値をそのまま返す
+        return byte_data
+
+
+def get_field_set_file_value(field_set_file_view, index):
+    """
+    FieldSetFileのビューから指定行のValueを取得し、タプルの右辺に格納されたバイナリデータもデシリアライズする
+
+    :param field_set_file_view: FieldSetFileのビュー
+    :type field_set_file_view: FieldSetFilePackage.FieldSetFileView
+    :param index: 行番号
+    :type index: int
+
+    :return: デシリアライズされたValue値
+    :rtype: Any
+    """
+    deserialized_value = field_set_file_view.get_value_by_index(index)
+
+    # Value値がtuple型かつ要素数が2かつ右辺がバイトデータの場合
+    if isinstance(deserialized_value[0], tuple) and len(deserialized_value[0]) == 2 and isinstance(
+            deserialized_value[0][1], bytes):
+        # タプルの右辺がpickle.loadsに対応するバイナリデータの場合、デシリアライズを行い再格納
+        deserialized_value = [tuple([value[0], _validate_pickle_loads(value[1])]) for value in
+                              deserialized_value]
+
+    return deserialized_value
+
+
+def field_set_file_to_dataframe(field_set_file, is_decode=True, dwh_name_list=None):
     """
     FieldSetFileをDataFrameに変換する
+    CSV形式、バイナリ形式のFieldSetFileを自動判定する
+    dwh_name_listを指定した場合は対象の行のみを出力し、それ以外の行のValue列はデシリアライズしない
 
-    :param field_set_file: FieldSetFile
-    :type field_set_file: bytes
+    :param field_set_file: FieldSetFile もしくは FieldSetFileのビュー
+    :type field_set_file: bytes | FieldSetFilePackage.FieldSetFileView
     :param is_decode: Value列のデシリアライズの実施の有無 True:実施 False:実施しない
     :type is_decode: bool
+    :param dwh_name_list: 出力対象のDwh名のリスト（デフォルトはNone、指定されない場合は全ての行）
+    :type dwh_name_list: list[str]
 
     :return: 変換されたDataFrame
     :rtype: Pandas.DataFrame
     """
 
-    def validate_pickle_loads(byte_data):
-        """
-        バイトデータがpickle.loadsによるデシリアライズ処理が可能かを確認し
-        可能な場合はデシリアライズした値を返す。
-
-        :param byte_data: デシリアライズ処理対象データ
-        :type byte_data: bytes
-
-        :return: デシリアライズ処理後のインプットデータ。デシリアライズできなかった場合は入力データをそのまま返す。
-        :rtype: Any
-        """
-        try:
-            # デシリアライズを実施
-            deserialized_data = pickle.loads(byte_data)
-            return deserialized_data
-        except (pickle.UnpicklingError, EOFError, TypeError, MemoryError) as e:
-            # デシリアライズできなかった場合、入力値をそのまま返す
-            return byte_data
-
     try:
-        # FieldSetFileをデコード
-        field_set_file_decode = field_set_file.decode("utf-8")
-
-        # デコードしたFieldSetFileをpathとして扱う
-        field_set_file_stringio = io.StringIO(field_set_file_decode)
-
-        # DataFrameに加工
-        dataframe = pd.read_csv(field_set_file_stringio)
+        # Dwh、Typeの一覧のみを解析し、Value列は参照時にデシリアライズする
+        if isinstance(field_set_file, FSP.FieldSetFileView):
+            field_set_file_view = field_set_file
+        else:
+            field_set_file_view = FSP.FieldSetFileView(field_set_file)
 
-        if is_decode:
-            for i in range(len(dataframe)):
-                # Value列の値をデシリアライズ
-                deserialized_value = decode_value(dataframe.loc[i, "Value"])
+        if not is_decode:
+            return field_set_file_view.to_dataframe(dwh_name_list=dwh_name_list)
 
-                # Value値がtuple型かつ要素数が2かつ右辺がバイトデータの場合
-                if isinstance(deserialized_value[0], tuple) and len(deserialized_value[0]) == 2 and isinstance(
-                        deserialized_value[0][1], bytes):
-                    # タプルの右辺がpickle.loadsに対応するバイナリデータの場合、デシリアライズを行い再格納
-                    deserialized_value = [tuple([value[0], validate_pickle_loads(value[1])]) for value in
-                                          deserialized_value]
+        index_list = field_set_file_view.get_index_list(dwh_name_list)
 
-                # デシリアライズ処理後のValue値を再格納
-                dataframe.loc[i, "Value"] = deserialized_value
+        # 対象行のみデシリアライズ処理後のValue値を格納
+        dataframe = field_set_file_view.to_dataframe(is_decode=True, dwh_name_list=dwh_name_list)
+        dataframe["Value"] = FSP.create_object_array(
+            [get_field_set_file_value(field_set_file_view, i) for i in index_list])
 
         return dataframe
 
@@ -179,8 +198,15 @@ def field_set_file_to_geodataframe(
     :rtype: Pandas.GeoDataFrame
     """
     try:
+        # geometry_nameが指定されている場合、そのカテゴリの行のみデシリアライズしてDataFrameを作成
+        dwh_name_list = None
+        if geometry_name:
+            field_set_file = FSP.FieldSetFileView(field_set_file)
+            dwh_name_list = [dwh_name for dwh_name in field_set_file.dwh_list
+                             if str(dwh_name).split("/")[0] == geometry_name]
+
         # FieldSetFileからDataFrameを作成
-        df = field_set_file_to_dataframe(field_set_file)
+        df = field_set_file_to_dataframe(field_set_file, dwh_name_list=dwh_name_list)
 
         # '/' で分割し、前半をカテゴリ、後半をキーとして新しいカラムに追加
         df["category"] = df["Dwh"].str.split("/").str[0]
@@ -348,32 +374,29 @@ def field_set_file_to_geodataframe(
         raise Exception(f"Error converting FieldSetFile to GeoDataFrame: {str(e)}")
 
 
-def dataframe_to_field_set_file(df):
+def dataframe_to_field_set_file(df, binary=False):
     """
     DataFrameをFieldSetFileに変換する
 
     :param df: DataFrame
     :type df: pandas.DataFrame
+    :param binary: True:バイナリ形式で出力 False:CSV形式で出力（デフォルト）
+    :type binary: bool
 
     :return: FieldSetFile
-    :rtype: str
+    :rtype: str | bytes
     """
     if len(df) <= 0:
         return pd.DataFrame()
 
-    new_df = df.copy()
+    # 1行ずつエンコードして書き出し、エンコード済みValueのリストやDataFrameを作成しない
+    stream = io.BytesIO()
+    FSP.write_field_set_file_to_stream(stream, df["Dwh"].tolist(), df["Type"].tolist(), df["Value"].tolist(), binary)
 
-    dwh_list = []
-    field_value_list = []
-    field_type_list = []
-    for index, row in new_df.iterrows():
-        dwh_list.append(row["Dwh"])
-        field_type_list.append(row["Type"])
-        row_value = encode_value(row["Value"])
+    if binary:
+        return stream.getvalue()
 
-        field_value_list.append(row_value)
-
-    return NSP.get_field_set_file(field_type_list, field_value_list, dwh_list)
+    return stream.getvalue().decode("utf-8")
 
 
 def geo_ndarray_to_ndarray_dict(geo_ndarray):
@@ -419,23 +442,27 @@ def geo_ndarray_to_geodataframe(geo_ndarray):
     :return: GeoDataFrame
     :rtype: pandas.GeoDataFrame
     """
-    # GeoNdarrayを辞書型に変換する
-    ndarray_dict = geo_ndarray_to_ndarray_dict(geo_ndarray)
-
-    # Shapelyオブジェクトのリストを作成（Point, Polygon, LineStringを判断して追加）
-    geometries = []
-    for _id, shape in ndarray_dict.items():
-        if len(shape) == 1:
-            # Pointオブジェクトとして追加
-            geometries.append(Point(shape[0]))
-        elif len(shape) > 2 and np.array_equal(shape[0], shape[-1]):
-            # Polygonオブジェクトとして追加
-            geometries.append(Polygon(shape))
-        else:
-            # LineStringオブジェクトとして追加
-            geometries.append(LineString(shape))
-
-    # GeoDataFrameを作成（Shapelyオブジェクトのリストを使用）
+    # ID順に並び替え、IDごとの構成点の範囲を取得する（同一ID内の構成点順は保持）
+    _, sort_index_array, offset_array = NSP.get_sorted_group_index(geo_ndarray[:, 0])
+    sorted_geo_ndarray = np.asarray(geo_ndarray, dtype=np.float64)[sort_index_array]
+
+    # ジオメトリタイプを判断（構成点が1点はPoint、3点以上で始点と終点が一致すればPolygon、それ以外はLineString）
+    point_counts = np.diff(offset_array)
+    start_points = sorted_geo_ndarray[offset_array[:-1], 1:]
+    end_points = sorted_geo_ndarray[offset_array[1:] - 1, 1:]
+    is_closed = np.all(start_points == end_points, axis=1)
+    geometry_types = np.where(
+        point_counts == 1,
+        "Point",
+        np.where((point_counts > 2) & is_closed, "Polygon", "LineString"),
+    )
+
+    # Shapelyオブジェクトを一括で作成
+    _, geometries = NSP.create_geometries_from_coordinates_array(
+        sorted_geo_ndarray, geometry_types.tolist()
+    )
+
+    # GeoDataFrameを作成（Shapelyオブジェクトの配列を使用）
     return gpd.GeoDataFrame(geometry=geometries)
 
 
@@ -33,6 +33,7 @@ from common.base_validate_processor import BaseValidateProcessor
 from common.error_code_list import ErrorCodeList
 import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 import cad.common.cad_utils as CU
 from importlib import import_module
@@ -199,7 +200,7 @@ class DataProcessingBaseValidateProcessor(BaseValidateProcessor):
         :return デシリアライズされたデータ or None: 正常=デシリアライズされたデータ、異常=None
         """
         try:
-            return True, pickle.loads(input_data)
+            return True, GCP.deserialize_content(input_data)
         except Exception:
             self.validate_logger.write_log(ErrorCodeList.EC00015)
             return False, None
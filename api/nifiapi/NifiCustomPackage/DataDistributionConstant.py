@@ -172,6 +172,28 @@ TARGET_FLOAT64      = "float64"
 
 DATA_URI_HEADER = "data:application/octet-stream;base64,"
 
+#glTFの出力形式（glTF：JSON形式、バッファはBase64のデータURI　GLB：バイナリ形式）
+GLTF_OUTPUT_FORMAT_GLTF = "glTF"
+GLTF_OUTPUT_FORMAT_GLB  = "GLB"
+
+#glTFの出力形式ごとの拡張子
+GLTF_EXTENSION_DICT = { GLTF_OUTPUT_FORMAT_GLTF:".gltf"
+                      , GLTF_OUTPUT_FORMAT_GLB :".glb"
+                      }
+
+#GLBのヘッダとチャンクの設定値
+GLB_MAGIC           = b"glTF"
+GLB_VERSION         = 2
+GLB_JSON_CHUNK_TYPE = 0x4E4F534A
+GLB_BIN_CHUNK_TYPE  = 0x004E4942
+GLB_ALIGNMENT       = 4
+
+#座標変換オブジェクト（pyproj.Transformer）のキャッシュ件数
+TRANSFORMER_CACHE_SIZE = 64
+
+#座標変換を複数スレッドで分割して行う際の1スレッドあたりの座標数
+CRS_TRANSFORM_CHUNK_SIZE = 1000000
+
 #レベル50000のX軸図郭コードに対する原点からのメッシュ数
 LEVEL_50000_X_DICT = { 'A':-4
                      , 'B':-3
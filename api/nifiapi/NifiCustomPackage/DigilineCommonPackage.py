@@ -23,8 +23,11 @@
 # Python標準ライブラリ
 import pickle
 import base64
-import io
+import os
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pathlib
 
 import datetime
@@ -33,6 +36,7 @@ import csv
 from importlib import import_module
 
 import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
 
 # 外部ライブラリの動的インポート
 np = import_module("numpy")
@@ -121,6 +125,102 @@ def calculate_ground_resolution(latitude, max_tile):
     return (np.cos(latitude * np.pi / 180) * 2 * np.pi * 6378137) / max_tile
 
 
+# 座標変換スレッドごとの座標変換オブジェクト格納先
+_transformer_thread_local = threading.local()
+
+
+@lru_cache(maxsize=DDC.TRANSFORMER_CACHE_SIZE)
+def get_transformer(from_crs, to_crs, always_xy=True):
+    # 【共通】座標変換オブジェクトの取得
+    # 生成にはPROJのデータベース検索が伴うため、変換前後のCRSの組み合わせごとにプロセス内で使いまわす
+    # 引数1：変換前のCRS
+    # 引数2：変換後のCRS
+    # 引数3：xy方向を経度、緯度の順に統一するか
+    # 戻り値：pyproj.Transformer
+    return pyproj.Transformer.from_crs(from_crs,
+                                       to_crs,
+                                       always_xy=always_xy)
+
+
+def _get_thread_local_transformer(from_crs, to_crs, always_xy):
+    # 座標変換スレッド専用の座標変換オブジェクトを取得する
+    # スレッド間でオブジェクトを共有しないよう、スレッドごとに生成して使いまわす
+    transformer_dict = getattr(_transformer_thread_local, "transformer_dict", None)
+
+    if transformer_dict is None:
+        transformer_dict = {}
+        _transformer_thread_local.transformer_dict = transformer_dict
+
+    transformer_key = (from_crs, to_crs, always_xy)
+
+    if transformer_key not in transformer_dict:
+        transformer_dict[transformer_key]\
+            = pyproj.Transformer.from_crs(from_crs,
+                                          to_crs,
+                                          always_xy=always_xy)
+
+    return transformer_dict[transformer_key]
+
+
+def _transform_xy_chunk(target_x_coordinates_array,
+                        target_y_coordinates_array,
+                        from_crs,
+                        to_crs,
+                        always_xy):
+    # 座標変換スレッドで分割した1区間分の座標を変換する
+    return _get_thread_local_transformer(from_crs,
+                                         to_crs,
+                                         always_xy).transform(target_x_coordinates_array,
+                                                              target_y_coordinates_array)
+
+
+def transform_xy_coordinates_array(target_x_coordinates_array,
+                                   target_y_coordinates_array,
+                                   from_crs,
+                                   to_crs,
+                                   always_xy=True,
+                                   chunk_size=DDC.CRS_TRANSFORM_CHUNK_SIZE):
+    # 【共通】座標参照系の変換（大量座標の分割並列変換）
+    # 座標数がchunk_sizeを超える場合は区間に分割し、CPUコア数分のスレッドで変換する
+    # PROJの変換処理はGILを解放するため、スレッドで並列に実行される
+    # 引数1：変換するx座標1次元配列
+    # 引数2：変換するy座標1次元配列
+    # 引数3：変換前のCRS
+    # 引数4：変換後のCRS
+    # 引数5：xy方向を経度、緯度の順に統一するか
+    # 引数6：1スレッドあたりの座標数
+    # 戻り値1：変換後のx座標1次元配列
+    # 戻り値2：変換後のy座標1次元配列
+
+    worker_number = os.cpu_count() or 1
+
+    # 分割しない場合はキャッシュした座標変換オブジェクトでそのまま変換
+    if worker_number == 1 \
+            or not isinstance(target_x_coordinates_array, np.ndarray) \
+            or not isinstance(target_y_coordinates_array, np.ndarray) \
+            or len(target_x_coordinates_array) <= chunk_size:
+        return get_transformer(from_crs,
+                               to_crs,
+                               always_xy).transform(target_x_coordinates_array,
+                                                    target_y_coordinates_array)
+
+    # 区間ごとの開始位置
+    start_index_list = list(range(0, len(target_x_coordinates_array), chunk_size))
+
+    with ThreadPoolExecutor(max_workers=min(worker_number, len(start_index_list))) as executor:
+        result_list = list(executor.map(lambda start_index: _transform_xy_chunk(target_x_coordinates_array[start_index:start_index + chunk_size],
+                                                                                target_y_coordinates_array[start_index:start_index + chunk_size],
+                                                                                from_crs,
+                                                                                to_crs,
+                                                                                always_xy),
+                                        start_index_list))
+
+    result_x_array = np.concatenate([result[0] for result in result_list])
+    result_y_array = np.concatenate([result[1] for result in result_list])
+
+    return result_x_array, result_y_array
+
+
 def convert_xy_corrdinates_array(target_x_coordinates_array,
                                  target_y_coordinates_array,
                                  from_crs,
@@ -130,17 +230,13 @@ def convert_xy_corrdinates_array(target_x_coordinates_array,
     # 引数2：変換するy座標1次元配列
     # x,yの概念は、xが経度、yが緯度の方向とする 平面直角座標系の配列を渡すときには注意すること
 
-    # pyprojのインスタンス生成 xy方向を統一
-    transform_instance\
-        = pyproj.Transformer.from_crs(from_crs,
-                                      to_crs,
-                                      always_xy=True)
-
-    # 座標系変換
+    # 座標系変換 xy方向を統一
     result_x_array, \
         result_y_array\
-        = transform_instance.transform(target_x_coordinates_array,
-                                       target_y_coordinates_array)
+        = transform_xy_coordinates_array(target_x_coordinates_array,
+                                         target_y_coordinates_array,
+                                         from_crs,
+                                         to_crs)
 
     return result_x_array, result_y_array
 
@@ -1012,13 +1108,10 @@ def convert_flowfile_to_field_set_file_dataframe(flowfile):
     # 引数:NifiFlowファイルオブジェクト
 
     # FlowFileからデータを取得プロパティから取得
-    input_field_set_file = flowfile.getContentsAsBytes().decode("utf-8")
-
-    # FlowFileのデータをfile_objectへ変換
-    field_set_file_stringio = io.StringIO(input_field_set_file)
+    input_field_set_file = flowfile.getContentsAsBytes()
 
-    # Dataframeに変換。
-    field_set_file_dataframe = pd.read_csv(field_set_file_stringio)
+    # Dataframeに変換。バイナリ形式、CSV形式は自動判定する
+    field_set_file_dataframe = FSP.read_field_set_file(input_field_set_file)
 
     return field_set_file_dataframe
 
@@ -1852,13 +1945,9 @@ def get_min_distance_points2linestrings(points_array, linestring_array, start_in
 def convert_xy_coordinates_array(target_x_coordinates_array, target_y_coordinates_array, from_crs, to_crs
                                  ):
 
-    # pyprojのインスタンス生成 xy方向を統一
-    transform_instance = pyproj.Transformer.from_crs(from_crs, to_crs, always_xy=True
-                                                     )
-
-    # 座標系変換
-    result_x_array, result_y_array = transform_instance.transform(target_x_coordinates_array, target_y_coordinates_array
-                                                                  )
+    # 座標系変換 xy方向を統一
+    result_x_array, result_y_array = transform_xy_coordinates_array(target_x_coordinates_array, target_y_coordinates_array, from_crs, to_crs
+                                                                    )
 
     return result_x_array, result_y_array
 
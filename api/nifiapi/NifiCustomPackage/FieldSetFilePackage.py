@@ -0,0 +1,738 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# FieldSetFile（Dwh、Type、Value）の読み書きを行う。
+# 従来のCSV形式（Value列をpickle→base64でエンコード）に加え、
+# Value列をテキスト化せずに格納するバイナリ形式を扱う。
+#
+# 【出力形式の切り替え】
+#   writerごとにbinary=Trueを指定した場合のみバイナリ形式で出力する（既定は CSV形式）。
+#   pd.read_csvで直接読み込むプロセッサがあるため、全体の既定値は切り替えない。読み込み側は形式を自動判定する。
+#
+# 【バイナリ形式のレイアウト】
+#   識別子(8byte)
+#   Valueのペイロード（各ペイロードの先頭はファイル先頭から64byte境界に揃える）
+#   インデックス（Dwh、Type、コーデック、オフセット等を格納したUTF-8のJSON）
+#   インデックスのバイト数(uint64 リトルエンディアン)
+#   識別子(8byte)
+# インデックスを末尾に置くことで、シーク不可の出力先（ZIPエントリなど）にも先頭から順に書き出せる。
+# --------------------------------------------------------------------------------------------
+
+# Python標準ライブラリ
+import base64
+import csv
+import io
+import json
+import os
+import pickle
+import struct
+import zipfile
+
+from importlib import import_module
+
+# 外部ライブラリの動的インポート
+np = import_module("numpy")
+pd = import_module("pandas")
+
+# バイナリ形式FieldSetFileの識別子（UTF-8として不正な先頭バイトにしてCSV形式と区別する）
+BINARY_FIELD_SET_FILE_MAGIC = b"\x89FSF\r\n\x1a\n"
+
+# バイナリ形式のバージョン
+BINARY_FIELD_SET_FILE_VERSION = 1
+
+# ペイロードの境界（np.frombufferで読み出す際のアライメント）
+BINARY_FIELD_SET_FILE_ALIGNMENT = 64
+
+# インデックスのバイト数を格納する領域の形式
+BINARY_FIELD_SET_FILE_INDEX_LENGTH_FORMAT = "<Q"
+
+# Valueのコーデック
+# ndarray: 数値・文字列などオブジェクトを含まないnumpy配列を生バッファのまま格納
+# pickle : 上記以外をpickleのバイト列のまま格納（base64エンコードは行わない）
+NDARRAY_CODEC = "ndarray"
+PICKLE_CODEC = "pickle"
+
+# ndarrayコーデックで格納するnumpy配列のdtype.kind
+NDARRAY_CODEC_DTYPE_KINDS = "biufcmMSU"
+
+FIELD_SET_FILE_COLUMNS = ["Dwh", "Type", "Value"]
+
+
+def is_binary_field_set_file(content):
+    """
+    概要:
+        contentがバイナリ形式のFieldSetFileかを先頭の識別子で判定する
+
+    引数:
+        content: FlowFileのcontents
+
+    戻り値:
+        True: バイナリ形式 False: それ以外（CSV形式のFieldSetFile、シリアライズされたデータなど）
+    """
+
+    if not isinstance(content, (bytes, bytearray, memoryview)):
+        return False
+
+    return bytes(content[:len(BINARY_FIELD_SET_FILE_MAGIC)]) == BINARY_FIELD_SET_FILE_MAGIC
+
+
+def encode_value(value):
+    """
+    概要:
+        Valueを従来のCSV形式FieldSetFile用にシリアライズしbase64でエンコードする
+
+    引数:
+        value: エンコード対象のデータ
+
+    戻り値:
+        シリアライズ、エンコードされた文字列
+    """
+
+    return base64.b64encode(pickle.dumps(value)).decode("utf-8")
+
+
+def decode_value(encoded_value):
+    """
+    概要:
+        従来のCSV形式FieldSetFileのValueをデコードしデシリアライズする
+
+    引数:
+        encoded_value: base64エンコードされた文字列
+
+    戻り値:
+        デコード、デシリアライズされたデータ
+    """
+
+    return pickle.loads(base64.b64decode(encoded_value))
+
+
+def encode_binary_value(value):
+    """
+    概要:
+        Valueをバイナリ形式FieldSetFile用のペイロードに変換する
+        オブジェクトを含まないnumpy配列はメモリ上のバッファをそのまま使用し、それ以外はpickleのバイト列とする
+
+    引数:
+        value: 変換対象のデータ
+
+    戻り値:
+        record_dict: コーデック、dtype、shapeを格納した辞書
+        payload: ペイロード（bytes もしくは memoryview）
+    """
+
+    if isinstance(value, np.ndarray) \
+            and not isinstance(value, np.ma.MaskedArray) \
+            and value.dtype.kind in NDARRAY_CODEC_DTYPE_KINDS:
+
+        # C連続でない場合のみコピーが発生する
+        contiguous_array = np.ascontiguousarray(value)
+
+        record_dict = {"codec": NDARRAY_CODEC,
+                       "dtype": contiguous_array.dtype.str,
+                       "shape": list(contiguous_array.shape)}
+
+        # datetime型などバッファプロトコル非対応のdtypeもあるため、uint8のビューとして書き出す
+        return record_dict, memoryview(contiguous_array.reshape(-1).view(np.uint8))
+
+    record_dict = {"codec": PICKLE_CODEC}
+
+    return record_dict, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_binary_value(record_dict, content):
+    """
+    概要:
+        バイナリ形式FieldSetFileのペイロードをValueに復元する
+
+    引数:
+        record_dict: インデックスの1レコード分（codec、offset、length等）
+        content: バイナリ形式FieldSetFile全体のバイト列
+
+    戻り値:
+        復元されたデータ
+    """
+
+    start_index = record_dict["offset"]
+    end_index = start_index + record_dict["length"]
+
+    payload = memoryview(content)[start_index:end_index]
+
+    if record_dict["codec"] == NDARRAY_CODEC:
+
+        # frombufferは読み取り専用のビューを返すため、後続処理での書き換えに備えて1度だけコピーする
+        return np.frombuffer(payload, dtype=np.dtype(record_dict["dtype"]))\
+            .reshape(record_dict["shape"]).copy()
+
+    elif record_dict["codec"] == PICKLE_CODEC:
+        return pickle.loads(payload)
+
+    else:
+        raise ValueError(f"未対応のコーデックです: {record_dict['codec']}")
+
+
+def write_binary_field_set_file(dwh_list, type_list, value_list):
+    """
+    概要:
+        バイナリ形式のFieldSetFileを作成する
+
+    引数:
+        dwh_list: Dwh名のリスト
+        type_list: Typeのリスト
+        value_list: Valueのリスト（シリアライズ前のlist、arrayなど）
+
+    戻り値:
+        バイナリ形式のFieldSetFile(bytes)
+    """
+
+    stream = io.BytesIO()
+
+    write_field_set_file_to_stream(stream, dwh_list, type_list, value_list, binary=True)
+
+    return stream.getvalue()
+
+
+def read_binary_field_set_file_index(content):
+    """
+    概要:
+        バイナリ形式FieldSetFileの末尾からインデックスを読み込む
+
+    引数:
+        content: バイナリ形式FieldSetFile全体のバイト列
+
+    戻り値:
+        record_list: レコードごとのDwh、Type、コーデック、オフセット等を格納した辞書のリスト
+    """
+
+    magic_length = len(BINARY_FIELD_SET_FILE_MAGIC)
+    length_size = struct.calcsize(BINARY_FIELD_SET_FILE_INDEX_LENGTH_FORMAT)
+
+    if len(content) < magic_length * 2 + length_size \
+            or bytes(content[-magic_length:]) != BINARY_FIELD_SET_FILE_MAGIC:
+        raise ValueError("バイナリ形式のFieldSetFileの末尾が不正です。")
+
+    length_end_index = len(content) - magic_length
+    index_end_index = length_end_index - length_size
+
+    index_length = struct.unpack(BINARY_FIELD_SET_FILE_INDEX_LENGTH_FORMAT,
+                                 content[index_end_index:length_end_index])[0]
+
+    index_dict = json.loads(
+        bytes(content[index_end_index - index_length:index_end_index]).decode("utf-8"))
+
+    if index_dict.get("version") != BINARY_FIELD_SET_FILE_VERSION:
+        raise ValueError(f"未対応のバージョンです: {index_dict.get('version')}")
+
+    return index_dict["records"]
+
+
+def read_binary_field_set_file(content, is_decode=True):
+    """
+    概要:
+        バイナリ形式のFieldSetFileをDataFrame（Dwh、Type、Value）に変換する
+
+    引数:
+        content: バイナリ形式FieldSetFile全体のバイト列
+        is_decode: True: Value列を復元したデータとする
+                   False: Value列を従来のCSV形式と同じエンコード済み文字列とする
+
+    戻り値:
+        field_set_file_dataframe: FieldSetFileのDataFrame
+    """
+
+    return FieldSetFileView(content).to_dataframe(is_decode)
+
+
+def read_field_set_file(content, is_decode=False):
+    """
+    概要:
+        FieldSetFileの形式（バイナリ形式/CSV形式）を判定し、DataFrame（Dwh、Type、Value）に変換する
+
+    引数:
+        content: FieldSetFile(bytes もしくは str)
+        is_decode: True: Value列を復元したデータとする
+                   False: Value列を従来のCSV形式と同じエンコード済み文字列とする
+
+    戻り値:
+        field_set_file_dataframe: FieldSetFileのDataFrame
+    """
+
+    if is_binary_field_set_file(content):
+        return read_binary_field_set_file(content, is_decode)
+
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        content = bytes(content).decode("utf-8")
+
+    field_set_file_dataframe = pd.read_csv(io.StringIO(content))
+
+    if is_decode:
+        field_set_file_dataframe["Value"] \
+            = [decode_value(value) for value in field_set_file_dataframe["Value"]]
+
+    return field_set_file_dataframe
+
+
+class FieldSetFileView:
+    """
+    概要:
+        FieldSetFileの遅延読み込み用ビュー
+        生成時にはDwh、Typeの一覧のみを解析し、Valueは初回アクセス時にデコードしてキャッシュする
+        CSV形式、バイナリ形式を自動判定する
+
+    引数:
+        content: FieldSetFile(bytes もしくは str)
+    """
+
+    def __init__(self, content):
+
+        self.is_binary = is_binary_field_set_file(content)
+
+        # デコード済みValueのキャッシュ（キーは行番号）
+        self._value_cache = {}
+
+        if self.is_binary:
+
+            # インデックスのみを読み込み、ペイロードは参照を保持するだけとする
+            self._content = content
+            self._record_list = read_binary_field_set_file_index(content)
+
+            self.dwh_list = [record_dict["Dwh"] for record_dict in self._record_list]
+            self.type_list = [record_dict["Type"] for record_dict in self._record_list]
+
+        else:
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                content = bytes(content).decode("utf-8")
+
+            # Value列はエンコード済み文字列のまま保持する
+            field_set_file_dataframe = pd.read_csv(io.StringIO(content))
+
+            self.dwh_list = field_set_file_dataframe["Dwh"].tolist()
+            self.type_list = field_set_file_dataframe["Type"].tolist()
+            self._encoded_value_list = field_set_file_dataframe["Value"].tolist()
+
+    def __len__(self):
+        return len(self.dwh_list)
+
+    def __contains__(self, dwh_name):
+        return dwh_name in self.dwh_list
+
+    def get_index(self, dwh_name):
+        """
+        概要:
+            Dwh名に一致する最初の行番号を取得する
+
+        引数:
+            dwh_name: Dwh名
+
+        戻り値:
+            行番号
+        """
+
+        if dwh_name not in self.dwh_list:
+            raise KeyError(f"Dwh名が存在しません: {dwh_name}")
+
+        return self.dwh_list.index(dwh_name)
+
+    def get_type(self, dwh_name):
+        """
+        概要:
+            Dwh名に一致する行のTypeを取得する
+
+        引数:
+            dwh_name: Dwh名
+
+        戻り値:
+            Type
+        """
+
+        return self.type_list[self.get_index(dwh_name)]
+
+    def get_value_by_index(self, index, is_cache=True):
+        """
+        概要:
+            行番号を指定してValueを取得する。デコードは初回のみ行い、以降はキャッシュを返す
+
+        引数:
+            index: 行番号
+            is_cache: True: デコード結果をキャッシュする False: キャッシュせずに返す（1行ずつ処理して破棄する場合）
+
+        戻り値:
+            デコード、デシリアライズされたValue
+        """
+
+        if index in self._value_cache:
+            return self._value_cache[index]
+
+        if self.is_binary:
+            value = decode_binary_value(self._record_list[index], self._content)
+        else:
+            value = decode_value(self._encoded_value_list[index])
+
+        if is_cache:
+            self._value_cache[index] = value
+
+        return value
+
+    def get_value(self, dwh_name):
+        """
+        概要:
+            Dwh名を指定してValueを取得する
+
+        引数:
+            dwh_name: Dwh名
+
+        戻り値:
+            デコード、デシリアライズされたValue
+        """
+
+        return self.get_value_by_index(self.get_index(dwh_name))
+
+    def get_encoded_value_by_index(self, index):
+        """
+        概要:
+            行番号を指定して、従来のCSV形式と同じエンコード済み文字列のValueを取得する
+
+        引数:
+            index: 行番号
+
+        戻り値:
+            シリアライズ、エンコードされた文字列
+        """
+
+        if self.is_binary:
+            return encode_value(self.get_value_by_index(index))
+
+        return self._encoded_value_list[index]
+
+    def get_index_list(self, dwh_name_list=None):
+        """
+        概要:
+            Dwh名のリストに含まれる行の行番号を取得する
+
+        引数:
+            dwh_name_list: Dwh名のリスト（Noneの場合は全行）
+
+        戻り値:
+            行番号のリスト
+        """
+
+        if dwh_name_list is None:
+            return list(range(len(self.dwh_list)))
+
+        dwh_name_set = set(dwh_name_list)
+
+        return [i for i, dwh_name in enumerate(self.dwh_list) if dwh_name in dwh_name_set]
+
+    def to_dataframe(self, is_decode=False, dwh_name_list=None):
+        """
+        概要:
+            FieldSetFileのDataFrame（Dwh、Type、Value）に変換する
+            dwh_name_listを指定した場合は対象の行のみを出力し、それ以外の行のValueはデコードしない
+
+        引数:
+            is_decode: True: Value列を復元したデータとする
+                       False: Value列を従来のCSV形式と同じエンコード済み文字列とする
+            dwh_name_list: 出力対象のDwh名のリスト（Noneの場合は全行）
+
+        戻り値:
+            field_set_file_dataframe: FieldSetFileのDataFrame
+        """
+
+        index_list = self.get_index_list(dwh_name_list)
+
+        if is_decode:
+            value_list = [self.get_value_by_index(i) for i in index_list]
+        else:
+            value_list = [self.get_encoded_value_by_index(i) for i in index_list]
+
+        return _create_field_set_file_dataframe([self.dwh_list[i] for i in index_list],
+                                                [self.type_list[i] for i in index_list],
+                                                value_list)
+
+
+class FieldSetFileWriter:
+    """
+    概要:
+        FieldSetFileを1行ずつファイルオブジェクトに書き出す
+        全行のValueをメモリ上に保持しないため、出力サイズに依らずメモリ使用量は1行分に抑えられる
+
+    引数:
+        stream: 書き込み先のバイナリモードのファイルオブジェクト（ZipFile.openで開いたエントリも可）
+        binary: True: バイナリ形式 False: CSV形式（デフォルト）
+    """
+
+    def __init__(self, stream, binary=False):
+
+        self.stream = stream
+        self.binary = binary
+        self.row_count = 0
+
+        self._record_list = []
+        self._closed = False
+
+        if self.binary:
+            self.stream.write(BINARY_FIELD_SET_FILE_MAGIC)
+            self._position = len(BINARY_FIELD_SET_FILE_MAGIC)
+
+        else:
+            self._write_csv_row(FIELD_SET_FILE_COLUMNS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_row(self, dwh_name, type_name, value):
+        """
+        概要:
+            FieldSetFileに1行書き出す
+
+        引数:
+            dwh_name: Dwh名
+            type_name: Type
+            value: Value（シリアライズ前のlist、arrayなど）
+
+        戻り値:
+            なし
+        """
+
+        if self._closed:
+            raise ValueError("クローズ済みのFieldSetFileWriterには書き込めません。")
+
+        if self.binary:
+            self._write_binary_row(dwh_name, type_name, value)
+        else:
+            self._write_csv_row([dwh_name, type_name, encode_value(value)])
+
+        self.row_count += 1
+
+    def write_rows(self, dwh_list, type_list, value_list):
+        """
+        概要:
+            FieldSetFileに複数行書き出す
+
+        引数:
+            dwh_list: Dwh名のリスト
+            type_list: Typeのリスト
+            value_list: Valueのリスト（シリアライズ前のlist、arrayなど）
+
+        戻り値:
+            なし
+        """
+
+        if not len(dwh_list) == len(type_list) == len(value_list):
+            raise ValueError("Dwh、Type、Valueの要素数が一致しません。")
+
+        for dwh_name, type_name, value in zip(dwh_list, type_list, value_list):
+            self.write_row(dwh_name, type_name, value)
+
+    def close(self):
+        """
+        概要:
+            書き出しを終了する。バイナリ形式の場合は末尾にインデックスを書き出す
+            streamのクローズは呼び出し元で行う
+
+        引数:
+            なし
+
+        戻り値:
+            なし
+        """
+
+        if self._closed:
+            return
+
+        if self.binary:
+            index_bytes = json.dumps({"version": BINARY_FIELD_SET_FILE_VERSION,
+                                      "records": self._record_list},
+                                     ensure_ascii=False).encode("utf-8")
+
+            self.stream.write(index_bytes)
+            self.stream.write(struct.pack(BINARY_FIELD_SET_FILE_INDEX_LENGTH_FORMAT, len(index_bytes)))
+            self.stream.write(BINARY_FIELD_SET_FILE_MAGIC)
+
+        self._closed = True
+
+    def _write_binary_row(self, dwh_name, type_name, value):
+
+        # ペイロードの先頭を境界に揃える
+        padding_length = -self._position % BINARY_FIELD_SET_FILE_ALIGNMENT
+        self.stream.write(b"\x00" * padding_length)
+        self._position += padding_length
+
+        record_dict, payload = encode_binary_value(value)
+        payload_length = payload.nbytes if isinstance(payload, memoryview) else len(payload)
+
+        self.stream.write(payload)
+
+        record_dict.update({"Dwh": str(dwh_name),
+                            "Type": str(type_name),
+                            "offset": self._position,
+                            "length": payload_length})
+        self._record_list.append(record_dict)
+
+        self._position += payload_length
+
+    def _write_csv_row(self, field_list):
+
+        # DataFrame.to_csvと同じ形式（QUOTE_MINIMAL、欠損値は空文字、改行はos.linesep）で1行分の文字列を作成する
+        row_stringio = io.StringIO()
+        csv.writer(row_stringio, lineterminator=os.linesep).writerow(
+            ["" if _is_missing(field) else field for field in field_list])
+
+        self.stream.write(row_stringio.getvalue().encode("utf-8"))
+
+
+class FieldSetFileBuffer:
+    """
+    概要:
+        FieldSetFileをメモリ上に書き出す
+        zip_entry_nameを指定した場合はZIPエントリに直接書き出し、圧縮前の全体をメモリ上に保持しない
+
+    引数:
+        zip_entry_name: ZIP圧縮する場合のエントリ名（Noneの場合はZIP圧縮しない）
+        binary: True: バイナリ形式 False: CSV形式（デフォルト）
+    """
+
+    def __init__(self, zip_entry_name=None, binary=False):
+
+        self._buffer = io.BytesIO()
+        self._zip_file = None
+        self._stream = self._buffer
+
+        if zip_entry_name is not None:
+
+            # 出力サイズが事前に分からないため、ZIP64を有効にしてエントリを開く
+            self._zip_file = zipfile.ZipFile(self._buffer, "w", compression=zipfile.ZIP_DEFLATED)
+            self._stream = self._zip_file.open(zip_entry_name, "w", force_zip64=True)
+
+        self.writer = FieldSetFileWriter(self._stream, binary)
+
+    @property
+    def row_count(self):
+        return self.writer.row_count
+
+    def write_row(self, dwh_name, type_name, value):
+        self.writer.write_row(dwh_name, type_name, value)
+
+    def write_rows(self, dwh_list, type_list, value_list):
+        self.writer.write_rows(dwh_list, type_list, value_list)
+
+    def getvalue(self):
+        """
+        概要:
+            書き出しを終了し、FieldSetFile（ZIP圧縮する場合はZIPデータ）を取得する
+
+        引数:
+            なし
+
+        戻り値:
+            FieldSetFile もしくは ZIPデータ(bytes)
+        """
+
+        self.writer.close()
+
+        if self._zip_file is not None:
+            self._stream.close()
+            self._zip_file.close()
+
+        return self._buffer.getvalue()
+
+
+def write_field_set_file_to_stream(stream, dwh_list, type_list, value_list, binary=False):
+    """
+    概要:
+        Dwh、Type、Value（シリアライズ前のデータ）のリストからFieldSetFileを作成し、ファイルオブジェクトに書き出す
+
+    引数:
+        stream: 書き込み先のバイナリモードのファイルオブジェクト
+        dwh_list: Dwh名のリスト
+        type_list: Typeのリスト
+        value_list: Valueのリスト（シリアライズ前のlist、arrayなど）
+        binary: True: バイナリ形式 False: CSV形式（デフォルト）
+
+    戻り値:
+        なし
+    """
+
+    with FieldSetFileWriter(stream, binary) as field_set_file_writer:
+        field_set_file_writer.write_rows(dwh_list, type_list, value_list)
+
+
+def write_field_set_file(dwh_list, type_list, value_list, binary=False):
+    """
+    概要:
+        Dwh、Type、Value（シリアライズ前のデータ）のリストからFieldSetFileを作成する
+
+    引数:
+        dwh_list: Dwh名のリスト
+        type_list: Typeのリスト
+        value_list: Valueのリスト（シリアライズ前のlist、arrayなど）
+        binary: True: バイナリ形式 False: CSV形式（デフォルト）
+
+    戻り値:
+        FieldSetFile（バイナリ形式の場合はbytes、CSV形式の場合はstr）
+    """
+
+    stream = io.BytesIO()
+
+    write_field_set_file_to_stream(stream, dwh_list, type_list, value_list, binary)
+
+    if binary:
+        return stream.getvalue()
+
+    return stream.getvalue().decode("utf-8")
+
+
+def create_object_array(value_list):
+    """
+    概要:
+        ndarrayなどを要素に持つ場合でも、要素をそのまま保持する1次元のobject型配列を作成する
+
+    引数:
+        value_list: 要素のリスト
+
+    戻り値:
+        object型の1次元配列
+    """
+
+    object_array = np.empty(len(value_list), dtype=object)
+    for i, value in enumerate(value_list):
+        object_array[i] = value
+
+    return object_array
+
+
+def _is_missing(value):
+
+    # pandasで欠損値として扱われる値（None、NaN）かを判定する
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _create_field_set_file_dataframe(dwh_list, type_list, value_list):
+
+    # 全列をobject型としてread_csvで作成した場合と同じ構成にする
+    return pd.DataFrame({"Dwh": np.array(dwh_list, dtype=object),
+                         "Type": np.array(type_list, dtype=object),
+                         "Value": create_object_array(value_list)})
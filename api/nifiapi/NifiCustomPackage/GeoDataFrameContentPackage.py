@@ -0,0 +1,221 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# プロセッサ間で受け渡すGeoDataFrameのcontentsを読み書きする。
+# 従来のpickle形式に加え、ジオメトリをWKBとして格納するGeoParquet形式を扱う。
+# GeoParquet形式はshapelyオブジェクトを1件ずつpickle化しないため、大きなレイヤでも高速に読み書きでき、
+# ライブラリのバージョンにも依存しない。
+#
+# 【形式の判定】
+#   GeoParquet形式: 先頭と末尾がParquetの識別子(PAR1)
+#   上記以外      : pickle形式（従来のcontents）として復元する
+#
+# 【書き出し形式の切り替え】
+#   環境変数 NIFI_PYTHON_GEODATAFRAME_CONTENT_FORMAT に geoparquet または pickle を指定する（既定は geoparquet）。
+#   pyarrowがインストールされていない場合や、GeoParquetで型を保てない列を持つ場合はpickle形式で書き出す。
+# --------------------------------------------------------------------------------------------
+
+# Python標準ライブラリ
+import io
+import os
+import pickle
+
+from importlib import import_module
+from importlib.util import find_spec
+
+# 外部ライブラリの動的インポート
+pd = import_module("pandas")
+gpd = import_module("geopandas")
+
+# GeoParquet形式の識別子（Parquetファイルの先頭と末尾）
+GEOPARQUET_MAGIC = b"PAR1"
+
+# contentsの形式
+GEOPARQUET_CONTENT_FORMAT = "geoparquet"
+PICKLE_CONTENT_FORMAT = "pickle"
+
+# 書き出し形式を指定する環境変数
+CONTENT_FORMAT_ENVIRONMENT_NAME = "NIFI_PYTHON_GEODATAFRAME_CONTENT_FORMAT"
+
+# GeoParquet形式で型を保てるobject型の列の内容（pandas.api.types.infer_dtypeの結果）
+GEOPARQUET_OBJECT_DTYPES = ("string", "empty")
+
+
+def is_geoparquet_available():
+    """
+    概要:
+        GeoParquet形式の読み書きに必要なpyarrowが利用可能かを判定する
+
+    戻り値:
+        True: 利用可能 False: 利用不可
+    """
+
+    return find_spec("pyarrow") is not None
+
+
+def is_geoparquet_content(content):
+    """
+    概要:
+        contentがGeoParquet形式かを先頭と末尾の識別子で判定する
+
+    引数:
+        content: FlowFileのcontents
+
+    戻り値:
+        True: GeoParquet形式 False: それ以外（pickle形式など）
+    """
+
+    if not isinstance(content, (bytes, bytearray, memoryview)):
+        return False
+
+    magic_length = len(GEOPARQUET_MAGIC)
+
+    return len(content) >= magic_length * 2 \
+        and bytes(content[:magic_length]) == GEOPARQUET_MAGIC \
+        and bytes(content[-magic_length:]) == GEOPARQUET_MAGIC
+
+
+def get_content_format():
+    """
+    概要:
+        環境変数からGeoDataFrameの書き出し形式を取得する
+
+    戻り値:
+        content_format: geoparquet または pickle（不正な値の場合は既定のgeoparquet）
+    """
+
+    content_format = os.environ.get(CONTENT_FORMAT_ENVIRONMENT_NAME, GEOPARQUET_CONTENT_FORMAT).strip().lower()
+
+    if content_format not in (GEOPARQUET_CONTENT_FORMAT, PICKLE_CONTENT_FORMAT):
+        return GEOPARQUET_CONTENT_FORMAT
+
+    return content_format
+
+
+def _is_geoparquet_compatible_column(series):
+    """
+    概要:
+        列をGeoParquet形式で書き出しても読み込み後に同じ型で復元できるかを判定する
+        タプルやリストなどを持つobject型の列は配列として復元されるため対象外とする
+    """
+
+    if series.dtype != object:
+        return True
+
+    return pd.api.types.infer_dtype(series, skipna=True) in GEOPARQUET_OBJECT_DTYPES
+
+
+def can_write_geoparquet(geodataframe):
+    """
+    概要:
+        GeoDataFrameをGeoParquet形式で書き出せるかを判定する
+
+    引数:
+        geodataframe: 判定対象のデータ
+
+    戻り値:
+        True: 書き出し可能 False: 書き出し不可（pickle形式で書き出す）
+    """
+
+    if not isinstance(geodataframe, gpd.GeoDataFrame) or not is_geoparquet_available():
+        return False
+
+    # アクティブなジオメトリ列が設定されていること
+    try:
+        geodataframe.geometry
+    except AttributeError:
+        return False
+
+    # Parquetの列名は文字列のみ
+    if not all(isinstance(column_name, str) for column_name in geodataframe.columns):
+        return False
+
+    geometry_column_names = set(
+        geodataframe.columns[geodataframe.dtypes == "geometry"])
+
+    for column_name in geodataframe.columns:
+        if column_name in geometry_column_names:
+            continue
+        if not _is_geoparquet_compatible_column(geodataframe[column_name]):
+            return False
+
+    # インデックスも列として書き出されるため同様に判定する
+    for level in range(geodataframe.index.nlevels):
+        if not _is_geoparquet_compatible_column(
+                geodataframe.index.get_level_values(level).to_series()):
+            return False
+
+    return True
+
+
+def serialize_geodataframe(geodataframe, content_format=None):
+    """
+    概要:
+        GeoDataFrameをFlowFileのcontentsとしてシリアライズする
+        GeoParquet形式で書き出せない場合はpickle形式で書き出す
+
+    引数:
+        geodataframe: シリアライズ対象のデータ（GeoDataFrame以外の場合はpickle形式）
+        content_format: 書き出し形式（Noneの場合は環境変数の設定に従う）
+
+    戻り値:
+        content: シリアライズしたバイト列
+    """
+
+    if content_format is None:
+        content_format = get_content_format()
+
+    if content_format == GEOPARQUET_CONTENT_FORMAT and can_write_geoparquet(geodataframe):
+        try:
+            buffer = io.BytesIO()
+            geodataframe.to_parquet(buffer)
+            return buffer.getvalue()
+
+        except Exception:
+            # pyarrowが未対応の型を持つ場合などはpickle形式で書き出す
+            pass
+
+    return pickle.dumps(geodataframe)
+
+
+def deserialize_content(content):
+    """
+    概要:
+        FlowFileのcontentsを復元する
+        GeoParquet形式の場合はGeoDataFrameとして読み込み、それ以外は従来のpickle形式として復元する
+
+    引数:
+        content: FlowFileのcontents
+
+    戻り値:
+        target_value: 復元したデータ
+    """
+
+    if is_geoparquet_content(content):
+        pa = import_module("pyarrow")
+
+        # contentsのバッファをコピーせずにArrowの入力として読み込む
+        return gpd.read_parquet(pa.BufferReader(content))
+
+    return pickle.loads(content)
@@ -1837,6 +1837,46 @@ __position_right__ = 1
 __diff_formula_index_a__ = 0
 __diff_formula_index_b__ = 1
 
+@jit(b1(f8, f8, f8[:,:]),nopython=True,cache=True,nogil=True)
+def judge_point_in_tin(point_x, point_y, tin_xy_array):
+    """
+    ----------------------------------------------------------------
+    ・構成点のTIN内外判定処理
+    外積の正負により、構成点がTINに内包されるか（辺上を含む）を判定する
+    ----------------------------------------------------------------
+    【引数】
+    ①:構成点のx座標
+    ②:構成点のy座標
+    ③:TINを構成する3点のxy座標の2次元NumPy配列
+    【戻り値】
+    ①True:内包する False:内包しない
+    """
+    # 外積計算
+    ab_vector_0 = tin_xy_array[1][0] - tin_xy_array[0][0]
+    ab_vector_1 = tin_xy_array[1][1] - tin_xy_array[0][1]
+    bp_vector_0 = point_x - tin_xy_array[1][0]
+    bp_vector_1 = point_y - tin_xy_array[1][1]
+
+    bc_vector_0 = tin_xy_array[2][0] - tin_xy_array[1][0]
+    bc_vector_1 = tin_xy_array[2][1] - tin_xy_array[1][1]
+    cp_vector_0 = point_x - tin_xy_array[2][0]
+    cp_vector_1 = point_y - tin_xy_array[2][1]
+
+    ca_vector_0 = tin_xy_array[0][0] - tin_xy_array[2][0]
+    ca_vector_1 = tin_xy_array[0][1] - tin_xy_array[2][1]
+    ap_vector_0 = point_x - tin_xy_array[0][0]
+    ap_vector_1 = point_y - tin_xy_array[0][1]
+
+    cross_product_ab_bp = ab_vector_0 * bp_vector_1 - ab_vector_1 * bp_vector_0
+    cross_product_bc_cp = bc_vector_0 * cp_vector_1 - bc_vector_1 * cp_vector_0
+    cross_product_ca_ap = ca_vector_0 * ap_vector_1 - ca_vector_1 * ap_vector_0
+
+    # 外積の正負がすべて一致していれば三角形内部に点が存在する。
+    if (cross_product_ab_bp >= 0 and cross_product_bc_cp >= 0 and cross_product_ca_ap >= 0) or (cross_product_ab_bp <= 0 and cross_product_bc_cp <= 0 and cross_product_ca_ap <= 0):
+        return True
+
+    return False
+
 @jit(i8(f8[:],f8[:,:,:]),nopython=True,cache=True,nogil=True)
 def get_tin_index(correction_target_feature,correction_target_tin_numpy_array):
     """
@@ -1853,52 +1893,205 @@ def get_tin_index(correction_target_feature,correction_target_tin_numpy_array):
     """
     # 補正対象TINごと
     # ti:TINのインデックス
-    for ti in prange(len(correction_target_tin_numpy_array)):
-
-        # TINを構成する3点取得
-        temp_correction_target_tin_numpy_array = correction_target_tin_numpy_array[ti]
-        
-        # 内外判定初期化
-        judgment_boolean = False
-
-        # 外積計算
-        ab_vector_0 = temp_correction_target_tin_numpy_array[1][0] - temp_correction_target_tin_numpy_array[0][0]
-        ab_vector_1 = temp_correction_target_tin_numpy_array[1][1] - temp_correction_target_tin_numpy_array[0][1]
-        bp_vector_0 = correction_target_feature[0]  - temp_correction_target_tin_numpy_array[1][0]
-        bp_vector_1 = correction_target_feature[1]  - temp_correction_target_tin_numpy_array[1][1]
-
-        bc_vector_0 = temp_correction_target_tin_numpy_array[2][0] - temp_correction_target_tin_numpy_array[1][0]
-        bc_vector_1 = temp_correction_target_tin_numpy_array[2][1] - temp_correction_target_tin_numpy_array[1][1]
-        cp_vector_0 = correction_target_feature[0]  - temp_correction_target_tin_numpy_array[2][0]
-        cp_vector_1 = correction_target_feature[1]  - temp_correction_target_tin_numpy_array[2][1]
-
-        ca_vector_0 = temp_correction_target_tin_numpy_array[0][0] - temp_correction_target_tin_numpy_array[2][0]
-        ca_vector_1 = temp_correction_target_tin_numpy_array[0][1] - temp_correction_target_tin_numpy_array[2][1]
-        ap_vector_0 = correction_target_feature[0] - temp_correction_target_tin_numpy_array[0][0]
-        ap_vector_1 = correction_target_feature[1] - temp_correction_target_tin_numpy_array[0][1]
-
-        cross_product_ab_bp = ab_vector_0 * bp_vector_1 - ab_vector_1 * bp_vector_0
-        cross_product_bc_cp = bc_vector_0 * cp_vector_1 - bc_vector_1 * cp_vector_0
-        cross_product_ca_ap = ca_vector_0 * ap_vector_1 - ca_vector_1 * ap_vector_0
-
-        # 外積の正負がすべて一致していれば三角形内部に点が存在する。
-        if (cross_product_ab_bp >= 0 and cross_product_bc_cp >= 0 and cross_product_ca_ap >= 0) or (cross_product_ab_bp <= 0 and cross_product_bc_cp <= 0 and cross_product_ca_ap <= 0):
-            judgment_boolean = True
-        else:
-            judgment_boolean = False
+    for ti in range(len(correction_target_tin_numpy_array)):
 
         # 構成点がTINに内包されているならTINのインデックスを返して終了
-        if judgment_boolean == True:
+        if judge_point_in_tin(correction_target_feature[0], correction_target_feature[1], correction_target_tin_numpy_array[ti]):
             return ti
 
-        # 内包していない場合次のTINへ
-        # 内包しているTINが存在しない場合は初期値のままとなる
-        else:
-            continue
-
     # 一度も内包判定されない場合-1を返して終了
     return -1
 
+@jit('Tuple((i8[:], i8[:]))(i8[:], i8[:], i8[:], i8[:], i8, i8)',nopython=True,cache=True,nogil=True)
+def create_grid_cell_array(min_x_index_array, max_x_index_array, min_y_index_array, max_y_index_array, x_cell_number, y_cell_number):
+    """
+    ----------------------------------------------------------------
+    ・グリッドのセルごとの要素インデックス一覧作成処理
+    各要素（TIN、線分など）の外接矩形が重なるセルに要素のインデックスを登録する
+    セル内の要素のインデックスは昇順となる
+    ----------------------------------------------------------------
+    【引数】
+    ①:要素の外接矩形の最小x方向セル番号の1次元NumPy配列
+    ②:要素の外接矩形の最大x方向セル番号の1次元NumPy配列
+    ③:要素の外接矩形の最小y方向セル番号の1次元NumPy配列
+    ④:要素の外接矩形の最大y方向セル番号の1次元NumPy配列
+    ⑤:x方向のセル数
+    ⑥:y方向のセル数
+    【戻り値】
+    ①セルごとの要素インデックスの開始位置（要素数はセル数+1）
+    ②セルごとに並べた要素のインデックス
+    """
+    cell_number = x_cell_number * y_cell_number
+
+    # セルごとの登録件数を集計
+    cell_start_array = np.zeros(cell_number + 1, dtype=np.int64)
+    for ei in range(len(min_x_index_array)):
+        for yi in range(min_y_index_array[ei], max_y_index_array[ei] + 1):
+            for xi in range(min_x_index_array[ei], max_x_index_array[ei] + 1):
+                cell_start_array[yi * x_cell_number + xi + 1] += 1
+
+    cell_start_array = np.cumsum(cell_start_array)
+
+    # 要素のインデックス順に登録
+    cell_element_array = np.empty(cell_start_array[-1], dtype=np.int64)
+    cell_position_array = cell_start_array[:-1].copy()
+    for ei in range(len(min_x_index_array)):
+        for yi in range(min_y_index_array[ei], max_y_index_array[ei] + 1):
+            for xi in range(min_x_index_array[ei], max_x_index_array[ei] + 1):
+                cell_index = yi * x_cell_number + xi
+                cell_element_array[cell_position_array[cell_index]] = ei
+                cell_position_array[cell_index] += 1
+
+    return cell_start_array, cell_element_array
+
+def create_bounding_box_grid_index(min_xy_array, max_xy_array):
+    """
+    ----------------------------------------------------------------
+    【概要】
+    外接矩形の一様グリッドインデックス作成処理
+    全外接矩形の範囲を、セル数が要素数程度となるよう縦横比に合わせて分割し、各要素を重なるセルに登録する
+    【引数】
+    ①:要素ごとの外接矩形の最小xy座標の2次元NumPy配列
+    ②:要素ごとの外接矩形の最大xy座標の2次元NumPy配列
+    【戻り値】
+    ①セルごとの要素インデックスの開始位置（要素数はセル数+1）
+    ②セルごとに並べた要素のインデックス
+    ③グリッド範囲と大きさ[最小x, 最小y, 最大x, 最大y, セル幅, セル高さ]
+    ④x方向のセル数
+    ⑤y方向のセル数
+    ----------------------------------------------------------------
+    """
+    element_number = len(min_xy_array)
+
+    grid_min_x, grid_min_y = min_xy_array.min(axis=0)
+    grid_max_x, grid_max_y = max_xy_array.max(axis=0)
+    grid_width = grid_max_x - grid_min_x
+    grid_height = grid_max_y - grid_min_y
+
+    # セル数が要素数程度となるよう、範囲の縦横比に合わせてセル数を決定
+    # 幅または高さが0の場合は1列（1行）とする
+    if grid_width > 0 and grid_height > 0:
+        cell_size = np.sqrt(grid_width * grid_height / element_number)
+    else:
+        cell_size = max(grid_width, grid_height) / element_number
+
+    if cell_size > 0:
+        x_cell_number = int(min(max(np.ceil(grid_width / cell_size), 1), element_number))
+        y_cell_number = int(min(max(np.ceil(grid_height / cell_size), 1), element_number))
+    else:
+        x_cell_number = 1
+        y_cell_number = 1
+
+    cell_width = grid_width / x_cell_number if grid_width > 0 else 1.0
+    cell_height = grid_height / y_cell_number if grid_height > 0 else 1.0
+
+    min_x_index_array = np.clip(np.floor((min_xy_array[:, 0] - grid_min_x) / cell_width), 0, x_cell_number - 1).astype(np.int64)
+    max_x_index_array = np.clip(np.floor((max_xy_array[:, 0] - grid_min_x) / cell_width), 0, x_cell_number - 1).astype(np.int64)
+    min_y_index_array = np.clip(np.floor((min_xy_array[:, 1] - grid_min_y) / cell_height), 0, y_cell_number - 1).astype(np.int64)
+    max_y_index_array = np.clip(np.floor((max_xy_array[:, 1] - grid_min_y) / cell_height), 0, y_cell_number - 1).astype(np.int64)
+
+    cell_start_array, cell_element_array = create_grid_cell_array(min_x_index_array, max_x_index_array, min_y_index_array, max_y_index_array, x_cell_number, y_cell_number)
+
+    grid_range_array = np.array([grid_min_x, grid_min_y, grid_max_x, grid_max_y, cell_width, cell_height], dtype=np.float64)
+
+    return cell_start_array, cell_element_array, grid_range_array, x_cell_number, y_cell_number
+
+def create_tin_grid_index(correction_target_tin_xy_array):
+    """
+    ----------------------------------------------------------------
+    【概要】
+    TINの点位置検索用グリッドインデックス作成処理
+    TINの外接矩形をセル数がTIN数程度の一様グリッドに登録する
+    面積が0に近い（縮退した）TINは外接矩形外の点も内包判定されうるため、全構成点の判定対象とする
+    【引数】
+    ①:補正対象TINのxy座標の3次元NumPy配列 (TIN>構成点の組み合わせ>xy座標)
+    【戻り値】
+    ①グリッドインデックスのタプル
+      (セルごとのTINインデックスの開始位置, セルごとのTINインデックス, 縮退TINのインデックス,
+       グリッド範囲と大きさ[最小x, 最小y, 最大x, 最大y, セル幅, セル高さ], x方向のセル数, y方向のセル数)
+    ----------------------------------------------------------------
+    """
+    tin_xy_array = np.asarray(correction_target_tin_xy_array, dtype=np.float64)
+
+    # 座標にnanを含むTINは内包判定されないため対象外とする
+    valid_tin_bool = ~np.isnan(tin_xy_array).any(axis=(1, 2))
+
+    # 縮退判定（2倍面積が最長辺の2乗に対して十分小さいTIN）
+    edge_vector_array = tin_xy_array[:, [1, 2, 0], :] - tin_xy_array
+    double_area_array = edge_vector_array[:, 0, 0] * edge_vector_array[:, 1, 1] - edge_vector_array[:, 0, 1] * edge_vector_array[:, 1, 0]
+    max_edge_square_array = np.max(np.sum(edge_vector_array ** 2, axis=2), axis=1)
+    degenerate_tin_bool = valid_tin_bool & (np.abs(double_area_array) <= 1e-10 * max_edge_square_array)
+
+    degenerate_tin_index_array = np.flatnonzero(degenerate_tin_bool).astype(np.int64)
+    grid_tin_index_array = np.flatnonzero(valid_tin_bool & ~degenerate_tin_bool).astype(np.int64)
+
+    if len(grid_tin_index_array) == 0:
+        return (np.zeros(2, dtype=np.int64), np.empty(0, dtype=np.int64), degenerate_tin_index_array,
+                np.array([0.0, 0.0, -1.0, -1.0, 1.0, 1.0]), 1, 1)
+
+    # 外積の丸め誤差による辺上付近の判定揺れを考慮し、外接矩形を座標の大きさに応じて広げる
+    grid_tin_xy_array = tin_xy_array[grid_tin_index_array]
+    min_xy_array = grid_tin_xy_array.min(axis=1)
+    max_xy_array = grid_tin_xy_array.max(axis=1)
+    margin = 1e-7 * (np.abs(grid_tin_xy_array).max() + np.max(max_xy_array.max(axis=0) - min_xy_array.min(axis=0)))
+    min_xy_array = min_xy_array - margin
+    max_xy_array = max_xy_array + margin
+
+    cell_start_array, cell_tin_array, grid_range_array, x_cell_number, y_cell_number = create_bounding_box_grid_index(min_xy_array, max_xy_array)
+
+    # グリッド内の通し番号を元のTINのインデックスに戻す
+    cell_tin_array = grid_tin_index_array[cell_tin_array]
+
+    return cell_start_array, cell_tin_array, degenerate_tin_index_array, grid_range_array, x_cell_number, y_cell_number
+
+@jit(i8[:](f8[:,:], f8[:,:,:], i8[:], i8[:], i8[:], f8[:], i8, i8),nopython=True,cache=True,nogil=True,parallel=True)
+def get_tin_index_array_by_grid(correction_target_feature_xy_array, correction_target_tin_xy_array, cell_start_array, cell_tin_array, degenerate_tin_index_array, grid_range_array, x_cell_number, y_cell_number):
+    """
+    ----------------------------------------------------------------
+    ・グリッドインデックスを用いた構成点を内包するTINのインデックス取得処理
+    構成点が属するセルに登録されたTINと縮退TINのみを判定し、
+    内包するTINのうち最小のインデックスを返す（get_tin_indexと同じ結果）
+    ----------------------------------------------------------------
+    【引数】
+    ①:補正対象地物の構成点のxy座標の2次元NumPy配列
+    ②:補正対象TINのxy座標の3次元NumPy配列 (TIN>構成点の組み合わせ>xy座標)
+    ③~⑧:create_tin_grid_indexの戻り値
+    【戻り値】
+    ①構成点ごとのTINのインデックス（内包するTINが存在しない場合-1）
+    """
+    tin_index_array = np.full(len(correction_target_feature_xy_array), -1, dtype=np.int64)
+
+    # 構成点ごとに並列で判定
+    for pi in prange(len(correction_target_feature_xy_array)):
+
+        point_x = correction_target_feature_xy_array[pi][0]
+        point_y = correction_target_feature_xy_array[pi][1]
+
+        tin_index = -1
+
+        # グリッド範囲内の場合のみ、属するセルのTINを昇順に判定
+        if point_x >= grid_range_array[0] and point_x <= grid_range_array[2] and point_y >= grid_range_array[1] and point_y <= grid_range_array[3]:
+            x_index = min(int(np.floor((point_x - grid_range_array[0]) / grid_range_array[4])), x_cell_number - 1)
+            y_index = min(int(np.floor((point_y - grid_range_array[1]) / grid_range_array[5])), y_cell_number - 1)
+            cell_index = y_index * x_cell_number + x_index
+
+            for ci in range(cell_start_array[cell_index], cell_start_array[cell_index + 1]):
+                if judge_point_in_tin(point_x, point_y, correction_target_tin_xy_array[cell_tin_array[ci]]):
+                    tin_index = cell_tin_array[ci]
+                    break
+
+        # 縮退TINはグリッド判定結果より小さいインデックスのみ判定
+        for di in range(len(degenerate_tin_index_array)):
+            if tin_index != -1 and degenerate_tin_index_array[di] > tin_index:
+                break
+            if judge_point_in_tin(point_x, point_y, correction_target_tin_xy_array[degenerate_tin_index_array[di]]):
+                tin_index = degenerate_tin_index_array[di]
+                break
+
+        tin_index_array[pi] = tin_index
+
+    return tin_index_array
+
 def create_TIN( correction_target_gcp_array
               , position_standard_gcp_array):
     """
@@ -2121,8 +2314,7 @@ def calculate_geometry_coordinate_by_formula( correction_target_feature
     # 戻り値①：変換用計算式で更新された補正対象地物のFeatureオブジェクト
     return correction_target_feature
 
-@jit(i8[:, :](f8[:, :],f8[:, :, :]), nopython = True, cache = True, nogil = True)
-def get_point_id_and_tin_index(correction_target_feature_array, correction_target_tin_array):
+def get_point_id_and_tin_index(correction_target_feature_array, correction_target_tin_array, tin_grid_index=None):
     """
     ----------------------------------------------------------------
     【概要】
@@ -2130,6 +2322,7 @@ def get_point_id_and_tin_index(correction_target_feature_array, correction_targe
     【引数】
     ①:補正対象TINの3次元NumPy配列 (TIN>構成点の組み合わせ>座標)
     ②:補正対象地物のNumPy配列 id + xy(z)座標 + 構成点id
+    ③:create_tin_grid_indexで作成したグリッドインデックス（省略時は作成する）
     【戻り値】
     ①構成点id+tinの2次元配列インデックス
     ----------------------------------------------------------------
@@ -2147,8 +2340,11 @@ def get_point_id_and_tin_index(correction_target_feature_array, correction_targe
     correction_target_feature_xy_array = correction_target_feature_array[:, 1:3].copy()
     correction_target_tin_xy_array = correction_target_tin_array[:, :, 1:3].copy()
 
-    # 構成点数の数だけ内包判定処理
-    tin_index_array = np.array([get_tin_index(correction_target_feature_xy_array[i], correction_target_tin_xy_array) for i in range(correction_target_feature_number)])
+    if tin_grid_index is None:
+        tin_grid_index = create_tin_grid_index(correction_target_tin_xy_array)
+
+    # 構成点が属するセルのTINのみを並列で内包判定
+    tin_index_array = get_tin_index_array_by_grid(correction_target_feature_xy_array, correction_target_tin_xy_array, *tin_grid_index)
     tin_index_array = tin_index_array.reshape(correction_target_feature_number, 1)
 
     # 2列目をTINのインデックスで更新
@@ -2212,9 +2408,12 @@ def judge_inclusion( correction_target_tin_array
 
     logger.info(str(datetime.datetime.now()) + ' 内包判定処理開始')
 
+    # TINのグリッドインデックスは分割単位に関わらず1度だけ作成する
+    tin_grid_index = create_tin_grid_index(correction_target_tin_array[:, :, 1:3])
+
     # 分割して処理
     for i in range(split_times):
-        result = get_point_id_and_tin_index(split_geometry_list[i], correction_target_tin_array)
+        result = get_point_id_and_tin_index(split_geometry_list[i], correction_target_tin_array, tin_grid_index)
         tin_index_array.append(result)
 
     # 結果を結合
@@ -3021,74 +3220,430 @@ def get_min_distance_coordinates_array(point_array,
            result_coordinates_array
 
 
-@jit('Tuple((f8[:],f8[:,:], i8[:]))(f8[:,:], f8[:,:])', nopython=True, cache=True, nogil=True)
-def get_snapped_point_to_linestring(point_array,
-                                    linestring_array):
+def create_segment_grid_index(linestring_array):
     """
-    ポイントをラインに最近傍でスナップしてその座標を取得する
-    スナップはxy平面上での最短距離で判定する
-    引数１：ポイント座標配列（２次元配列）[ラインの構成点]＞[id+xy(z)]
-    引数２：ライン座標配列（２次元配列）[ラインの構成点]＞[id+xy(z)]
-    戻り値：ポイントごとの最近傍のスナップ座標
-    戻り値：ポイントごとの最近傍距離配列
-    戻り値：ポイントごとのスナップ先ラインのID
+    ラインの線分の近傍検索用グリッドインデックスを作成する
+    線分の外接矩形を、セル数が線分数程度の一様グリッドに登録する
+    引数１：ライン座標配列（２次元配列）[ラインの構成点]＞[id+xy(z)]
+    戻り値：グリッドインデックスのタプル
+            (線分の始点インデックス, 線分ごとのラインのインデックス, セルごとの線分インデックスの開始位置,
+             セルごとの線分インデックス, グリッド範囲と大きさ[最小x, 最小y, 最大x, 最大y, セル幅, セル高さ],
+             x方向のセル数, y方向のセル数, 距離比較の許容誤差)
     """
-    # ポイントの数
-    point_count=len(point_array)
-
     # ラインの始点終点インデックスを取得する
-    # lsi:ラインの始点インデックス
-    # lei:ラインの終点インデックス
     lsi,lei=get_start_index_and_end_index(linestring_array)
 
-    # ラインの地物数
-    linestring_count=len(lsi)
+    # 線分の始点インデックスと線分ごとのラインのインデックス（ライン順、ライン内の線分順）
+    segment_count_array=lei-lsi
+    segment_linestring_index_array=np.repeat(np.arange(len(lsi), dtype=np.int64), segment_count_array)
+    segment_start_index_array=(np.arange(len(segment_linestring_index_array), dtype=np.int64)
+                               -np.repeat(np.cumsum(segment_count_array)-segment_count_array, segment_count_array)
+                               +np.repeat(lsi, segment_count_array)).astype(np.int64)
+
+    # 座標にnanを含む線分は登録しない
+    start_xy_array=linestring_array[segment_start_index_array,1:3]
+    end_xy_array=linestring_array[segment_start_index_array+1,1:3]
+    valid_segment_bool=~(np.isnan(start_xy_array).any(axis=1) | np.isnan(end_xy_array).any(axis=1))
+    valid_segment_index_array=np.flatnonzero(valid_segment_bool).astype(np.int64)
+
+    if len(valid_segment_index_array)==0:
+        return (segment_start_index_array, segment_linestring_index_array,
+                np.zeros(2, dtype=np.int64), np.empty(0, dtype=np.int64),
+                np.array([0.0, 0.0, -1.0, -1.0, 1.0, 1.0]), 1, 1, 0.0)
+
+    min_xy_array=np.minimum(start_xy_array, end_xy_array)[valid_segment_index_array]
+    max_xy_array=np.maximum(start_xy_array, end_xy_array)[valid_segment_index_array]
+
+    # 距離計算の丸め誤差を考慮した許容誤差（座標の大きさに応じる）
+    tolerance=1e-7*(max(np.abs(min_xy_array).max(), np.abs(max_xy_array).max())
+                    +np.max(max_xy_array.max(axis=0)-min_xy_array.min(axis=0)))
+
+    cell_start_array,\
+    cell_segment_array,\
+    grid_range_array,\
+    x_cell_number,\
+    y_cell_number\
+        =create_bounding_box_grid_index(min_xy_array, max_xy_array)
+
+    # グリッド内の通し番号を線分のインデックスに戻す
+    cell_segment_array=valid_segment_index_array[cell_segment_array]
+
+    return segment_start_index_array,\
+           segment_linestring_index_array,\
+           cell_start_array,\
+           cell_segment_array,\
+           grid_range_array,\
+           x_cell_number,\
+           y_cell_number,\
+           tolerance
+
+
+@jit(i8(f8, f8[:], i8, i8), nopython=True, cache=True, nogil=True)
+def get_grid_cell_xy_index(coordinate, grid_range_array, axis, cell_number):
+    """
+    座標が属するグリッドのセル番号を取得する（グリッド外の場合は端のセル）
+    引数１：x座標またはy座標
+    引数２：グリッド範囲と大きさ[最小x, 最小y, 最大x, 最大y, セル幅, セル高さ]
+    引数３：0:x方向 1:y方向
+    引数４：セル数
+    戻り値：セル番号
+    """
+    position=(coordinate-grid_range_array[axis])/grid_range_array[4+axis]
+
+    return int(np.floor(min(max(position, 0.0), cell_number-1.0)))
+
+
+@jit(f8(f8, f8, f8, f8, f8, f8), nopython=True, cache=True, nogil=True)
+def get_approximate_distance_point_segment(point_x, point_y, start_x, start_y, end_x, end_y):
+    """
+    点と線分の最短距離を配列を生成せずに概算する（候補の絞り込み用）
+    丸め誤差の範囲でget_min_distance_coordinatesの距離と一致する
+    引数１~２：ポイントのxy座標
+    引数３~６：線分の始点と終点のxy座標
+    戻り値：最短距離
+    """
+    vector_x=end_x-start_x
+    vector_y=end_y-start_y
+    length_square=vector_x*vector_x+vector_y*vector_y
+
+    # 線分上の最近傍点の位置（0:始点 1:終点）
+    ratio=0.0
+    if length_square>0:
+        ratio=((point_x-start_x)*vector_x+(point_y-start_y)*vector_y)/length_square
+        ratio=min(max(ratio, 0.0), 1.0)
+
+    diff_x=point_x-(start_x+ratio*vector_x)
+    diff_y=point_y-(start_y+ratio*vector_y)
+
+    return np.sqrt(diff_x*diff_x+diff_y*diff_y)
+
+
+@jit('Tuple((f8[:],f8[:,:], i8[:]))(f8[:,:], f8[:,:], i8[:], i8[:], i8[:], f8[:], i8, i8, f8)', nopython=True, cache=True, nogil=True, parallel=True)
+def get_nearest_segment_by_grid(point_xy_array,
+                                linestring_xy_array,
+                                segment_start_index_array,
+                                cell_start_array,
+                                cell_segment_array,
+                                grid_range_array,
+                                x_cell_number,
+                                y_cell_number,
+                                tolerance):
+    """
+    グリッドインデックスを用いてポイントごとの最近傍の線分を取得する
+    ポイントが属するセルから外側のセルへ順に探索し、未探索のセルとの距離が最小距離を超えた時点で終了する
+    最小距離が等しい線分が複数ある場合は線分のインデックスが最小のものとする
+    引数１：ポイントのxy座標配列（２次元配列）
+    引数２：ラインのxy座標配列（２次元配列）
+    引数３~９：create_segment_grid_indexの戻り値
+    戻り値：ポイントごとの最近傍距離配列
+    戻り値：ポイントごとの最近傍のスナップ座標(xy)
+    戻り値：ポイントごとの最近傍の線分のインデックス
+    """
+    point_count=len(point_xy_array)
 
-    # 最小距離格納用配列（要素数はポイントの数）
-    result_distance_array\
-        =np.zeros(point_count, dtype=np.float64)
+    result_distance_array=np.full(point_count, np.inf, dtype=np.float64)
+    result_coordinates_array=np.zeros((point_count, 2), dtype=np.float64)
+    result_segment_index_array=np.full(point_count, -1, dtype=np.int64)
 
-    # 最小距離をなす座標格納用初期配列（要素数はポイントの数）
+    for pi in prange(point_count):
 
-    result_coordinates_array=point_array.copy()
+        point_x=point_xy_array[pi,0]
+        point_y=point_xy_array[pi,1]
+
+        # 座標がnanの場合は距離の比較ができないため先頭の線分とする
+        if np.isnan(point_x) or np.isnan(point_y):
+            if len(segment_start_index_array)>0:
+                si=segment_start_index_array[0]
+                min_distance,result_array=get_min_distance_coordinates(point_xy_array[pi],
+                                                                       linestring_xy_array[si:si+2,:])
+                result_distance_array[pi]=min_distance
+                result_coordinates_array[pi]=result_array
+                result_segment_index_array[pi]=0
+            continue
 
-    # 最小距離をなすラインのインデックス
-    result_linestring_index_array\
-            =np.zeros(point_count, dtype=np.int64)
+        # 探索開始セル（グリッド外の場合は端のセル）
+        center_x_index=get_grid_cell_xy_index(point_x, grid_range_array, 0, x_cell_number)
+        center_y_index=get_grid_cell_xy_index(point_y, grid_range_array, 1, y_cell_number)
+
+        best_distance=np.inf
+        best_segment_index=-1
+        best_x=0.0
+        best_y=0.0
+
+        ring=0
+        while True:
+
+            # 探索開始セルからring番目の外周セルを探索
+            for y_index in range(center_y_index-ring, center_y_index+ring+1):
+                if y_index<0 or y_index>=y_cell_number:
+                    continue
+
+                if y_index==center_y_index-ring or y_index==center_y_index+ring:
+                    x_step=1
+                else:
+                    x_step=max(2*ring, 1)
+
+                for x_index in range(center_x_index-ring, center_x_index+ring+1, x_step):
+                    if x_index<0 or x_index>=x_cell_number:
+                        continue
+
+                    cell_index=y_index*x_cell_number+x_index
+
+                    for ci in range(cell_start_array[cell_index], cell_start_array[cell_index+1]):
+                        segment_index=cell_segment_array[ci]
+                        si=segment_start_index_array[segment_index]
+
+                        # 概算距離で最小距離を超えることが明らかな線分は除外
+                        if get_approximate_distance_point_segment(point_x, point_y,
+                                                                  linestring_xy_array[si,0], linestring_xy_array[si,1],
+                                                                  linestring_xy_array[si+1,0], linestring_xy_array[si+1,1])-tolerance>best_distance:
+                            continue
+
+                        min_distance,result_array=get_min_distance_coordinates(point_xy_array[pi],
+                                                                               linestring_xy_array[si:si+2,:])
+
+                        if min_distance<best_distance or (min_distance==best_distance and segment_index<best_segment_index):
+                            best_distance=min_distance
+                            best_segment_index=segment_index
+                            best_x=result_array[0]
+                            best_y=result_array[1]
+
+            # 未探索のセルまでの最短距離（探索済み範囲の各辺までの距離の最小値）
+            lower_bound=np.inf
+            if center_x_index-ring>0:
+                lower_bound=min(lower_bound, point_x-(grid_range_array[0]+(center_x_index-ring)*grid_range_array[4]))
+            if center_x_index+ring<x_cell_number-1:
+                lower_bound=min(lower_bound, grid_range_array[0]+(center_x_index+ring+1)*grid_range_array[4]-point_x)
+            if center_y_index-ring>0:
+                lower_bound=min(lower_bound, point_y-(grid_range_array[1]+(center_y_index-ring)*grid_range_array[5]))
+            if center_y_index+ring<y_cell_number-1:
+                lower_bound=min(lower_bound, grid_range_array[1]+(center_y_index+ring+1)*grid_range_array[5]-point_y)
+
+            # 全セル探索済み、または未探索のセルに最小距離以下の線分が存在しえない場合は終了
+            if lower_bound==np.inf:
+                break
+            if best_segment_index>=0 and lower_bound-tolerance>best_distance:
+                break
+
+            ring+=1
+
+        result_distance_array[pi]=best_distance
+        result_coordinates_array[pi,0]=best_x
+        result_coordinates_array[pi,1]=best_y
+        result_segment_index_array[pi]=best_segment_index
+
+    return result_distance_array,\
+           result_coordinates_array,\
+           result_segment_index_array
+
+
+@jit(i8(i8, f8[:,:], f8[:,:], f8, i8[:], i8[:], i8[:], i8[:], f8[:], i8, i8, f8, i8, f8[:], f8[:,:], i8[:], b1), nopython=True, cache=True, nogil=True)
+def collect_linestrings_within_distance(point_index,
+                                        point_xy_array,
+                                        linestring_xy_array,
+                                        threshold,
+                                        segment_start_index_array,
+                                        segment_linestring_index_array,
+                                        cell_start_array,
+                                        cell_segment_array,
+                                        grid_range_array,
+                                        x_cell_number,
+                                        y_cell_number,
+                                        tolerance,
+                                        result_position,
+                                        result_distance_array,
+                                        result_coordinates_array,
+                                        result_linestring_index_array,
+                                        write_flag):
+    """
+    1つのポイントに対して閾値未満の距離にあるラインを取得する
+    ラインごとの距離は構成する線分との最小距離（等しい場合はライン内で先の線分）とする
+    引数１：ポイントのインデックス
+    引数２~１２：get_linestrings_within_distance_by_gridの引数
+    引数１３：結果の書き込み開始位置
+    引数１４~１６：結果の書き込み先配列（距離、スナップ座標(xy)、ラインのインデックス）
+    引数１７：True:結果を書き込む False:件数のみ数える
+    戻り値：結果の件数
+    """
+    point_x=point_xy_array[point_index,0]
+    point_y=point_xy_array[point_index,1]
+
+    # 閾値未満の判定ができない場合は対象なし
+    if np.isnan(point_x) or np.isnan(point_y) or not threshold>0:
+        return 0
+
+    # 閾値分広げた範囲がグリッド外の場合は対象なし
+    search_distance=threshold+tolerance
+    if point_x+search_distance<grid_range_array[0] or point_x-search_distance>grid_range_array[2] or\
+       point_y+search_distance<grid_range_array[1] or point_y-search_distance>grid_range_array[3]:
+        return 0
+
+    min_x_index=get_grid_cell_xy_index(point_x-search_distance, grid_range_array, 0, x_cell_number)
+    max_x_index=get_grid_cell_xy_index(point_x+search_distance, grid_range_array, 0, x_cell_number)
+    min_y_index=get_grid_cell_xy_index(point_y-search_distance, grid_range_array, 1, y_cell_number)
+    max_y_index=get_grid_cell_xy_index(point_y+search_distance, grid_range_array, 1, y_cell_number)
+
+    # 候補の線分を取得し、重複を除いて昇順（ライン順、ライン内の線分順）にする
+    candidate_count=0
+    for y_index in range(min_y_index, max_y_index+1):
+        for x_index in range(min_x_index, max_x_index+1):
+            cell_index=y_index*x_cell_number+x_index
+            candidate_count+=cell_start_array[cell_index+1]-cell_start_array[cell_index]
+
+    candidate_array=np.empty(candidate_count, dtype=np.int64)
+    candidate_position=0
+    for y_index in range(min_y_index, max_y_index+1):
+        for x_index in range(min_x_index, max_x_index+1):
+            cell_index=y_index*x_cell_number+x_index
+            for ci in range(cell_start_array[cell_index], cell_start_array[cell_index+1]):
+                candidate_array[candidate_position]=cell_segment_array[ci]
+                candidate_position+=1
+
+    candidate_array=np.unique(candidate_array)
+
+    # ラインごとの最小距離を求め、閾値未満のラインを結果とする
+    result_count=0
+    current_linestring_index=-1
+    current_distance=np.inf
+    current_x=0.0
+    current_y=0.0
+    segment_index=0
+
+    for ci in range(len(candidate_array)+1):
+
+        if ci<len(candidate_array):
+            segment_index=candidate_array[ci]
+            linestring_index=segment_linestring_index_array[segment_index]
+        else:
+            linestring_index=-1
+
+        # ラインが切り替わったら直前のラインの結果を判定
+        if linestring_index!=current_linestring_index:
+            if current_linestring_index>=0 and current_distance<threshold:
+                if write_flag:
+                    result_distance_array[result_position+result_count]=current_distance
+                    result_coordinates_array[result_position+result_count,0]=current_x
+                    result_coordinates_array[result_position+result_count,1]=current_y
+                    result_linestring_index_array[result_position+result_count]=current_linestring_index
+                result_count+=1
+
+            current_linestring_index=linestring_index
+            current_distance=np.inf
+
+        if linestring_index<0:
+            break
+
+        si=segment_start_index_array[segment_index]
+
+        # 概算距離で閾値またはライン内の最小距離を超えることが明らかな線分は除外
+        if get_approximate_distance_point_segment(point_x, point_y,
+                                                  linestring_xy_array[si,0], linestring_xy_array[si,1],
+                                                  linestring_xy_array[si+1,0], linestring_xy_array[si+1,1])-tolerance>min(threshold, current_distance):
+            continue
+
+        min_distance,result_array=get_min_distance_coordinates(point_xy_array[point_index],
+                                                               linestring_xy_array[si:si+2,:])
+
+        # ライン内では先の線分を優先する
+        if min_distance<current_distance:
+            current_distance=min_distance
+            current_x=result_array[0]
+            current_y=result_array[1]
+
+    return result_count
+
+
+@jit('Tuple((i8[:],f8[:],f8[:,:], i8[:]))(f8[:,:], f8[:,:], f8, i8[:], i8[:], i8[:], i8[:], f8[:], i8, i8, f8)', nopython=True, cache=True, nogil=True, parallel=True)
+def get_linestrings_within_distance_by_grid(point_xy_array,
+                                            linestring_xy_array,
+                                            threshold,
+                                            segment_start_index_array,
+                                            segment_linestring_index_array,
+                                            cell_start_array,
+                                            cell_segment_array,
+                                            grid_range_array,
+                                            x_cell_number,
+                                            y_cell_number,
+                                            tolerance):
+    """
+    グリッドインデックスを用いてポイントごとに閾値未満の距離にあるラインを取得する
+    引数１：ポイントのxy座標配列（２次元配列）
+    引数２：ラインのxy座標配列（２次元配列）
+    引数３：距離の閾値
+    引数４~１１：create_segment_grid_indexの戻り値
+    戻り値：ポイントごとの結果の開始位置（要素数はポイントの数+1）
+    戻り値：結果ごとの距離配列
+    戻り値：結果ごとのスナップ座標(xy)
+    戻り値：結果ごとのラインのインデックス（ポイントごとにラインのインデックスの昇順）
+    """
+    point_count=len(point_xy_array)
+
+    # 1回目はポイントごとの結果件数のみを数える
+    result_count_array=np.zeros(point_count+1, dtype=np.int64)
+    empty_distance_array=np.zeros(0, dtype=np.float64)
+    empty_coordinates_array=np.zeros((0, 2), dtype=np.float64)
+    empty_linestring_index_array=np.zeros(0, dtype=np.int64)
 
-    # ポイントの数だけループ
     for pi in prange(point_count):
+        result_count_array[pi+1]=collect_linestrings_within_distance(pi, point_xy_array, linestring_xy_array, threshold,
+                                                                     segment_start_index_array, segment_linestring_index_array,
+                                                                     cell_start_array, cell_segment_array, grid_range_array,
+                                                                     x_cell_number, y_cell_number, tolerance,
+                                                                     0, empty_distance_array, empty_coordinates_array,
+                                                                     empty_linestring_index_array, False)
 
-        # 1つのポイントに対する全ラインの情報
-        temp_point_distance_array\
-            =np.zeros(linestring_count, dtype=np.float64)
-        temp_point_coordinates_array\
-            =np.zeros((linestring_count, 2), dtype=np.float64)
-        temp_point_linestring_index_array\
-            =np.zeros(linestring_count, dtype=np.int64)
+    result_count_array=np.cumsum(result_count_array)
 
-        # ラインごとに処理
-        for li in prange(linestring_count):
+    # 2回目で結果を書き込む
+    result_distance_array=np.zeros(result_count_array[-1], dtype=np.float64)
+    result_coordinates_array=np.zeros((result_count_array[-1], 2), dtype=np.float64)
+    result_linestring_index_array=np.zeros(result_count_array[-1], dtype=np.int64)
 
-            # 1つのラインの線分に対する距離と最小距離取得
-            temp_distance_array,\
-            temp_coordinates_array\
-                =get_min_distance_coordinates_array(point_array[pi,1:3],
-                                                    linestring_array[lsi[li]:lei[li]+1,1:3])
+    for pi in prange(point_count):
+        collect_linestrings_within_distance(pi, point_xy_array, linestring_xy_array, threshold,
+                                            segment_start_index_array, segment_linestring_index_array,
+                                            cell_start_array, cell_segment_array, grid_range_array,
+                                            x_cell_number, y_cell_number, tolerance,
+                                            result_count_array[pi], result_distance_array, result_coordinates_array,
+                                            result_linestring_index_array, True)
+
+    return result_count_array,\
+           result_distance_array,\
+           result_coordinates_array,\
+           result_linestring_index_array
 
-            # 最小値のインデックス取得
-            temp_argmin=np.argmin(temp_distance_array)
-            temp_point_distance_array[li]=temp_distance_array[temp_argmin]
-            temp_point_coordinates_array[li]=temp_coordinates_array[temp_argmin]
-            temp_point_linestring_index_array[li]=li
 
-        # 最小距離を持つ座標を結果の配列に設定
-        temp_point_argmin=np.argmin(temp_point_distance_array)
+def get_snapped_point_to_linestring(point_array,
+                                    linestring_array):
+    """
+    ポイントをラインに最近傍でスナップしてその座標を取得する
+    スナップはxy平面上での最短距離で判定する
+    線分のグリッドインデックスを用いて、ポイントの近傍の線分のみ距離を計算する
+    引数１：ポイント座標配列（２次元配列）[ラインの構成点]＞[id+xy(z)]
+    引数２：ライン座標配列（２次元配列）[ラインの構成点]＞[id+xy(z)]
+    戻り値：ポイントごとの最近傍のスナップ座標
+    戻り値：ポイントごとの最近傍距離配列
+    戻り値：ポイントごとのスナップ先ラインのID
+    """
+    # 線分のグリッドインデックス作成
+    segment_grid_index=create_segment_grid_index(linestring_array)
+    segment_linestring_index_array=segment_grid_index[1]
 
-        # 結果格納用配列更新
-        result_distance_array[pi]=temp_point_distance_array[temp_point_argmin]
-        result_coordinates_array[pi,1:3]=temp_point_coordinates_array[temp_point_argmin]
-        result_linestring_index_array[pi]=temp_point_linestring_index_array[temp_point_argmin]
+    # ポイントごとの最近傍の線分取得
+    result_distance_array,\
+    temp_coordinates_array,\
+    result_segment_index_array\
+        =get_nearest_segment_by_grid(np.ascontiguousarray(point_array[:,1:3]),
+                                     np.ascontiguousarray(linestring_array[:,1:3]),
+                                     segment_grid_index[0],
+                                     *segment_grid_index[2:])
+
+    # 最小距離をなす座標格納用配列（xyのみ更新）
+    result_coordinates_array=point_array.copy()
+    result_coordinates_array[:,1:3]=temp_coordinates_array
+
+    # 線分のインデックスをラインのインデックスに変換
+    result_linestring_index_array=segment_linestring_index_array[result_segment_index_array]
 
     return result_distance_array,\
            result_coordinates_array,\
@@ -3167,71 +3722,37 @@ def get_snapped_point_to_linestring_multi(point_array,
                                          linestring_array,
                                          minimum_threthold):
     """
-    ポイントをラインに最近傍でスナップしてその座標を取得する
+    ポイントを閾値未満の距離にあるすべてのラインにスナップしてその座標を取得する
     スナップはxy平面上での最短距離で判定する
+    線分のグリッドインデックスを用いて、ポイントから閾値の範囲にある線分のみ距離を計算する
     引数１：ポイント座標配列（２次元配列）[ラインの構成点]＞[id+xy(z)]
     引数２：ライン座標配列（２次元配列）[ラインの構成点]＞[id+xy(z)]
-    戻り値：ポイントごとの最近傍のスナップ座標
-    戻り値：ポイントごとの最近傍距離配列
-    戻り値：ポイントごとのスナップ先ラインのID
-    """
-    # ポイントの数
-    point_count=len(point_array)
-
-    # ラインの始点終点インデックスを取得する
-    # lsi:ラインの始点インデックス
-    # lei:ラインの終点インデックス
-    lsi,lei=get_start_index_and_end_index(linestring_array)
-
-    # ラインの地物数
-    linestring_count=len(lsi)
-
-    result_distance_list=[]
-    result_coordinates_list=[]
-    result_linestring_list=[]
-
-    # ポイントの数だけループ
-    for pi in prange(point_count):
-
-        # 1つのポイントに対する全ラインの情報
-        temp_point_distance_array\
-            =np.zeros(linestring_count, dtype=np.float64)
-        temp_point_coordinates_array\
-            =np.zeros((linestring_count, 2), dtype=np.float64)
-        temp_point_linestring_index_array\
-            =np.zeros(linestring_count, dtype=np.int64)
+    引数３：スナップ対象とする距離の閾値
+    戻り値：スナップ結果ごとの距離配列
+    戻り値：スナップ結果ごとのスナップ座標（ポイントのidを除く）
+    戻り値：スナップ結果ごとのスナップ先ラインのインデックス
+    """
+    # 線分のグリッドインデックス作成
+    segment_grid_index=create_segment_grid_index(linestring_array)
+
+    # ポイントごとに閾値未満のライン取得（ポイント順、ポイント内はライン順）
+    result_start_array,\
+    result_distance_array,\
+    temp_coordinates_array,\
+    result_linestring_index_array\
+        =get_linestrings_within_distance_by_grid(np.ascontiguousarray(point_array[:,1:3]),
+                                                 np.ascontiguousarray(linestring_array[:,1:3]),
+                                                 float(minimum_threthold),
+                                                 *segment_grid_index)
 
-        # ラインごとに処理
-        for li in prange(linestring_count):
+    # スナップ結果ごとにポイントの座標を複製し、xyをスナップ座標で更新
+    result_point_index_array=np.repeat(np.arange(len(point_array)), np.diff(result_start_array))
+    result_coordinates_array=point_array[result_point_index_array,1:]
+    result_coordinates_array[:,:2]=temp_coordinates_array
 
-            # 1つのラインの線分に対する距離と最小距離取得
-            temp_distance_array,\
-            temp_coordinates_array\
-                =get_min_distance_coordinates_array(point_array[pi,1:3],
-                                                    linestring_array[lsi[li]:lei[li]+1,1:3])
-
-            # 最小値のインデックス取得
-            temp_argmin=np.argmin(temp_distance_array)
-            temp_point_distance_array[li]=temp_distance_array[temp_argmin]
-            temp_point_coordinates_array[li]=temp_coordinates_array[temp_argmin]
-            temp_point_linestring_index_array[li]=li
-
-        # 最小距離を持つ座標を結果の配列に設定
-        temp_point_min_index_array=temp_point_distance_array<minimum_threthold
-        temp_point_array=temp_point_coordinates_array[temp_point_min_index_array]
-        result_point_array=np.tile(point_array[pi,1:],(len(temp_point_array),1))
-        result_point_array[:,:2]=temp_point_array
-
-        # これを複製してpoint_array[pi,1:]
-
-        # 結果格納用配列更新
-        result_distance_list.append(temp_point_distance_array[temp_point_min_index_array])
-        result_coordinates_list.append(result_point_array)
-        result_linestring_list.append(temp_point_linestring_index_array[temp_point_min_index_array])
-
-    return np.concatenate(result_distance_list),\
-           np.concatenate(result_coordinates_list),\
-           np.concatenate(result_linestring_list)
+    return result_distance_array,\
+           result_coordinates_array,\
+           result_linestring_index_array
 
 
 def _add_snapped_point_to_linestring(linestring_array,
@@ -21,12 +21,32 @@
 # SOFTWARE.
 
 import io
+import os
+import pathlib
+import threading
+import time
 from importlib import import_module
 
 
 # 外部ライブラリの動的インポート
 rasterio = import_module("rasterio")
+Window = getattr(import_module("rasterio.windows"), "Window")
 np = import_module("numpy")
+shapely = import_module("shapely")
+
+# GeoTIFFフットプリントインデックスの格納先（GeoTIFFのフォルダ直下に作成するフォルダ名）と拡張子ごとのファイル名
+# フォルダ直下にファイルを直接作成するとフォルダの更新日時が変わるため、サブフォルダに格納する
+FOOTPRINT_INDEX_FOLDER_NAME = ".footprint_index"
+FOOTPRINT_INDEX_FILE_NAME = "{}.npz"
+
+# フォルダの更新日時が変わらない場合に、ファイルごとの更新日時、サイズを確認し直す間隔（秒）
+# 同名ファイルへの上書きはフォルダの更新日時が変わらないため、この間隔で確認する
+FOOTPRINT_INDEX_STAT_INTERVAL = 60.0
+
+# GeoTIFFフットプリントインデックスのプロセス内キャッシュ
+# {(フォルダパス, 拡張子): (フットプリントインデックス, STRtree, フォルダの更新日時, ファイルを確認した時刻)}
+# フォルダの更新日時が一致し、確認した時刻からFOOTPRINT_INDEX_STAT_INTERVAL秒以内の場合はそのまま使用する
+footprint_index_cache = {}
 
 
 def get_geotiff_information(geotiff_value):
@@ -52,20 +72,7 @@ def get_geotiff_information(geotiff_value):
         height_array[np.where(height_array == -9999)] = 0
 
         # ワールドファイルの内容取得
-        tfw_file_list = [
-            # x_pixelの長さ
-            src.transform[0],
-            # x_pixelの回転
-            src.transform[1],
-            # y_pixelの回転
-            src.transform[3],
-            # y_pixelの長さ
-            src.transform[4],
-            # 左上のpixelの中心X座標
-            src.transform[2],
-            # 左上のpixelの中心Y座標
-            src.transform[5]
-        ]
+        tfw_file_list = get_tfw_list(src)
 
         # ピクセルの数取得
         raster_x_size = src.width
@@ -91,3 +98,303 @@ def get_grid_index(x_array, y_array, tfw_list):
         np.floor((y_array - tfw_list[5]) / tfw_list[3]), dtype=np.int64)
 
     return x_index, y_index
+
+
+def get_tfw_list(src):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : rasterioで開いたGeoTIFFからtfw情報を取得する関数
+    # 引数　 : src      - rasterioのDatasetReader
+    # 戻り値 : tfw_list - tfw情報 List [x_pixelの長さ, 0.0, 0.0, y_pixelの長さ, 左上のpixelの中心X座標, 左上のpixelの中心Y座標]
+    # -------------------------------------------------------------------------------------------------
+
+    tfw_list = [
+        # x_pixelの長さ
+        src.transform[0],
+        # x_pixelの回転
+        src.transform[1],
+        # y_pixelの回転
+        src.transform[3],
+        # y_pixelの長さ
+        src.transform[4],
+        # 左上のpixelの中心X座標
+        src.transform[2],
+        # 左上のpixelの中心Y座標
+        src.transform[5]
+    ]
+
+    return tfw_list
+
+
+def get_geotiff_footprint(file_path):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : GeoTIFFのヘッダのみを読み込み、四隅の座標を取得する関数
+    # 引数　 : file_path - GeoTIFFのファイルパス
+    # 戻り値 : min_x, max_x, min_y, max_y - GeoTIFFの範囲
+    # -------------------------------------------------------------------------------------------------
+
+    with rasterio.open(file_path) as src:
+
+        min_x = src.transform[2]
+        max_y = src.transform[5]
+
+        # 原点からのx, y移動量を加算
+        max_x = min_x + src.width * src.transform[0]
+        min_y = max_y + src.height * src.transform[4]
+
+    return min_x, max_x, min_y, max_y
+
+
+def get_geotiff_file_stat(folder_path, extent):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : フォルダ直下のGeoTIFFのファイル名、更新日時、サイズを取得する関数
+    # 　　　   ファイルを置き換えずに上書きした場合はフォルダの更新日時が変わらないため、ファイルごとに確認する
+    # 引数　 : folder_path - GeoTIFFが格納されているフォルダパス
+    # 　　　 : extent      - 拡張子(「.」ドット無し)
+    # 戻り値 : file_stat   - key:file_path, file_name, mtime_ns, size の辞書（ファイルの並び順は従来の処理と同じ）
+    # -------------------------------------------------------------------------------------------------
+
+    file_path_list = []
+    file_name_list = []
+    mtime_ns_list = []
+    size_list = []
+
+    # フォルダ直下をglobで検索
+    for temp_path in pathlib.Path(folder_path).glob("*." + extent):
+
+        stat_result = temp_path.stat()
+
+        file_path_list.append(temp_path)
+        file_name_list.append(temp_path.name)
+        mtime_ns_list.append(stat_result.st_mtime_ns)
+        size_list.append(stat_result.st_size)
+
+    file_stat = {
+        "file_path": file_path_list,
+        "file_name": np.array(file_name_list, dtype=str),
+        "mtime_ns": np.array(mtime_ns_list, dtype=np.int64),
+        "size": np.array(size_list, dtype=np.int64),
+    }
+
+    return file_stat
+
+
+def is_footprint_index_current(footprint_index, file_stat):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : フットプリントインデックスのファイル名、更新日時、サイズが現在のファイルと一致するかを判定する関数
+    # 引数　 : footprint_index - フットプリントインデックス
+    # 　　　 : file_stat       - get_geotiff_file_statの戻り値
+    # 戻り値 : True:一致（インデックスを再利用可能） False:不一致
+    # -------------------------------------------------------------------------------------------------
+
+    return all(key in footprint_index and np.array_equal(footprint_index[key], file_stat[key])
+               for key in ("file_name", "mtime_ns", "size"))
+
+
+def build_geotiff_footprint_index(folder_path, extent, footprint_index=None, file_stat=None):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : フォルダ直下のGeoTIFFの範囲をまとめたフットプリントインデックスを作成する関数
+    # 　　　   既存のインデックスでファイル名、更新日時、サイズが一致するファイルは開かずに範囲を再利用する
+    # 引数　 : folder_path     - GeoTIFFが格納されているフォルダパス
+    # 　　　 : extent          - 拡張子(「.」ドット無し)
+    # 　　　 : footprint_index - 既存のフットプリントインデックス（存在しない場合はNone）
+    # 　　　 : file_stat       - get_geotiff_file_statの戻り値（Noneの場合は取得する）
+    # 戻り値 : footprint_index - フットプリントインデックス（key:file_name, mtime_ns, size, min_x, max_x, min_y, max_y）
+    # -------------------------------------------------------------------------------------------------
+
+    if file_stat is None:
+        file_stat = get_geotiff_file_stat(folder_path, extent)
+
+    # 既存のインデックスをファイル名で引けるようにする
+    previous_dict = {}
+    if footprint_index is not None:
+        for index, file_name in enumerate(footprint_index["file_name"].tolist()):
+            previous_dict[file_name] = index
+
+    bounds_list = []
+
+    for file_index, temp_path in enumerate(file_stat["file_path"]):
+
+        previous_index = previous_dict.get(temp_path.name)
+
+        if previous_index is not None \
+                and footprint_index["mtime_ns"][previous_index] == file_stat["mtime_ns"][file_index] \
+                and footprint_index["size"][previous_index] == file_stat["size"][file_index]:
+            # 変更のないファイルは既存の範囲を再利用
+            bounds = (footprint_index["min_x"][previous_index],
+                      footprint_index["max_x"][previous_index],
+                      footprint_index["min_y"][previous_index],
+                      footprint_index["max_y"][previous_index])
+        else:
+            # 追加、更新されたファイルのみヘッダを読み込む
+            bounds = get_geotiff_footprint(str(temp_path))
+
+        bounds_list.append(bounds)
+
+    bounds_array = np.array(bounds_list, dtype=np.float64).reshape(-1, 4)
+
+    footprint_index = {
+        "file_name": file_stat["file_name"],
+        "mtime_ns": file_stat["mtime_ns"],
+        "size": file_stat["size"],
+        "min_x": bounds_array[:, 0],
+        "max_x": bounds_array[:, 1],
+        "min_y": bounds_array[:, 2],
+        "max_y": bounds_array[:, 3],
+    }
+
+    return footprint_index
+
+
+def get_geotiff_footprint_index(folder_path, extent):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : フォルダ直下のGeoTIFFのフットプリントインデックスと、範囲のSTRtreeを取得する関数
+    # 　　　   インデックスはファイルとして永続化し、GeoTIFFのファイル名、更新日時、サイズのいずれかが
+    # 　　　   変わった場合のみ作り直す（同名ファイルへの上書きはフォルダの更新日時が変わらないため個別に確認する）
+    # 　　　   同一プロセス内ではメモリ上のキャッシュを使用し、フォルダの更新日時が変わった場合か、
+    # 　　　   FOOTPRINT_INDEX_STAT_INTERVAL秒ごとにのみファイルの更新日時、サイズを確認する
+    # 引数　 : folder_path     - GeoTIFFが格納されているフォルダパス
+    # 　　　 : extent          - 拡張子(「.」ドット無し)
+    # 戻り値 : footprint_index - フットプリントインデックス
+    # 　　　 : footprint_tree  - GeoTIFFの範囲の矩形を格納したSTRtree（インデックスの並び順）
+    # -------------------------------------------------------------------------------------------------
+
+    cache_key = (os.path.abspath(folder_path), extent)
+    folder_mtime_ns = os.stat(folder_path).st_mtime_ns
+    current_time = time.monotonic()
+
+    # フォルダの更新日時が一致し、前回の確認から間隔が経過していない場合はファイルを確認せずに使用
+    cache_value = footprint_index_cache.get(cache_key)
+    if cache_value is not None and cache_value[2] == folder_mtime_ns \
+            and current_time - cache_value[3] < FOOTPRINT_INDEX_STAT_INTERVAL:
+        return cache_value[0], cache_value[1]
+
+    file_stat = get_geotiff_file_stat(folder_path, extent)
+
+    # プロセス内キャッシュのファイル名、更新日時、サイズが一致する場合は確認した時刻のみ更新して使用
+    if cache_value is not None and is_footprint_index_current(cache_value[0], file_stat):
+        footprint_index_cache[cache_key] = (cache_value[0], cache_value[1], folder_mtime_ns, current_time)
+        return cache_value[0], cache_value[1]
+
+    index_folder_path = os.path.join(folder_path, FOOTPRINT_INDEX_FOLDER_NAME)
+    index_file_path = os.path.join(index_folder_path, FOOTPRINT_INDEX_FILE_NAME.format(extent))
+
+    # 永続化されたインデックスを読み込む
+    # 途中までしか書き込まれていない、壊れている場合（zipfile.BadZipFile等）は作り直す
+    footprint_index = None
+    if os.path.isfile(index_file_path):
+        try:
+            with np.load(index_file_path, allow_pickle=False) as npz_file:
+                footprint_index = {key: npz_file[key] for key in npz_file.files}
+        except Exception:
+            footprint_index = None
+
+    if footprint_index is None or not is_footprint_index_current(footprint_index, file_stat):
+
+        # インデックスの格納先を作成（書き込み権限がない場合はメモリ上でのみ使用）
+        try:
+            os.makedirs(index_folder_path, exist_ok=True)
+        except OSError:
+            pass
+
+        # 変更のあったファイルのみ読み込み直してインデックスを作成
+        footprint_index = build_geotiff_footprint_index(folder_path, extent, footprint_index, file_stat)
+
+        # インデックスを一時ファイルに書き出してから置き換える
+        # 一時ファイルはプロセス、スレッドごとに分け、同時に作成した場合も互いに上書きしないようにする
+        temp_index_file_path = f"{index_file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_index_file_path, "wb") as index_file:
+                np.savez(index_file, **footprint_index)
+            os.replace(temp_index_file_path, index_file_path)
+        except OSError:
+            try:
+                os.remove(temp_index_file_path)
+            except OSError:
+                pass
+
+    # GeoTIFFの範囲の矩形のSTRtreeを作成
+    footprint_tree = shapely.STRtree(shapely.box(footprint_index["min_x"],
+                                                 footprint_index["min_y"],
+                                                 footprint_index["max_x"],
+                                                 footprint_index["max_y"]))
+
+    footprint_index_cache[cache_key] = (footprint_index, footprint_tree, folder_mtime_ns, current_time)
+
+    return footprint_index, footprint_tree
+
+
+def get_geotiff_index_array_containing_points(footprint_tree, x_array, y_array):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : 座標を1点以上範囲内（境界を含む）に持つGeoTIFFのインデックスを取得する関数
+    # 引数　 : footprint_tree - GeoTIFFの範囲の矩形を格納したSTRtree
+    # 　　　 : x_array        - x座標 1次元配列
+    # 　　　 : y_array        - y座標 1次元配列
+    # 戻り値 : geotiff_index_array - フットプリントインデックスのインデックス 1次元配列（昇順）
+    # -------------------------------------------------------------------------------------------------
+
+    _, geotiff_index_array = footprint_tree.query(shapely.points(x_array, y_array), predicate="intersects")
+
+    return np.unique(geotiff_index_array)
+
+
+def get_geotiff_z_value_at_grid_index(src, x_index_array, y_index_array):
+    # -------------------------------------------------------------------------------------------------
+    # 概要　 : 指定したピクセルを含む範囲のみを読み込み、ピクセルの標高値を取得する関数
+    # 　　　   ピクセルを含むブロックのみを読み込み、ブロック数が多い場合はピクセルを囲む矩形を1回で読み込む
+    # 引数　 : src           - rasterioのDatasetReader
+    # 　　　 : x_index_array - x_index 1次元配列（範囲内のピクセルのみ）
+    # 　　　 : y_index_array - y_index 1次元配列（範囲内のピクセルのみ）
+    # 戻り値 : z_value_array - 標高値 1次元配列（-9999は0に置き換え）
+    # -------------------------------------------------------------------------------------------------
+
+    z_value_array = np.empty(len(x_index_array), dtype=src.dtypes[0])
+
+    if len(x_index_array) == 0:
+        return z_value_array
+
+    # ピクセルを囲む矩形
+    col_off = int(x_index_array.min())
+    row_off = int(y_index_array.min())
+    window_width = int(x_index_array.max()) - col_off + 1
+    window_height = int(y_index_array.max()) - row_off + 1
+
+    # ピクセルを含むブロック
+    block_height, block_width = src.block_shapes[0]
+    block_key_array = (y_index_array // block_height) * ((src.width + block_width - 1) // block_width) \
+        + (x_index_array // block_width)
+    unique_block_key_array, block_inverse_array = np.unique(block_key_array, return_inverse=True)
+
+    if len(unique_block_key_array) * block_height * block_width >= window_width * window_height:
+
+        # ブロック単位で読み込むより小さい場合は、ピクセルを囲む矩形を1回で読み込む
+        window_array = src.read(1, window=Window(col_off, row_off, window_width, window_height))
+        z_value_array[:] = window_array[y_index_array - row_off, x_index_array - col_off]
+
+    else:
+
+        # ピクセルをブロックごとにまとめる（ソートは1回のみ行い、ブロックごとの全件走査は行わない）
+        block_order_array = np.argsort(block_inverse_array.reshape(-1), kind="stable")
+        block_end_array = np.cumsum(np.bincount(block_inverse_array.reshape(-1),
+                                                minlength=len(unique_block_key_array)))
+        block_start_array = np.concatenate(([0], block_end_array[:-1]))
+
+        # ピクセルを含むブロックごとに読み込む
+        for block_index in range(len(unique_block_key_array)):
+
+            target_array = block_order_array[block_start_array[block_index]:block_end_array[block_index]]
+
+            block_row_off = int(y_index_array[target_array[0]]) // block_height * block_height
+            block_col_off = int(x_index_array[target_array[0]]) // block_width * block_width
+
+            window_array = src.read(1, window=Window(block_col_off,
+                                                     block_row_off,
+                                                     min(block_width, src.width - block_col_off),
+                                                     min(block_height, src.height - block_row_off)))
+
+            z_value_array[target_array] = window_array[y_index_array[target_array] - block_row_off,
+                                                       x_index_array[target_array] - block_col_off]
+
+    # データの中で -9999 の値を 0 に置き換える（無効値を処理）
+    z_value_array[z_value_array == -9999] = 0
+
+    return z_value_array
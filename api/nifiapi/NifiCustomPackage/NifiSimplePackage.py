@@ -22,12 +22,15 @@
 
 # Python標準ライブラリ
 import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import time
 import xml.etree.ElementTree as ET
 import pickle
 import base64
 import io
 import json
+import struct
 import unicodedata
 import pathlib
 
@@ -40,6 +43,7 @@ np = import_module("numpy")
 pd = import_module("pandas")
 gpd = import_module("geopandas")
 pgl = import_module("pygltflib")
+shapely = import_module("shapely")
 Point = import_module("shapely").geometry.Point
 LineString = import_module("shapely").geometry.LineString
 Polygon = import_module("shapely").geometry.Polygon
@@ -60,77 +64,14 @@ def get_geometries_points_numpy(target_geometries_list,
         NumPy配列: ジオメトリごとの座標を格納したNumPy配列（id付き）
     """
 
-    # 初期化
-    result_shape_list = []
-    result_geohashes_list = []
-    max_count = len(target_geometries_list)
-
-    # ジオメトリタイプを一つ目のジオメトリから判定
-    # すべての地物のジオメトリタイプはすべて同じとする。
-    target_geometry_type = target_geometries_list[0].geom_type
-
-    # list変換回数
-    max_count_range = range(max_count)
-
-    # ジオメトリタイプによる引数の分岐
-    # ジオメトリタイプがポリゴンの場合
-    if 'Polygon' in target_geometry_type:
-
-        # Multiジオメトリの場合
-        if 'Multi' in target_geometry_type:
-
-            # 最初の要素から外観の座標値を取得する
-            # ジオメトリごとにまとめたリストを取得する
-            # ただし空のジオメトリは対象としない
-            result_shape_list = [get_geometry_points_list(
-                target_geometries_list[i].exterior.coords[0]) for i in max_count_range if target_geometries_list[i].is_empty == False]
-
-        # Multiでない場合
-        else:
-
-            # ジオメトリごとにまとめたリストを取得する
-            # ただし空のジオメトリは対象としない
-            result_shape_list = [get_geometry_points_list(
-                target_geometries_list[i].exterior.coords) for i in max_count_range if target_geometries_list[i].is_empty == False]
-
-    # ジオメトリタイプがポリゴン以外（ポイントorライン）の場合
-    else:
-
-        # Multiジオメトリの場合
-        if 'Multi' in target_geometry_type:
-
-            # 最初の要素から座標値を取得する
-            # ジオメトリごとにまとめたリストを取得する
-            # ただし空のジオメトリは対象としない
-            result_shape_list = [get_geometry_points_list(
-                target_geometries_list[i].geoms[0].coords) for i in max_count_range if target_geometries_list[i].is_empty == False]
-
-        else:
-            # ジオメトリごとにまとめたリストを取得する
-            # ただし空のジオメトリは対象としない
-            result_shape_list = [get_geometry_points_list(
-                target_geometries_list[i].coords) for i in max_count_range if target_geometries_list[i].is_empty == False]
-
-    # ジオメトリごとにidを列挿入する idは0からの連番
-    result_id_shapes_list = [np.insert(np.array(
-        result_shape_list[i], dtype=np.float64), 0, i, axis=1).copy().tolist() for i in max_count_range]
-
-    # id付ジオメトリnumpy配列格納list
-    result_list = []
+    # 空のジオメトリは対象としない
+    target_geometries_array = np.asarray(target_geometries_list, dtype=object)
+    target_geometries_array = target_geometries_array[~shapely.is_empty(target_geometries_array)]
 
-    # ジオメトリの構成点を一つずつ配列に格納する
-    for result_id_shape_list in result_id_shapes_list:
-
-        # ジオメトリごとの座標リスト
-        list = [result_id_shape_list[l]
-                for l in range(len(result_id_shape_list))]
-
-        # リストに追加
-        result_list.extend(list)
-
-    et = time.perf_counter()
-    # 戻り値を設定
-    return np.array(result_list, dtype=np.float64).copy()
+    # ジオメトリごとの構成点を連続した重複点を削除した上で一括取得する
+    # idは0からの連番
+    return get_coordinates_array_from_geometries(target_geometries_array,
+                                                 remove_duplicated_next_point=True)
 
 
 def get_geometry_points_list(target_shape,
@@ -886,16 +827,17 @@ def convert_array_3_points(array):
     return result_array
 
 
-def get_binary_information(array):
+def get_binary_information(array, is_uri=True):
     """
     概要:
         与えられた配列をバイナリ形式に変換し、そのバイナリデータの長さと、gltfのURIに設定するための文字列に変換した結果を返す
 
     引数:
         array: バイナリ形式に変換したい配列。xyz座標の場合は2次元配列 座標の組み合わせは1次元配列を想定している
+        is_uri: Trueの場合はURIに設定する文字列、Falseの場合はバイナリデータのまま返す（GLB出力用）
 
     戻り値:
-        array_blob: 配列をバイナリ形式に変換した後、gltfのURIに使用できる形式にエンコードされた文字列
+        array_blob: 配列をバイナリ形式に変換した後、gltfのURIに使用できる形式にエンコードされた文字列（is_uriがFalseの場合はbytes）
         array_blob_length: バイナリ形式に変換した配列のバイナリデータの長さ
     """
 
@@ -906,11 +848,78 @@ def get_binary_information(array):
     array_blob_length = len(array_blob)
 
     # gltfのuriに設定する文字列へ変換
-    array_blob = get_uri_value(array_blob)
+    if is_uri:
+        array_blob = get_uri_value(array_blob)
 
     return array_blob, array_blob_length
 
 
+def append_glb_binary_chunk(binary_chunk_list, binary_chunk_length, array_blob):
+    """
+    概要:
+        GLBのBINチャンクにバイナリデータを追加する
+        追加するデータの開始位置がGLBの境界（4バイト）に揃うよう、必要に応じて0埋めを行う
+
+    引数:
+        binary_chunk_list: BINチャンクを構成するバイナリデータのList
+        binary_chunk_length: 追加前のBINチャンクの長さ
+        array_blob: 追加するバイナリデータ
+
+    戻り値:
+        byte_offset: 追加したバイナリデータのBINチャンク内の開始位置（bufferViewのbyteOffset）
+        binary_chunk_length: 追加後のBINチャンクの長さ
+    """
+
+    # 境界に揃えるための0埋め
+    padding_length = -binary_chunk_length % DDC.GLB_ALIGNMENT
+    if padding_length > 0:
+        binary_chunk_list.append(b"\x00" * padding_length)
+
+    byte_offset = binary_chunk_length + padding_length
+    binary_chunk_list.append(array_blob)
+
+    return byte_offset, byte_offset + len(array_blob)
+
+
+def convert_gltf_to_glb(gltf_data):
+    """
+    概要:
+        バイナリデータを持つglTFオブジェクトをGLB（バイナリglTF）のバイト列に変換する
+        JSONチャンクは整形せずに出力し、BINチャンクはglTFオブジェクトのバイナリデータをそのまま使用する
+
+    引数:
+        gltf_data: set_binary_blobでBINチャンクのデータを設定したglTFオブジェクト
+
+    戻り値:
+        glb_bytes: GLBのバイト列
+    """
+
+    # JSONチャンク 境界に揃うよう空白で埋める
+    json_chunk = gltf_data.to_json(separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % DDC.GLB_ALIGNMENT)
+
+    # BINチャンク 境界に揃うよう0で埋める
+    binary_chunk = gltf_data.binary_blob() or b""
+    binary_chunk_padding = b"\x00" * (-len(binary_chunk) % DDC.GLB_ALIGNMENT)
+    binary_chunk_length = len(binary_chunk) + len(binary_chunk_padding)
+
+    # ヘッダ（マジック、バージョン、全体の長さ）と各チャンク（長さ、種類、データ）
+    chunk_list = [None,
+                  struct.pack("<II", len(json_chunk), DDC.GLB_JSON_CHUNK_TYPE),
+                  json_chunk]
+
+    # BINチャンクはデータがある場合のみ出力する
+    if binary_chunk_length > 0:
+        chunk_list.extend([struct.pack("<II", binary_chunk_length, DDC.GLB_BIN_CHUNK_TYPE),
+                           binary_chunk,
+                           binary_chunk_padding])
+
+    glb_length = 12 + sum(len(chunk) for chunk in chunk_list[1:])
+    chunk_list[0] = struct.pack("<4sII", DDC.GLB_MAGIC, DDC.GLB_VERSION, glb_length)
+
+    return b"".join(chunk_list)
+
+
 def get_geometry_information_list(temporary_xyz_array):
     """
     概要:
@@ -930,10 +939,8 @@ def get_geometry_information_list(temporary_xyz_array):
         np.trunc((temporary_xyz_array * 10000000)) / 10000000).copy()
 
     # IDごとの構成点座標取得（キー：地物ID、値：地物IDの構成点のxyz座標）
-    id_array = np.unique(temporary_round_down_xyz_array[:, 0:1])
-
-    id_coordinate_dict = {id_array[i]: temporary_round_down_xyz_array[list(np.where(
-        temporary_round_down_xyz_array[:, 0] == id_array[i])[0]), 1:4] for i in range(len(id_array))}
+    id_array, id_coordinate_dict = create_id_array_dict(temporary_round_down_xyz_array,
+                                                        column_slice=slice(1, 4))
 
     # 一意な構成点格納用List、マルチパッチの構成点組み合わせインデックス格納用List
     coordinates_list = []
@@ -1445,6 +1452,23 @@ def create_feature_rectangle(feature_array, level_mesh_array):
     return np.array(result_list)
 
 
+def get_cross_2d(vector_array1, vector_array2):
+    """
+    概要:
+        2次元ベクトルの外積（z成分）を計算する
+        np.crossと同じ演算順序で計算し、軸の入れ替えを行わない分高速に処理する
+
+    引数:
+        vector_array1: 1つ目の2次元ベクトル（配列の最後の次元がxy）
+        vector_array2: 2つ目の2次元ベクトル（配列の最後の次元がxy）
+
+    戻り値:
+        cross_array: 外積の値
+    """
+
+    return vector_array1[..., 0] * vector_array2[..., 1] - vector_array1[..., 1] * vector_array2[..., 0]
+
+
 def get_cross(line_string_array, unit_line_string_array):
     """
     概要:
@@ -1475,8 +1499,8 @@ def get_cross(line_string_array, unit_line_string_array):
     # 両方0の場合は同一直線上にある→交差判定としない
     # 積が0だが片方のみ0の場合は同じ点を共有するので交差とする
     # 外積の計算
-    cross_array1 = np.cross(ab_array, ac_array)
-    cross_array2 = np.cross(ab_array, ad_array)
+    cross_array1 = get_cross_2d(ab_array, ac_array)
+    cross_array2 = get_cross_2d(ab_array, ad_array)
 
     # 基準2
     cd_array = unit_line_string_array[:, 1,
@@ -1491,8 +1515,8 @@ def get_cross(line_string_array, unit_line_string_array):
     # 両方0の場合は同一直線上にある→交差判定としない
     # 積が0だが片方のみ0の場合は同じ点を共有するので交差とする
     # 外積の計算
-    cross_array3 = np.cross(cd_array, cb_array)
-    cross_array4 = np.cross(cd_array, ca_array)
+    cross_array3 = get_cross_2d(cd_array, cb_array)
+    cross_array4 = get_cross_2d(cd_array, ca_array)
 
     # 1,2は地物の線分側から見た外積
     # 3,4は図郭の線分側から見た外積
@@ -1555,7 +1579,7 @@ def get_intersect_point_array(line_array, unit_array):
     # 交差した図郭の線分ab
     # tが0あるいは1の時線分の端点になる
     # 0より大きく1より小さいものが地物を分割する点となる
-    t = -np.cross(cd, ca) / np.cross(cd, ab)
+    t = -get_cross_2d(cd, ca) / get_cross_2d(cd, ab)
 
     t = np.sort(t)
     # 複数の点を同時に計算するため2次元配列にする
@@ -1593,101 +1617,113 @@ def judge_citygml(feature_array, unit_origin_array, level_mesh_array):
         return False
     else:
 
-        # 原点と延長格納用List
-        # [x,y,length]→この図郭（原点）にどれだけの延長が存在しているか
-        origin_length_list = []
-
-        # 線分ごとに交差図郭抽出
-        for i in range(len(feature_array)-1):
-
-            # 線分が存在する図郭の線分座標生成
-            temp_unit_array = create_feature_rectangle(
-                feature_array[i:i+2, :], level_mesh_array)
-
-            # 線分と図郭の外積取得
-            cross1, cross2, cross3, cross4 = get_cross(
-                feature_array[i:i+2, :], temp_unit_array)
+        # 集計結果から延長最大の原点取得
+        # 延長が最大の原点が引数の図郭と同じなら出力対象
+        if np.all(np.isclose(get_dominant_unit_origin(feature_array, level_mesh_array), unit_origin_array)):
+            return True
 
-            # 交差判定
-            intersect_bool = is_intersect(cross1, cross2, cross3, cross4)
+        # それ以外は出力対象としない
+        else:
+            return False
 
-            if np.any(intersect_bool):
 
-                # 線分ごとに交差箇所特定→ここでの交差判定は外積の積が0以下かつ少なくとも片方は0でない場合
-                cross_point = get_intersect_point_array(
-                    feature_array[i:i+2, :], temp_unit_array[intersect_bool])
+def get_dominant_unit_origin(feature_array, level_mesh_array):
+    # ---------------------------------------------------------------
+    # 地物を図郭線で分割し、図郭ごとの延長を集計して延長最大の図郭原点を返す
+    # 判定対象の図郭に依存しないため、地物ごとに1回だけ計算すればよい
+    # 1地物
+    # 50000レベルから抽出範囲図郭までの1meshの単位
+    # ---------------------------------------------------------------
 
-                # 始点の原点
-                start_origin = get_origin_point_from_coordinates_array(
-                    feature_array[i:i+1, :], level_mesh_array)
+    # 原点と延長格納用List
+    # [x,y,length]→この図郭（原点）にどれだけの延長が存在しているか
+    origin_length_list = []
+
+    # 線分ごとに交差図郭抽出
+    for i in range(len(feature_array)-1):
+
+        # 線分が存在する図郭の線分座標生成
+        temp_unit_array = create_feature_rectangle(
+            feature_array[i:i+2, :], level_mesh_array)
+
+        # 線分と図郭の外積取得
+        cross1, cross2, cross3, cross4 = get_cross(
+            feature_array[i:i+2, :], temp_unit_array)
+
+        # 交差判定
+        intersect_bool = is_intersect(cross1, cross2, cross3, cross4)
+
+        if np.any(intersect_bool):
+
+            # 線分ごとに交差箇所特定→ここでの交差判定は外積の積が0以下かつ少なくとも片方は0でない場合
+            cross_point = get_intersect_point_array(
+                feature_array[i:i+2, :], temp_unit_array[intersect_bool])
+
+            # 始点の原点
+            start_origin = get_origin_point_from_coordinates_array(
+                feature_array[i:i+1, :], level_mesh_array)
+
+            # 始点から交差点までの長さ
+            start_distance = np.sqrt(
+                np.sum(np.power(feature_array[i] - cross_point[0], 2)))
+            origin_length_list.append(
+                [start_origin[0, 0].copy(), start_origin[0, 1].copy(), start_distance.copy()])
+
+            if len(cross_point) > 1:
+                # 交差点間
+                # 分割単位で図郭の左上特定と長さの計算
+                #    交差図郭で以上以下を調べて左上とする
+                #    交差点の数よる1の時0の時2以上の時
+                #    延長の計算は始点→交差点 交差点→交差点・・・・交差点→終点
+                #    それぞれどの図郭に存在するかは交差点以外で判定
+                #    交差点同士で挟まれている場合は中点で判定
+                # 交差する点が1点しかなければ交差点同士の計算はしない
+                for ci in range(len(cross_point)-1):
+                    temp_distance = np.sqrt(
+                        np.sum(np.power(cross_point[ci] - cross_point[ci+1], 2)))
+                    temp_middle_point = (
+                        cross_point[ci:ci+1, :] + cross_point[ci+1:ci+2, :]) / 2
+                    temp_origin = get_origin_point_from_coordinates_array(
+                        temp_middle_point, level_mesh_array)
+                    origin_length_list.append(
+                        [temp_origin[0, 0].copy(), temp_origin[0, 1].copy(), temp_distance.copy()])
 
-                # 始点から交差点までの長さ
-                start_distance = np.sqrt(
-                    np.sum(np.power(feature_array[i] - cross_point[0], 2)))
-                origin_length_list.append(
-                    [start_origin[0, 0].copy(), start_origin[0, 1].copy(), start_distance.copy()])
+            else:
+                pass
 
-                if len(cross_point) > 1:
-                    # 交差点間
-                    # 分割単位で図郭の左上特定と長さの計算
-                    #    交差図郭で以上以下を調べて左上とする
-                    #    交差点の数よる1の時0の時2以上の時
-                    #    延長の計算は始点→交差点 交差点→交差点・・・・交差点→終点
-                    #    それぞれどの図郭に存在するかは交差点以外で判定
-                    #    交差点同士で挟まれている場合は中点で判定
-                    # 交差する点が1点しかなければ交差点同士の計算はしない
-                    for ci in range(len(cross_point)-1):
-                        temp_distance = np.sqrt(
-                            np.sum(np.power(cross_point[ci] - cross_point[ci+1], 2)))
-                        temp_middle_point = (
-                            cross_point[ci:ci+1, :] + cross_point[ci+1:ci+2, :]) / 2
-                        temp_origin = get_origin_point_from_coordinates_array(
-                            temp_middle_point, level_mesh_array)
-                        origin_length_list.append(
-                            [temp_origin[0, 0].copy(), temp_origin[0, 1].copy(), temp_distance.copy()])
+            # 交差点から終点まで
+            # 終点の存在する図郭取得
+            end_origin = get_origin_point_from_coordinates_array(
+                feature_array[i+1:i+2, :], level_mesh_array)
 
-                else:
-                    pass
+            # 交差点から終点までの長さ
+            end_distance = np.sqrt(
+                np.sum(np.power(feature_array[i+1] - cross_point[-1], 2)))
+            origin_length_list.append(
+                [end_origin[0, 0].copy(), end_origin[0, 1].copy(), end_distance.copy()])
 
-                # 交差点から終点まで
-                # 終点の存在する図郭取得
-                end_origin = get_origin_point_from_coordinates_array(
-                    feature_array[i+1:i+2, :], level_mesh_array)
+        else:
+            # 交差がなければ原点追加、線分の距離
+            # 終点の存在する図郭取得
+            temp_origin = get_origin_point_from_coordinates_array(
+                feature_array[i:i + 1, :], level_mesh_array)
 
-                # 交差点から終点までの長さ
-                end_distance = np.sqrt(
-                    np.sum(np.power(feature_array[i+1] - cross_point[-1], 2)))
-                origin_length_list.append(
-                    [end_origin[0, 0].copy(), end_origin[0, 1].copy(), end_distance.copy()])
+            # 交差点から終点までの長さ
+            temp_distance = np.sqrt(
+                np.sum(np.power(feature_array[i] - feature_array[i + 1], 2)))
+            origin_length_list.append(
+                [temp_origin[0, 0].copy(), temp_origin[0, 1].copy(), temp_distance.copy()])
 
-            else:
-                # 交差がなければ原点追加、線分の距離
-                # 終点の存在する図郭取得
-                temp_origin = get_origin_point_from_coordinates_array(
-                    feature_array[i:i + 1, :], level_mesh_array)
+    origin_length_array = np.array(origin_length_list).round(decimals=2)
 
-                # 交差点から終点までの長さ
-                temp_distance = np.sqrt(
-                    np.sum(np.power(feature_array[i] - feature_array[i + 1], 2)))
-                origin_length_list.append(
-                    [temp_origin[0, 0].copy(), temp_origin[0, 1].copy(), temp_distance.copy()])
+    # 分割単位が同じ（含まれる原点が同じ）もので合計
+    unique_origin = np.unique(
+        origin_length_array[:, :2], axis=0).astype(np.int64)
+    sum_distance = np.array([np.sum(origin_length_array[np.all(origin_length_array[:, :2].astype(
+        np.int64) == unique_origin[ui], axis=1), 2]) for ui in range(len(unique_origin))])
 
-        origin_length_array = np.array(origin_length_list).round(decimals=2)
-
-        # 分割単位が同じ（含まれる原点が同じ）もので合計
-        unique_origin = np.unique(
-            origin_length_array[:, :2], axis=0).astype(np.int64)
-        sum_distance = np.array([np.sum(origin_length_array[np.all(origin_length_array[:, :2].astype(
-            np.int64) == unique_origin[ui], axis=1), 2]) for ui in range(len(unique_origin))])
-
-        # 集計結果から延長最大の原点取得
-        # 延長が最大の原点が引数の図郭と同じなら出力対象
-        if np.all(np.isclose(unique_origin[np.argmax(sum_distance)], unit_origin_array)):
-            return True
-
-        # それ以外は出力対象としない
-        else:
-            return False
+    # 延長最大の原点
+    return unique_origin[np.argmax(sum_distance)]
 
 
 def judge_citygmls(linestring_array,
@@ -1708,6 +1744,215 @@ def judge_citygmls(linestring_array,
     return np.array(feature_bool, dtype=np.bool_)
 
 
+def create_unit_feature_index_list(coordinates_array,
+                                   start_index_array,
+                                   end_index_array,
+                                   unit_origin_array,
+                                   level_mesh_array):
+    """
+    概要:
+        全地物を出力対象図郭に1回で振り分ける
+        各図郭についてjudge_citygmlを全地物に実行した結果と同じ地物を返す
+        図郭内に収まる地物は外接矩形と図郭の格子位置から判定し、
+        図郭線をまたぐ地物のみ延長最大の図郭を1回だけ計算する
+
+    引数:
+        coordinates_array: 全地物のxy座標を連結した2次元配列
+        start_index_array: 地物ごとの開始インデックス配列
+        end_index_array: 地物ごとの終了インデックス配列
+        unit_origin_array: 出力対象図郭の原点座標の2次元配列 [[x,y]...]
+        level_mesh_array: 50000レベルから出力対象図郭までの1meshの単位（全図郭で同じレベルであること）
+
+    戻り値:
+        unit_feature_index_list: 図郭ごとの出力対象地物インデックス配列（昇順）のList unit_origin_arrayと同順
+    """
+
+    coordinates_array = np.asarray(coordinates_array, dtype=np.float64)
+    start_index_array = np.asarray(start_index_array, dtype=np.int64)
+    end_index_array = np.asarray(end_index_array, dtype=np.int64)
+    unit_origin_array = np.asarray(
+        unit_origin_array, dtype=np.float64).reshape(-1, 2)
+
+    feature_number = len(start_index_array)
+    unit_number = len(unit_origin_array)
+
+    if feature_number == 0 or unit_number == 0:
+        return [np.zeros(0, dtype=np.int64) for _ in range(unit_number)]
+
+    # 図郭のmesh単位
+    x_unit = level_mesh_array[-1, 0]
+    y_unit = level_mesh_array[-1, 1]
+
+    # 図郭の格子位置（原点x / x単位, 原点y / y単位）をキーとして図郭を検索できるようにする
+    # 同じ図郭が複数指定された場合は同じ結果とするため、ユニークなキーで判定する
+    unit_key_array = np.round(
+        unit_origin_array / np.array([x_unit, y_unit])).astype(np.int64)
+    unique_key_array, unit_inverse_array = np.unique(
+        unit_key_array, axis=0, return_inverse=True)
+    unit_inverse_array = unit_inverse_array.ravel()
+    unique_origin_array = np.zeros((len(unique_key_array), 2))
+    unique_origin_array[unit_inverse_array] = unit_origin_array
+    unique_code_array = unique_key_array[:, 0] * \
+        (1 << 32) + unique_key_array[:, 1]
+
+    # 地物を出力対象とする図郭の組み合わせ格納用List（地物インデックス, ユニーク図郭インデックス）
+    feature_pair_list = []
+    unit_pair_list = []
+
+    # 構成点のない地物はjudge_citygmlで常に出力対象となる
+    empty_bool = end_index_array < start_index_array
+    if np.any(empty_bool):
+        empty_index_array = np.flatnonzero(empty_bool)
+        feature_pair_list.append(
+            np.repeat(empty_index_array, len(unique_key_array)))
+        unit_pair_list.append(
+            np.tile(np.arange(len(unique_key_array)), len(empty_index_array)))
+
+    target_index_array = np.flatnonzero(~empty_bool)
+    target_start_array = start_index_array[target_index_array]
+    target_end_array = end_index_array[target_index_array]
+
+    # 地物ごとの外接矩形 開始位置と終了位置+1を交互に並べてreduceatで集計する
+    reduce_index_array = np.column_stack(
+        [target_start_array, target_end_array + 1]).ravel()
+    x_array = np.append(coordinates_array[:, 0], np.nan)
+    y_array = np.append(coordinates_array[:, 1], np.nan)
+    min_x = np.minimum.reduceat(x_array, reduce_index_array)[::2]
+    max_x = np.maximum.reduceat(x_array, reduce_index_array)[::2]
+    min_y = np.minimum.reduceat(y_array, reduce_index_array)[::2]
+    max_y = np.maximum.reduceat(y_array, reduce_index_array)[::2]
+
+    # 外接矩形の左下が存在する格子位置
+    base_x_key = np.floor(min_x / x_unit).astype(np.int64)
+    base_y_key = np.floor(min_y / y_unit).astype(np.int64) + 1
+
+    # 地物全体が図郭内（境界含む）に存在する図郭
+    # 境界上の地物は隣接図郭にも含まれるため周囲の格子位置も確認し、判定自体はjudge_citygmlと同じ比較で行う
+    for x_offset in (-1, 0, 1):
+        for y_offset in (-1, 0, 1):
+            candidate_code_array = (base_x_key + x_offset) * \
+                (1 << 32) + (base_y_key + y_offset)
+            position_array = np.searchsorted(
+                unique_code_array, candidate_code_array)
+            position_array = np.minimum(
+                position_array, len(unique_code_array) - 1)
+            found_bool = unique_code_array[position_array] == candidate_code_array
+
+            unit_min_x = unique_origin_array[position_array, 0]
+            unit_max_x = unit_min_x + x_unit
+            unit_max_y = unique_origin_array[position_array, 1]
+            unit_min_y = unit_max_y - y_unit
+
+            inside_bool = found_bool\
+                & (unit_min_x <= min_x) & (max_x <= unit_max_x)\
+                & (unit_min_y <= min_y) & (max_y <= unit_max_y)
+
+            feature_pair_list.append(target_index_array[inside_bool])
+            unit_pair_list.append(position_array[inside_bool])
+
+    # 格子の内部に完全に収まる地物は延長最大の図郭もその図郭となるため計算不要
+    # 浮動小数点の誤差を考慮し、格子線から許容誤差以内の地物は図郭線をまたぐ地物として扱う
+    tolerance = 1e-7 * (np.nanmax(np.abs(coordinates_array[:, :2]), initial=0.0)
+                        + max(x_unit, y_unit))
+    interior_bool = (base_x_key * x_unit + tolerance < min_x)\
+        & (max_x < (base_x_key + 1) * x_unit - tolerance)\
+        & ((base_y_key - 1) * y_unit + tolerance < min_y)\
+        & (max_y < base_y_key * y_unit - tolerance)
+
+    # 構成点が1点の地物は図郭内か図郭外のどちらかに必ず判定される
+    multi_point_bool = target_end_array > target_start_array
+
+    for fi in np.flatnonzero(~interior_bool & multi_point_bool):
+
+        # 延長最大の図郭原点
+        dominant_origin_array = get_dominant_unit_origin(
+            coordinates_array[target_start_array[fi]:target_end_array[fi] + 1, :2], level_mesh_array)
+
+        # 出力対象図郭に含まれるか
+        dominant_key_array = np.round(
+            dominant_origin_array / np.array([x_unit, y_unit])).astype(np.int64)
+        dominant_code = dominant_key_array[0] * \
+            (1 << 32) + dominant_key_array[1]
+        position = np.searchsorted(unique_code_array, dominant_code)
+        if position == len(unique_code_array) or unique_code_array[position] != dominant_code:
+            continue
+
+        # judge_citygmlと同じく、全構成点が図郭の片側にある場合は対象外
+        unit_min_x = unique_origin_array[position, 0]
+        unit_max_x = unit_min_x + x_unit
+        unit_max_y = unique_origin_array[position, 1]
+        unit_min_y = unit_max_y - y_unit
+        if max_x[fi] < unit_min_x or unit_max_x < min_x[fi]\
+                or max_y[fi] < unit_min_y or unit_max_y < min_y[fi]:
+            continue
+
+        if np.all(np.isclose(dominant_origin_array, unique_origin_array[position])):
+            feature_pair_list.append(target_index_array[fi:fi + 1])
+            unit_pair_list.append(np.array([position], dtype=np.int64))
+
+    # 図郭ごとに地物インデックスをまとめる（重複を除き昇順）
+    pair_array = np.unique(np.column_stack([np.concatenate(unit_pair_list),
+                                            np.concatenate(feature_pair_list)]).astype(np.int64), axis=0)
+    unique_unit_array, _, offset_array = get_sorted_group_index(pair_array[:, 0])
+
+    unique_feature_index_list = [np.zeros(0, dtype=np.int64)
+                                 for _ in range(len(unique_key_array))]
+    for ui in range(len(unique_unit_array)):
+        unique_feature_index_list[unique_unit_array[ui]]\
+            = pair_array[offset_array[ui]:offset_array[ui + 1], 1]
+
+    return [unique_feature_index_list[unit_inverse_array[ui]] for ui in range(unit_number)]
+
+
+def create_unit_feature_index_list_from_unit_code(feature_array_list,
+                                                  unit_code_list):
+    """
+    概要:
+        地物ごとの座標配列のListを国土基本図図郭コードごとに1回で振り分ける
+        図郭コードごとにjudge_citygmlを全地物に実行した結果と同じ地物を返す
+
+    引数:
+        feature_array_list: 地物ごとのxy座標配列のList
+        unit_code_list: 出力対象の国土基本図図郭コード文字列のList
+
+    戻り値:
+        unit_feature_index_list: 図郭コードごとの出力対象地物インデックス配列（昇順）のList unit_code_listと同順
+    """
+
+    # 地物の座標を連結し、地物ごとの範囲を取得
+    length_array = np.array([len(temp_array)
+                            for temp_array in feature_array_list], dtype=np.int64)
+    end_index_array = np.cumsum(length_array) - 1
+    start_index_array = end_index_array - length_array + 1
+
+    if len(feature_array_list) > 0 and np.sum(length_array) > 0:
+        coordinates_array = np.concatenate([np.asarray(temp_array, dtype=np.float64)[:, :2].reshape(-1, 2)
+                                            for temp_array in feature_array_list])
+    else:
+        coordinates_array = np.zeros((0, 2))
+
+    # 図郭の原点とmesh単位取得
+    unit_list = [get_unit_origin(unit_code) for unit_code in unit_code_list]
+
+    # 地図情報レベルが同じ図郭ごとにまとめて振り分ける
+    level_dict = {}
+    for ui in range(len(unit_list)):
+        level_dict.setdefault(
+            tuple(np.ravel(unit_list[ui][1]).tolist()), []).append(ui)
+
+    unit_feature_index_list = [None] * len(unit_code_list)
+    for unit_index_list in level_dict.values():
+        temp_index_list = create_unit_feature_index_list(coordinates_array,
+                                                         start_index_array,
+                                                         end_index_array,
+                                                         np.array(
+                                                             [unit_list[ui][0] for ui in unit_index_list]),
+                                                         unit_list[unit_index_list[0]][1])
+        for li in range(len(unit_index_list)):
+            unit_feature_index_list[unit_index_list[li]] = temp_index_list[li]
+
+    return unit_feature_index_list
+
 def create_element(element_list, element_dict):
     # ---------------------------------------------------------------
     # ネストされた要素を作成 最後の要素を返す←値を追加する用
@@ -1949,15 +2194,20 @@ def get_matrix_gltf_from_cartesian3(cartesian3, ellipsoid):
     return np.array([matrix_array[1], matrix_array[9], -matrix_array[5], matrix_array[12], matrix_array[2], matrix_array[10], -matrix_array[6], matrix_array[13], matrix_array[0], matrix_array[8], -matrix_array[4], matrix_array[14], matrix_array[3], matrix_array[11], -matrix_array[7], matrix_array[15]])
 
 
-def get_buffer_attribute(input_data_list):
+def get_buffer_attribute(input_data_list, is_uri=True):
+    # ---------------------------------------------------------------
+    # 属性値の文字列を連結したバイナリデータと、各値の開始位置配列を取得する
+    # is_uriがTrueの場合はURIに設定する文字列、Falseの場合はバイナリデータのまま返す（GLB出力用）
+    # ---------------------------------------------------------------
 
     data_list = [str(input_data_list[i]) for i in range(len(input_data_list))]
 
     data_len_array = np.array([len(data_list[i].encode('utf-8'))
                               for i in range(len(data_list))], dtype=np.uint32)
 
-    data_offset_array = np.array([0 if i == 0 else np.sum(
-        data_len_array[0:i]) for i in range(len(data_len_array)+1)], dtype=np.uint32)
+    # 各値の開始位置 先頭は0、末尾は全体の長さ
+    data_offset_array = np.zeros(len(data_len_array)+1, dtype=np.uint32)
+    data_offset_array[1:] = np.cumsum(data_len_array, dtype=np.uint64)
 
     data_string = "".join(data_list)
 
@@ -1965,15 +2215,19 @@ def get_buffer_attribute(input_data_list):
 
     data_string_length = int(np.sum(data_len_array))
 
-    attribute_uri = DDC.DATA_URI_HEADER + get_uri_value(data_string)
+    if is_uri:
+        attribute_uri = DDC.DATA_URI_HEADER + get_uri_value(data_string)
+    else:
+        attribute_uri = data_string
 
     return data_string_length, data_offset_array, attribute_uri
 
 
-def create_gltf_object(temporary_xyz_array, all_attribute_dataframe, matrix_list=None):
+def create_gltf_object(temporary_xyz_array, all_attribute_dataframe, matrix_list=None, binary_flag=False):
     # -----------------------------------------------------------------------------------------------------------
     # 関数名      ：glTF出力データクラスオブジェクト作成処理
     # 第１引数    ：【XYZ】の順に座標情報が格納された2次元のndarray配列
+    # 第４引数    ：Trueの場合はGLB出力用に、全バッファを1つのBINチャンクにまとめてglTFオブジェクトに設定する
     # 戻り値      ：glTFのデータクラスオブジェクト
     # 処理概要    ：XYZの配列から立体の面を構成するための座標同士の結びつきの情報と、
     #              XZYの並びに変換した座標情報をもとにglTFに出力するデータ配列を作成する。
@@ -2004,27 +2258,30 @@ def create_gltf_object(temporary_xyz_array, all_attribute_dataframe, matrix_list
             result_coordinates_array[:, 0], return_counts=True)
         feature_counts = len(np.unique(feature_unique_id_array))
 
-        result_feature_id_array = np.concatenate(
-            [[i]*feature_unique_id_counts_array[i] for i in range(len(feature_unique_id_counts_array))])
+        result_feature_id_array = np.repeat(np.arange(
+            len(feature_unique_id_counts_array)), feature_unique_id_counts_array)
+
+        # GLB出力の場合はURIに変換せずバイナリデータのまま扱う
+        is_uri = not binary_flag
 
         # マルチパッチの頂点法線座標をgltfに設定する形式へ変換
         # 「構成面座標連番配列」作成
         target_triangles_binary_blob, target_triangles_binary_length = get_binary_information(
-            result_coordinates_combination_array)
+            result_coordinates_combination_array, is_uri)
 
         # glTFの仕様で浮動小数点の値は32bitのデータ型でしか持てないため、
         # 「座標情報配列」を32bit浮動小数に変換し、バイナリデータ化する。
         target_points_array = result_coordinates_array[:, [
             2, 3, 1]].astype(np.float32)
         target_points_binary_blob, target_points_binary_length = get_binary_information(
-            target_points_array)
+            target_points_array, is_uri)
 
         # buffers,bufferViewsでデータ長の設定をするため、
         # 事前に「座標情報配列」と「構成面座標連番配列」のバイナリデータ長の取得する。
         # 座標情報配列は一意な点情報の塊　構成面座標連番配列とはその組み合わせ（インデックスで指定）
         # 「地物ID配列」作成（複数の三角形を一つの地物とみなすため）
         target_feature_id_binary_blob, target_feature_id_binary_length = get_binary_information(
-            result_feature_id_array.flatten())
+            result_feature_id_array.flatten(), is_uri)
 
         # 「頂点法線座標連番配列」作成
         # 「頂点法線座標情報配列」を32bit浮動小数に変換し、バイナリデータ化する。
@@ -2032,7 +2289,7 @@ def create_gltf_object(temporary_xyz_array, all_attribute_dataframe, matrix_list
         target_vertex_normal_array = result_coordinates_array[:, [
             5, 6, 4]].astype(np.float32)
         target_vertex_normal_points_binary_blob, target_vertex_normal_points_binary_length = get_binary_information(
-            target_vertex_normal_array)
+            target_vertex_normal_array, is_uri)
 
         ######################################################################################################
         # 【２．glTFの出力データ配列作成】
@@ -2044,15 +2301,30 @@ def create_gltf_object(temporary_xyz_array, all_attribute_dataframe, matrix_list
 
         # バイナリデータのデータ長を「構成面座標連番配列」と「座標情報配列」の長さの合計とする。
         # 「地物ID配列」、「頂点法線座標連番配列」、「頂点法線座標情報配列」
-        target_gltf_buffers_list = [pgl.Buffer(byteLength=target_triangles_binary_length
-                                               + target_points_binary_length
-                                               + target_feature_id_binary_length
-                                               + target_vertex_normal_points_binary_length, uri=DDC.DATA_URI_HEADER
-                                               + target_triangles_binary_blob
-                                               + target_points_binary_blob
-                                               + target_feature_id_binary_blob
-                                               + target_vertex_normal_points_binary_blob
-                                               )]
+        if binary_flag:
+
+            # GLBの場合はBINチャンクに順番に追加する（各配列の長さは4の倍数のため境界の0埋めは発生しない）
+            # bufferのbyteLengthは属性追加後に全体の長さで設定する
+            binary_chunk_list = [target_triangles_binary_blob,
+                                 target_points_binary_blob,
+                                 target_feature_id_binary_blob,
+                                 target_vertex_normal_points_binary_blob]
+            binary_chunk_length = target_triangles_binary_length\
+                + target_points_binary_length\
+                + target_feature_id_binary_length\
+                + target_vertex_normal_points_binary_length
+            target_gltf_buffers_list = [pgl.Buffer(byteLength=binary_chunk_length)]
+
+        else:
+            target_gltf_buffers_list = [pgl.Buffer(byteLength=target_triangles_binary_length
+                                                   + target_points_binary_length
+                                                   + target_feature_id_binary_length
+                                                   + target_vertex_normal_points_binary_length, uri=DDC.DATA_URI_HEADER
+                                                   + target_triangles_binary_blob
+                                                   + target_points_binary_blob
+                                                   + target_feature_id_binary_blob
+                                                   + target_vertex_normal_points_binary_blob
+                                                   )]
 
         ######################################################################################################
         # ＜２－２．bufferViewsの出力内容設定＞
@@ -2157,7 +2429,26 @@ def create_gltf_object(temporary_xyz_array, all_attribute_dataframe, matrix_list
         for di in range(len(data_list)):
 
             attribute_binary_length, offset_array, attribute_uri = get_buffer_attribute(
-                data_list[di])
+                data_list[di], is_uri)
+
+            # GLBの場合はbufferを分けずにBINチャンクに追加し、bufferViewは開始位置で参照する
+            if binary_flag:
+
+                # 属性のbufferView設定
+                attribute_byte_offset, binary_chunk_length = append_glb_binary_chunk(
+                    binary_chunk_list, binary_chunk_length, attribute_uri)
+                target_gltf_bufferViews_list.append(pgl.BufferView(buffer=0, byteOffset=attribute_byte_offset, byteLength=attribute_binary_length
+                                                                   ))
+
+                offset_blob, offset_binary_length = get_binary_information(
+                    offset_array, is_uri)
+
+                # オフセットのbufferView設定
+                offset_byte_offset, binary_chunk_length = append_glb_binary_chunk(
+                    binary_chunk_list, binary_chunk_length, offset_blob)
+                target_gltf_bufferViews_list.append(pgl.BufferView(buffer=0, byteOffset=offset_byte_offset, byteLength=offset_binary_length, target=pgl.ELEMENT_ARRAY_BUFFER
+                                                                   ))
+                continue
 
             # バッファ分け
             target_gltf_buffers_list.append(pgl.Buffer(
@@ -2211,6 +2502,11 @@ def create_gltf_object(temporary_xyz_array, all_attribute_dataframe, matrix_list
                                            "schema": classes_dict, "propertyTables": properties_table_list}}
                                        )
 
+        # GLBの場合はBINチャンクのデータを設定する
+        if binary_flag:
+            target_gltf_buffers_list[0].byteLength = binary_chunk_length
+            target_gltf_object.set_binary_blob(b"".join(binary_chunk_list))
+
         return target_gltf_object
 
     else:
@@ -2249,6 +2545,64 @@ def split_geometry_points_dict(target_geometries_points, all_key_list=None):
     return result_dict
 
 
+def convert_dict_to_geometries(geometries_dictionary, geometry_type):
+    # ---------------------------------------------------------------
+    # dictionaryからジオメトリへ一括変換
+    # 概要　：辞書型配列に格納されているndarryの座標情報を座標の次元（2D/3D）ごとに1つの座標配列にまとめ、
+    # 　　　　shaplyのジオメトリオブジェクトを一括で作成しリストで返す。
+    # 　　　　座標情報がNoneの場合や、構成点がない・2D/3D以外の形状の場合は従来どおりジオメトリのコンストラクタに渡す。
+    # 引数1 ：座標情報を格納した辞書型配列
+    # 引数2 ：ジオメトリタイプ（'Point', 'LineString', 'Polygon'）
+    # 戻り値：辞書型配列にキーとジオメトリを１組としたリスト
+    # ---------------------------------------------------------------
+
+    geometry_class = {'Point': Point, 'LineString': LineString}.get(geometry_type, Polygon)
+
+    key_list = list(geometries_dictionary)
+    geometry_array = np.empty(len(key_list), dtype=object)
+
+    # 座標の次元ごとに {次元: ([ジオメトリ番号], [構成点の配列])}
+    dimension_dict = {}
+    fallback_index_list = []
+
+    for i, key in enumerate(key_list):
+        value = geometries_dictionary[key]
+
+        if value is None:
+            fallback_index_list.append(i)
+            continue
+
+        points = np.asarray(value, dtype=np.float64)
+
+        # ポイントの座標は1次元配列として格納されている
+        if geometry_type == 'Point':
+            points = points.reshape(1, -1)
+
+        if points.ndim != 2 or len(points) == 0 or points.shape[1] not in (2, 3):
+            fallback_index_list.append(i)
+            continue
+
+        index_list, points_list = dimension_dict.setdefault(points.shape[1], ([], []))
+        index_list.append(i)
+        points_list.append(points)
+
+    for index_list, points_list in dimension_dict.values():
+
+        # ジオメトリ番号をid列とした座標配列を作成する
+        coordinates_array = np.column_stack([
+            np.repeat(np.arange(len(points_list), dtype=np.float64),
+                      [len(points) for points in points_list]),
+            np.concatenate(points_list)])
+
+        _, geometry_array[index_list] = create_geometries_from_coordinates_array(
+            coordinates_array, geometry_type)
+
+    for i in fallback_index_list:
+        geometry_array[i] = geometry_class(geometries_dictionary[key_list[i]])
+
+    return [[key, geometry] for key, geometry in zip(key_list, geometry_array)]
+
+
 def convert_dict_to_point_geometries(geometries_dictionary):
     # ---------------------------------------------------------------
     # dictionaryからポイントジオメトリへ変換
@@ -2258,10 +2612,7 @@ def convert_dict_to_point_geometries(geometries_dictionary):
     # 戻り値：辞書型配列にキーとラインジオメトリを１組としたリスト
     # ---------------------------------------------------------------
 
-    geometries_list = []
-
-    geometries_list = [[keys, Point(geometries_dictionary[keys])]
-                       for keys in geometries_dictionary]
+    geometries_list = convert_dict_to_geometries(geometries_dictionary, 'Point')
 
     return geometries_list
 
@@ -2275,10 +2626,7 @@ def convert_dict_to_linestring_geometries(geometries_dictionary):
     # 戻り値：辞書型配列にキーとラインジオメトリを１組としたリスト
     # ---------------------------------------------------------------
 
-    geometries_list = []
-
-    geometries_list = [[keys, LineString(
-        geometries_dictionary[keys])] for keys in geometries_dictionary]
+    geometries_list = convert_dict_to_geometries(geometries_dictionary, 'LineString')
 
     return geometries_list
 
@@ -2292,10 +2640,7 @@ def convert_dict_to_polygon_geometries(geometries_dictionary):
     # 戻り値：辞書型配列にキーとラインジオメトリを１組としたリスト
     # ---------------------------------------------------------------
 
-    geometries_list = []
-
-    geometries_list = [[keys, Polygon(geometries_dictionary[keys])]
-                       for keys in geometries_dictionary]
+    geometries_list = convert_dict_to_geometries(geometries_dictionary, 'Polygon')
 
     return geometries_list
 
@@ -2512,45 +2857,50 @@ def extract_output_target(all_attribute_dataframe, feature_bool,
     # -----------------------------------------------------------------------------------------------------------
     # 概要  : 出力対象抽出
     # 引数  : all_attribute_dataframe　- 全属性項目をまとめたデータフレーム
-    # 　　  : feature_bool             - 出力対象があるかないかのbool型
+    # 　　  : feature_bool             - 出力対象があるかないかのbool型、または出力対象のインデックス配列
     # 　　  : coordinates_id_array     - 座標配列のID配列
     # 　　  : coordinates_dict         - IDに対しての座標配列
     # 戻り値: target_attribute_dataframe - all_attribute_dataframeから、出力対象だけまとめたデータフレーム
     # 　　　: target_coordinates_array   - 出力対象のcoordinates_array
     # -----------------------------------------------------------------------------------------------------------
 
-    # feature_bool に基づいて、出力対象の行のみを選択
+    # 出力対象のインデックス配列 bool型の場合はTrueの位置に変換する
+    target_index_array = np.asarray(feature_bool)
+    if target_index_array.dtype == np.bool_:
+        target_index_array = np.flatnonzero(target_index_array)
+
+    # 出力対象の行のみを選択
     # インデックスをリセットして、新しいデータフレームを作成
-    target_attribute_dataframe = all_attribute_dataframe[feature_bool].reset_index(
+    target_attribute_dataframe = all_attribute_dataframe.iloc[target_index_array].reset_index(
         drop=True)
 
     # 出力対象のIDに基づいて座標配列を抽出
-    # feature_bool に基づいて、出力対象のID配列を選択
     # ID配列に対応する座標配列をcoordinates_dictから取得し、全てを一つの配列に結合
-    target_id_array = coordinates_id_array[feature_bool].copy()
+    target_id_array = coordinates_id_array[target_index_array].copy()
     target_coordinates_array = np.concatenate(
         [coordinates_dict[target_id_array[i]] for i in range(len(target_id_array))])
 
     # 出力対象の座標配列のIDを再整列する
     # 座標配列の最初の列（ID列）のユニークな値とその出現回数を取得
     # 各IDが出現する回数に応じて、再度ID配列を生成し、ID列を更新
-    target_unique_id_array, target_unique_id_counts_array = np.unique(
+    _, target_unique_id_counts_array = np.unique(
         target_coordinates_array[:, 0], return_counts=True)
-    target_unique_id_array = np.concatenate(
-        [[i]*target_unique_id_counts_array[i] for i in range(len(target_unique_id_counts_array))])
-    target_coordinates_array[:, 0] = target_unique_id_array
+    target_coordinates_array[:, 0] = np.repeat(np.arange(
+        len(target_unique_id_counts_array)), target_unique_id_counts_array)
 
     return target_attribute_dataframe, target_coordinates_array
 
 
 def append_gltf_uri_string_to_uri_list(geometry_dwh_file_name_list, unit_index_array,
-                                       unit_origin_array_index, gltf_directory_path, uri_list):
+                                       unit_origin_array_index, gltf_directory_path, uri_list,
+                                       gltf_extension=".gltf"):
     # ---------------------------------------------------------------------------------------------
     # 概要   : 出力することが決まればgltf、tileset.jsonに設定する値を生成し、uri設定用パス格納する。
     # 引数   : geometry_dwh_file_name_list   -データ定義ファイルで定義された、geometryのファイル名が格納されたlist
     # 　　   : unit_index_array              -存在する図郭の原点インデックス配列
     # 　　   : unit_origin_array_index       -存在する図郭の原点配列（左上）
     # 　　   : uri_list                      -tileset.json用gltf相対パス格納用list
+    # 　　   : gltf_extension                -uriに設定する拡張子（GLB出力の場合は".glb"）
     # 戻り値 : gltf_file_name                -拡張子のついていない、ファイル名
     # 　　　 : uri_list                      -tileset.json用gltf相対パス格納用list
     # ---------------------------------------------------------------------------------------------
@@ -2560,7 +2910,7 @@ def append_gltf_uri_string_to_uri_list(geometry_dwh_file_name_list, unit_index_a
         unit_index_array[unit_origin_array_index, 0])) + "_" + str(int(unit_index_array[unit_origin_array_index, 1]))
 
     # ディレクトリに何が保存されるのかの相対パス
-    gltf_uri_string = gltf_directory_path + "/" + gltf_file_name + ".gltf"
+    gltf_uri_string = gltf_directory_path + "/" + gltf_file_name + gltf_extension
 
     # uri_listに格納
     uri_list.append(gltf_uri_string)
@@ -2782,6 +3132,182 @@ def get_data_definition_list(flowfile):
     return field_set_data_frame, data_definition_list
 
 
+def get_sorted_group_index(id_array):
+    """
+    概要:
+        ID配列を安定ソートし、IDごとのグループ範囲（分割位置）を取得する
+        同一ID内の並び順は入力時の順序が保たれる
+
+    引数:
+        id_array: グループ化に用いるIDの1次元配列
+
+    戻り値:
+        unique_id_array: ユニークなIDの配列（昇順）
+        sort_index_array: ID順に並び替えるためのインデックス配列
+        offset_array: 並び替え後の配列におけるIDごとの開始位置（末尾に全体の要素数を持つ）
+    """
+
+    id_array = np.asarray(id_array).ravel()
+
+    # 同一ID内の構成点順を保つため安定ソートを使用する
+    sort_index_array = np.argsort(id_array, kind="stable")
+    sorted_id_array = id_array[sort_index_array]
+
+    # IDが切り替わる位置をグループの開始位置とする
+    start_flag_array = np.ones(len(sorted_id_array), dtype=bool)
+    start_flag_array[1:] = sorted_id_array[1:] != sorted_id_array[:-1]
+    start_index_array = np.flatnonzero(start_flag_array)
+
+    unique_id_array = sorted_id_array[start_index_array]
+    offset_array = np.append(start_index_array, len(sorted_id_array))
+
+    return unique_id_array, sort_index_array, offset_array
+
+
+def get_coordinates_array_from_geometries(geometries,
+                                          id_array=None,
+                                          remove_duplicated_next_point=False):
+    """
+    概要:
+        ジオメトリの配列から座標配列（[ID, x, y]または[ID, x, y, z]）を一括で取得する
+        ポリゴンは外周、マルチジオメトリは最初の要素の座標を対象とする
+
+    引数:
+        geometries: shapelyジオメトリの配列（GeoSeries.to_numpy()等）
+        id_array: ジオメトリごとのID配列（Noneの場合は0からの連番）
+        remove_duplicated_next_point: 連続する重複点を削除するかどうかのフラグ（デフォルトはFalse）
+
+    戻り値:
+        coordinates_array: ID付きの座標配列（Z値を持つジオメトリが1つでもあればZ列を含む）
+    """
+
+    geometry_array = np.asarray(geometries, dtype=object)
+
+    # マルチジオメトリは最初の要素、ポリゴンは外周を座標の取得対象とする
+    type_id_array = shapely.get_type_id(geometry_array)
+    geometry_array = np.where(np.isin(type_id_array, (4, 5, 6)),
+                              shapely.get_geometry(geometry_array, 0),
+                              geometry_array)
+    geometry_array = np.where(shapely.get_type_id(geometry_array) == 3,
+                              shapely.get_exterior_ring(geometry_array),
+                              geometry_array)
+
+    include_z = bool(shapely.has_z(geometry_array).any())
+    coordinates, index_array = shapely.get_coordinates(geometry_array,
+                                                       include_z=include_z,
+                                                       return_index=True)
+
+    if remove_duplicated_next_point and len(coordinates) > 1:
+        # 同一ジオメトリ内で直前の構成点と同じ座標の構成点を削除する
+        keep_flag_array = np.ones(len(coordinates), dtype=bool)
+        keep_flag_array[1:] = (index_array[1:] != index_array[:-1]) \
+            | np.any(coordinates[1:] != coordinates[:-1], axis=1)
+        coordinates = coordinates[keep_flag_array]
+        index_array = index_array[keep_flag_array]
+
+    if id_array is None:
+        feature_id_array = index_array
+    else:
+        feature_id_array = np.asarray(id_array)[index_array]
+
+    return np.column_stack([feature_id_array.astype(np.float64), coordinates])
+
+
+def create_geometries_from_coordinates_array(coordinates_array,
+                                             geometry_type_list):
+    """
+    概要:
+        座標配列（[ID, x, y]または[ID, x, y, z]）からshapelyのジオメトリを一括で作成する
+        同一IDの構成点は連続して並んでいるものとし、出現順にジオメトリを作成する
+
+    引数:
+        coordinates_array: ID付きの座標配列
+        geometry_type_list: ジオメトリタイプ（'Point', 'LineString', 'Polygon'）
+                            文字列の場合はすべてのジオメトリに適用し、リストの場合はIDの出現順に対応する
+                            'Point', 'LineString'以外はPolygonとして作成する
+
+    戻り値:
+        unique_id_array: ジオメトリごとのIDの配列
+        geometry_array: shapelyジオメトリの配列
+    """
+
+    coordinates_array = np.asarray(coordinates_array, dtype=np.float64)
+    id_array = coordinates_array[:, 0]
+    points_array = coordinates_array[:, 1:]
+
+    # IDが切り替わる位置をジオメトリの開始位置とする
+    start_flag_array = np.ones(len(id_array), dtype=bool)
+    start_flag_array[1:] = id_array[1:] != id_array[:-1]
+    start_index_array = np.flatnonzero(start_flag_array)
+    unique_id_array = id_array[start_index_array]
+
+    # 構成点ごとのジオメトリ番号
+    part_index_array = np.cumsum(start_flag_array) - 1
+
+    if isinstance(geometry_type_list, str):
+        geometry_type_array = np.full(len(unique_id_array), geometry_type_list, dtype=object)
+    else:
+        geometry_type_array = np.asarray(geometry_type_list, dtype=object)
+
+    geometry_array = np.empty(len(unique_id_array), dtype=object)
+
+    # ポイントは先頭の構成点から作成する
+    point_flag_array = geometry_type_array == 'Point'
+    if point_flag_array.any():
+        geometry_array[point_flag_array] = shapely.points(
+            points_array[start_index_array[point_flag_array]])
+
+    # ライン、ポリゴンは対象ジオメトリの構成点を抜き出し、ジオメトリ番号を振り直して作成する
+    line_flag_array = geometry_type_array == 'LineString'
+    polygon_flag_array = ~(point_flag_array | line_flag_array)
+
+    for target_flag_array, is_polygon in ((line_flag_array, False), (polygon_flag_array, True)):
+        if not target_flag_array.any():
+            continue
+
+        target_point_flag_array = target_flag_array[part_index_array]
+        new_index_array = (np.cumsum(target_flag_array) - 1)[part_index_array[target_point_flag_array]]
+
+        if is_polygon:
+            geometry_array[target_flag_array] = shapely.polygons(
+                shapely.linearrings(points_array[target_point_flag_array], indices=new_index_array))
+        else:
+            geometry_array[target_flag_array] = shapely.linestrings(
+                points_array[target_point_flag_array], indices=new_index_array)
+
+    return unique_id_array, geometry_array
+
+
+def create_id_array_dict(target_array, id_array=None, column_slice=slice(None)):
+    """
+    概要:
+        配列をIDごとに分割し、キー：ID、値：IDに該当する行の配列とした辞書を作成する
+        並び替えは全体で1回のみ行い、各値は並び替え後の配列のビューとなる
+
+    引数:
+        target_array: 分割対象の2次元配列
+        id_array: 各行のIDの1次元配列 省略時はtarget_arrayの0列目を使用する
+        column_slice: 値として取り出す列の範囲 省略時は全列
+
+    戻り値:
+        unique_id_array: ユニークなIDの配列（昇順）
+        id_array_dict: IDごとの配列を格納した辞書
+    """
+
+    if id_array is None:
+        id_array = target_array[:, 0]
+
+    unique_id_array, sort_index_array, offset_array = get_sorted_group_index(id_array)
+
+    # 並び替えと列の抽出をまとめて行い、以降はスライスで参照する
+    sorted_array = target_array[sort_index_array][:, column_slice]
+
+    id_array_dict = {unique_id_array[i]: sorted_array[offset_array[i]:offset_array[i + 1]]
+                     for i in range(len(unique_id_array))}
+
+    return unique_id_array, id_array_dict
+
+
 def create_coordinates_id_array_and_dict_from_coordinates_array(field_set_file_data_frame,
                                                                 geometry_dwh_file_name_list):
 
@@ -2798,13 +3324,9 @@ def create_coordinates_id_array_and_dict_from_coordinates_array(field_set_file_d
     geometry_value_coordinates_array\
         = pickle.loads(base64.b64decode(field_set_file_data_frame.loc[field_set_file_data_frame["Dwh"] == geometry_dwh_file_name_list[0], "Value"].values[0]))
 
-    # ユニークIDの配列を作成
-    coordinates_id_array\
-        = np.unique(geometry_value_coordinates_array[:, 0])
-
-    # IDに対しての二次元配列を作成
-    coordinates_dict\
-        = {coordinates_id_array[i]: geometry_value_coordinates_array[list(np.where(geometry_value_coordinates_array[:, 0] == coordinates_id_array[i])[0])] for i in range(len(coordinates_id_array))}
+    # ユニークIDの配列とIDに対しての二次元配列を作成
+    coordinates_id_array, coordinates_dict\
+        = create_id_array_dict(geometry_value_coordinates_array)
 
     return geometry_value_coordinates_array, \
         coordinates_id_array, \
@@ -2831,11 +3353,13 @@ def get_target_point_gltf_meshes_list(geometry_number):
 
 def create_point_gltf_object(temporary_xyz_array,
                              attribute_dataframe,
-                             matrix_list=None):
+                             matrix_list=None,
+                             binary_flag=False):
 
     # -----------------------------------------------------------------------------------------------------------
     # 関数名      ：glTF出力データクラスオブジェクト作成処理
     # 第１引数    ：【XYZ】の順に座標情報が格納された2次元のndarray配列
+    # 第４引数    ：Trueの場合はGLB出力用に、バッファをBINチャンクとしてglTFオブジェクトに設定する
     # 戻り値      ：glTFのデータクラスオブジェクト
     # 処理概要    ：XYZの配列から立体の面を構成するための座標同士の結びつきの情報と、
     #              XZYの並びに変換した座標情報をもとにglTFに出力するデータ配列を作成する。
@@ -2861,7 +3385,7 @@ def create_point_gltf_object(temporary_xyz_array,
             2, 3, 1]].astype(np.float32)
         target_points_binary_blob, \
             target_points_binary_length\
-            = get_binary_information(target_points_array)
+            = get_binary_information(target_points_array, not binary_flag)
 
         # -----------------------------------------------------------------------------------------------------------
         # 【２．glTFの出力データ配列作成】
@@ -2873,9 +3397,13 @@ def create_point_gltf_object(temporary_xyz_array,
 
         # バイナリデータのデータ長を「構成面座標連番配列」と「座標情報配列」の長さの合計とする。
         # 「地物ID配列」、「頂点法線座標連番配列」、「頂点法線座標情報配列」
-        target_gltf_buffers_list = [pgl.Buffer(byteLength=target_points_binary_length,
-                                               uri=DDC.DATA_URI_HEADER+target_points_binary_blob
-                                               )]
+        # GLBの場合はURIを設定せず、BINチャンクを参照する
+        if binary_flag:
+            target_gltf_buffers_list = [pgl.Buffer(byteLength=target_points_binary_length)]
+        else:
+            target_gltf_buffers_list = [pgl.Buffer(byteLength=target_points_binary_length,
+                                                   uri=DDC.DATA_URI_HEADER+target_points_binary_blob
+                                                   )]
 
         # -----------------------------------------------------------------------------------------------------------
         # ＜２－２．bufferViewsの出力内容設定＞
@@ -2955,6 +3483,10 @@ def create_point_gltf_object(temporary_xyz_array,
                                        buffers=target_gltf_buffers_list
                                        )
 
+        # GLBの場合はBINチャンクのデータを設定する
+        if binary_flag:
+            target_gltf_object.set_binary_blob(target_points_binary_blob)
+
         return target_gltf_object
 
     else:
@@ -2968,13 +3500,10 @@ def convert_flowfile_to_field_set_file_dataframe(flowfile):
     # ---------------------------------------------------------------
 
     # FlowFileからデータを取得プロパティから取得
-    input_field_set_file = flowfile.getContentsAsBytes().decode("utf-8")
-
-    # FlowFileのデータをfile_objectへ変換
-    field_set_file_stringio = io.StringIO(input_field_set_file)
+    input_field_set_file = flowfile.getContentsAsBytes()
 
-    # Dataframeに変換。
-    field_set_file_dataframe = pd.read_csv(field_set_file_stringio)
+    # Dataframeに変換。バイナリ形式、CSV形式は自動判定する
+    field_set_file_dataframe = FSP.read_field_set_file(input_field_set_file)
 
     return field_set_file_dataframe
 
@@ -3389,19 +3918,16 @@ def get_coordinates_array_from_geodataframe(geodataframe):
     # geopandasからCoordinates配列を取得
     # ジオメトリのタイプはシングルであり１種しかないものとする
     # ---------------------------------------------------------------
-    # ジオメトリのSeries取得→dict
+    # ジオメトリのSeries取得
     geometry_column_series = geodataframe[geodataframe.geometry.name]
-    geometry_column_dict = geometry_column_series.to_dict()
     index_array = geodataframe.index.to_numpy()
 
-    # ジオメトリの座標配列取得
-    geometry_list\
-        = list(map(get_geometry_array, geometry_column_dict.values(), index_array))
-    result_array = np.concatenate(geometry_list)
+    # ジオメトリの座標配列を一括取得
+    result_array = get_coordinates_array_from_geometries(
+        geometry_column_series.to_numpy(), index_array)
 
     # ジオメトリタイプ取得
-    geometry_type_list\
-        = list(map(get_geometry_type, geometry_column_dict.values()))
+    geometry_type_list = geometry_column_series.geom_type.tolist()
 
     return result_array, \
         geometry_type_list, \
@@ -3460,24 +3986,12 @@ def get_shapely_dict_from_coordinates_array(coordinates_array,
     # この辞書型からvaluesだけを取り出しgeopandasのgeometryに直接設定すると座標を更新可能
     # ---------------------------------------------------------------
 
-    # 座標の始点終点のインデックスを取得
-    si, \
-        ei = get_start_index_and_end_index(coordinates_array)
+    # 地物ごとのジオメトリタイプによるshapelyのオブジェクトを一括で作成する
+    unique_id_array, \
+        geometry_array = create_geometries_from_coordinates_array(coordinates_array,
+                                                                  geometry_type_list)
 
-    shapely_dict = {}
-    # 1地物ごとに座標を取り出してそれぞれのジオメトリタイプによるshapelyのオブジェクトを格納する
-    for i in range(len(geometry_type_list)):
-        if geometry_type_list[i] == 'Point':
-            shapely_dict[coordinates_array[si[i], 0]] = Point(
-                coordinates_array[si[i], 1:])
-        elif geometry_type_list[i] == 'LineString':
-            shapely_dict[coordinates_array[si[i], 0]] = LineString(
-                coordinates_array[si[i]:ei[i]+1, 1:])
-        else:
-            shapely_dict[coordinates_array[si[i], 0]] = Polygon(
-                coordinates_array[si[i]:ei[i]+1, 1:])
-
-    return shapely_dict
+    return dict(zip(unique_id_array, geometry_array))
 
 
 def get_geodataframe_from_contents_or_field_set_file(flowfile):
@@ -3485,24 +3999,16 @@ def get_geodataframe_from_contents_or_field_set_file(flowfile):
     # contentsかフィールド集合ファイルからgeodataframeを取得する
     # ---------------------------------------------------------------
 
-    # インプットの形式がfieldsetfileのとき
+    # インプットの形式がfieldsetfileのとき（CSV形式、バイナリ形式は自動判定）
     try:
-        # Flowfileから、csv形式のfield_set_fileを取得。
-        input_field_set_file = flowfile.getContentsAsBytes().decode("utf-8")
-
-        # StringIOオブジェクトとしてCSV形式のデータをDataFrameとして読み込む
-        field_set_file_data_frame = pd.read_csv(
-            io.StringIO(input_field_set_file))
-
-        # 1行目のデータを変数に格納
-        geodataframe = pickle.loads(base64.b64decode(
-            field_set_file_data_frame.loc[0, "Value"]))
+        # 1行目のデータのみをデコードし変数に格納
+        geodataframe = FSP.FieldSetFileView(flowfile.getContentsAsBytes()).get_value_by_index(0)
 
     # インプットの形式がシリアライズされたGeoDataFrameのとき
     except Exception as e:
 
         # FlowFileからシリアライズされたGeoDataFrameのバイトデータを取得し、バイトデータからGeoDataFrameを復元
-        geodataframe = pickle.loads(flowfile.getContentsAsBytes())
+        geodataframe = GCP.deserialize_content(flowfile.getContentsAsBytes())
 
     return geodataframe
 
@@ -20,14 +20,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import pickle
-import base64
-import io
-
-from importlib import import_module
-
-# 外部ライブラリの動的インポート
-pd = import_module("pandas")
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 
 def get_dataframe_and_value_from_field_set_file(flowfile):
@@ -36,6 +30,8 @@ def get_dataframe_and_value_from_field_set_file(flowfile):
         【前提条件】FieldSetFileはpartitionrecordプロセッサにて、カラムの行を除いた1行しかないものとする。
         flowfileからCSV形式のFieldSetFileを取得し、DataFrameに加工。Value列の値をデコードデシリアライズしlist もしくは、arrayにする。
         Dwh列からDWHファイル名を、Type列からTypeの種類を取得。
+        バイナリ形式のFieldSetFileの場合は自動判定し、Value列をテキストを介さずに復元する。
+        DataFrameのValue列は、形式に依らずCSV形式と同じエンコード済み文字列とする。
 
     引数:
         flowfile: processorに入ってくるデータ
@@ -47,14 +43,11 @@ def get_dataframe_and_value_from_field_set_file(flowfile):
         target_value: デコード、デシリアライズされたValue列データ
     """
 
-    # flowfileから、CSV形式のFieldSetFileを取得
-    input_field_set_file = flowfile.getContentsAsBytes().decode("utf-8")
-
-    # flowfile_contentsをパスとして扱う
-    field_set_file_stringio = io.StringIO(input_field_set_file)
+    # flowfileから、FieldSetFileを取得（Valueのデコードは参照時に行う）
+    field_set_file_view = FSP.FieldSetFileView(flowfile.getContentsAsBytes())
 
-    # DataFrameに加工
-    field_set_file_dataframe = pd.read_csv(field_set_file_stringio)
+    # DataFrameに加工（バイナリ形式の場合もValue列は従来と同じエンコード済み文字列とする）
+    field_set_file_dataframe = field_set_file_view.to_dataframe()
 
     # FieldSetFileの１行目のDwh列を抽出
     target_dwh = field_set_file_dataframe.loc[0, "Dwh"]
@@ -65,51 +58,39 @@ def get_dataframe_and_value_from_field_set_file(flowfile):
 
     # FieldSetFileの1行目のValue列をデコードデシリアライズする
     # target_value = list or arrayが入る
-    target_value = pickle.loads(base64.b64decode(
-        field_set_file_dataframe.loc[0, "Value"]))
+    target_value = field_set_file_view.get_value_by_index(0)
 
     return field_set_file_dataframe, target_dwh, target_type, target_value
 
 
-def set_field_set_file(dwh_list, type_list, values_list):
+def set_field_set_file(dwh_list, type_list, values_list, binary=False):
     """
     概要:
         flowfileのcontentsには、配列やリストは入らない為、シリアライズ、エンコード、バイト列を文字列にしたいのでutf-8でデコードする必要がある。
         そのデータが何のデータなのかを識別するためにdwhとtypeをFieldSetFileに書き込む。
         引数で取得した値を、dataframe内の該当の列に、配置し、csv化。
+        binaryがTrueの場合は、テキスト化を行わないバイナリ形式のFieldSetFileを作成する。
 
     引数:
         dwh_list: 加工したデータに関連するDwhファイル名
         type_list: 加工したデータの型
         values_list: 加工したデータ（リストまたは配列）
+        binary: True: バイナリ形式 False: CSV形式（デフォルト）
 
     戻り値:
-        field_set_file: FlowFileに送るために作成されたCSV形式のFieldSetFile
+        field_set_file: FlowFileに送るために作成されたFieldSetFile（CSV形式はstr、バイナリ形式はbytes）
     """
 
-    # list or array を、シリアライズ、base64でエンコード、バイト列を文字列にしたいのでutf-8でデコード
-    encoded_values_list = [base64.b64encode(pickle.dumps(
-        value)).decode("utf-8") for value in values_list]
-
-    # FieldSetFile用のdata_dictを作成
-    data_dict = {
-        "Dwh": dwh_list,
-        "Type": type_list,
-        "Value": encoded_values_list
-    }
-
-    # data_dictをFieldSetFile(CSV形式)に加工
-    result_dataframe = pd.DataFrame(data_dict)
-    field_set_file = result_dataframe.to_csv(index=False)
-
-    return field_set_file
+    return FSP.write_field_set_file(dwh_list, type_list, values_list, binary)
 
 
 def get_value_from_field_Set_file_or_serialized(flowfile):
     """
     概要:
         FlowFileからCSV形式のfield_set_fileを取得し、その中のValue列をデコード・デシリアライズして返す
+        バイナリ形式のfield_set_fileの場合は、1行目のValueをペイロードから直接復元して返す
         CSV形式ではない(シリアライズされたGeoDataFrame)場合は、シリアライズされたバイトデータをそのまま復元して返す
+        GeoParquet形式のGeoDataFrameは識別子で判定し、FieldSetFileとしての解析を行わずに復元する
 
     引数:
         flowfile: processorに入ってくるデータ
@@ -118,26 +99,19 @@ def get_value_from_field_Set_file_or_serialized(flowfile):
         target_value: 復元されたデータ
     """
 
-    try:
-        # flowfileから、CSV形式のFieldSetFileを取得
-        input_field_set_file = flowfile.getContentsAsBytes().decode("utf-8")
-
-        # flowfile_contentsをパスとして扱う
-        field_set_file_stringio = io.StringIO(input_field_set_file)
+    input_contents = flowfile.getContentsAsBytes()
 
-        # DataFrameに加工
-        field_set_file_dataframe = pd.read_csv(field_set_file_stringio)
+    # GeoParquet形式のGeoDataFrameはそのまま復元する
+    if GCP.is_geoparquet_content(input_contents):
+        return GCP.deserialize_content(input_contents)
 
-        # FieldSetFileの1行目のValue列をデコードデシリアライズする
-        target_value = pickle.loads(base64.b64decode(
-            field_set_file_dataframe.loc[0, "Value"]))
+    try:
+        # FieldSetFileの1行目のValue列のみをデコードデシリアライズする
+        target_value = FSP.FieldSetFileView(input_contents).get_value_by_index(0)
 
     except UnicodeDecodeError:
 
-        # flowfileからシリアライズされたGeoDataFrameのバイトデータを取得する
-        serialize_dataframe = flowfile.getContentsAsBytes()
-
         # バイトデータからGeoDataFrameを復元する
-        target_value = pickle.loads(serialize_dataframe)
+        target_value = GCP.deserialize_content(input_contents)
 
     return target_value
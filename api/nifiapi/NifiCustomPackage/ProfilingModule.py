@@ -0,0 +1,460 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Python標準ライブラリ
+import json
+import os
+import threading
+import time
+
+# プロファイリングのモード
+# off     : 計測しない（ラップした関数をそのまま呼び出す）
+# summary : 関数ごと、プロセッサごとに集計する
+# per_call: summaryに加え、呼び出しごとに実行時間をINFOログに出力する
+PROFILING_MODE_OFF = "off"
+PROFILING_MODE_SUMMARY = "summary"
+PROFILING_MODE_PER_CALL = "per_call"
+PROFILING_MODE_LIST = (PROFILING_MODE_OFF, PROFILING_MODE_SUMMARY, PROFILING_MODE_PER_CALL)
+
+# 既定のモードとレポートの出力先を指定する環境変数
+PROFILING_MODE_ENV = "NIFI_PYTHON_PROFILING_MODE"
+PROFILING_REPORT_PATH_ENV = "NIFI_PYTHON_PROFILING_REPORT_PATH"
+
+# FlowFile単位でモードを指定する属性
+# レポートの出力先は任意のファイルを上書きできないよう、環境変数でのみ指定する
+PROFILING_MODE_ATTRIBUTE = "profiling.mode"
+
+# レポートを出力する最短の間隔（秒）
+PROFILING_EXPORT_INTERVAL = 5.0
+
+# Prometheusのテキスト形式で出力するレポートの拡張子
+PROMETHEUS_REPORT_EXTENSIONS = (".prom", ".txt")
+
+# 処理したバイト数として数える引数の型
+BYTES_TYPES = (bytes, bytearray, memoryview, str)
+
+
+def normalize_mode(mode, default=PROFILING_MODE_OFF):
+    """
+    概要:
+        プロファイリングのモードを正規化する
+
+    引数:
+        mode: モードの文字列（大文字小文字、"-"と"_"の違いは区別しない）
+        default: modeが未指定の場合のモード
+
+    戻り値:
+        PROFILING_MODE_LISTのいずれかのモード
+    """
+
+    if mode is None or str(mode).strip() == "":
+        return default
+
+    mode = str(mode).strip().lower().replace("-", "_")
+
+    if mode not in PROFILING_MODE_LIST:
+        raise ValueError(f"プロファイリングのモードが不正です: {mode}")
+
+    return mode
+
+
+def count_bytes(args):
+    """
+    概要:
+        引数のうちバイト列、文字列の長さの合計を求める
+
+    引数:
+        args: 位置引数のタプル
+
+    戻り値:
+        バイト数の合計
+    """
+
+    return sum(len(arg) for arg in args if isinstance(arg, BYTES_TYPES))
+
+
+def get_function_name(f):
+    """
+    概要:
+        集計に使用する関数名（モジュール名.修飾名）を取得する
+
+    引数:
+        f: 関数
+
+    戻り値:
+        関数名
+    """
+
+    module_name = getattr(f, "__module__", None) or ""
+    qualified_name = getattr(f, "__qualname__", None) or getattr(f, "__name__", repr(f))
+
+    return f"{module_name}.{qualified_name}" if module_name else qualified_name
+
+
+def get_processor_name(f):
+    """
+    概要:
+        関数が属するプロセッサ名を取得する
+        メソッドの場合はクラス名、関数の場合はモジュール名とする
+
+    引数:
+        f: 関数
+
+    戻り値:
+        プロセッサ名
+    """
+
+    qualified_name = getattr(f, "__qualname__", None) or ""
+
+    if "." in qualified_name:
+        return qualified_name.split(".")[0]
+
+    return (getattr(f, "__module__", None) or "").split(".")[-1]
+
+
+def escape_label(value):
+    """
+    概要:
+        Prometheusのラベル値をエスケープする
+
+    引数:
+        value: ラベル値
+
+    戻り値:
+        エスケープしたラベル値
+    """
+
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Profiler:
+    """
+    概要:
+        関数、プロセッサごとの実行時間、呼び出し回数、処理したバイト数を集計するクラス
+        モードがoffの場合は計測を行わず、ラップした関数をそのまま呼び出す
+        FlowFileの属性で指定したモードはスレッドごとに保持し、
+        同時に処理している他のFlowFileには影響しない
+
+    引数:
+        mode: 既定のモード
+        report_path: レポートの出力先（Noneの場合は出力しない）
+    """
+
+    def __init__(self, mode=PROFILING_MODE_OFF, report_path=None):
+
+        # 環境変数の値が不正な場合でもプロセッサの読み込みは止めず、計測しない
+        try:
+            self.default_mode = normalize_mode(mode)
+
+        except ValueError:
+            self.default_mode = PROFILING_MODE_OFF
+
+        self.report_path = report_path or None
+
+        # {名前: [呼び出し回数, 実行時間の合計, 実行時間の最大, バイト数の合計]}
+        self._function_stats = {}
+        self._processor_stats = {}
+
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._local = threading.local()
+        self._last_export_time = 0.0
+
+    @property
+    def mode(self):
+        # 呼び出し元のスレッドで設定したモード（未設定の場合は既定のモード）
+        return getattr(self._local, "mode", self.default_mode)
+
+    @property
+    def enabled(self):
+        return self.mode != PROFILING_MODE_OFF
+
+    def configure(self, mode=None):
+        """
+        概要:
+            呼び出し元のスレッドのモードを設定する
+            未指定の場合は既定のモードに戻す
+
+        引数:
+            mode: モード
+        """
+
+        self._local.mode = normalize_mode(mode, self.default_mode)
+
+    def configure_from_attributes(self, attributes, logger=None):
+        """
+        概要:
+            FlowFileの属性から、呼び出し元のスレッドのモードを設定する
+            属性が未指定の場合は既定のモードに戻し、前のFlowFileの設定を引き継がない
+            属性の値が不正な場合は、FlowFileの処理を止めずに警告を出力して既定のモードとする
+
+        引数:
+            attributes: FlowFileの属性の辞書
+            logger: 属性の値が不正な場合に警告を出力するロガー
+        """
+
+        try:
+            self.configure(attributes.get(PROFILING_MODE_ATTRIBUTE))
+
+        except ValueError as e:
+            if logger is not None:
+                logger.warning(f"{e} 既定のモード（{self.default_mode}）で処理します")
+
+            self.configure()
+
+    def _add(self, stats_dict, name, elapsed, nbytes, calls=1):
+
+        with self._lock:
+            stats = stats_dict.get(name)
+
+            if stats is None:
+                stats_dict[name] = [calls, elapsed, elapsed, nbytes]
+
+            else:
+                stats[0] += calls
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+                stats[3] += nbytes
+
+    def record(self, function_name, elapsed, nbytes=0, processor_name=None):
+        """
+        概要:
+            関数の実行結果を集計に加える
+            processor_nameを指定した場合はプロセッサの集計にも加える
+
+        引数:
+            function_name: 関数名
+            elapsed: 実行時間（秒）
+            nbytes: 処理したバイト数
+            processor_name: プロセッサ名
+        """
+
+        self._add(self._function_stats, function_name, elapsed, nbytes)
+
+        if processor_name is not None:
+            self._add(self._processor_stats, processor_name, elapsed, nbytes)
+
+    def add_bytes(self, name, nbytes):
+        """
+        概要:
+            呼び出し回数、実行時間を加えずに処理したバイト数のみを集計に加える
+
+        引数:
+            name: 集計する名前
+            nbytes: 処理したバイト数
+        """
+
+        self._add(self._function_stats, name, 0.0, nbytes, calls=0)
+
+    def call(self, f, args, kwargs, logger=None):
+        """
+        概要:
+            関数を実行し、実行時間、呼び出し回数、引数のバイト数を集計する
+            最も外側の呼び出しはプロセッサの集計にも加える
+
+        引数:
+            f: 関数
+            args: 位置引数
+            kwargs: キーワード引数
+            logger: per_callモードでログを出力するロガー
+
+        戻り値:
+            関数の戻り値
+        """
+
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+
+        start_time = time.perf_counter()
+
+        try:
+            return f(*args, **kwargs)
+
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self._local.depth = depth
+
+            function_name = get_function_name(f)
+            nbytes = count_bytes(args)
+
+            self.record(function_name,
+                        elapsed,
+                        nbytes,
+                        get_processor_name(f) if depth == 0 else None)
+
+            if self.mode == PROFILING_MODE_PER_CALL and logger is not None:
+                logger.info(f"{function_name} 実行時間: {elapsed:.6f}s 処理バイト数: {nbytes}")
+
+            if depth == 0:
+                self.export_if_due(logger)
+
+    def get_report(self):
+        """
+        概要:
+            集計結果を辞書で取得する
+
+        戻り値:
+            {"mode", "functions", "processors"}の辞書
+            functions、processorsは{名前: {"calls", "wall_time", "max_time", "bytes"}}の辞書
+        """
+
+        def to_dict(stats_dict):
+            return {name: {"calls": calls,
+                           "wall_time": wall_time,
+                           "max_time": max_time,
+                           "bytes": nbytes}
+                    for name, (calls, wall_time, max_time, nbytes) in stats_dict.items()}
+
+        with self._lock:
+            return {"mode": self.mode,
+                    "functions": to_dict(self._function_stats),
+                    "processors": to_dict(self._processor_stats)}
+
+    def to_json(self):
+        """
+        概要:
+            集計結果をJSON文字列に変換する
+
+        戻り値:
+            JSON文字列
+        """
+
+        return json.dumps(self.get_report(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """
+        概要:
+            集計結果をPrometheusのテキスト形式に変換する
+
+        戻り値:
+            Prometheusのテキスト形式の文字列
+        """
+
+        report = self.get_report()
+
+        line_list = []
+
+        for scope, label in (("functions", "function"), ("processors", "processor")):
+
+            metric_prefix = f"nifi_python_{label}"
+
+            for metric_name, key, metric_type in (("calls_total", "calls", "counter"),
+                                                  ("wall_time_seconds_total", "wall_time", "counter"),
+                                                  ("max_time_seconds", "max_time", "gauge"),
+                                                  ("bytes_total", "bytes", "counter")):
+
+                line_list.append(f"# TYPE {metric_prefix}_{metric_name} {metric_type}")
+
+                for name, stats in report[scope].items():
+                    line_list.append(f"{metric_prefix}_{metric_name}"
+                                     f"{{{label}=\"{escape_label(name)}\"}} {stats[key]}")
+
+        return "\n".join(line_list) + "\n"
+
+    def export(self, report_path=None):
+        """
+        概要:
+            集計結果をファイルに出力する
+            拡張子が.prom、.txtの場合はPrometheusのテキスト形式、それ以外はJSONとする
+
+        引数:
+            report_path: 出力先（未指定の場合は設定済みの出力先）
+        """
+
+        report_path = report_path or self.report_path
+
+        if not report_path:
+            return
+
+        if report_path.lower().endswith(PROMETHEUS_REPORT_EXTENSIONS):
+            report_text = self.to_prometheus()
+
+        else:
+            report_text = self.to_json()
+
+        # 読み込み途中のファイルを参照されないよう、一時ファイルに書き込んでから置き換える
+        # 一時ファイルはスレッドごとに分け、同時に出力した場合も互いに上書きしないようにする
+        temporary_path = f"{report_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with self._export_lock:
+            with open(temporary_path, "w", encoding="utf-8") as report_file:
+                report_file.write(report_text)
+
+            os.replace(temporary_path, report_path)
+
+            self._last_export_time = time.monotonic()
+
+    def export_if_due(self, logger=None):
+        """
+        概要:
+            前回の出力からPROFILING_EXPORT_INTERVAL秒以上経過している場合に集計結果を出力する
+            レポートの出力先が未設定の場合は、loggerに集計結果をINFOログとして出力する
+
+        引数:
+            logger: レポートの出力先が未設定の場合に使用するロガー
+        """
+
+        if time.monotonic() - self._last_export_time < PROFILING_EXPORT_INTERVAL:
+            return
+
+        if self.report_path:
+            self.export()
+
+        elif logger is not None:
+            logger.info(f"プロファイリング結果\n{self.format_summary()}")
+            self._last_export_time = time.monotonic()
+
+    def format_summary(self, processor_name=None):
+        """
+        概要:
+            集計結果をログ出力用の文字列にする
+
+        引数:
+            processor_name: 指定した場合は、関数名にプロセッサ名を含む関数のみを対象とする
+
+        戻り値:
+            実行時間の合計が長い順に"関数名 呼び出し回数 実行時間 バイト数"を改行区切りで連結した文字列
+        """
+
+        report = self.get_report()
+
+        item_list = [(name, stats) for name, stats in report["functions"].items()
+                     if processor_name is None or processor_name in name]
+
+        item_list.sort(key=lambda item: item[1]["wall_time"], reverse=True)
+
+        return "\n".join(f"{name} calls={stats['calls']} wall_time={stats['wall_time']:.6f}s bytes={stats['bytes']}"
+                         for name, stats in item_list)
+
+    def reset(self):
+        """
+        概要:
+            集計結果を初期化する
+        """
+
+        with self._lock:
+            self._function_stats = {}
+            self._processor_stats = {}
+
+
+# プロセス全体で共有するプロファイラ
+PROFILER = Profiler(os.environ.get(PROFILING_MODE_ENV), os.environ.get(PROFILING_REPORT_PATH_ENV))
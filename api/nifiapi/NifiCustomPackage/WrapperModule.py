@@ -24,6 +24,8 @@ from functools import wraps
 
 import traceback
 
+from nifiapi.NifiCustomPackage.ProfilingModule import PROFILER
+
 
 # 実行するメソッド前後に開始終了LOGを付与する
 # 実行するメソッドが
@@ -39,7 +41,12 @@ def calc_func_time(mylogger, tracebackflag=True):
             # logクラスの開始ログ用メソッドを実行する予定
             try:
 
-                result = f(*args, **kwargs)
+                # プロファイリングが無効の場合は計測を行わない
+                if PROFILER.enabled:
+                    result = PROFILER.call(f, args, kwargs, mylogger)
+
+                else:
+                    result = f(*args, **kwargs)
 
             except Exception:
                 mylogger.error(f'{f.__name__} 異常終了')
@@ -24,7 +24,7 @@
 import sys
 from functools import wraps
 import traceback
-import io
+import time
 import importlib
 
 # 外部ライブラリの動的インポート
@@ -36,6 +36,8 @@ from raster_to_vector.common.custom_processor_executor import CustomProcessorExe
 from raster_to_vector.common.field_set_file_converter import FieldSetFileConverter
 from raster_to_vector.common.basic_processor_executor import BasicProcessorExecutor
 from raster_to_vector.common.base_raster_vector_logic import BaseRasterVectorLogic
+from raster_to_vector.common.parsed_content import ParsedContent
+from nifiapi.NifiCustomPackage.ProfilingModule import PROFILER, PROFILING_MODE_PER_CALL
 
 
 class BaseProcessor(FlowFileTransform):
@@ -56,10 +58,11 @@ class BaseProcessor(FlowFileTransform):
 
     def calc_func_time(self, func):
         """
-        関数の実行時間を測定し、ログに記録します。
+        関数をラップし、例外発生時のログ出力とプロファイリングを行います。
 
-        渡された関数をラップし、関数の開始と終了時にログを出力します。
-        また、例外が発生した場合にはエラーログを記録し、引数やエラー内容もログに残します。
+        プロファイリングが有効な場合は実行時間、呼び出し回数、処理したバイト数を集計し、
+        per_callモードの場合は呼び出しごとに実行時間をログに記録します。
+        例外が発生した場合にはエラーログを記録し、引数やエラー内容もログに残します。
 
         Parameters
         ----------
@@ -69,14 +72,17 @@ class BaseProcessor(FlowFileTransform):
         Returns
         -------
         callable
-            実行時間が記録されるようにラップされた関数を返します。
+            例外発生時のログ出力とプロファイリングを行うようにラップされた関数を返します。
         """
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            self.logger.info(func.__name__ + ' 実行開始')
             try:
-                result = func(*args, **kwargs)
+                # プロファイリングが無効の場合は計測を行わない
+                if PROFILER.enabled:
+                    result = PROFILER.call(func, args, kwargs, self.logger)
+                else:
+                    result = func(*args, **kwargs)
             except Exception as e:
                 self.logger.error(f'{func.__name__} 異常終了')
                 for index, arg in enumerate(args):
@@ -87,7 +93,6 @@ class BaseProcessor(FlowFileTransform):
                 self.logger.error(traceback.format_exc())
                 raise ValueError from e
 
-            self.logger.info(func.__name__ + ' 実行終了')
             return result
 
         return wrapper
@@ -229,21 +234,32 @@ class BaseProcessor(FlowFileTransform):
         return self.wrap_with_timing(method)(content, attribute, properties)
 
     def create_executor(self, content, attribute):
+        """
+        ロジックとコンテンツに応じたExecutorを作成します。
+        FieldSetFileかどうかはコンテンツの先頭のみで判定し、コンテンツ全体の解析は行いません。
+
+        Parameters
+        ----------
+        content : bytes or ParsedContent
+            FlowFileのコンテンツです。
+        attribute : dict
+            フロー属性の辞書です。
+
+        Returns
+        -------
+        BasicProcessorExecutor or CustomProcessorExecutor
+            コンテンツを処理するExecutorです。
+        """
         executor = BasicProcessorExecutor(self.logic_instance, self.process_content)
         if not issubclass(self.logic_instance.__class__, BaseRasterVectorLogic):
             # raster vector team以外はBasicProcessorExecutorのみを使用する
             return executor
 
-        try:
-            content_str = content.decode('utf-8')
-            df_content = pd.read_csv(io.StringIO(content_str))
-            all_exist = all(col in df_content.columns for col in BaseProcessor.columns_to_field_set_file)
-            if all_exist:
-                executor = CustomProcessorExecutor(self.logic_instance, self.process_content)
+        if not isinstance(content, ParsedContent):
+            content = ParsedContent(content)
 
-        except Exception as e:
-            # 例外が発生した場合はBasicProcessorExecutor
-            pass
+        if content.is_field_set_file():
+            executor = CustomProcessorExecutor(self.logic_instance, self.process_content)
 
         return executor
 
@@ -294,13 +310,28 @@ class BaseProcessor(FlowFileTransform):
             self.logger.error(f'{self.__class__.__name__} propertyデータの取得に失敗しました')
             raise e
 
+        # FlowFileの属性でプロファイリングのモードが指定されている場合は切り替える（未指定の場合は既定のモード）
+        PROFILER.configure_from_attributes(attributes, self.logger)
+        start_time = time.perf_counter()
+
+        # コンテンツの解析結果はExecutorの選択とロジックの実行で共有する
         converter = FieldSetFileConverter()
-        content = converter.convert_img_to_field_set_file(content, attributes)
+        parsed_content = converter.parse_content(content, attributes)
 
-        executor = self.create_executor(content, attributes)
+        executor = self.create_executor(parsed_content, attributes)
 
         # カスタムプロセッサの実行を行う
-        new_content, new_attribute = executor.execute(content, attributes, properties)
+        new_content, new_attribute = executor.execute(parsed_content, attributes, properties)
+
+        if PROFILER.enabled:
+            processor_name = self.__class__.__name__
+            PROFILER.record(f'{processor_name}.transform', time.perf_counter() - start_time, len(content), processor_name)
+            for stage, nbytes in parsed_content.bytes_parsed.items():
+                PROFILER.add_bytes(f'{processor_name}.parse.{stage}', nbytes)
+
+            if PROFILER.mode == PROFILING_MODE_PER_CALL:
+                self.logger.info(f'{processor_name} 解析バイト数: {parsed_content.format_bytes_parsed()}')
+            PROFILER.export_if_due(self.logger)
 
         result = FlowFileTransformResult(relationship="success", contents=new_content, attributes=new_attribute)
 
@@ -23,12 +23,60 @@
 
 
 class BaseRasterVectorLogic:
+    # タイル分割実行に対応するか（merge_tile_resultsをオーバーライドしたロジックでTrueにする）
+    supports_tile_execution = False
+
     def __init__(self):
         pass
 
     def __call__(self, *args, **kwargs):
         pass
 
+    def prepare_rows(self, df_content, attributes, properties):
+        """
+        行ごとの処理（__call__）の前に、FieldSetFileの全行をまとめて前処理します。
+        複数行を一括で処理した方が効率の良いロジックでオーバーライドされることを想定しています。
+
+        Parameters
+        ----------
+        df_content : pandas.DataFrame
+            FieldSetFileから作成した、処理対象の全行を含むDataFrameです。
+        attributes : dict
+            フロー属性の辞書です。
+        properties : dict
+            プロパティの辞書です。
+        """
+        pass
+
+    def merge_tile_results(self, row, tile_row_list, window_list, properties):
+        """
+        タイル分割実行（tile_width_division_num, tile_height_division_numプロパティ）で
+        タイルごとに処理した結果を結合し、rowに書き込みます。
+        タイル分割実行に対応するロジックでオーバーライドし、supports_tile_executionをTrueにすることを想定しています。
+
+        Parameters
+        ----------
+        row : pandas.Series
+            分割前の行です。結合結果はこの行に書き込みます。
+        tile_row_list : list
+            タイルごとの処理後の行のリストです。
+        window_list : list
+            タイルごとの(y1, y2, x1, x2)形式の範囲のリストです。
+        properties : dict
+            プロパティの辞書です。
+
+        Returns
+        -------
+        pandas.Series
+            結合結果を書き込んだ行です。
+
+        Raises
+        ------
+        Exception
+            タイル分割実行に対応していないロジックの場合に発生します。
+        """
+        raise Exception(f'{self.__class__.__name__}はタイル分割実行に対応していません')
+
 
 class FlexibleRasterVectorLogic(BaseRasterVectorLogic):
     def __init__(self):
@@ -20,6 +20,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from raster_to_vector.common.parsed_content import ParsedContent
 
 
 class BasicProcessorExecutor:
@@ -28,6 +29,10 @@ class BasicProcessorExecutor:
         self.processors = processors
 
     def execute(self, content_data, attributes, properties):
+        if isinstance(content_data, ParsedContent):
+            # ロジックにはFlowFileのコンテンツをそのまま渡す
+            content_data = content_data.get_content()
+
         new_content, new_attribute = self.processors(content_data, attributes, properties)
 
         return new_content, new_attribute
@@ -21,6 +21,8 @@
 # SOFTWARE.
 
 # Python標準ライブラリ
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 
 # 外部ライブラリの動的インポート
@@ -29,13 +31,22 @@ pd = import_module("pandas")
 from raster_to_vector.common.field_set_file_converter import FieldSetFileConverter
 from raster_to_vector.common.processor_results import ProcessorResults
 from raster_to_vector.common.base_raster_vector_logic import FlexibleRasterVectorLogic
+from raster_to_vector.common.image_tile_utils import (
+    create_tile_window_list,
+    dumps_tile_image_window,
+    get_tile_setting,
+    register_tile_image,
+    unregister_tile_image,
+)
+from nifiapi.NifiCustomPackage.ProfilingModule import PROFILER
 
 
 class CustomProcessorExecutor:
-    def __init__(self, instance, processors):
+    def __init__(self, instance, processors, converter=None):
         self.instance = instance
         self.processors = processors
-        self.converter = FieldSetFileConverter()
+        # パイプライン実行時は前後の処理と型情報を共有するため、converterを引き継ぐ
+        self.converter = converter if converter is not None else FieldSetFileConverter()
 
     def execute_raster_vector_one_row(self, row, attributes, properties):
         # ラスベクチームの場合はrow['content']をカスタムプロセッサのcontentに設定する
@@ -81,6 +92,81 @@ class CustomProcessorExecutor:
 
         return new_row, new_attribute, df
 
+    def execute_tiled_one_row(self, row, attributes, properties, tile_setting):
+        """
+        画像を重なり領域付きのタイルに分割し、タイルごとにロジックを並列実行して結果を結合します。
+        各タイルには画像のコピーではなく、分割前の画像のビューを渡します。
+        結合はロジックのmerge_tile_resultsで行います。
+
+        Parameters
+        ----------
+        row : pandas.Series
+            処理対象の行です。
+        attributes : dict
+            フロー属性の辞書です。
+        properties : dict
+            プロパティの辞書です。
+        tile_setting : tuple
+            get_tile_settingで取得した(横方向の分割数, 縦方向の分割数, 重なり領域, 同時に処理するタイル数)です。
+
+        Returns
+        -------
+        tuple
+            処理後の行、属性の辞書、None(1 to Nにはならない)を含むタプルを返します。
+        """
+        width_division_num, height_division_num, overlap_region, max_workers = tile_setting
+        attributes['ColorSpace'] = row.get('color_space', '')
+
+        fsf_image_src = properties.get('fsf_image_src', 'content')
+        try:
+            image = pickle.loads(row[fsf_image_src])
+            image_shape = image.shape[:2]
+        except:
+            raise ValueError(f'fsf_image_srcに無効な値が設定されています: {properties.get("fsf_image_src")}')
+
+        # fsf_image_*で指定された項目のうち、分割前の画像と同じ大きさの画像をタイルに分割する
+        image_column_list = []
+        for key, value in properties.items():
+            if key.startswith('fsf_image') and value in row.index and value not in image_column_list:
+                image_column_list.append(value)
+
+        window_list = create_tile_window_list(image_shape[0], image_shape[1],
+                                              height_division_num, width_division_num, overlap_region)
+
+        image_key_dict = {}
+        try:
+            for column in image_column_list:
+                column_image = image if column == fsf_image_src else pickle.loads(row[column])
+                if getattr(column_image, 'shape', (None, None))[:2] == image_shape:
+                    image_key_dict[column] = register_tile_image(column_image)
+
+            tile_row_list = []
+            for window in window_list:
+                tile_row = row.copy()
+                for column, key in image_key_dict.items():
+                    tile_row[column] = dumps_tile_image_window(key, window)
+                tile_row_list.append(tile_row)
+
+            # プロファイリングの設定はスレッドごとのため、FlowFileの設定をタイルを処理するスレッドに引き継ぐ
+            profiling_mode = PROFILER.mode
+
+            def execute_tile(tile_row):
+                PROFILER.configure(profiling_mode)
+                return self.processors(tile_row, dict(attributes), properties)
+
+            # OpenCVの検出処理はGILを解放するため、スレッドで並列実行する
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                result_list = list(executor.map(execute_tile, tile_row_list))
+        finally:
+            for key in image_key_dict.values():
+                unregister_tile_image(key)
+
+        new_tile_row_list = [new_tile_row for new_tile_row, _ in result_list]
+        new_attribute = result_list[0][1]
+        new_row = self.instance.merge_tile_results(row, new_tile_row_list, window_list, properties)
+
+        return new_row, new_attribute, None
+
     def create_one_to_n_data(self, index, row, df):
         row_columns = set(row.index)
         df_columns = set(df.columns)
@@ -94,9 +180,34 @@ class CustomProcessorExecutor:
         return df
 
     def execute(self, content_data, attributes, properties):
-        df_content_field_set_file = self.converter.content_to_field_set_file(content_data)
-        df_content = self.converter.field_set_file_to_table(df_content_field_set_file)
+        df_content = self.converter.content_to_table(content_data)
+
+        df_content, new_attribute = self.execute_table(df_content, attributes, properties)
+
+        df_field_set_file = self.converter.table_to_field_set_file(df_content)
+        field_set_file = df_field_set_file.to_csv(index=False)
+
+        return field_set_file, new_attribute
 
+    def execute_table(self, df_content, attributes, properties):
+        """
+        FieldSetFileから作成したDataFrameに対してロジックを実行し、処理後のDataFrameを返します。
+        FieldSetFileとの変換は行わないため、複数のロジックを続けて実行する場合に使用できます。
+
+        Parameters
+        ----------
+        df_content : pandas.DataFrame
+            FieldSetFileConverter.field_set_file_to_tableで作成したDataFrameです。
+        attributes : dict
+            フロー属性の辞書です。
+        properties : dict
+            プロパティの辞書です。
+
+        Returns
+        -------
+        tuple
+            処理後のDataFrameと属性の辞書を含むタプルを返します。
+        """
         # 1 to Nでレコードが増加した場合使用するdataframe
         df_content_new = None
 
@@ -105,8 +216,21 @@ class CustomProcessorExecutor:
             group_row = df_content.groupby('layer').agg(lambda x: list(x)).reset_index()
             df_content = group_row.copy()
 
+        # タイル分割実行の設定（分割しない場合はNone）
+        tile_setting = get_tile_setting(properties)
+
+        # 結合に対応していないロジックの場合は、前処理やタイルの処理を行う前にエラーとする
+        if tile_setting is not None and not self.instance.supports_tile_execution:
+            raise Exception(f'{self.instance.__class__.__name__}はタイル分割実行に対応していません')
+
+        # 全行をまとめて前処理するロジックの場合は、行ごとの処理の前に実行する
+        self.instance.prepare_rows(df_content, attributes, properties)
+
         for index, row in df_content.iterrows():
-            if not issubclass(self.instance.__class__, FlexibleRasterVectorLogic):
+            if tile_setting is not None:
+                # タイル分割実行の場合
+                new_row, new_attribute, df = self.execute_tiled_one_row(row, attributes, properties, tile_setting)
+            elif not issubclass(self.instance.__class__, FlexibleRasterVectorLogic):
                 # BaseRasterVectorLogicを継承している場合
                 new_row, new_attribute, df = self.execute_raster_vector_one_row(row, attributes, properties)
             else:
@@ -139,10 +263,7 @@ class CustomProcessorExecutor:
             # 不要なcolumnを削除
             df_content = df_content.drop(columns=[new_attribute['offset_coordinate_x'], new_attribute['offset_coordinate_y']])
 
-        df_field_set_file = self.converter.table_to_field_set_file(df_content)
-        field_set_file = df_field_set_file.to_csv(index=False)
-
-        return field_set_file, new_attribute
+        return df_content, new_attribute
 
 
 
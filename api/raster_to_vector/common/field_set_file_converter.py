@@ -31,6 +31,10 @@ pd = import_module("pandas")
 np = import_module("numpy")
 Image = import_module('PIL.Image')
 
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
+from raster_to_vector.common.image_codec import encode_image, compress_pickled_image
+from raster_to_vector.common.parsed_content import ParsedContent, STAGE_FIELD_SET_FILE, STAGE_IMAGE, STAGE_TABLE
+
 
 class FieldSetFileConverter:
     def __init__(self):
@@ -42,14 +46,16 @@ class FieldSetFileConverter:
         type_list = []
         value_list = []
 
-        layer_List = df['layer'].unique()
-        for layer in layer_List:
-            df_filtered = df[df['layer'] == layer]
+        # layerごとに1度だけ抽出し、列単位でまとめて(Findex, 値)のペアを作成する
+        for layer, df_filtered in df.groupby('layer', sort=False):
+            findex_list = df_filtered['Findex'].tolist()
+
             for column in df_filtered.columns:
                 if column in ('Findex', 'layer'):
                     continue
 
-                column_data = [(row['Findex'], row[column]) for _, row in df_filtered.iterrows()]
+                # pickle化された画像は可逆圧縮したバイト列に置き換える（pickle.loadsでそのまま復元できる）
+                column_data = list(zip(findex_list, [compress_pickled_image(value) for value in df_filtered[column].tolist()]))
 
                 # content全体をpickle.dumps()する
                 # [(0, xxxx), (1, yyyy),...., (n, zzzz)]
@@ -74,6 +80,17 @@ class FieldSetFileConverter:
         return df_new
 
     def content_to_field_set_file(self, content):
+        if isinstance(content, ParsedContent):
+            # 解析済みの場合は再解析しない
+            if content.field_set_file is None:
+                content.field_set_file = self.content_to_field_set_file(content.get_content())
+                content.add_bytes_parsed(STAGE_FIELD_SET_FILE, len(content.get_content()))
+            return content.field_set_file
+
+        if FSP.is_binary_field_set_file(content):
+            # バイナリ形式の場合はValue列を従来と同じエンコード済み文字列としたDataFrameを返す
+            return FSP.read_field_set_file(content)
+
         try:
             content_str = content.decode('utf-8')
         except UnicodeDecodeError:
@@ -85,46 +102,111 @@ class FieldSetFileConverter:
         except pd.errors.EmptyDataError:
             raise Exception("FieldSetFileの読み込みに失敗しました。データが空、または形式が正しくありません。")
 
+    def content_to_table(self, content):
+        """
+        コンテンツをfield_set_file_to_tableと同じ形式のDataFrameに変換します。
+        画像から変換したDataFrameを保持するParsedContentの場合は、FieldSetFileを経由せずにDataFrameを作成します。
+
+        Parameters
+        ----------
+        content : bytes or ParsedContent
+            FieldSetFile形式のコンテンツです。
+
+        Returns
+        -------
+        pandas.DataFrame
+            FieldSetFileから作成したDataFrameです。
+        """
+        if isinstance(content, ParsedContent) and content.table is not None:
+            return self.refresh_table(content.table)
+
+        df_field_set_file = self.content_to_field_set_file(content)
+        df_table = self.field_set_file_to_table(df_field_set_file)
+
+        if isinstance(content, ParsedContent):
+            content.add_bytes_parsed(STAGE_TABLE, int(df_field_set_file['Value'].str.len().sum()))
+
+        return df_table
+
     def field_set_file_to_table(self, df_field_set_file):
         new_columns = [dwh.split('/')[-1] for dwh in df_field_set_file['Dwh']]
         new_columns = list(dict.fromkeys(new_columns))
         new_columns.append('layer')
         new_columns.append('Findex')
-        df_restored = pd.DataFrame(columns=new_columns)
 
         # self.data_name = df_field_set_file['Dwh'][0].split('/')[0]
-        layer_list = df_field_set_file['Dwh'].apply(lambda x: x.split('/')[0]).unique()
+        layer_series = df_field_set_file['Dwh'].str.split('/').str[0]
 
-        for layer in layer_list:
-            df_filtered = df_field_set_file[df_field_set_file['Dwh'].str.contains(layer)]
-            row_count = len(df_restored)
+        df_layer_list = []
+        for layer in layer_series.unique():
+            df_filtered = df_field_set_file[layer_series == layer]
 
-            for _, row in df_filtered.iterrows():
-                column_name = row['Dwh'].split('/')[-1]
-                column_type = row['Type']
+            # 列ごとにFindexをインデックスとした配列を作成し、layer分のDataFrameを1度で構築する
+            column_dict = {}
+            for dwh, column_type, encoded_value in zip(df_filtered['Dwh'], df_filtered['Type'], df_filtered['Value']):
+                column_name = dwh.split('/')[-1]
                 self.type_dict[column_name] = column_type
 
-                encoded_value = row['Value']
                 decoded_data = base64.b64decode(encoded_value)
                 column_data = pickle.loads(decoded_data)
 
-                for findex, value in column_data:
-                    if len(df_restored) < len(column_data) + row_count:
-                        df_restored = pd.concat(
-                            [
-                                df_restored,
-                                pd.DataFrame([{column_name: value, 'layer': layer, "Findex": findex}])
-                            ],
-                            ignore_index=True)
-                    else:
-                        df_restored.at[findex + row_count, column_name] = value
+                findex_list = [findex for findex, _ in column_data]
+                column_dict[column_name] = pd.Series(
+                    FSP.create_object_array([value for _, value in column_data]),
+                    index=findex_list,
+                    dtype=object)
+
+            df_layer = pd.DataFrame(column_dict, dtype=object)
+            df_layer['layer'] = layer
+            df_layer['Findex'] = FSP.create_object_array(df_layer.index.tolist())
+            df_layer_list.append(df_layer)
+
+        if not df_layer_list:
+            return pd.DataFrame(columns=new_columns)
+
+        df_restored = pd.concat(df_layer_list, ignore_index=True)
+        df_restored = df_restored.reindex(columns=new_columns).astype(object)
+
+        return df_restored
+
+    def refresh_table(self, df):
+        """
+        table_to_field_set_fileで作成したFieldSetFileをfield_set_file_to_tableで読み込んだ場合と
+        同じDataFrameを、pickle化やBase64エンコードを行わずに作成します。
+        複数のロジックを続けて実行する際に、ロジック間のFieldSetFileへの変換を省略するために使用します。
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            ロジック実行後のDataFrameです。
+
+        Returns
+        -------
+        pandas.DataFrame
+            layerごとに行をまとめ、列をfield_set_file_to_tableと同じ並びにしたobject型のDataFrameです。
+        """
+        if len(df) == 0:
+            return pd.DataFrame(columns=['layer', 'Findex'])
+
+        column_list = [column for column in df.columns if column not in ('Findex', 'layer')]
+
+        # 書き込み時と同じく、型が未登録の列は先頭行の値の型を登録する
+        for column in column_list:
+            self.type_dict[column] = self.type_dict.get(column, type(df.loc[0, column]).__name__)
+
+        # layerの出現順に行をまとめる（layerが欠損している行はFieldSetFileに書き込まれないため除外）
+        layer_code_array, _ = pd.factorize(df['layer'])
+        row_index_array = np.argsort(layer_code_array, kind='stable')
+        row_index_array = row_index_array[layer_code_array[row_index_array] >= 0]
+
+        df_restored = df.iloc[row_index_array].reset_index(drop=True)
+        df_restored = df_restored.reindex(columns=column_list + ['layer', 'Findex']).astype(object)
 
         return df_restored
 
     def create_fsf_new_row_from_image(self, img, content, attribute):
         img_numpy = np.array(img)
-        img_pickle = pickle.dumps(img_numpy)
-        img_numpy = np.array(img)
+        img_pickle = encode_image(img_numpy)
 
         if img.mode == '1' or (np.unique(img_numpy).size == 2 and img_numpy.min() == 0 and img_numpy.max() == 255):
             # 2値画像であってもimg.mode: '1'にならない場合があるので上記の条件分としている
@@ -143,55 +225,120 @@ class FieldSetFileConverter:
             "Findex": 0
         }
 
-    def convert_img_to_field_set_file(self, content, attribute):
-        new_content = content
+    def parse_content(self, content, attribute):
+        """
+        FlowFileのコンテンツからParsedContentを作成します。
+        画像の場合はDataFrameに変換して保持し、FieldSetFileへの変換と再解析を行いません。
+
+        Parameters
+        ----------
+        content : bytes
+            FlowFileのコンテンツです。
+        attribute : dict
+            フロー属性の辞書です。
+
+        Returns
+        -------
+        ParsedContent
+            コンテンツと解析結果を保持するオブジェクトです。
+        """
+        df = self.convert_img_to_table(content, attribute)
+        if df is None:
+            return ParsedContent(content)
+
+        parsed_content = ParsedContent(None, table=df, converter=self)
+        parsed_content.add_bytes_parsed(STAGE_IMAGE, len(content))
+
+        return parsed_content
+
+    def convert_img_to_table(self, content, attribute):
+        """
+        画像のコンテンツを、content, color_space, layer, Findexの列を持つDataFrameに変換します。
+
+        Parameters
+        ----------
+        content : bytes
+            FlowFileのコンテンツです。
+        attribute : dict
+            フロー属性の辞書です。
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            変換したDataFrameです。画像でない場合はNoneを返します。
+        """
         ext = attribute.get('filename', '').split('.')[-1]
         if ext.lower() not in ('jpg', 'jpeg', 'tiff', 'png', 'pdf'):
-            return new_content
+            return None
 
         df = pd.DataFrame(columns=["content", "color_space", 'layer', "Findex"])
 
         if ext == 'pdf':
             # PDFの場合
             new_row = {
-                "content": new_content,
+                "content": content,
                 "color_space": 'RGB',
                 "layer": attribute['filename'],
                 "Findex": 0
             }
 
         else:
-            # 画像の場合
+            # 画像の場合（Image.openはヘッダーのみを読み込む）
             try:
                 img = Image.open(io.BytesIO(content))
             except Exception as e:
-                return new_content
+                return None
 
-            img_numpy = np.array(img)
-            img_pickle = pickle.dumps(img_numpy)
+            # 画素データはTIFF以外の保存、またはGRAYSCALEとBINARYの判定に必要な場合のみ展開する
+            img_numpy = None
+            if img.format != 'TIFF' or img.mode in ('L', 'F'):
+                img_numpy = np.array(img)
 
             if img.mode in ('L', 'F'):
                 color_space = 'GRAYSCALE'
                 # 画素が0と255のみの場合をBINARYとする
-                if np.unique(img_numpy).size == 2 and img_numpy.min() == 0 and img_numpy.max() == 255:
+                if self.is_binary_image(img_numpy):
                     color_space = 'BINARY'
             else:
                 color_space = img.mode  # 他のモード (例: 24bit画像:RGB, 32bit画像:RGBAなど)
 
             new_row = {
-                "content": img_pickle if img.format != 'TIFF' else content,
+                "content": encode_image(img_numpy) if img.format != 'TIFF' else content,
                 "color_space": color_space,
                 "layer": attribute['filename'],
                 "Findex": 0
             }
 
         df.loc[len(df)] = new_row
-        df_field_set_file = self.table_to_field_set_file(df)
-        new_content = df_field_set_file.to_csv(index=False).encode('utf-8')
 
-        return new_content
+        return df
+
+    def is_binary_image(self, img_numpy):
+        """
+        画素が0と255のみで、かつ両方を含む画像かを判定します。
+        np.uniqueは全画素をソートするため、0と255の画素数を数えて判定します。
+
+        Parameters
+        ----------
+        img_numpy : numpy.ndarray
+            判定する画像です。
 
+        Returns
+        -------
+        bool
+            2値画像の場合はTrueを返します。
+        """
+        zero_count = np.count_nonzero(img_numpy == 0)
+        max_count = np.count_nonzero(img_numpy == 255)
 
+        return zero_count > 0 and max_count > 0 and zero_count + max_count == img_numpy.size
 
+    def convert_img_to_field_set_file(self, content, attribute):
+        df = self.convert_img_to_table(content, attribute)
+        if df is None:
+            return content
 
+        df_field_set_file = self.table_to_field_set_file(df)
+        new_content = df_field_set_file.to_csv(index=False).encode('utf-8')
 
+        return new_content
@@ -0,0 +1,170 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Python標準ライブラリ
+import pickle
+import zlib
+from importlib import import_module
+
+# 外部ライブラリの動的インポート
+np = import_module("numpy")
+
+# 圧縮方式 zlib：画素値をそのままzlib圧縮 bitpack：0と255のみの2値画像を1画素1ビットに詰めてzlib圧縮
+IMAGE_CODEC_ZLIB = 'zlib'
+IMAGE_CODEC_BITPACK = 'bitpack'
+
+# zlibの圧縮レベル（画像は容量が大きいため、速度を優先する）
+IMAGE_COMPRESSION_LEVEL = 1
+
+# 圧縮対象とする画像の最小バイト数（小さい配列は圧縮せずにpickleのまま保持する）
+IMAGE_CODEC_MIN_NBYTES = 65536
+
+# pickle化したndarrayの先頭付近に含まれる復元関数名
+NDARRAY_PICKLE_MARKER = b'_reconstruct'
+NDARRAY_PICKLE_MARKER_RANGE = 128
+
+
+class _EncodedImage:
+    """
+    圧縮した画像をpickle化するためのクラスです。
+    pickle.loadsで復元すると、decode_imageが呼ばれて元のndarrayが返ります。
+    """
+
+    def __init__(self, codec, dtype_str, shape, data):
+        self.codec = codec
+        self.dtype_str = dtype_str
+        self.shape = shape
+        self.data = data
+
+    def __reduce__(self):
+        return decode_image, (self.codec, self.dtype_str, self.shape, self.data)
+
+
+def decode_image(codec, dtype_str, shape, data):
+    """
+    encode_imageで圧縮した画像をndarrayに復元します。
+    pickle.loadsから呼ばれるため、各ロジックの呼び出し箇所は変更不要です。
+
+    Parameters
+    ----------
+    codec : str
+        圧縮方式です。
+    dtype_str : str
+        元の配列のdtype文字列です。
+    shape : tuple
+        元の配列の形状です。
+    data : bytes
+        圧縮したデータです。
+
+    Returns
+    -------
+    numpy.ndarray
+        復元した画像です。書き込み可能な配列を返します。
+    """
+    if codec == IMAGE_CODEC_BITPACK:
+        bit_array = np.unpackbits(np.frombuffer(zlib.decompress(data), dtype=np.uint8),
+                                  count=int(np.prod(shape)))
+        return (bit_array * np.uint8(255)).astype(np.dtype(dtype_str), copy=False).reshape(shape)
+
+    if codec == IMAGE_CODEC_ZLIB:
+        return np.frombuffer(bytearray(zlib.decompress(data)), dtype=np.dtype(dtype_str)).reshape(shape)
+
+    raise ValueError(f'未対応の画像の圧縮方式です: {codec}')
+
+
+def is_encodable_image(image):
+    """
+    画像を可逆圧縮できるか判定します。
+    数値型のC連続なndarrayで、一定以上の大きさのものを対象とします。
+
+    Parameters
+    ----------
+    image : object
+        判定対象です。
+
+    Returns
+    -------
+    bool
+        圧縮できる場合はTrueを返します。
+    """
+    return type(image) is np.ndarray \
+        and image.dtype.kind in 'biuf' \
+        and image.flags.c_contiguous \
+        and image.nbytes >= IMAGE_CODEC_MIN_NBYTES
+
+
+def encode_image(image):
+    """
+    画像を可逆圧縮し、pickle.loadsでndarrayに復元できるバイト列にします。
+    0と255のみのuint8の画像（2値画像）は1画素1ビットに詰めて圧縮します。
+    圧縮対象外の場合はpickle.dumpsの結果をそのまま返します。
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        圧縮する画像です。
+
+    Returns
+    -------
+    bytes
+        pickle化した圧縮画像です。
+    """
+    if not is_encodable_image(image):
+        return pickle.dumps(image)
+
+    if image.dtype == np.uint8 and ((image == 0) | (image == 255)).all():
+        codec = IMAGE_CODEC_BITPACK
+        data = zlib.compress(np.packbits(image == 255).tobytes(), IMAGE_COMPRESSION_LEVEL)
+    else:
+        codec = IMAGE_CODEC_ZLIB
+        data = zlib.compress(image.data, IMAGE_COMPRESSION_LEVEL)
+
+    return pickle.dumps(_EncodedImage(codec, image.dtype.str, image.shape, data))
+
+
+def compress_pickled_image(value):
+    """
+    pickle化したndarrayのバイト列であれば、encode_imageで圧縮したバイト列に置き換えます。
+    ndarray以外のバイト列や圧縮済みのバイト列はそのまま返します。
+
+    Parameters
+    ----------
+    value : object
+        FieldSetFileに書き込む値です。
+
+    Returns
+    -------
+    object
+        圧縮した値、または元の値を返します。
+    """
+    if not isinstance(value, bytes) or NDARRAY_PICKLE_MARKER not in value[:NDARRAY_PICKLE_MARKER_RANGE]:
+        return value
+
+    try:
+        image = pickle.loads(value)
+    except Exception:
+        return value
+
+    if not is_encodable_image(image):
+        return value
+
+    return encode_image(image)
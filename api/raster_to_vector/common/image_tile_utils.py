@@ -0,0 +1,436 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Python標準ライブラリ
+import os
+import pickle
+import threading
+import uuid
+from importlib import import_module
+
+# 外部ライブラリの動的インポート
+np = import_module("numpy")
+
+# タイル分割実行中の画像 {登録キー: numpy.ndarray}
+_tile_image_dict = {}
+_tile_image_lock = threading.Lock()
+
+
+class _TileImageWindow:
+    """
+    登録済み画像の一部（タイル）をpickle化するためのクラスです。
+    画素データは持たず、pickle.loadsで復元するとget_tile_image_windowが呼ばれて画像のビューが返ります。
+    """
+
+    def __init__(self, key, window):
+        self.key = key
+        self.window = window
+
+    def __reduce__(self):
+        return get_tile_image_window, (self.key,) + tuple(self.window)
+
+
+def register_tile_image(image):
+    """
+    タイル分割実行で参照する画像を登録します。
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        登録する画像です。
+
+    Returns
+    -------
+    str
+        登録キーです。
+    """
+    key = uuid.uuid4().hex
+    with _tile_image_lock:
+        _tile_image_dict[key] = image
+
+    return key
+
+
+def unregister_tile_image(key):
+    """
+    register_tile_imageで登録した画像を削除します。
+
+    Parameters
+    ----------
+    key : str
+        登録キーです。
+    """
+    with _tile_image_lock:
+        _tile_image_dict.pop(key, None)
+
+
+def get_tile_image_window(key, y1, y2, x1, x2):
+    """
+    登録済み画像の指定範囲をコピーせずにビューとして取得します。
+    pickle.loadsから呼ばれるため、各ロジックの呼び出し箇所は変更不要です。
+
+    Parameters
+    ----------
+    key : str
+        登録キーです。
+    y1, y2, x1, x2 : int
+        取得する範囲です。
+
+    Returns
+    -------
+    numpy.ndarray
+        指定範囲の画像のビューです。
+    """
+    with _tile_image_lock:
+        image = _tile_image_dict[key]
+
+    return image[y1:y2, x1:x2]
+
+
+def dumps_tile_image_window(key, window):
+    """
+    登録済み画像の指定範囲を、画素データを含まないバイト列にします。
+
+    Parameters
+    ----------
+    key : str
+        登録キーです。
+    window : tuple
+        (y1, y2, x1, x2)形式の範囲です。
+
+    Returns
+    -------
+    bytes
+        pickle.loadsで画像のビューに復元できるバイト列です。
+    """
+    return pickle.dumps(_TileImageWindow(key, window))
+
+
+def create_tile_window_list(height, width, height_division_num, width_division_num, overlap_region):
+    """
+    画像を重なり領域付きのタイルに分割した際の範囲を求めます。
+    分割方法はImageSplitと同じで、各タイルの左上座標がオフセットになります。
+
+    Parameters
+    ----------
+    height : int
+        画像の高さです。
+    width : int
+        画像の幅です。
+    height_division_num : int
+        縦方向の分割数です。
+    width_division_num : int
+        横方向の分割数です。
+    overlap_region : int
+        タイルの縦横の重なり領域です。
+
+    Returns
+    -------
+    list
+        (y1, y2, x1, x2)形式の範囲のリストです。行優先で並びます。
+    """
+    increase_height = height // height_division_num
+    increase_width = width // width_division_num
+
+    window_list = []
+    for row in range(height_division_num):
+        for column in range(width_division_num):
+            y1 = row * increase_height
+            y2 = min((row + 1) * increase_height + overlap_region, height)
+            x1 = column * increase_width
+            x2 = min((column + 1) * increase_width + overlap_region, width)
+            window_list.append((y1, y2, x1, x2))
+
+    return window_list
+
+
+def get_tile_setting(properties):
+    """
+    プロパティからタイル分割実行の設定を取得します。
+
+    Parameters
+    ----------
+    properties : dict
+        プロパティの辞書です。
+        - tile_width_division_num: int
+            横方向の分割数です。
+        - tile_height_division_num: int
+            縦方向の分割数です。
+        - tile_overlap_region: int
+            タイルの縦横の重なり領域です。
+        - tile_max_workers: int
+            同時に処理するタイル数です。0の場合はCPU数になります。
+
+    Returns
+    -------
+    tuple or None
+        (横方向の分割数, 縦方向の分割数, 重なり領域, 同時に処理するタイル数)のタプルです。
+        分割数がいずれも1（またはプロパティ未設定）の場合はNoneを返します。
+
+    Raises
+    ------
+    ValueError
+        プロパティの値が不正な場合に発生します。
+    """
+    try:
+        width_division_num = int(properties.get('tile_width_division_num') or 1)
+        height_division_num = int(properties.get('tile_height_division_num') or 1)
+        overlap_region = int(properties.get('tile_overlap_region') or 0)
+        max_workers = int(properties.get('tile_max_workers') or 0)
+    except Exception as e:
+        raise ValueError(f'タイル分割のプロパティの取得時にエラーが発生しました: {e}')
+
+    if width_division_num <= 0:
+        raise ValueError("tile_width_division_numは0より大きい数である必要があります")
+    if height_division_num <= 0:
+        raise ValueError("tile_height_division_numは0より大きい数である必要があります")
+    if overlap_region < 0:
+        raise ValueError("tile_overlap_regionは0以上である必要があります")
+    if max_workers < 0:
+        raise ValueError("tile_max_workersは0以上である必要があります")
+
+    if width_division_num == 1 and height_division_num == 1:
+        return None
+
+    if max_workers == 0:
+        max_workers = os.cpu_count() or 1
+
+    return width_division_num, height_division_num, overlap_region, max_workers
+
+
+def get_cluster_epsilon(properties, key):
+    """
+    プロパティからクラスタリングの距離(px)を取得します。
+
+    Parameters
+    ----------
+    properties : dict
+        プロパティの辞書です。
+    key : str
+        プロパティのキーです。
+
+    Returns
+    -------
+    int
+        クラスタリングの距離(px)です。
+
+    Raises
+    ------
+    ValueError
+        値が数値でない場合や負の場合に発生します。
+    """
+    try:
+        epsilon = int(properties.get(key) or 0)
+    except:
+        raise ValueError(f'{key}に無効な値が設定されています: {properties.get(key)}')
+    if epsilon < 0:
+        raise ValueError(f'{key}は0以上の値を入力してください: {properties.get(key)}')
+
+    return epsilon
+
+
+def remove_duplicate_coordinates(coordinate_list):
+    """
+    重複した座標を順序を維持したまま削除します。
+
+    Parameters
+    ----------
+    coordinate_list : list
+        座標のタプルのリストです。
+
+    Returns
+    -------
+    numpy.ndarray
+        重複を削除した座標の配列です。
+    """
+    seen = set()
+    unique_list = []
+    for item in coordinate_list:
+        if item not in seen:
+            unique_list.append(item)
+            seen.add(item)
+
+    return np.array(unique_list)
+
+
+def calc_cluster_labels(coordinate_array, eps):
+    """
+    DBSCANで近い座標をクラスタリングし、ラベルを返します。
+    epsが0の場合はクラスタリングを行わず、すべての座標を別のクラスタとします。
+
+    Parameters
+    ----------
+    coordinate_array : numpy.ndarray
+        座標の配列です。
+    eps : int
+        同一とみなす距離(px)です。
+
+    Returns
+    -------
+    numpy.ndarray
+        座標ごとのクラスタのラベルです。
+    """
+    if eps == 0:
+        return np.arange(len(coordinate_array))
+
+    DBSCAN = import_module("sklearn.cluster").DBSCAN
+    dbscan = DBSCAN(eps=eps, min_samples=1)
+
+    return dbscan.fit_predict(coordinate_array)
+
+
+def cluster_coordinates(coordinate_array, eps):
+    """
+    近い座標をクラスタリングし、クラスタごとの平均座標を返します。
+
+    Parameters
+    ----------
+    coordinate_array : numpy.ndarray
+        座標の配列です。
+    eps : int
+        同一とみなす距離(px)です。0の場合はクラスタリングを行いません。
+
+    Returns
+    -------
+    numpy.ndarray
+        クラスタごとの平均座標（整数）の配列です。
+    """
+    if len(coordinate_array) == 0:
+        return np.array([])
+
+    labels = calc_cluster_labels(coordinate_array, eps)
+    group_averages = []
+    # ラベルが-1の場合、それはノイズなので無視
+    for label in set(labels):
+        if label != -1:
+            group_points = coordinate_array[labels == label]
+            # グループ内の平均を計算
+            group_average = np.mean(group_points, axis=0)
+            group_averages.append(group_average.astype(int))
+
+    return np.array(group_averages)
+
+
+def merge_circle_coordinates(circle_coordinate_list, offset_x_list, offset_y_list, eps):
+    """
+    タイルごとに検出した円の座標を分割前の画像の座標に変換し、重複した円をまとめます。
+
+    Parameters
+    ----------
+    circle_coordinate_list : list
+        タイルごとの円のリスト([(x, y), radius]のリスト)です。
+    offset_x_list : list
+        タイルごとのオフセットX座標です。
+    offset_y_list : list
+        タイルごとのオフセットY座標です。
+    eps : int
+        同一の円とみなす中心座標の距離(px)です。0の場合は完全に一致する円のみをまとめます。
+
+    Returns
+    -------
+    list
+        [(x, y), radius]形式の円のリストです。
+    """
+    # それぞれの円の座標を結合後の座標に適用する
+    circle_merged_coordinate_list = []
+    for i, circle_coordinate in enumerate(circle_coordinate_list):
+        for circle in circle_coordinate:
+            x, y = circle[0]
+            radius = circle[1]
+            circle_x = offset_x_list[i] + x
+            circle_y = offset_y_list[i] + y
+            circle_merged_coordinate_list.append((circle_x, circle_y, radius))
+    # 円の重複をなくす
+    unique_circle = remove_duplicate_coordinates(circle_merged_coordinate_list)
+
+    # 近い円座標をクラスタリング
+    circle_averages = cluster_coordinates(unique_circle, eps)
+
+    # 元の形に変形
+    return [[(x[0], x[1]), x[2]] for x in circle_averages]
+
+
+def merge_line_coordinates(line_coordinate_list, offset_x_list, offset_y_list, eps, keep_thickness=False):
+    """
+    タイルごとに検出した線分の座標を分割前の画像の座標に変換し、重複した線分をまとめます。
+    始点、終点、中点の座標でクラスタリングします。
+
+    Parameters
+    ----------
+    line_coordinate_list : list
+        タイルごとの線分のリスト([(x1, y1), (x2, y2)]または[(x1, y1), (x2, y2), 太さ]のリスト)です。
+    offset_x_list : list
+        タイルごとのオフセットX座標です。
+    offset_y_list : list
+        タイルごとのオフセットY座標です。
+    eps : int
+        同一の線分とみなす距離(px)です。0の場合は完全に一致する線分のみをまとめます。
+    keep_thickness : bool, optional
+        Trueの場合は線分の太さをクラスタごとに平均して出力します。
+        Falseの場合は太さ情報を使わず、出力にも含めません。
+
+    Returns
+    -------
+    list
+        [(x1, y1), (x2, y2)]または[(x1, y1), (x2, y2), 太さ]形式の線分のリストです。
+    """
+    # それぞれの線分の座標を結合後の座標に適用する
+    line_merged_coordinate_list = []
+    thickness_dict = {}
+    for i, line_coordinate in enumerate(line_coordinate_list):
+        for line in line_coordinate:
+            # 線分の太さ情報は座標と分けて扱う
+            line_point_list = [line_point for line_point in line if isinstance(line_point, tuple)]
+            x1 = line_point_list[0][0] + offset_x_list[i]
+            y1 = line_point_list[0][1] + offset_y_list[i]
+            x2 = line_point_list[1][0] + offset_x_list[i]
+            y2 = line_point_list[1][1] + offset_y_list[i]
+            mid_point_x = (x1 + x2) // 2
+            mid_point_y = (y1 + y2) // 2
+            line_key = (x1, y1, x2, y2, mid_point_x, mid_point_y)
+            line_merged_coordinate_list.append(line_key)
+
+            if keep_thickness and line_key not in thickness_dict:
+                thickness_dict[line_key] = line[2] if len(line) > 2 else 0
+    # 線分の重複をなくす
+    unique_line = remove_duplicate_coordinates(line_merged_coordinate_list)
+
+    if not keep_thickness:
+        # 近い線分座標をクラスタリング
+        line_averages = cluster_coordinates(unique_line, eps)
+        # 元の形に変形
+        return [[(x[0], x[1]), (x[2], x[3])] for x in line_averages]
+
+    if len(unique_line) == 0:
+        return []
+
+    thickness_array = np.array([thickness_dict[tuple(line_key)] for line_key in unique_line.tolist()])
+    labels = calc_cluster_labels(unique_line, eps)
+    line_list = []
+    for label in set(labels):
+        if label != -1:
+            is_group = labels == label
+            line_average = np.mean(unique_line[is_group], axis=0).astype(int)
+            thickness = np.mean(thickness_array[is_group])
+            line_list.append([(line_average[0], line_average[1]), (line_average[2], line_average[3]), thickness])
+
+    return line_list
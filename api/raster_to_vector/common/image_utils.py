@@ -27,6 +27,10 @@ from importlib import import_module
 cv2 = import_module("cv2")
 np = import_module("numpy")
 
+# 線の太さ計測で一度に画素を取得するサンプル数（線分数×オフセット数×線分長の上限）
+THICKNESS_SAMPLE_CHUNK_SIZE = 4000000
+
+
 def calc_line_thickness(line_list, img_gray, threshold=200):
     """
     与えられた複数の線分に対して、画像上での太さ(厚み)を計測します。
@@ -46,22 +50,191 @@ def calc_line_thickness(line_list, img_gray, threshold=200):
         対応する線分ごとの太さを格納したリスト
     """
 
-    thickness_list = []
-
     # debug_img = cv2.cvtColor(img_gray, cv2.COLOR_GRAY2BGR)
 
-    for index, line in enumerate(line_list):
-        ((x1, y1), (x2, y2)) = line
-        thickness = measure_line_thickness_parallel_refined(
-            (x1, y1, x2, y2),
-            img_gray,
-            threshold=threshold,
-            max_offset=6)
+    # 全線分をまとめて計測（結果はmeasure_line_thickness_parallel_refinedと同一）
+    thickness_list = measure_line_thickness_batch(
+        line_list,
+        img_gray,
+        threshold=threshold,
+        max_offset=6)
+
+    # for ((x1, y1), (x2, y2)), thickness in zip(line_list, thickness_list):
+    #     display_thickness_at_center_line(x1, y1, x2, y2, 0, thickness, debug_img)
+    # Image.fromarray(debug_img).show()
+
+    return thickness_list
+
+
+def calc_offset_line_ratio_array(line_array, img, threshold, offset_array):
+    """
+    各線分を法線方向にオフセットずらしたラインについて、閾値以下の画素の割合をまとめて計算します。
+    measure_line_thickness_parallel_refined内のget_line_pixels、calc_ratioと同じ座標計算を
+    配列演算で行い、全線分・全オフセットの画素をインデックス配列で一括取得します。
+
+    Parameters
+    ----------
+    line_array : numpy.ndarray
+        (N, 4) の [x1, y1, x2, y2] 配列。線分長が1以上のもののみ
+    img : numpy.ndarray
+        グレースケール画像（2次元配列）
+    threshold : int
+        ピクセル値判定用閾値
+    offset_array : numpy.ndarray
+        法線方向へずらすピクセル数の1次元配列
+
+    Returns
+    -------
+    ratio_array : numpy.ndarray
+        (N, オフセット数) の割合の配列。ラインが画像外に出る場合は0
+    """
+    dx = line_array[:, 2] - line_array[:, 0]
+    dy = line_array[:, 3] - line_array[:, 1]
+    length_array = np.hypot(dx, dy).astype(np.int64)
+
+    # 正規化された方向ベクトルと垂直方向ベクトル
+    dir_x_array = dx / length_array
+    dir_y_array = dy / length_array
+    perp_x_array = -dir_y_array
+    perp_y_array = dir_x_array
+
+    # 元のライン付近の中央
+    cx_array = (line_array[:, 0] + line_array[:, 2]) / 2.0
+    cy_array = (line_array[:, 1] + line_array[:, 3]) / 2.0
+
+    # オフセットごとのラインの始点 (N, オフセット数)
+    start_x_array = cx_array[:, np.newaxis] + offset_array[np.newaxis, :] * perp_x_array[:, np.newaxis] \
+        - ((length_array / 2) * dir_x_array)[:, np.newaxis]
+    start_y_array = cy_array[:, np.newaxis] + offset_array[np.newaxis, :] * perp_y_array[:, np.newaxis] \
+        - ((length_array / 2) * dir_y_array)[:, np.newaxis]
+
+    ratio_array = np.zeros((len(line_array), len(offset_array)), dtype=np.float64)
+
+    # 画素数が多い場合はメモリを抑えるため線分を分割して処理
+    sample_number_array = np.cumsum(length_array) * len(offset_array)
+    chunk_start = 0
+    while chunk_start < len(line_array):
+
+        chunk_end = max(int(np.searchsorted(sample_number_array,
+                                            sample_number_array[chunk_start] - length_array[chunk_start] * len(offset_array)
+                                            + THICKNESS_SAMPLE_CHUNK_SIZE,
+                                            side="right")),
+                        chunk_start + 1)
+
+        chunk_length_array = length_array[chunk_start:chunk_end]
+        segment_start_array = np.concatenate([[0], np.cumsum(chunk_length_array)[:-1]])
+
+        # 画素ごとの線分番号と線分内の位置
+        line_index_array = np.repeat(np.arange(chunk_start, chunk_end), chunk_length_array)
+        step_array = np.arange(len(line_index_array)) - np.repeat(segment_start_array, chunk_length_array)
+
+        # 画素座標 (画素数, オフセット数) int()と同じく0方向に切り捨て
+        px_array = (start_x_array[line_index_array]
+                    + (step_array * dir_x_array[line_index_array])[:, np.newaxis]).astype(np.int64)
+        py_array = (start_y_array[line_index_array]
+                    + (step_array * dir_y_array[line_index_array])[:, np.newaxis]).astype(np.int64)
+
+        inside_bool = (0 <= px_array) & (px_array < img.shape[1]) & (0 <= py_array) & (py_array < img.shape[0])
+
+        # 画像内の画素のみ判定し、画像外に出るラインは後で0とする
+        below_bool = np.zeros(px_array.shape, dtype=np.bool_)
+        below_bool[inside_bool] = img[py_array[inside_bool], px_array[inside_bool]] <= threshold
+
+        outside_count_array = np.add.reduceat(~inside_bool, segment_start_array, axis=0)
+        below_count_array = np.add.reduceat(below_bool.astype(np.int64), segment_start_array, axis=0)
+
+        ratio_array[chunk_start:chunk_end] = np.where(outside_count_array == 0,
+                                                      below_count_array / chunk_length_array[:, np.newaxis],
+                                                      0.0)
+
+        chunk_start = chunk_end
+
+    return ratio_array
+
 
-        # display_thickness_at_center_line(x1, y1, x2, y2, 0, thickness, debug_img)
-        # Image.fromarray(debug_img).show()
+def measure_line_thickness_batch(line_list, img, threshold=200, max_offset=6):
+    """
+    複数の線分の太さをまとめて計測します。
+    中心線探索と太さ計測で参照するオフセット(-2*max_offset～2*max_offset)の割合を
+    calc_offset_line_ratio_arrayで一括計算し、線分ごとの判定は
+    measure_line_thickness_parallel_refinedと同じ手順で行います。
+
+    Parameters
+    ----------
+    line_list : list
+        [(x1,y1), (x2,y2)] 形式の直線座標ペアを要素とするリスト
+    img : numpy.ndarray
+        グレースケール画像（2次元配列）
+    threshold : int, optional
+        ピクセル値判定用閾値。これより小さい(暗い)ピクセルを線とみなします。
+    max_offset : int, optional
+        線に垂直方向へずらす最大ピクセル数。デフォルト6。
+
+    Returns
+    -------
+    thickness_list : list
+        対応する線分ごとの太さを格納したリスト
+    """
+    if len(line_list) == 0:
+        return []
+
+    line_array = np.asarray(line_list, dtype=np.float64).reshape(-1, 4)
+    length_array = np.hypot(line_array[:, 2] - line_array[:, 0],
+                            line_array[:, 3] - line_array[:, 1]).astype(np.int64)
+
+    # 線分長が0の線分は太さ0
+    valid_index_array = np.flatnonzero(length_array > 0)
+
+    offset_array = np.arange(-2 * max_offset, 2 * max_offset + 1)
+    ratio_array = calc_offset_line_ratio_array(line_array[valid_index_array], img, threshold, offset_array)
+
+    thickness_list = [0] * len(line_array)
+
+    for vi, line_index in enumerate(valid_index_array):
+
+        ratio_row = ratio_array[vi]
+
+        # Step1: offsetを-max_offsetからmax_offsetまで試して最大ratioのラインを探す
+        best_ratio = -1.0
+        best_offset = 0
+        line_found = False
+
+        for off in range(-max_offset, max_offset + 1):
+            ratio = ratio_row[off + 2 * max_offset]
+            if ratio > best_ratio:
+                best_ratio = ratio
+                best_offset = off
+            elif ratio == best_ratio:
+                # 同率の場合、中心に近い方（絶対値が小さいoffset）を採用
+                if abs(off) < abs(best_offset):
+                    best_offset = off
+
+            if 0 < ratio:
+                line_found = True
+
+        # ratioがすべて0以下なら線なしと判定
+        if not line_found:
+            continue
+
+        thickness_count = 0
+
+        # 正方向(+offset)へ探索
+        for off in range(0, max_offset + 1):
+            ratio = ratio_row[best_offset + off + 2 * max_offset]
+            if 0.1 < ratio:
+                thickness_count += ratio
+            else:
+                break
+
+        # 負方向(-offset)へ探索
+        for off in range(-1, -(max_offset + 1), -1):
+            ratio = ratio_row[best_offset + off + 2 * max_offset]
+            if 0.1 < ratio:
+                thickness_count += ratio
+            else:
+                break
 
-        thickness_list.append(thickness)
+        thickness_list[line_index] = thickness_count
 
     return thickness_list
 
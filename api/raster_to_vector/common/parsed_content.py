@@ -0,0 +1,153 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Python標準ライブラリ
+import io
+from importlib import import_module
+
+# 外部ライブラリの動的インポート
+pd = import_module("pandas")
+
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
+
+# FieldSetFileかを判定する際に読み込む先頭のバイト数（ヘッダー行はこの範囲に収まる想定）
+FIELD_SET_FILE_SNIFF_SIZE = 65536
+
+# 解析したバイト数を記録する処理段階
+STAGE_SNIFF = 'sniff'
+STAGE_IMAGE = 'image'
+STAGE_FIELD_SET_FILE = 'field_set_file'
+STAGE_TABLE = 'table'
+
+
+class ParsedContent:
+    """
+    FlowFileのコンテンツと、その解析結果を保持するクラスです。
+    プロセッサの入口で1度だけ作成し、Executorの選択とロジックの実行で解析結果を共有します。
+    解析は必要になった時点で1度だけ行い、処理段階ごとに解析したバイト数を記録します。
+    """
+
+    def __init__(self, content, table=None, converter=None):
+        """
+        Parameters
+        ----------
+        content : bytes or None
+            FlowFileのコンテンツです。画像から変換したDataFrameを保持する場合はNoneを指定できます。
+        table : pandas.DataFrame, optional
+            画像から変換したDataFrame（content, color_space, layer, Findex）です。
+        converter : FieldSetFileConverter, optional
+            tableをFieldSetFileに変換する際に使用するConverterです。tableを指定する場合は必須です。
+        """
+        self._content = content
+        self.table = table
+        self.converter = converter
+        self.field_set_file = None
+        self._is_field_set_file = None
+        self.bytes_parsed = {}
+
+    def add_bytes_parsed(self, stage, nbytes):
+        """
+        処理段階ごとの解析したバイト数を加算します。
+
+        Parameters
+        ----------
+        stage : str
+            処理段階の名前です。
+        nbytes : int
+            解析したバイト数です。
+        """
+        self.bytes_parsed[stage] = self.bytes_parsed.get(stage, 0) + nbytes
+
+    def get_content(self):
+        """
+        FlowFileのコンテンツを返します。
+        画像から変換したDataFrameのみを保持している場合は、初回呼び出し時にCSV形式のFieldSetFileに変換します。
+
+        Returns
+        -------
+        bytes
+            FlowFileのコンテンツです。
+        """
+        if self._content is None:
+            df_field_set_file = self.converter.table_to_field_set_file(self.table)
+            self._content = df_field_set_file.to_csv(index=False).encode('utf-8')
+
+        return self._content
+
+    def is_field_set_file(self):
+        """
+        コンテンツがDwh, Type, Valueの列を持つFieldSetFileかを、先頭のバイト列のみで判定します。
+        コンテンツ全体のデコードやCSVの解析は行いません。
+
+        Returns
+        -------
+        bool
+            FieldSetFileの場合はTrueを返します。
+        """
+        if self._is_field_set_file is not None:
+            return self._is_field_set_file
+
+        if self.table is not None or self.field_set_file is not None:
+            self._is_field_set_file = True
+            return True
+
+        content = self._content
+        self._is_field_set_file = False
+
+        if FSP.is_binary_field_set_file(content):
+            # バイナリ形式のFieldSetFileはDwh/Type/Valueの構成が保証されている
+            self.add_bytes_parsed(STAGE_SNIFF, len(FSP.BINARY_FIELD_SET_FILE_MAGIC))
+            self._is_field_set_file = True
+            return True
+
+        if not isinstance(content, (bytes, bytearray)):
+            return False
+
+        # ヘッダー行のみを取り出す（範囲内に改行がない場合はFieldSetFileではない）
+        header_end = content.find(b'\n', 0, FIELD_SET_FILE_SNIFF_SIZE)
+        if header_end == -1:
+            if len(content) > FIELD_SET_FILE_SNIFF_SIZE:
+                return False
+            header_end = len(content)
+
+        header = bytes(content[:header_end])
+        self.add_bytes_parsed(STAGE_SNIFF, len(header))
+
+        try:
+            columns = pd.read_csv(io.StringIO(header.decode('utf-8')), nrows=0).columns
+        except Exception:
+            return False
+
+        self._is_field_set_file = all(column in columns for column in FSP.FIELD_SET_FILE_COLUMNS)
+
+        return self._is_field_set_file
+
+    def format_bytes_parsed(self):
+        """
+        処理段階ごとの解析したバイト数を、ログ出力用の文字列にします。
+
+        Returns
+        -------
+        str
+            "処理段階=バイト数"をカンマ区切りで連結した文字列です。
+        """
+        return ', '.join(f'{stage}={nbytes:,}B' for stage, nbytes in self.bytes_parsed.items())
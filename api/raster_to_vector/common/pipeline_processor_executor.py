@@ -0,0 +1,74 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from raster_to_vector.common.custom_processor_executor import CustomProcessorExecutor
+from raster_to_vector.common.field_set_file_converter import FieldSetFileConverter
+
+
+class PipelineProcessorExecutor:
+    def __init__(self, create_stage_list):
+        """
+        複数のロジックを続けて実行するExecutorです。
+
+        Parameters
+        ----------
+        create_stage_list : callable
+            プロパティの辞書を受け取り、(ロジックのインスタンス, 実行関数, プロパティの辞書)のリストを返す関数です。
+        """
+        self.create_stage_list = create_stage_list
+        self.converter = FieldSetFileConverter()
+
+    def execute(self, content_data, attributes, properties):
+        """
+        FieldSetFileを読み込み、各ロジックをDataFrameのまま順に実行して、最後にFieldSetFileへ変換します。
+        ロジック間ではFieldSetFileへの変換（pickle化、Base64エンコード、CSV出力）を行いません。
+
+        Parameters
+        ----------
+        content_data : bytes or ParsedContent
+            FieldSetFile形式のコンテンツです。
+        attributes : dict
+            フロー属性の辞書です。
+        properties : dict
+            パイプラインのプロパティの辞書です。
+
+        Returns
+        -------
+        tuple
+            FieldSetFile形式のコンテンツと属性の辞書を含むタプルを返します。
+        """
+        stage_list = self.create_stage_list(properties)
+
+        df_content = self.converter.content_to_table(content_data)
+
+        new_attribute = attributes
+        for logic_instance, processors, stage_properties in stage_list:
+            executor = CustomProcessorExecutor(logic_instance, processors, self.converter)
+            df_content, new_attribute = executor.execute_table(df_content, new_attribute, stage_properties)
+
+            # 次のロジックにはFieldSetFileを読み込んだ場合と同じ形式のDataFrameを渡す
+            df_content = self.converter.refresh_table(df_content)
+
+        df_field_set_file = self.converter.table_to_field_set_file(df_content)
+        field_set_file = df_field_set_file.to_csv(index=False)
+
+        return field_set_file, new_attribute
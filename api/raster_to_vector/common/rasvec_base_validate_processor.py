@@ -21,7 +21,6 @@
 # SOFTWARE.
 
 # Python標準ライブラリ
-import pickle
 from importlib import import_module
 from abc import abstractmethod
 
@@ -29,6 +28,7 @@ from abc import abstractmethod
 np = import_module("numpy")
 pd = import_module("pandas")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 from common.base_validate_processor import BaseValidateProcessor
 from common.error_code_list import ErrorCodeList
 from raster_to_vector.common.field_set_file_converter import FieldSetFileConverter
@@ -70,9 +70,8 @@ class RasVecBaseValidateProcessor(BaseValidateProcessor):
         try:
             # 画像データの場合はFSFに変換
             self.converter = FieldSetFileConverter()
-            field_set_file = self.converter.convert_img_to_field_set_file(input_data, attributes)
-            df_content_field_set_file = self.converter.content_to_field_set_file(field_set_file)
-            df_table = self.converter.field_set_file_to_table(df_content_field_set_file)
+            parsed_content = self.converter.parse_content(input_data, attributes)
+            df_table = self.converter.content_to_table(parsed_content)
         except:
             args = {
                     "error_code": ErrorCodeList.ER00002,
@@ -149,7 +148,7 @@ class RasVecBaseValidateProcessor(BaseValidateProcessor):
             content_name = "入力データ → " + file_name
 
         if not file_name.lower().endswith(('.tiff', '.pdf')):
-            content = pickle.loads(input_data)
+            content = GCP.deserialize_content(input_data)
         else:
             content = input_data
         
@@ -196,7 +195,7 @@ class RasVecBaseValidateProcessor(BaseValidateProcessor):
             content_name = "入力データ → " + file_name
             
         if not file_name.lower().endswith(('.tiff', '.pdf')):
-            content = pickle.loads(input_data)
+            content = GCP.deserialize_content(input_data)
         else:
             content = input_data
 
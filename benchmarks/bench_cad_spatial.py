@@ -0,0 +1,138 @@
+# MIT License
+#
+# Copyright (c) 2025 NTT InfraNet
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# cad.common.cad_spatialのDistance、TouchesEndpoint、CascadeTouches、MostIntersectsのベンチマーク。
+# CADレイヤを模した合成の線分（メイン、サブ同数）を作成し、STRtreeによる一括問い合わせの処理と、
+# 置き換え前の総当たりの処理（legacy_cad_spatial）の実行時間を比較する。
+# 置き換え前の処理は件数の2乗に比例するため、--legacy-max-size以下の件数のみ計測する。
+#
+# 実行例:
+#   python benchmarks/bench_cad_spatial.py
+#   python benchmarks/bench_cad_spatial.py --sizes 1000 50000 --operations distance cascade_touches
+# --------------------------------------------------------------------------------------------
+
+import benchmark_utils
+
+benchmark_utils.add_import_path()
+
+# 外部ライブラリ
+import geopandas as gpd
+import numpy as np
+import shapely
+
+import cad.common.cad_spatial as CS
+import legacy_cad_spatial as LCS
+
+# 既定の計測件数（メイン、サブそれぞれの件数）
+DEFAULT_SIZE_LIST = [1000, 10000, 50000]
+
+# 置き換え前の処理を計測する最大件数
+DEFAULT_LEGACY_MAX_SIZE = 1000
+
+# 線分の長さと、1件あたりの配置範囲の面積（線分同士が数件程度交差する密度とする）
+SEGMENT_LENGTH = 10.0
+AREA_PER_SEGMENT = 100.0
+
+# 探索範囲値、許容範囲値
+DISTANCE = 2.0
+TOLERANCE = 0.5
+
+# 操作名と、(置き換え後の処理, 置き換え前の処理, 探索範囲値・許容範囲値)
+OPERATION_DICT = {
+    "distance": (CS.perform_distance, LCS.perform_distance, DISTANCE),
+    "touches_endpoint": (CS.perform_touches_endpoint, LCS.perform_touches_endpoint, TOLERANCE),
+    "cascade_touches": (CS.perform_cascade_touches, LCS.perform_cascade_touches, TOLERANCE),
+    "most_intersects": (CS.perform_most_intersects, LCS.perform_most_intersects, TOLERANCE),
+}
+
+
+def create_layer(size, layer_name, rng):
+    """
+    概要:
+        ランダムな向きの線分を持つ合成のCADレイヤを作成する
+
+    引数:
+        size: 線分の件数
+        layer_name: FID列に格納するレイヤ名
+        rng: numpy.random.Generator
+
+    戻り値:
+        FID（(レイヤ名, Findex)のタプル）、geometryを列に持つGeoDataFrame
+    """
+
+    extent = np.sqrt(size * AREA_PER_SEGMENT)
+
+    start_array = rng.random((size, 2)) * extent
+    angle_array = rng.random(size) * 2.0 * np.pi
+    end_array = start_array + SEGMENT_LENGTH * np.column_stack([np.cos(angle_array), np.sin(angle_array)])
+
+    geometries = shapely.linestrings(np.stack([start_array, end_array], axis=1))
+
+    return gpd.GeoDataFrame({
+        "FID": [(layer_name, float(i)) for i in range(size)],
+        "geometry": geometries,
+    })
+
+
+def main():
+
+    parser = benchmark_utils.create_argument_parser(
+        "cad_spatialの空間演算（STRtree）のベンチマーク", DEFAULT_SIZE_LIST)
+    parser.add_argument("--operations", nargs="+", default=list(OPERATION_DICT), choices=list(OPERATION_DICT),
+                        help="計測する操作")
+    parser.add_argument("--legacy-max-size", type=int, default=DEFAULT_LEGACY_MAX_SIZE,
+                        help="置き換え前の処理を計測する最大件数（0の場合は計測しない）")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    for operation in args.operations:
+        new_function, legacy_function, value = OPERATION_DICT[operation]
+
+        print(f"[{operation}] 列: 件数, 置き換え後(秒), 置き換え前(秒), 速度比")
+        benchmark_utils.print_header("size", "strtree", "legacy", "speedup")
+
+        for size in args.sizes:
+            main_geo_df = create_layer(size, "main", rng)
+            sub_geo_df = create_layer(size, "sub", rng)
+
+            # ジオメトリを書き換える処理があるため、実行ごとに複製を渡す
+            new_time, _ = benchmark_utils.measure(
+                lambda: new_function(main_geo_df.copy(), sub_geo_df.copy(), value), args.repeat)
+
+            legacy_time = None
+            speedup = None
+
+            if size <= args.legacy_max_size:
+                legacy_time, _ = benchmark_utils.measure(
+                    lambda: legacy_function(main_geo_df.copy(), sub_geo_df.copy(), value), 1)
+                speedup = f"{legacy_time / new_time:.1f}x"
+
+            benchmark_utils.print_row(size, new_time, legacy_time, speedup)
+
+        print()
+
+
+if __name__ == "__main__":
+    main()
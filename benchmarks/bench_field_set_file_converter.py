@@ -0,0 +1,206 @@
+# MIT License
+#
+# Copyright (c) 2025 NTT InfraNet
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# FieldSetFileConverterのtable_to_field_set_file、field_set_file_to_tableのベンチマーク。
+# 輪郭検出の結果を模した合成テーブル（輪郭座標、面積、ラベル）を1k～1M行で変換し、
+# 1行あたりの実行時間がほぼ一定（件数に対して線形）であることを確認する。
+# 従来の処理（1値ごとにpd.concatする処理）は件数の2乗に比例するため、--legacy-max-size以下の件数のみ計測する。
+#
+# 実行例:
+#   python benchmarks/bench_field_set_file_converter.py
+#   python benchmarks/bench_field_set_file_converter.py --sizes 1000 10000 --legacy-max-size 10000
+# --------------------------------------------------------------------------------------------
+
+# Python標準ライブラリ
+import base64
+import pickle
+
+import benchmark_utils
+
+benchmark_utils.add_import_path()
+
+# 外部ライブラリ
+import numpy as np
+import pandas as pd
+
+from raster_to_vector.common.field_set_file_converter import FieldSetFileConverter
+
+# 既定の計測件数
+DEFAULT_SIZE_LIST = [1000, 10000, 100000, 1000000]
+
+# 従来の処理を計測する最大件数
+DEFAULT_LEGACY_MAX_SIZE = 5000
+
+# 合成テーブルのlayer
+LAYER_LIST = ["contour", "line"]
+
+
+def create_table(size, seed=0):
+    """
+    概要:
+        輪郭検出の結果を模した合成テーブルを作成する
+        行はlayerごとに分け、Findexはlayer内の連番とする
+
+    引数:
+        size: 行数
+        seed: 乱数シード
+
+    戻り値:
+        Findex、layer、contour、area、labelを列に持つDataFrame
+    """
+
+    rng = np.random.default_rng(seed)
+
+    layer_array = np.array(LAYER_LIST)[np.arange(size) * len(LAYER_LIST) // max(size, 1)]
+    findex_array = np.concatenate([np.arange(np.count_nonzero(layer_array == layer)) for layer in LAYER_LIST])
+
+    contour_array = rng.integers(0, 10000, size=(size, 4, 2), dtype=np.int32)
+    contour_list = [contour for contour in contour_array]
+
+    return pd.DataFrame({
+        "Findex": findex_array,
+        "layer": layer_array,
+        "contour": contour_list,
+        "area": rng.random(size) * 1000.0,
+        "label": [f"label_{i % 100}" for i in range(size)],
+    })
+
+
+def legacy_table_to_field_set_file(converter, df):
+    """
+    概要:
+        従来のtable_to_field_set_file（layer、列ごとにiterrowsで値を取り出す処理）
+
+    引数:
+        converter: FieldSetFileConverter
+        df: 変換するDataFrame
+
+    戻り値:
+        FieldSetFileのDataFrame
+    """
+
+    dwh_list = []
+    type_list = []
+    value_list = []
+
+    for layer in df['layer'].unique():
+        df_filtered = df[df['layer'] == layer]
+        for column in df_filtered.columns:
+            if column in ('Findex', 'layer'):
+                continue
+
+            column_data = [(row['Findex'], row[column]) for _, row in df_filtered.iterrows()]
+            encoded_column_data = base64.b64encode(pickle.dumps(column_data)).decode('utf-8')
+
+            dwh_list.append(f"{layer}/{column}")
+            type_list.append(converter.type_dict.get(column, type(df.loc[0, column]).__name__))
+            value_list.append(encoded_column_data)
+
+    return pd.DataFrame({"Dwh": dwh_list, "Type": type_list, "Value": value_list})
+
+
+def legacy_field_set_file_to_table(converter, df_field_set_file):
+    """
+    概要:
+        従来のfield_set_file_to_table（(Findex, 値)ごとにpd.concatする処理）
+
+    引数:
+        converter: FieldSetFileConverter
+        df_field_set_file: FieldSetFileのDataFrame
+
+    戻り値:
+        復元したDataFrame
+    """
+
+    new_columns = list(dict.fromkeys(dwh.split('/')[-1] for dwh in df_field_set_file['Dwh']))
+    new_columns.append('layer')
+    new_columns.append('Findex')
+    df_restored = pd.DataFrame(columns=new_columns)
+
+    layer_list = df_field_set_file['Dwh'].apply(lambda x: x.split('/')[0]).unique()
+
+    for layer in layer_list:
+        df_filtered = df_field_set_file[df_field_set_file['Dwh'].str.contains(layer)]
+        row_count = len(df_restored)
+
+        for _, row in df_filtered.iterrows():
+            column_name = row['Dwh'].split('/')[-1]
+            converter.type_dict[column_name] = row['Type']
+            column_data = pickle.loads(base64.b64decode(row['Value']))
+
+            for findex, value in column_data:
+                if len(df_restored) < len(column_data) + row_count:
+                    df_restored = pd.concat(
+                        [df_restored, pd.DataFrame([{column_name: value, 'layer': layer, "Findex": findex}])],
+                        ignore_index=True)
+                else:
+                    df_restored.at[findex + row_count, column_name] = value
+
+    return df_restored
+
+
+def main():
+
+    parser = benchmark_utils.create_argument_parser(
+        "FieldSetFileConverterのテーブル変換のベンチマーク", DEFAULT_SIZE_LIST)
+    parser.add_argument("--legacy-max-size", type=int, default=DEFAULT_LEGACY_MAX_SIZE,
+                        help="従来の処理を計測する最大件数（0の場合は計測しない）")
+    args = parser.parse_args()
+
+    print("列: 件数, table_to_field_set_file(秒), field_set_file_to_table(秒), 1行あたり(μs), "
+          "従来のtable_to_field_set_file(秒), 従来のfield_set_file_to_table(秒)")
+    benchmark_utils.print_header("rows", "to_fsf", "to_table", "us/row", "legacy_to_fsf", "legacy_to_table")
+
+    for size in args.sizes:
+        df = create_table(size, args.seed)
+        converter = FieldSetFileConverter()
+
+        to_fsf_time, df_field_set_file = benchmark_utils.measure(
+            lambda: converter.table_to_field_set_file(df), args.repeat)
+        to_table_time, df_restored = benchmark_utils.measure(
+            lambda: converter.field_set_file_to_table(df_field_set_file), args.repeat)
+
+        # 往復で行数が変わらないことを確認する
+        assert len(df_restored) == size
+
+        legacy_to_fsf_time = None
+        legacy_to_table_time = None
+
+        if size <= args.legacy_max_size:
+            legacy_converter = FieldSetFileConverter()
+            legacy_to_fsf_time, legacy_df_field_set_file = benchmark_utils.measure(
+                lambda: legacy_table_to_field_set_file(legacy_converter, df), args.repeat)
+            legacy_to_table_time, _ = benchmark_utils.measure(
+                lambda: legacy_field_set_file_to_table(legacy_converter, legacy_df_field_set_file), 1)
+
+        benchmark_utils.print_row(size,
+                                  to_fsf_time,
+                                  to_table_time,
+                                  (to_fsf_time + to_table_time) / size * 1e6,
+                                  legacy_to_fsf_time,
+                                  legacy_to_table_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# MIT License
+#
+# Copyright (c) 2025 NTT InfraNet
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# GenerateSpatialIDのgenerate_spatial_index（ボクセルキーでの重複排除と空間IDの行の書き出し）のベンチマーク。
+# ズームレベル26で、長い管路の断面内の点群を模した(x, y, f)インデックスを管路の本数分作成し、
+# 置き換え後の処理と、範囲ごとに文字列を作成してsetで重複を除く置き換え前の処理の実行時間を比較する。
+# 置き換え前の処理を計測した件数では、出力される空間IDの行が一致することも確認する。
+#
+# GenerateSpatialIDはnifiapi.properties、nifiapi.flowfiletransformを読み込むため、
+# NiFiのPythonフレームワーク（nifiapi）を読み込める環境で実行する。
+#
+# 実行例:
+#   python benchmarks/bench_generate_spatial_id.py
+#   python benchmarks/bench_generate_spatial_id.py --sizes 500 --points-per-pipe 20000
+# --------------------------------------------------------------------------------------------
+
+# Python標準ライブラリ
+import os
+
+import benchmark_utils
+
+benchmark_utils.add_import_path(os.path.join(benchmark_utils.EXTENSIONS_DIRECTORY, "GenerateSpatialID"))
+
+# 外部ライブラリ
+import numpy as np
+import pandas as pd
+
+from GenerateSpatialID import GenerateSpatialID
+
+# 既定の計測件数（管路の本数）
+DEFAULT_SIZE_LIST = [50, 200, 500]
+
+# 置き換え前の処理を計測する最大件数
+DEFAULT_LEGACY_MAX_SIZE = 500
+
+# 管路1本あたりの点の数（既定値）
+DEFAULT_POINTS_PER_PIPE = 20000
+
+# 空間IDのズームレベル
+ZOOM_LEVEL = 26
+
+# 管路の中心線上の点の間隔と、断面の幅、高さ（ボクセル単位）
+# 点の間隔をボクセルより細かくし、同じボクセルに複数の点が入るようにする
+POINT_INTERVAL = 0.25
+SECTION_WIDTH = 4.0
+SECTION_HEIGHT = 4.0
+
+# 管路ごとに分けるFindexの数（1つのFIDに複数の範囲がある状態とする）
+FINDEX_PER_PIPE = 2
+
+# FID列のDwh名、開始日、終了日の属性名
+FID_COLUMN_NAME = "FID"
+START_DAY_COLUMN_NAME = "start_day"
+END_DAY_COLUMN_NAME = "end_day"
+
+
+def create_pipe_network(pipe_count, points_per_pipe, rng):
+    """
+    概要:
+        管路の断面内の点群を模した(x, y, f)インデックスを作成する
+        管路ごとにランダムな始点と向きを持ち、中心線に沿って断面内にランダムな点を配置する
+
+    引数:
+        pipe_count: 管路の本数
+        points_per_pipe: 管路1本あたりの点の数
+        rng: numpy.random.Generator
+
+    戻り値:
+        x_index_array, y_index_array, f_index_array: インデックスの配列
+        all_points: [findex, x, y, z]の点群（findex列のみ使用する）
+        df: FID列を持つFieldSetFileのDataFrame
+    """
+
+    # ズームレベル26の東京付近のインデックスを始点とする
+    base_x = 2 ** (ZOOM_LEVEL - 1) + 2 ** 23
+    base_y = 2 ** (ZOOM_LEVEL - 2) + 2 ** 23
+
+    origin_array = rng.integers(0, 200000, size=(pipe_count, 2)) + np.array([base_x, base_y])
+    angle_array = rng.random(pipe_count) * 2.0 * np.pi
+    depth_array = rng.integers(-10, 0, size=pipe_count)
+
+    pipe_array = np.repeat(np.arange(pipe_count), points_per_pipe)
+    position_array = np.tile(np.arange(points_per_pipe) * POINT_INTERVAL, pipe_count)
+    width_offset_array = (rng.random(len(pipe_array)) - 0.5) * SECTION_WIDTH
+    height_offset_array = rng.random(len(pipe_array)) * SECTION_HEIGHT
+
+    cos_array = np.cos(angle_array)[pipe_array]
+    sin_array = np.sin(angle_array)[pipe_array]
+
+    x_index_array = np.floor(origin_array[pipe_array, 0]
+                             + position_array * cos_array - width_offset_array * sin_array).astype(np.int64)
+    y_index_array = np.floor(origin_array[pipe_array, 1]
+                             + position_array * sin_array + width_offset_array * cos_array).astype(np.int64)
+    f_index_array = (depth_array[pipe_array] + np.floor(height_offset_array)).astype(np.int64)
+
+    # 管路の前半、後半で別のFindexとし、同じFIDに紐づける
+    findex_array = pipe_array * FINDEX_PER_PIPE \
+        + np.tile(np.arange(points_per_pipe) * FINDEX_PER_PIPE // points_per_pipe, pipe_count)
+
+    all_points = np.column_stack([findex_array, x_index_array, y_index_array, f_index_array]).astype(np.float64)
+
+    fid_value = [(f"pipe_{findex // FINDEX_PER_PIPE}", float(findex))
+                 for findex in range(pipe_count * FINDEX_PER_PIPE)]
+    df = pd.DataFrame({"Dwh": [FID_COLUMN_NAME], "Type": ["object"], "Value": [fid_value]})
+
+    return x_index_array, y_index_array, f_index_array, all_points, df
+
+
+def create_processor():
+    """
+    概要:
+        generate_spatial_indexで参照するパラメータを設定したGenerateSpatialIDを作成する
+
+    戻り値:
+        GenerateSpatialID
+    """
+
+    processor = GenerateSpatialID()
+    processor.all_params = {processor.zoom_level: ZOOM_LEVEL,
+                            processor.feature_id_column_name: FID_COLUMN_NAME}
+    processor.start_day_col = START_DAY_COLUMN_NAME
+    processor.end_day_col = END_DAY_COLUMN_NAME
+
+    return processor
+
+
+def legacy_generate_spatial_strings(processor, zoom_level, x_index_list, y_index_list, f_index_list, fid, df):
+    """
+    概要:
+        置き換え前のgenerate_spatial_strings（範囲ごとにnp.unique(axis=0)し、object型の文字列を連結する処理）
+    """
+
+    unique_combinations = np.unique(np.stack((x_index_list, y_index_list, f_index_list), axis=1), axis=0)
+    list_len = len(unique_combinations)
+
+    z_str_array = np.full(list_len, str(zoom_level), dtype=np.object_)
+    f_str_array = unique_combinations[:, 2].astype(str)
+    x_str_array = unique_combinations[:, 0].astype(str)
+    y_str_array = unique_combinations[:, 1].astype(str)
+
+    start_date_array = (
+        df[df["Dwh"].str.contains(processor.start_day_col, na=False)]['Value']
+        .fillna(processor.default_start_date).astype(str).to_numpy()
+        if processor.start_day_col in df["Dwh"].values
+        else np.full(list_len, processor.default_start_date, dtype=np.object_))
+    end_date_array = (
+        df[df["Dwh"].str.contains(processor.end_day_col, na=False)]['Value']
+        .fillna(processor.default_end_date).astype(str).to_numpy()
+        if processor.end_day_col in df["Dwh"].values
+        else np.full(list_len, processor.default_end_date, dtype=np.object_))
+
+    spatial_ids = z_str_array + "/" + f_str_array + "/" + x_str_array + "/" + y_str_array
+    fid_str_array = [np.array(fid) for _ in range(len(x_str_array))]
+
+    results = ('"' + spatial_ids + '","' + fid_str_array + '","' +
+               start_date_array + '","' + end_date_array + '"')
+
+    return results.tolist()
+
+
+def legacy_generate_spatial_index(processor, x_index_list, y_index_list, f_index_list, all_points, df):
+    """
+    概要:
+        置き換え前のgenerate_spatial_index（範囲ごとに文字列を作成し、FIDごとにsetで重複を除く処理）
+    """
+
+    _, start_positions = np.unique(all_points[:, 0], return_index=True)
+    fid_list = processor.get_fid_list(df)
+
+    fid_to_positions = {}
+    for i, start in enumerate(start_positions):
+        end = start_positions[i + 1] if i + 1 < len(start_positions) else len(x_index_list)
+        fid_to_positions.setdefault(fid_list[i], []).append((start, end))
+
+    all_index = []
+    for fid, ranges in fid_to_positions.items():
+        fid_results = []
+        for start, end in ranges:
+            fid_results.extend(legacy_generate_spatial_strings(processor,
+                                                               processor.all_params[processor.zoom_level],
+                                                               x_index_list[start:end],
+                                                               y_index_list[start:end],
+                                                               f_index_list[start:end],
+                                                               fid,
+                                                               df))
+        all_index.append(list(set(fid_results)))
+
+    return all_index
+
+
+def main():
+
+    parser = benchmark_utils.create_argument_parser(
+        "GenerateSpatialIDの空間IDの重複排除と書き出しのベンチマーク", DEFAULT_SIZE_LIST)
+    parser.add_argument("--points-per-pipe", type=int, default=DEFAULT_POINTS_PER_PIPE,
+                        help="管路1本あたりの点の数")
+    parser.add_argument("--legacy-max-size", type=int, default=DEFAULT_LEGACY_MAX_SIZE,
+                        help="置き換え前の処理を計測する最大件数（0の場合は計測しない）")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    processor = create_processor()
+
+    # numbaのコンパイル時間を計測に含めないよう、少量のデータで1度実行する
+    processor.generate_spatial_index(*create_pipe_network(1, 10, rng))
+
+    print("列: 管路の本数, 点の数, 空間IDの行数, 置き換え後(秒), 置き換え前(秒), 速度比")
+    benchmark_utils.print_header("pipes", "points", "voxels", "packed", "legacy", "speedup")
+
+    for size in args.sizes:
+        x_index_array, y_index_array, f_index_array, all_points, df = create_pipe_network(
+            size, args.points_per_pipe, rng)
+
+        new_time, all_index = benchmark_utils.measure(
+            lambda: processor.generate_spatial_index(x_index_array, y_index_array, f_index_array, all_points, df),
+            args.repeat)
+
+        line_list = [line for fid_lines in all_index for line in fid_lines.split("\n")]
+
+        legacy_time = None
+        speedup = None
+
+        if size <= args.legacy_max_size:
+            legacy_time, legacy_all_index = benchmark_utils.measure(
+                lambda: legacy_generate_spatial_index(processor, x_index_array, y_index_array, f_index_array,
+                                                      all_points, df),
+                1)
+            speedup = f"{legacy_time / new_time:.1f}x"
+
+            # FIDごとの行の並び順は異なるため、集合として比較する
+            legacy_line_list = [line for fid_lines in legacy_all_index for line in fid_lines]
+            assert sorted(line_list) == sorted(legacy_line_list), "置き換え前後で空間IDの行が一致しません"
+
+        benchmark_utils.print_row(size, len(all_points), len(line_list), new_time, legacy_time, speedup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# MIT License
+#
+# Copyright (c) 2025 NTT InfraNet
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# GeoDataFrame、座標配列（[ID, x, y, z]）、GeoNdarray、座標の辞書とshapelyのジオメトリの一括変換のベンチマーク。
+# 合成の地物（既定はZ値ありのLineString）を最大1M件作成し、shapely 2の一括変換と、
+# 1地物ずつ変換する従来の処理の実行時間を比較する。
+# 従来のGeoNdarrayの変換はIDごとに配列全体を走査するため、従来の処理は--legacy-max-size以下の件数のみ計測する。
+#
+# 実行例:
+#   python benchmarks/bench_geometry_coordinates_conversion.py
+#   python benchmarks/bench_geometry_coordinates_conversion.py --geometry-type Polygon --no-z --sizes 1000000
+# --------------------------------------------------------------------------------------------
+
+import benchmark_utils
+
+benchmark_utils.add_import_path()
+
+# 外部ライブラリ
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import LineString, Point, Polygon
+
+import cad.common.cad_utils as CU
+import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+
+# 既定の計測件数（地物数）
+DEFAULT_SIZE_LIST = [1000, 10000, 100000, 1000000]
+
+# 従来の処理を計測する最大件数
+DEFAULT_LEGACY_MAX_SIZE = 10000
+
+# 1地物あたりの構成点の数（ポリゴンは始点を末尾に追加して閉じる）
+DEFAULT_VERTEX_COUNT = 5
+
+GEOMETRY_TYPE_LIST = ["Point", "LineString", "Polygon"]
+
+
+def create_coordinates_array(size, geometry_type, vertex_count, include_z, rng):
+    """
+    概要:
+        合成の地物の座標配列（[ID, x, y]または[ID, x, y, z]）を作成する
+        ポリゴンは原点周りの角度順に並べた構成点で、自己交差しない閉じた外周とする
+
+    引数:
+        size: 地物数
+        geometry_type: ジオメトリタイプ
+        vertex_count: 1地物あたりの構成点の数
+        include_z: Z値を含めるかどうか
+        rng: numpy.random.Generator
+
+    戻り値:
+        coordinates_array: ID付きの座標配列
+    """
+
+    if geometry_type == "Point":
+        vertex_count = 1
+
+    origin_array = rng.random((size, 1, 2)) * 100000.0
+
+    if geometry_type == "Polygon":
+        angle_array = np.sort(rng.random((size, vertex_count)) * 2.0 * np.pi, axis=1)
+        radius_array = 5.0 + rng.random((size, vertex_count)) * 5.0
+        xy_array = origin_array + np.stack([radius_array * np.cos(angle_array),
+                                            radius_array * np.sin(angle_array)], axis=2)
+        xy_array = np.concatenate([xy_array, xy_array[:, :1]], axis=1)
+    else:
+        xy_array = origin_array + np.cumsum(rng.random((size, vertex_count, 2)) * 10.0, axis=1)
+
+    point_count = xy_array.shape[1]
+    column_list = [np.repeat(np.arange(size, dtype=np.float64), point_count), xy_array.reshape(-1, 2)]
+
+    if include_z:
+        column_list.append(rng.random(size * point_count) * 10.0)
+
+    return np.column_stack(column_list)
+
+
+def legacy_get_coordinates_array_from_geodataframe(geodataframe):
+    """
+    概要:
+        従来のget_coordinates_array_from_geodataframe（1地物ずつget_geometry_arrayで変換して連結する処理）
+    """
+
+    geometry_column_dict = geodataframe[geodataframe.geometry.name].to_dict()
+    index_array = geodataframe.index.to_numpy()
+
+    result_array = np.concatenate(list(map(NSP.get_geometry_array, geometry_column_dict.values(), index_array)))
+    geometry_type_list = list(map(NSP.get_geometry_type, geometry_column_dict.values()))
+
+    return result_array, geometry_type_list, index_array
+
+
+def legacy_get_shapely_dict_from_coordinates_array(coordinates_array, geometry_type_list):
+    """
+    概要:
+        従来のget_shapely_dict_from_coordinates_array（1地物ずつshapelyのオブジェクトを作成する処理）
+    """
+
+    si, ei = NSP.get_start_index_and_end_index(coordinates_array)
+
+    shapely_dict = {}
+    for i in range(len(geometry_type_list)):
+        if geometry_type_list[i] == 'Point':
+            shapely_dict[coordinates_array[si[i], 0]] = Point(coordinates_array[si[i], 1:])
+        elif geometry_type_list[i] == 'LineString':
+            shapely_dict[coordinates_array[si[i], 0]] = LineString(coordinates_array[si[i]:ei[i] + 1, 1:])
+        else:
+            shapely_dict[coordinates_array[si[i], 0]] = Polygon(coordinates_array[si[i]:ei[i] + 1, 1:])
+
+    return shapely_dict
+
+
+def legacy_geo_ndarray_to_geodataframe(geo_ndarray):
+    """
+    概要:
+        従来のgeo_ndarray_to_geodataframe（IDごとの辞書を作成し、1地物ずつshapelyのオブジェクトを作成する処理）
+    """
+
+    geometries = []
+    for _id, shape in CU.geo_ndarray_to_ndarray_dict(geo_ndarray).items():
+        if len(shape) == 1:
+            geometries.append(Point(shape[0]))
+        elif len(shape) > 2 and np.array_equal(shape[0], shape[-1]):
+            geometries.append(Polygon(shape))
+        else:
+            geometries.append(LineString(shape))
+
+    return gpd.GeoDataFrame(geometry=geometries)
+
+
+def legacy_convert_dict_to_geometries(geometries_dictionary, geometry_type):
+    """
+    概要:
+        従来のconvert_dict_to_*_geometries（1地物ずつコンストラクタに渡す処理）
+    """
+
+    geometry_class = {'Point': Point, 'LineString': LineString}.get(geometry_type, Polygon)
+
+    return [[key, geometry_class(value)] for key, value in geometries_dictionary.items()]
+
+
+def main():
+
+    parser = benchmark_utils.create_argument_parser(
+        "ジオメトリと座標配列の一括変換のベンチマーク", DEFAULT_SIZE_LIST)
+    parser.add_argument("--geometry-type", default="LineString", choices=GEOMETRY_TYPE_LIST,
+                        help="地物のジオメトリタイプ")
+    parser.add_argument("--vertices", type=int, default=DEFAULT_VERTEX_COUNT,
+                        help="1地物あたりの構成点の数")
+    parser.add_argument("--no-z", action="store_true",
+                        help="Z値を含めない")
+    parser.add_argument("--legacy-max-size", type=int, default=DEFAULT_LEGACY_MAX_SIZE,
+                        help="従来の処理を計測する最大件数（0の場合は計測しない）")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    # 変換名と、(一括変換, 従来の処理)を作成する関数
+    def create_operation_dict(coordinates_array, geometry_type_list, geodataframe, geometries_dictionary):
+        return {
+            "geodataframe_to_coordinates": (
+                lambda: NSP.get_coordinates_array_from_geodataframe(geodataframe),
+                lambda: legacy_get_coordinates_array_from_geodataframe(geodataframe)),
+            "coordinates_to_shapely_dict": (
+                lambda: NSP.get_shapely_dict_from_coordinates_array(coordinates_array, geometry_type_list),
+                lambda: legacy_get_shapely_dict_from_coordinates_array(coordinates_array, geometry_type_list)),
+            "geo_ndarray_to_geodataframe": (
+                lambda: CU.geo_ndarray_to_geodataframe(coordinates_array),
+                lambda: legacy_geo_ndarray_to_geodataframe(coordinates_array)),
+            "dict_to_geometries": (
+                lambda: NSP.convert_dict_to_geometries(geometries_dictionary, args.geometry_type),
+                lambda: legacy_convert_dict_to_geometries(geometries_dictionary, args.geometry_type)),
+        }
+
+    print(f"ジオメトリタイプ: {args.geometry_type} 構成点数: {args.vertices} Z値: {'なし' if args.no_z else 'あり'}")
+
+    result_dict = {}
+
+    for size in args.sizes:
+        coordinates_array = create_coordinates_array(size, args.geometry_type, args.vertices, not args.no_z, rng)
+        geometry_type_list = [args.geometry_type] * size
+
+        _, geometry_array = NSP.create_geometries_from_coordinates_array(coordinates_array, args.geometry_type)
+        geodataframe = gpd.GeoDataFrame(geometry=geometry_array)
+
+        _, id_array_dict = NSP.create_id_array_dict(coordinates_array, column_slice=slice(1, None))
+        if args.geometry_type == "Point":
+            id_array_dict = {key: value[0] for key, value in id_array_dict.items()}
+
+        operation_dict = create_operation_dict(coordinates_array, geometry_type_list, geodataframe, id_array_dict)
+
+        for operation, (new_function, legacy_function) in operation_dict.items():
+            new_time, new_result = benchmark_utils.measure(new_function, args.repeat)
+
+            legacy_time = None
+            speedup = None
+
+            if size <= args.legacy_max_size:
+                legacy_time, legacy_result = benchmark_utils.measure(legacy_function, 1)
+                speedup = f"{legacy_time / new_time:.1f}x"
+
+                if operation == "geodataframe_to_coordinates":
+                    # 座標配列は従来の処理と完全に一致する
+                    np.testing.assert_array_equal(new_result[0], legacy_result[0])
+
+            result_dict.setdefault(operation, []).append((size, new_time, legacy_time, speedup))
+
+    for operation, row_list in result_dict.items():
+        print(f"[{operation}] 列: 地物数, 一括変換(秒), 従来の処理(秒), 速度比")
+        benchmark_utils.print_header("features", "bulk", "legacy", "speedup")
+
+        for row in row_list:
+            benchmark_utils.print_row(*row)
+
+        print()
+
+
+if __name__ == "__main__":
+    main()
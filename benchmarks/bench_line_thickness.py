@@ -0,0 +1,159 @@
+# MIT License
+#
+# Copyright (c) 2025 NTT InfraNet
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# raster_to_vector.common.image_utilsの線の太さ計測のマイクロベンチマーク。
+# 太さの異なる線分を描画した合成の図面画像を作成し、全線分をまとめて計測する
+# measure_line_thickness_batchと、線分ごとに計測するmeasure_line_thickness_parallel_refinedの
+# 実行時間を比較する。線分ごとの計測を行った件数では、太さが一致することも確認する。
+#
+# 実行例:
+#   python benchmarks/bench_line_thickness.py
+#   python benchmarks/bench_line_thickness.py --sizes 20000 --legacy-max-size 0
+# --------------------------------------------------------------------------------------------
+
+import benchmark_utils
+
+benchmark_utils.add_import_path()
+
+# 外部ライブラリ
+import cv2
+import numpy as np
+
+import raster_to_vector.common.image_utils as IU
+
+# 既定の計測件数（線分の数）
+DEFAULT_SIZE_LIST = [1000, 5000, 20000]
+
+# 線分ごとの計測を行う最大件数
+DEFAULT_LEGACY_MAX_SIZE = 2000
+
+# 合成の図面画像の大きさ（高さ, 幅）
+DEFAULT_IMAGE_SHAPE = (4200, 3000)
+
+# 描画する線分の長さ、太さの範囲（ピクセル）
+SEGMENT_LENGTH_RANGE = (20, 400)
+SEGMENT_THICKNESS_RANGE = (1, 6)
+
+# 太さ計測の閾値、オフセットの最大値（calc_line_thicknessと同じ値）
+THRESHOLD = 200
+MAX_OFFSET = 6
+
+
+def create_drawing(line_count, image_shape, rng):
+    """
+    概要:
+        白地に黒の線分を描画した合成の図面画像と、検出結果を模した線分のリストを作成する
+        線分のリストはHoughLinesPの出力と同じint32とし、描画した線分から1ピクセル以内でずらす
+        一部の線分は画像外にはみ出し、長さ0の線分も1件含める
+
+    引数:
+        line_count: 線分の数
+        image_shape: 画像の(高さ, 幅)
+        rng: numpy.random.Generator
+
+    戻り値:
+        img_gray: グレースケール画像
+        line_list: [(x1, y1), (x2, y2)]形式の線分のリスト
+    """
+
+    height, width = image_shape
+    img_gray = np.full(image_shape, 255, dtype=np.uint8)
+
+    start_array = rng.integers(0, [width, height], size=(line_count, 2))
+    angle_array = rng.random(line_count) * 2.0 * np.pi
+    length_array = rng.integers(*SEGMENT_LENGTH_RANGE, size=line_count)
+    thickness_array = rng.integers(*SEGMENT_THICKNESS_RANGE, size=line_count)
+
+    end_array = (start_array + length_array[:, None]
+                 * np.column_stack([np.cos(angle_array), np.sin(angle_array)])).astype(np.int64)
+
+    for start, end, thickness in zip(start_array.tolist(), end_array.tolist(), thickness_array.tolist()):
+        cv2.line(img_gray, tuple(start), tuple(end), 0, int(thickness))
+
+    jitter_array = rng.integers(-1, 2, size=(line_count, 4))
+    segment_array = (np.column_stack([start_array, end_array]) + jitter_array).astype(np.int32)
+
+    line_list = [((x1, y1), (x2, y2)) for x1, y1, x2, y2 in segment_array]
+
+    if line_list:
+        (x1, y1), _ = line_list[0]
+        line_list[0] = ((x1, y1), (x1, y1))
+
+    return img_gray, line_list
+
+
+def measure_per_line(line_list, img_gray):
+    """
+    概要:
+        置き換え前のcalc_line_thicknessと同じく、線分ごとに太さを計測する
+
+    引数:
+        line_list: [(x1, y1), (x2, y2)]形式の線分のリスト
+        img_gray: グレースケール画像
+
+    戻り値:
+        線分ごとの太さのリスト
+    """
+
+    return [IU.measure_line_thickness_parallel_refined((x1, y1, x2, y2), img_gray,
+                                                       threshold=THRESHOLD, max_offset=MAX_OFFSET)
+            for (x1, y1), (x2, y2) in line_list]
+
+
+def main():
+
+    parser = benchmark_utils.create_argument_parser(
+        "線の太さ計測（一括計測と線分ごとの計測）のベンチマーク", DEFAULT_SIZE_LIST)
+    parser.add_argument("--image-shape", type=int, nargs=2, default=list(DEFAULT_IMAGE_SHAPE),
+                        metavar=("HEIGHT", "WIDTH"), help="合成の図面画像の高さ、幅")
+    parser.add_argument("--legacy-max-size", type=int, default=DEFAULT_LEGACY_MAX_SIZE,
+                        help="線分ごとの計測を行う最大件数（0の場合は計測しない）")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    print("列: 線分の数, 一括計測(秒), 線分ごとの計測(秒), 速度比")
+    benchmark_utils.print_header("lines", "batch", "per_line", "speedup")
+
+    for size in args.sizes:
+        img_gray, line_list = create_drawing(size, tuple(args.image_shape), rng)
+
+        batch_time, thickness_list = benchmark_utils.measure(
+            lambda: IU.calc_line_thickness(line_list, img_gray, threshold=THRESHOLD), args.repeat)
+
+        per_line_time = None
+        speedup = None
+
+        if size <= args.legacy_max_size:
+            per_line_time, per_line_thickness_list = benchmark_utils.measure(
+                lambda: measure_per_line(line_list, img_gray), 1)
+            speedup = f"{per_line_time / batch_time:.1f}x"
+
+            assert thickness_list == per_line_thickness_list, "一括計測と線分ごとの計測で太さが一致しません"
+
+        benchmark_utils.print_row(size, batch_time, per_line_time, speedup)
+
+
+if __name__ == "__main__":
+    main()
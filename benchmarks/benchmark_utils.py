@@ -0,0 +1,136 @@
+# MIT License
+#
+# Copyright (c) 2025 NTT InfraNet
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# ベンチマークスクリプトで共通して使用する処理。
+# apiディレクトリをインポートパスに追加し、NiFiと同じ「cad.～」「nifiapi.～」の形式で読み込めるようにする。
+# --------------------------------------------------------------------------------------------
+
+# Python標準ライブラリ
+import argparse
+import os
+import sys
+import time
+
+# リポジトリ直下のapiディレクトリ、extensionsディレクトリ
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIRECTORY = os.path.join(REPOSITORY_DIRECTORY, "api")
+EXTENSIONS_DIRECTORY = os.path.join(REPOSITORY_DIRECTORY, "extensions")
+
+
+def add_import_path(*directory_list):
+    """
+    概要:
+        apiディレクトリと指定したディレクトリをインポートパスの先頭に追加する
+
+    引数:
+        directory_list: 追加するディレクトリ（extensions配下のプロセッサのディレクトリなど）
+    """
+
+    for directory in (API_DIRECTORY,) + directory_list:
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+
+
+def create_argument_parser(description, default_size_list):
+    """
+    概要:
+        件数と繰り返し回数を指定するコマンドライン引数の解析器を作成する
+
+    引数:
+        description: ベンチマークの説明
+        default_size_list: 既定の件数のリスト
+
+    戻り値:
+        argparse.ArgumentParser
+    """
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sizes", type=int, nargs="+", default=default_size_list,
+                        help="計測する件数（スペース区切り）")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="件数ごとの繰り返し回数（最短の時間を採用する）")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="合成データの乱数シード")
+
+    return parser
+
+
+def measure(function, repeat=3):
+    """
+    概要:
+        関数をrepeat回実行し、最短の実行時間と最後の戻り値を返す
+
+    引数:
+        function: 引数なしで呼び出す関数
+        repeat: 繰り返し回数
+
+    戻り値:
+        (最短の実行時間（秒）, 戻り値)
+    """
+
+    best_time = float("inf")
+    result = None
+
+    for _ in range(max(repeat, 1)):
+        start_time = time.perf_counter()
+        result = function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    return best_time, result
+
+
+def print_header(*column_list):
+    """
+    概要:
+        計測結果の見出し行を出力する
+
+    引数:
+        column_list: 列名
+    """
+
+    print(" ".join(f"{column:>14}" for column in column_list))
+
+
+def print_row(size, *value_list):
+    """
+    概要:
+        計測結果を1行出力する
+        実行時間は秒、Noneは未計測として「-」を出力する
+
+    引数:
+        size: 件数
+        value_list: 実行時間などの値
+    """
+
+    text_list = [f"{size:>14,}"]
+
+    for value in value_list:
+        if value is None:
+            text_list.append(f"{'-':>14}")
+        elif isinstance(value, float):
+            text_list.append(f"{value:>14.4f}")
+        else:
+            text_list.append(f"{value:>14}")
+
+    print(" ".join(text_list))
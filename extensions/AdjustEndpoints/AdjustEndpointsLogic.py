@@ -23,7 +23,6 @@
 # Python標準ライブラリ
 from io import StringIO
 import uuid
-from collections import Counter
 from importlib import import_module
 
 # 外部ライブラリの動的インポート
@@ -33,14 +32,11 @@ gpd = import_module("geopandas")
 LineString = getattr(import_module("shapely.geometry"), "LineString")
 Point = getattr(import_module("shapely.geometry"), "Point")
 unary_union = getattr(import_module("shapely.ops"), "unary_union")
-csr_matrix = getattr(import_module("scipy.sparse"), "csr_matrix")
-connected_components = getattr(
-    import_module("scipy.sparse.csgraph"), "connected_components"
-)
 KDTree = getattr(import_module("scipy.spatial"), "KDTree")
 
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 import cad.common.cad_utils as CU
+import cad.common.cad_topology as CT
 
 
 class AdjustEndpointsLogic:
@@ -78,27 +74,25 @@ class AdjustEndpointsLogic:
             if target_geometries.empty:
                 raise ValueError(f"ERROR: {target_layer} doesn't exist.")
 
-            # 他のリンクの端点を集めてリストを作成
-            all_endpoints = []
+            # 他のリンクの端点を集めて、端点を共有するネットワークを作成
+            start_points = []
+            end_points = []
             for row in target_geometries.itertuples():
                 geom = row.geometry
                 start_point, end_point = self.get_endpoints(geom)
-                all_endpoints.append((start_point.x, start_point.y))
-                all_endpoints.append((end_point.x, end_point.y))
+                start_points.append((start_point.x, start_point.y))
+                end_points.append((end_point.x, end_point.y))
 
-            # 座標の出現回数をカウント
-            endpoint_counts = Counter(all_endpoints)
+            network = CT.LineNetwork.from_endpoints(start_points, end_points)
 
-            # 重複しない端点を抽出（出現回数が1回の端点のみを選択）
-            unique_endpoints = [
-                point for point, count in endpoint_counts.items() if count == 1
-            ]
+            # 重複しない端点を抽出（次数が1の端点のみを選択）
+            is_unique_endpoint = network.endpoint_degree() == 1
 
             # これで重複しない端点だけを対象に処理を行う
             extended_lines = []
 
             # 各LineStringの端点を取得し、延長線を作成
-            for row in target_geometries.itertuples(index=True):
+            for position, row in enumerate(target_geometries.itertuples(index=True)):
                 geom = row.geometry
                 fid = row.FID
 
@@ -106,9 +100,12 @@ class AdjustEndpointsLogic:
                 start_point, end_point = self.get_endpoints(geom)
 
                 # 他のリンクの端点と接続していない場合にのみ延長
-                for is_start, endpoint in [(True, start_point), (False, end_point)]:
+                for is_start, endpoint, is_unique in [
+                    (True, start_point, is_unique_endpoint[position, 0]),
+                    (False, end_point, is_unique_endpoint[position, 1]),
+                ]:
                     # 重複しない端点のみ延長処理を行う
-                    if (endpoint.x, endpoint.y) not in unique_endpoints:
+                    if not is_unique:
                         continue  # 重複する端点なので延長しない
 
                     # 延長処理
@@ -397,8 +394,12 @@ class AdjustEndpointsLogic:
                     point_data.append(item)  # 端点情報を保持
 
             # KDTreeの作成
+            points = np.array(points, dtype=np.float64).reshape(-1, 2)
             kdtree = KDTree(points)
 
+            # 各端点から閾値以内の端点を一括で取得
+            neighbor_lists = kdtree.query_ball_point(points, r=distance_threshold)
+
             created_pairs = set()
             for _, row in filtered_geometries.iterrows():
                 if row["geometry"].geom_type == "LineString":
@@ -417,17 +418,17 @@ class AdjustEndpointsLogic:
             # 各端点ごとに近接点を全て取得して接続
             for i, point_data_item in enumerate(point_data):
                 current_point = point_data_item[2]
-                distances, indices = kdtree.query(
-                    (current_point.x, current_point.y), k=len(point_data)
-                )
 
-                # 自分自身を除外した他の端点との接続を確認
-                for j, dist in enumerate(distances[1:]):
-                    if dist > distance_threshold:
-                        break
+                # 自分自身を除外し、距離が近い順に並べる
+                indices = np.array(neighbor_lists[i], dtype=np.int64)
+                indices = indices[indices != i]
+                distances = np.linalg.norm(points[indices] - points[i], axis=1)
+                indices = indices[np.argsort(distances, kind="stable")]
 
+                # 他の端点との接続を確認
+                for index in indices:
                     # 対象点を取得
-                    nearest_point = point_data[indices[j + 1]][2]
+                    nearest_point = point_data[index][2]
 
                     # 既に同じペアが作成されていないか確認
                     pair = tuple(
@@ -505,39 +506,11 @@ class AdjustEndpointsLogic:
             # KDTreeを使って、各端点の近接する端点（buffer_radius内）のインデックスを取得
             tree = KDTree(coords)
 
-            pairs = tree.query_ball_tree(tree, buffer_radius)
-
-            num_points = len(coords)
-            
-            # 配列の最大サイズを推定して初期化 (推定が難しい場合は、動的にリサイズする方法も検討できます)
-            max_pair_count = sum(
-                len(neighbors) - 1 for neighbors in pairs
-            )  # 自分自身を除外するので-1
-            row_indices = np.empty(max_pair_count, dtype=int)
-            col_indices = np.empty(max_pair_count, dtype=int)
-
-            # 接触する端点同士の関係を記録
-            index = 0
-            for i, neighbors in enumerate(pairs):
-                neighbors = np.array(neighbors)
-                valid_neighbors = neighbors[neighbors != i]  # 自分自身を除外
-                num_neighbors = len(valid_neighbors)
-                if num_neighbors > 0:
-                    row_indices[index : index + num_neighbors] = i
-                    col_indices[index : index + num_neighbors] = valid_neighbors
-                    index += num_neighbors
-
-            # 最後に無駄な領域を削除
-            row_indices = row_indices[:index]
-            col_indices = col_indices[:index]
-
-            # 2次元のブール型のnumpy配列を作成
-            intersections = np.zeros((num_points, num_points), dtype=bool)
-            intersections[row_indices, col_indices] = True
-            intersections[col_indices, row_indices] = True  # 対称的な関係を保持
+            # 接触する端点同士の組み合わせを取得（自分自身は含まれない）
+            pairs = tree.query_pairs(buffer_radius, output_type="ndarray")
 
             # find_connected_groupsを使って、連結された端点のグループを見つける
-            grouped_nodes = self.find_connected_groups(intersections)
+            grouped_nodes = self.find_connected_groups(pairs, len(coords))
 
             # grouped_nodes内の遅延を解消するために、GeoDataFrameからnumpy配列に変換
             fid_array = endpoint_gdf["fid"].to_numpy()
@@ -642,12 +615,14 @@ class AdjustEndpointsLogic:
         except Exception as e:
             raise Exception(f"[ERROR get_endpoints]: {str(e)}")
 
-    def find_connected_groups(self, intersections):
+    def find_connected_groups(self, pairs, num_points):
         """
-        ブール型の numpy 配列を使って、端点の接触関係を基にグループ化する。
+        端点の組み合わせの配列を使って、端点の接触関係を基にグループ化する。
 
-        :param intersections: 接触関係を表すブール型の2次元配列。
-        :type intersections: numpy.ndarray
+        :param pairs: 接触する端点のインデックスの組み合わせの配列（組み合わせ数×2）。
+        :type pairs: numpy.ndarray
+        :param num_points: 端点の数。
+        :type num_points: int
 
         :return: 連結した端点のインデックスのグループリスト。
         :rtype: list[list[int]]
@@ -655,20 +630,13 @@ class AdjustEndpointsLogic:
         :raises Exception: 処理中にエラーが発生した場合に例外をスローする。
         """
         try:
-            # numpy配列から疎行列を作成
-            sparse_matrix = csr_matrix(intersections)
+            pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
 
             # connected_componentsで連結成分を計算
-            num_components, labels = connected_components(
-                csgraph=sparse_matrix, directed=False, return_labels=True
-            )
+            _, labels = CT.label_components(pairs[:, 0], pairs[:, 1], num_points)
 
             # ラベルに基づいてグループを作成
-            groups = [[] for _ in range(num_components)]
-            for idx, label in enumerate(labels):
-                groups[label].append(idx)
-
-            return groups
+            return [group.tolist() for group in CT.group_indices(labels)]
         except Exception as e:
             raise Exception(f"[ERROR find_connected_groups]: {str(e)}")
 
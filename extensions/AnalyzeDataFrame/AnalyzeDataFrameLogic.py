@@ -21,7 +21,6 @@
 # SOFTWARE.
 
 from importlib import import_module
-import pickle
 import datetime
 
 # 外部ライブラリの動的インポート
@@ -29,6 +28,7 @@ pd = import_module("pandas")
 gpd = import_module("geopandas")
 
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 
 class AnalyzeDataFrameLogic:
@@ -74,7 +74,7 @@ class AnalyzeDataFrameLogic:
 
             new_content = self.get_title()
 
-            input_data = pickle.loads(byte_data)
+            input_data = GCP.deserialize_content(byte_data)
 
             if isinstance(input_data, pd.DataFrame):
                 # INPUTデータがデータフレームであれば
@@ -21,12 +21,12 @@
 # SOFTWARE.
 
 # Python標準ライブラリ
-import pickle
 from importlib import import_module
 
 # 外部ライブラリの動的インポート
 box = getattr(import_module("shapely.geometry"), "box")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import cad.common.cad_utils as CU
 
 
@@ -77,7 +77,7 @@ class ClipGeoDataFrameLogic:
         """
         try:
             # GeoDataFrameを取得しデシリアライズ
-            gdf = pickle.loads(byte_data)
+            gdf = GCP.deserialize_content(byte_data)
 
             # プロパティと属性情報からクリップ範囲の値を取得
             lower_left_x = CU.get_number_from_string(attributes.get("Lower Left X Coordinate") or properties['LOWER_LEFT_X'])
@@ -89,7 +89,7 @@ class ClipGeoDataFrameLogic:
             clipped_gdf = self.clip_geodataframe(gdf, lower_left_x, lower_left_y, upper_right_x, upper_right_y)
 
             # クリップされたGeoDataFrameをシリアライズ
-            serialized_clipped_gdf = pickle.dumps(clipped_gdf)
+            serialized_clipped_gdf = GCP.serialize_geodataframe(clipped_gdf)
 
             return serialized_clipped_gdf, attributes
 
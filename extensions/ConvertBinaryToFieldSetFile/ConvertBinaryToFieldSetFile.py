@@ -43,6 +43,7 @@ from nifiapi.flowfiletransform import FlowFileTransform, FlowFileTransformResult
 from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
 
 # 外部ライブラリの動的インポート
+np = import_module("numpy")
 pd = import_module("pandas")
 
 # Constants
@@ -72,6 +73,15 @@ ENCODING_ALLOWABLE_LIST = [
 NEGATIVE_FLAG_TRUE = "解釈する"
 NEGATIVE_FLAG_FALSE = "解釈しない"
 
+# 16進数、2進数の文字（ASCIIコード）から数値への変換表 数字以外は-1
+DIGIT_VALUE_ARRAY = np.full(256, -1, dtype=np.int64)
+DIGIT_VALUE_ARRAY[ord("0"):ord("9") + 1] = np.arange(10)
+DIGIT_VALUE_ARRAY[ord("a"):ord("f") + 1] = np.arange(10, 16)
+DIGIT_VALUE_ARRAY[ord("A"):ord("F") + 1] = np.arange(10, 16)
+
+# 16進数、2進数をまとめて数値に変換する際の最大ビット数（int64で桁あふれしない範囲）
+VECTORIZED_DECODE_MAX_BIT = 62
+
 
 class ConvertBinaryToFieldSetFile(FlowFileTransform):
     class Java:
@@ -345,7 +355,7 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
 
                 # 定義ファイルでは"データ型"列がコードになっているので、それぞれをデータ型に直す
                 definition_data_frame[DATA_TYPE] = definition_data_frame[DATA_TYPE].apply(
-                    WM.calc_func_time(self.logger, False)(self.load_data_type_code))
+                    self.load_data_type_code)
 
             # CSV系のプロパティ未入力時
             else:
@@ -560,8 +570,7 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
                         binary_encoding_code)
 
                     # nullバイトをそれぞれの型に則した空文字に変換
-                    null_replaceded_value = WM.calc_func_time(self.logger, False)(
-                        self.null_replace)(decode_value, data_type)
+                    null_replaceded_value = self.null_replace(decode_value, data_type)
 
                 else:
                     # テキストのときはデコードが不要
@@ -589,23 +598,140 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
                 row_list, \
                     after_character, \
                     before_character\
-                    = WM.calc_func_time(self.logger, False)(self.append_processed_binary)(definition_data_frame,
-                                                                                          binary_data_from_contents,
-                                                                                          j,
-                                                                                          encoding_number,
-                                                                                          bytes_to_characters_number,
-                                                                                          row_list,
-                                                                                          binary_negative_flag,
-                                                                                          after_character,
-                                                                                          before_character)
+                    = self.append_processed_binary(definition_data_frame,
+                                                   binary_data_from_contents,
+                                                   j,
+                                                   encoding_number,
+                                                   bytes_to_characters_number,
+                                                   row_list,
+                                                   binary_negative_flag,
+                                                   after_character,
+                                                   before_character)
 
         return row_list, before_character, after_character
 
+    def get_text_column_list(self, input_data_type, body_data, record_number, record_character,
+                             start_character, character_number, data_type, binary_encoding_code):
+        """
+        概要:
+            文字コードでデコードするボディ部の1項目分を全レコードまとめて変換する関数。
+            make_row_listと同じく、デコード、null置換、型変換を行う。
+
+        引数:
+            input_data_type: フローファイルのデータ形式
+            body_data: ボディ部のバイナリデータ（固定長テキストの場合は文字列）
+            record_number: レコード数
+            record_character: 1レコードの文字数
+            start_character: レコード内での項目の開始位置
+            character_number: 項目の文字数
+            data_type: 項目のデータ型
+            binary_encoding_code: バイナリのエンコーディング
+
+        戻り値:
+            column_list: 項目の値のリスト
+        """
+
+        # 全レコードの項目を切り出す
+        column_list = [body_data[position:position + character_number]
+                       for position in range(start_character, record_number * record_character, record_character)]
+
+        # 固定長テキストの場合はデコード、null置換が不要
+        if input_data_type == DATA_TYPE_TEXT:
+            return list(map(data_type, column_list))
+
+        # コンテンツをデコードする
+        column_list = [value.decode(binary_encoding_code)
+                       for value in column_list]
+
+        # nullバイトを含む項目のみ、それぞれの型に則した値に置換する
+        # nullバイトがなければデコード後の文字列にもnullは含まれない
+        column_byte_array = np.frombuffer(body_data, dtype=np.uint8).reshape(
+            record_number, record_character)[:, start_character:start_character + character_number]
+
+        if np.any(column_byte_array == 0):
+
+            # 数値型は文字列の0に置換、文字列型は空文字にする
+            if data_type == int or data_type == float:
+                column_list = [value.replace('\x00', '0')
+                               for value in column_list]
+            elif data_type == str:
+                column_list = [value.replace('\x00', '')
+                               for value in column_list]
+
+        return list(map(data_type, column_list))
+
+    def get_number_column_list(self, body_data, record_number, record_character, start_character,
+                               character_number, data_type, encoding_number, binary_negative_flag):
+        """
+        概要:
+            16進数、2進数のボディ部の1項目分を全レコードまとめて数値に変換する関数。
+            全レコードが数字のみで、int64に収まる桁数の場合は配列演算で変換し、
+            それ以外はappend_processed_binaryと同じく1件ずつint関数で変換する。
+
+        引数:
+            body_data: ボディ部のバイナリデータ（ASCIIの文字列の場合はbytesに変換済み）
+            record_number: レコード数
+            record_character: 1レコードの文字数
+            start_character: レコード内での項目の開始位置
+            character_number: 項目の文字数
+            data_type: 項目のデータ型
+            encoding_number: 進数
+            binary_negative_flag: バイナリで負数を扱うかのフラグ
+
+        戻り値:
+            column_list: 項目の値のリスト
+        """
+
+        # 項目の最大ビット数
+        bit_number = character_number * int(np.log2(encoding_number))
+
+        if isinstance(body_data, bytes) and 0 < bit_number <= VECTORIZED_DECODE_MAX_BIT:
+
+            # 全レコードの項目の文字を数値に変換
+            digit_array = DIGIT_VALUE_ARRAY[np.frombuffer(body_data, dtype=np.uint8).reshape(
+                record_number, record_character)[:, start_character:start_character + character_number]]
+
+            if np.all((digit_array >= 0) & (digit_array < encoding_number)):
+
+                # 上位の桁から順に10進数に変換
+                decode_value_array = np.zeros(record_number, dtype=np.int64)
+                for ci in range(character_number):
+                    decode_value_array = decode_value_array * \
+                        encoding_number + digit_array[:, ci]
+
+                # バイナリの最上位桁を負数のフラグとして解釈する場合
+                if binary_negative_flag:
+                    negative_bool = digit_array[:, 0] > (encoding_number / 2)
+                    decode_value_array[negative_bool] -= encoding_number ** character_number
+
+                return list(map(data_type, decode_value_array.tolist()))
+
+        # 数字以外を含む場合や桁数が大きい場合は1件ずつ変換する
+        column_list = []
+        for position in range(start_character, record_number * record_character, record_character):
+
+            binary = body_data[position:position + character_number]
+
+            # 指定の進数から10進数に変換する。
+            decode_value = int(binary, encoding_number)
+
+            # バイナリの最上位桁を負数のフラグとして解釈する場合
+            if binary_negative_flag:
+                if int(binary[0:1], encoding_number) > (encoding_number/2):
+                    over_number_string = "1" + character_number*"0"
+                    over_number = int(over_number_string, encoding_number)
+                    decode_value -= over_number
+
+            column_list.append(data_type(decode_value))
+
+        return column_list
+
     def get_body_data_frame(self, input_data_type, binary_data_from_contents, definition_data_frame_list,
                             binary_encoding_code, binary_negative_flag, before_character, after_character):
         """
         概要:
             ボディ部のDataFrameを作成する関数。
+            定義から各項目のレコード内の位置を1回だけ計算し、項目ごとに全レコードをまとめて変換する。
 
         引数:
             input_data_type: フローファイルのデータ形式
@@ -623,9 +749,6 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
         # ボディ部のDataFrameを変数に格納
         body_definition_data_frame = definition_data_frame_list[1]
 
-        # DataFrameの元となるリスト
-        value_list = []
-
         # 後続のループのため、バイナリの総文字数
         binary_data_length = len(binary_data_from_contents)
 
@@ -636,6 +759,9 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
             loop_times = int(int(data_character) /
                              int(body_definition_data_frame[DIGITS].sum()))
 
+            # "バイト数"を"文字数"に変えるためのかける数
+            bytes_to_characters_number = 1
+
         elif binary_encoding_code == ENCODING_BINARY:
             data_character = binary_data_length - 8 * \
                 (definition_data_frame_list[0][DIGITS].sum(
@@ -650,30 +776,67 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
             loop_times = int(int(data_character) /
                              (2*int(body_definition_data_frame[DIGITS].sum())))
 
-        # 行数分のループ
-        for i in range(loop_times):
-
-            # 1行のデータを作成する。
-            row_list, \
-                before_character, \
-                after_character\
-                = WM.calc_func_time(self.logger, False)(self.make_row_list)(input_data_type,
-                                                                            body_definition_data_frame,
-                                                                            binary_data_from_contents,
-                                                                            binary_encoding_code,
-                                                                            binary_negative_flag,
-                                                                            before_character,
-                                                                            after_character)
-
-            # 1行ずつのデータをリストに格納
-            value_list.append(row_list)
-
         # カラム名のリストを作成
         column_name_list = body_definition_data_frame[COLUMN_NAME].values.tolist(
         )
 
-        # DataFrameに変換する
-        body_data_frame = pd.DataFrame(value_list, columns=column_name_list)
+        # レコードがない場合は空のDataFrameとする
+        record_number = max(loop_times, 0)
+        if record_number == 0:
+            return pd.DataFrame([], columns=column_name_list)
+
+        # 16進数か2進数かで後続処理で行う乗算の定数を変更する。
+        if binary_encoding_code == ENCODING_BINARY or binary_encoding_code == ENCODING_HEX:
+            encoding_number, \
+                bytes_to_characters_number\
+                = self.get_encoding_temporary(binary_encoding_code)
+
+        # 各項目の文字数とレコード内の開始位置
+        character_number_list = [int(digits) * bytes_to_characters_number
+                                 for digits in body_definition_data_frame[DIGITS].tolist()]
+        record_character = sum(character_number_list)
+        start_character_list = np.concatenate(
+            [[0], np.cumsum(character_number_list)[:-1]]).astype(np.int64).tolist()
+
+        # ボディ部のみ切り出す
+        body_data = binary_data_from_contents[before_character:
+                                              before_character + record_number * record_character]
+
+        data_type_list = body_definition_data_frame[DATA_TYPE].tolist()
+
+        # 項目ごとに全レコード分の値を作成する
+        column_value_list = []
+
+        if binary_encoding_code != ENCODING_BINARY and binary_encoding_code != ENCODING_HEX:
+            for j in range(len(character_number_list)):
+                column_value_list.append(self.get_text_column_list(input_data_type,
+                                                                   body_data,
+                                                                   record_number,
+                                                                   record_character,
+                                                                   start_character_list[j],
+                                                                   character_number_list[j],
+                                                                   data_type_list[j],
+                                                                   binary_encoding_code))
+
+        else:
+            # ASCIIの文字列はbytesに変換して配列演算の対象とする
+            if isinstance(body_data, str) and body_data.isascii():
+                body_data = body_data.encode("ascii")
+
+            for j in range(len(character_number_list)):
+                column_value_list.append(self.get_number_column_list(body_data,
+                                                                     record_number,
+                                                                     record_character,
+                                                                     start_character_list[j],
+                                                                     character_number_list[j],
+                                                                     data_type_list[j],
+                                                                     encoding_number,
+                                                                     binary_negative_flag))
+
+        # DataFrameに変換する カラム名は重複する場合があるため位置で作成してから設定する
+        body_data_frame = pd.DataFrame(
+            dict(zip(range(len(column_value_list)), column_value_list)))
+        body_data_frame.columns = column_name_list
 
         return body_data_frame
 
@@ -743,6 +906,11 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
             body_list = []
             footer_list = []
 
+            # レコードごとに呼び出す関数は、ループの前に1度だけラップする
+            make_row_list = WM.calc_func_time(self.logger)(self.make_row_list)
+            add_findex_column_and_list_append = WM.calc_func_time(self.logger)(self.add_findex_column_and_list_append)
+            get_body_data_frame = WM.calc_func_time(self.logger)(self.get_body_data_frame)
+
             # コンテンツのリスト[findex, binary_data_from_contents]をfor文で回す。
             for findex, binary_data_from_contents in binary_data_list:
 
@@ -753,13 +921,13 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
                     header_data_list, \
                         before_character, \
                         after_character\
-                        = WM.calc_func_time(self.logger)(self.make_row_list)(input_data_type,
-                                                                             definition_data_frame_list[0],
-                                                                             binary_data_from_contents,
-                                                                             binary_encoding_code,
-                                                                             binary_negative_flag,
-                                                                             before_character=0,
-                                                                             after_character=0)
+                        = make_row_list(input_data_type,
+                                        definition_data_frame_list[0],
+                                        binary_data_from_contents,
+                                        binary_encoding_code,
+                                        binary_negative_flag,
+                                        before_character=0,
+                                        after_character=0)
 
                     # リストをDataFrameにする。
                     header_data_frame = pd.DataFrame(
@@ -767,9 +935,9 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
 
                     # 出力用のリストに1行分を加える。
                     header_list\
-                        = WM.calc_func_time(self.logger)(self.add_findex_column_and_list_append)(header_data_frame,
-                                                                                                 findex,
-                                                                                                 header_list)
+                        = add_findex_column_and_list_append(header_data_frame,
+                                                            findex,
+                                                            header_list)
 
                 # なければbefore_character, after_characterを0とする。
                 else:
@@ -777,18 +945,18 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
 
                 # バイナリのデコードを行い、DataFrameを作成する。
                 body_data_frame\
-                    = WM.calc_func_time(self.logger)(self.get_body_data_frame)(input_data_type,
-                                                                               binary_data_from_contents,
-                                                                               definition_data_frame_list,
-                                                                               binary_encoding_code,
-                                                                               binary_negative_flag,
-                                                                               before_character,
-                                                                               after_character)
+                    = get_body_data_frame(input_data_type,
+                                          binary_data_from_contents,
+                                          definition_data_frame_list,
+                                          binary_encoding_code,
+                                          binary_negative_flag,
+                                          before_character,
+                                          after_character)
 
                 body_list\
-                    = WM.calc_func_time(self.logger)(self.add_findex_column_and_list_append)(body_data_frame,
-                                                                                             findex,
-                                                                                             body_list)
+                    = add_findex_column_and_list_append(body_data_frame,
+                                                        findex,
+                                                        body_list)
 
                 # プロパティでヘッダを入力していれば作成
                 if definition_data_frame_list[2][DIGITS].sum() != 0:
@@ -801,13 +969,13 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
                     footer_data_list, \
                         before_character, \
                         after_character\
-                        = WM.calc_func_time(self.logger)(self.make_row_list)(input_data_type,
-                                                                             definition_data_frame_list[2],
-                                                                             binary_data_from_contents,
-                                                                             binary_encoding_code,
-                                                                             binary_negative_flag,
-                                                                             before_character=character_temporary,
-                                                                             after_character=character_temporary)
+                        = make_row_list(input_data_type,
+                                        definition_data_frame_list[2],
+                                        binary_data_from_contents,
+                                        binary_encoding_code,
+                                        binary_negative_flag,
+                                        before_character=character_temporary,
+                                        after_character=character_temporary)
 
                     # リストをDataFrameにする。
                     footer_data_frame = pd.DataFrame(
@@ -815,9 +983,9 @@ class ConvertBinaryToFieldSetFile(FlowFileTransform):
 
                     # 出力用のリストに1行分を加える。
                     footer_list\
-                        = WM.calc_func_time(self.logger)(self.add_findex_column_and_list_append)(footer_data_frame,
-                                                                                                 findex,
-                                                                                                 footer_list)
+                        = add_findex_column_and_list_append(footer_data_frame,
+                                                            findex,
+                                                            footer_list)
 
             # リストの要素を合体させる
             # FieldSetFile出荷処理（dwh_name_listにいれていく。/空なら追加しない）
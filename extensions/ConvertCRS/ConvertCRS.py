@@ -34,6 +34,7 @@ from importlib import import_module
 # NiFi自作ライブラリ
 import nifiapi.NifiCustomPackage.WrapperModule as WM
 import nifiapi.NifiCustomPackage.DigilineCommonPackage as DCP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 # NiFiライブラリ
 from nifiapi.flowfiletransform import FlowFileTransform, FlowFileTransformResult
@@ -117,7 +118,7 @@ class ConvertCRS(FlowFileTransform):
                 serialize_dataframe = flowfile.getContentsAsBytes()
 
                 # バイトデータからGeoDataFrameを復元する
-                target_coordinates_array_or_geodata_frame = pickle.loads(
+                target_coordinates_array_or_geodata_frame = GCP.deserialize_content(
                     serialize_dataframe)
                 not_field_set_file_flag = True
             except pickle.UnpicklingError:
@@ -189,7 +190,7 @@ class ConvertCRS(FlowFileTransform):
                 # target_field_set_file_dataframeを出荷の形(csv形式)に変換
                 # --------------------------------------------------------------------------
                 if not_field_set_file_flag:
-                    output_value = pickle.dumps(
+                    output_value = GCP.serialize_geodataframe(
                         target_coordinates_array_or_geodata_frame)
 
                 else:
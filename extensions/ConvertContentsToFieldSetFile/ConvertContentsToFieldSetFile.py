@@ -32,6 +32,7 @@ import pickle
 # NiFi自作ライブラリ
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 # NiFiライブラリ
 from nifiapi.flowfiletransform import FlowFileTransform, FlowFileTransformResult
@@ -113,7 +114,7 @@ class ConvertContentsToFieldSetFile(FlowFileTransform):
             try:
                 # binary文字を想定し、flowfileからデータを受け取る。
                 flowfile_contents_data = flowfile.getContentsAsBytes()
-                flowfile_contents_data = pickle.loads(flowfile_contents_data)
+                flowfile_contents_data = GCP.deserialize_content(flowfile_contents_data)
 
             # pickle.loads出来ない場合は、文字列型なので↓
             except pickle.UnpicklingError:
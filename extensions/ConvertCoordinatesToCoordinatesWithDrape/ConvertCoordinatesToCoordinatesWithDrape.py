@@ -31,8 +31,6 @@
 # Python標準ライブラリ
 import io
 import zipfile
-import pickle
-import base64
 import os
 import traceback
 
@@ -40,8 +38,8 @@ from importlib import import_module
 
 # NiFi自作ライブラリ
 import nifiapi.NifiCustomPackage.NifiRasterioPackage as NRP
-import nifiapi.NifiCustomPackage.DigilineCommonPackage as DCP
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
 
 # NiFiライブラリ
@@ -50,7 +48,6 @@ from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
 
 # 外部ライブラリの動的インポート
 np = import_module("numpy")
-pd = import_module("pandas")
 rasterio = import_module("rasterio")
 
 ADD = "加算"
@@ -185,35 +182,29 @@ class ConvertCoordinatesToCoordinatesWithDrape(FlowFileTransform):
             coordinates_type_list: 処理対象の Type 列のデータ
         """
 
-        # FlowfileからCSV形式のFieldSetFileを取得
-        input_field_set_file = flowfile.getContentsAsBytes().decode("utf-8")
+        # FlowfileからFieldSetFileを取得し、Dwh、Typeの一覧のみを解析する
+        field_set_file_view = FSP.FieldSetFileView(flowfile.getContentsAsBytes())
 
-        # StringIOオブジェクトとしてCSV形式のデータをDataFrameとして読み込む
-        field_set_file_data_frame = pd.read_csv(
-            io.StringIO(input_field_set_file))
-
-        # coordinates_dwh_nameに一致するDwhのValue列を取得し、pickleからデシリアライズ
-        coordinates_array = pickle.loads(base64.b64decode(
-            field_set_file_data_frame.loc[field_set_file_data_frame["Dwh"] == coordinates_dwh_name, "Value"].values[0]))
+        # coordinates_dwh_nameに一致するDwhのValue列のみをデシリアライズ
+        coordinates_array = field_set_file_view.get_value(coordinates_dwh_name)
 
         # coordinates_dwh_nameに一致する Dwh と Type のリストを取得
-        coordinates_dwh_list = field_set_file_data_frame.loc[
-            field_set_file_data_frame["Dwh"] == coordinates_dwh_name, "Dwh"].tolist()
+        coordinates_index_list = field_set_file_view.get_index_list([coordinates_dwh_name])
+
+        coordinates_dwh_list = [field_set_file_view.dwh_list[i] for i in coordinates_index_list]
 
-        coordinates_type_list = field_set_file_data_frame.loc[
-            field_set_file_data_frame["Dwh"] == coordinates_dwh_name, "Type"].tolist()
+        coordinates_type_list = [field_set_file_view.type_list[i] for i in coordinates_index_list]
 
         return coordinates_array, coordinates_dwh_list, coordinates_type_list
 
-    def get_index_that_is_within_pixel_index_range(self, width_pixel_num, height_pixel_num, geotiff_z_value_array, pixel_x_index_array, pixel_y_index_array):
+    def get_index_that_is_within_pixel_index_range(self, width_pixel_num, height_pixel_num, pixel_x_index_array, pixel_y_index_array):
         """
         概要:
-            座標データのZ値をGeoTIFFのZ値で更新する関数
+            ピクセルインデックスがGeoTIFFの範囲内である座標データのインデックスを取得する関数
 
         引数:
             width_pixel_num: 幅のpixel数
             height_pixel_num: 高さのpixel数
-            geotiff_z_value_array: GeoTIFFから取得したZ値の配列
             pixel_x_index_array: 座標データのX座標に基づくピクセルXインデックスの配列
             pixel_y_index_array: 座標データのY座標に基づくピクセルYインデックスの配列
 
@@ -227,30 +218,57 @@ class ConvertCoordinatesToCoordinatesWithDrape(FlowFileTransform):
             (pixel_x_index_array < width_pixel_num) &
             (pixel_y_index_array >= 0) &
             (pixel_y_index_array < height_pixel_num)
-        )
+        )[0]
+
+        return target_index_array
+
+    def get_z_value_from_geotiff(self, file_path, coordinates_array):
+        """
+        概要:
+            GeoTIFFから座標データの位置のピクセルのみを読み込み、標高値を取得する関数
+
+        引数:
+            file_path: GeoTIFFのファイルパス
+            coordinates_array: 座標データの配列 [ID, X, Y, Z]
+
+        戻り値:
+            target_index_array: 標高値が存在する座標データのインデックス配列
+            geotiff_z_value_array: target_index_arrayに対応する標高値の配列
+        """
+
+        with rasterio.open(file_path) as src:
+
+            # 座標データのX、Yを基にピクセルのインデックスを取得
+            pixel_x_index_array, \
+                pixel_y_index_array\
+                = NRP.get_grid_index(coordinates_array[:, 1],
+                                     coordinates_array[:, 2],
+                                     NRP.get_tfw_list(src))
+
+            # ピクセルインデックスの範囲内であるインデックスを取得
+            target_index_array = self.get_index_that_is_within_pixel_index_range(src.width,
+                                                                                 src.height,
+                                                                                 pixel_x_index_array,
+                                                                                 pixel_y_index_array)
+
+            # 範囲内のピクセルを含む部分のみを読み込み、標高値を取得
+            geotiff_z_value_array = NRP.get_geotiff_z_value_at_grid_index(src,
+                                                                          pixel_x_index_array[target_index_array],
+                                                                          pixel_y_index_array[target_index_array])
 
         # 値が存在しない（nan）ピクセルを除外
-        target_index_array = target_index_array[0][
-            ~np.isnan(
-                geotiff_z_value_array[
-                    pixel_y_index_array[target_index_array],
-                    pixel_x_index_array[target_index_array]
-                ]
-            )
-        ]
+        not_nan_array = ~np.isnan(geotiff_z_value_array)
 
-        return target_index_array
+        return target_index_array[not_nan_array], geotiff_z_value_array[not_nan_array]
 
-    def update_z_value(self, coordinates_array, geotiff_z_value_array, pixel_x_index_array, pixel_y_index_array, target_index_array, update_method):
+    def update_z_value(self, coordinates_array, geotiff_z_value_array, target_index_array, update_method):
         """
         概要:
             座標データのZ値をGeoTIFFのZ値で更新する関数
 
         引数:
             coordinates_array: 座標データの配列 [ID, X, Y, Z]
-            geotiff_z_value_array: GeoTIFFから取得したZ値の配列
-            pixel_x_index_array: 座標データのX座標に基づくピクセルXインデックスの配列
-            pixel_y_index_array: 座標データのY座標に基づくピクセルYインデックスの配列
+            geotiff_z_value_array: target_index_arrayに対応するGeoTIFFのZ値の配列
             target_index_array: 更新対象のインデックス配列
             update_method: 更新方法:'add'（加算）または 'overwrite'（上書き）
 
@@ -263,16 +281,12 @@ class ConvertCoordinatesToCoordinatesWithDrape(FlowFileTransform):
         if update_method == ADD:
 
             coordinates_array[target_index_array, 3] = \
-                coordinates_array[target_index_array, 3] + \
-                geotiff_z_value_array[pixel_y_index_array[target_index_array],
-                                      pixel_x_index_array[target_index_array]]
+                coordinates_array[target_index_array, 3] + geotiff_z_value_array
 
         # 上書きの場合
         elif update_method == OVERWRITE:
 
-            coordinates_array[target_index_array, 3] = \
-                geotiff_z_value_array[pixel_y_index_array[target_index_array],
-                                      pixel_x_index_array[target_index_array]]
+            coordinates_array[target_index_array, 3] = geotiff_z_value_array
 
     def transform(self, context, flowfile):
 
@@ -300,85 +314,37 @@ class ConvertCoordinatesToCoordinatesWithDrape(FlowFileTransform):
                                                                                             coordinates_dwh_name)
 
             # --------------------------------------------------------------------------
-            # フォルダ直下をpathlibで検索 ファイル名（拡張子あり）取得
-            # --------------------------------------------------------------------------
-            path_list\
-                = WM.calc_func_time(self.logger)(DCP.get_file_path)(tiff_folder, target_extent
-                                                                    )
-
-            # --------------------------------------------------------------------------
-
-            # --------------------------------------------------------------------------
-            # GDALでGEOTIFFを読み込んで四隅の情報取得
+            # フォルダ直下のGeoTIFFの四隅の情報をフットプリントインデックスから取得
+            # フォルダに変更がない場合はGeoTIFFを開かずに永続化されたインデックスを使用する
             # --------------------------------------------------------------------------
-            min_x_array, max_x_array, min_y_array, max_y_array, file_name_array\
-                = WM.calc_func_time(self.logger)(DCP.get_geotiff_coordinates_information_array)(path_list)
+            footprint_index, \
+                footprint_tree\
+                = WM.calc_func_time(self.logger)(NRP.get_geotiff_footprint_index)(tiff_folder, target_extent)
             # --------------------------------------------------------------------------
 
-            lines_points = coordinates_array[:, 1:3].tolist()
-
-            # file_name_arrayと同じインデックスの最大最小xyをそれぞれ抽出するために、file_name_arrayをループ
-            for index, filename in enumerate(file_name_array):
-                # -----------------------------------------------------------------------------------------------------------
-                # 構成点が存在するtiffのみ処理を行うため、処理対象の座標データが tiff データの範囲内に存在するか確認
-                found_point_within_bounds = False
-
-                # 各座標データ (x, y) に対して、ポリゴンの範囲内に収まるかどうかチェック
-                for point in lines_points:
-
-                    # 現在の座標データを取得
-                    x, y = point
-
-                    # 座標がポリゴンの範囲内に収まっているかをチェック
-                    if min_x_array[index] <= x <= max_x_array[index] and min_y_array[index] <= y <= max_y_array[index]:
-
-                        # 座標がポリゴンの範囲内に存在する場合、フラグをTrueに設定し、ループを終了
-                        found_point_within_bounds = True
-
-                        break
-                # -----------------------------------------------------------------------------------------------------------
-
-                # フラグ True (座標がポリゴンの範囲内に存在する)場合
-                if found_point_within_bounds:
-                    # フルパスを作成
-                    file_path = os.path.join(tiff_folder, filename)
-
-                    # TIFF ファイルを読み込み、データを取得
-                    with open(file_path, 'rb') as file:
-                        geotiff_value = file.read()
-
-                    # GeoTIFFのデータから情報を取得
-                    geotiff_z_value_array, \
-                        tfw_value_list, \
-                        width_pixel_num, \
-                        height_pixel_num\
-                        = WM.calc_func_time(self.logger)(NRP.get_geotiff_information)(geotiff_value)
-
-                    # 座標データのX、Yを基にピクセルのインデックスを取得
-                    pixel_x_index_array, \
-                        pixel_y_index_array\
-                        = WM.calc_func_time(self.logger)(NRP.get_grid_index)(coordinates_array[:, 1],
-                                                                             coordinates_array[:, 2],
-                                                                             tfw_value_list)
-
-                    # ピクセルインデックスの範囲内であるインデックスを取得し、値が存在しない（nan）ピクセルを除外
-                    target_index_array = WM.calc_func_time(self.logger)(self.get_index_that_is_within_pixel_index_range)(width_pixel_num,
-                                                                                                                         height_pixel_num,
-                                                                                                                         geotiff_z_value_array,
-                                                                                                                         pixel_x_index_array,
-                                                                                                                         pixel_y_index_array)
-
-                    # 座標データのZ値をGeoTIFFのZ値で更新
-                    WM.calc_func_time(self.logger)(self.update_z_value)(coordinates_array,
-                                                                        geotiff_z_value_array,
-                                                                        pixel_x_index_array,
-                                                                        pixel_y_index_array,
-                                                                        target_index_array,
-                                                                        update_method)
-
-                # フラグ False (座標がポリゴンの範囲内に存在しない)場合、次のtiffへ
-                else:
-                    continue
+            # 構成点が存在するtiffのみ処理を行うため、座標データを範囲内に持つGeoTIFFのインデックスを一括で取得
+            geotiff_index_array\
+                = WM.calc_func_time(self.logger)(NRP.get_geotiff_index_array_containing_points)(footprint_tree,
+                                                                                                coordinates_array[:, 1],
+                                                                                                coordinates_array[:, 2])
+
+            # フォルダ内の並び順にtiffを処理
+            for filename in footprint_index["file_name"][geotiff_index_array].tolist():
+
+                # フルパスを作成
+                file_path = os.path.join(tiff_folder, filename)
+
+                # 座標データの位置のピクセルのみを読み込み、値が存在する座標データのインデックスと標高値を取得
+                target_index_array, \
+                    geotiff_z_value_array\
+                    = WM.calc_func_time(self.logger)(self.get_z_value_from_geotiff)(file_path,
+                                                                                    coordinates_array)
+
+                # 座標データのZ値をGeoTIFFのZ値で更新
+                WM.calc_func_time(self.logger)(self.update_z_value)(coordinates_array,
+                                                                    geotiff_z_value_array,
+                                                                    target_index_array,
+                                                                    update_method)
 
             # set_field_set_file 関数で FieldSetFile(CSV形式) に加工する際 list 形式を求めるため list に変換
             output_list = [coordinates_array]
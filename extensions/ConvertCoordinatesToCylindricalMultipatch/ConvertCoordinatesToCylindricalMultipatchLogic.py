@@ -182,11 +182,14 @@ class ConvertCoordinatesToCylindricalMultipatchLogic:
         """
         try:
             # coordinates_arrayには{ID, x成分, y成分, z成分}の4つの要素があるので、IDを除いた座標の列を指定して取得する。
+            _, group_dict = NSP.create_id_array_dict(
+                coordinates_array, column_slice=slice(1, 4)
+            )
+
+            # 引数のIDの並び順で辞書を作成（座標が存在しないIDは空配列）
+            empty_array = coordinates_array[:0, 1:4]
             id_coordinate_dict = {
-                id_unique_array[i]: coordinates_array[
-                    list(np.where(coordinates_array[:, 0] == id_unique_array[i])[0]),
-                    1:4,
-                ]
+                id_unique_array[i]: group_dict.get(id_unique_array[i], empty_array)
                 for i in range(len(id_unique_array))
             }
 
@@ -29,14 +29,14 @@
 
 # Python標準ライブラリ
 import io
-import zipfile
 import json
 
 from importlib import import_module
 
 # NiFi自作ライブラリ
 import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
-import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
+import nifiapi.NifiCustomPackage.DigilineCommonPackage as DCP
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 import nifiapi.NifiCustomPackage.NifiComplicationPackage as NCP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
@@ -47,7 +47,6 @@ from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
 
 # 外部ライブラリの動的インポート
 np = import_module("numpy")
-pyproj = import_module("pyproj")
 
 ZIP_COMPRESSION_ENABLED = "圧縮する"
 ZIP_COMPRESSION_DISABLED = "圧縮しない"
@@ -165,6 +164,18 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
         expression_language_scope=ExpressionLanguageScope.NONE
     )
 
+    # glTFの出力形式（glTF：JSON形式　GLB：バイナリ形式）デフォルトは"glTF"
+    GLTF_OUTPUT_FORMAT = PropertyDescriptor(
+        name="glTF Output Format",
+        description="tileset.jsonが参照するglTFの出力形式（GLBの場合はバッファをBase64に変換せずバイナリで出力する）",
+        default_value=DDC.GLTF_OUTPUT_FORMAT_GLTF,
+        allowable_values=[DDC.GLTF_OUTPUT_FORMAT_GLTF,
+                          DDC.GLTF_OUTPUT_FORMAT_GLB],
+        required=True,
+        sensitive=False,
+        expression_language_scope=ExpressionLanguageScope.NONE
+    )
+
     property_descriptors = [DATA_DEFINITION_DELIMITER,
                             DATA_DEFINITION_ENCODING,
                             INPUT_CRS,
@@ -173,7 +184,8 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
                             Y_UNIT,
                             JUDGE_COORDINATES_DISTRIBUTION_NAME,
                             GLTF_DIRECTORY_PATH,
-                            OUTPUT_ZIP_FLAG]
+                            OUTPUT_ZIP_FLAG,
+                            GLTF_OUTPUT_FORMAT]
 
     def __init__(self, **kwargs):
         pass
@@ -188,7 +200,7 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
 
         try:
 
-            # flowfileの属性からfilenameを取得(writestrに渡すため)
+            # flowfileの属性からfilenameを取得(ZIPエントリ名に使用するため)
             filename = flowfile.getAttribute("filename")
 
             # ---------------------------------------------------------------------------
@@ -230,6 +242,14 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
             output_zip_flag\
                 = context.getProperty(self.OUTPUT_ZIP_FLAG).evaluateAttributeExpressions(flowfile).getValue()
 
+            # glTFの出力形式
+            gltf_output_format\
+                = context.getProperty(self.GLTF_OUTPUT_FORMAT).getValue()
+
+            # GLB出力かどうかと、出力するファイルの拡張子
+            binary_flag = gltf_output_format == DDC.GLTF_OUTPUT_FORMAT_GLB
+            gltf_extension = DDC.GLTF_EXTENSION_DICT[gltf_output_format]
+
             # ---------------------------------------------------------------------------
 
             # ---------------------------------------------------------------------------
@@ -249,12 +269,12 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
                 = WM.calc_func_time(self.logger)(NSP.get_value_dwh_list_from_field_set_file_dataframe)(target_field_set_file_dataframe)
 
             # ---------------------------------------------------------------------------
-            # pyprojオブジェクト作成
+            # pyprojオブジェクト取得（同じCRSの組み合わせはキャッシュしたものを使う）
             # ---------------------------------------------------------------------------
             transformer_object\
-                = WM.calc_func_time(self.logger)(pyproj.Transformer.from_crs)(input_crs,
-                                                                              parameter_crs,
-                                                                              always_xy=True)
+                = WM.calc_func_time(self.logger)(DCP.get_transformer)(input_crs,
+                                                                      parameter_crs,
+                                                                      always_xy=True)
             # ---------------------------------------------------------------------------
 
             # ---------------------------------------------------------------------------
@@ -269,10 +289,10 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
             # mesh配列作成
             mesh_array = np.array([[x_unit, y_unit]])
 
-            # output用のfield_set_fileに格納用のlist
-            output_dwh_list = []
-            output_value_list = []
-            output_type_list = []
+            # output用のfield_set_fileの書き出し先
+            # glTFは生成した順に書き出し、全件をメモリ上に保持しない（ZIP圧縮する場合はZIPエントリに直接書き出す）
+            output_field_set_file_buffer\
+                = FSP.FieldSetFileBuffer(filename if output_zip_flag == ZIP_COMPRESSION_ENABLED else None)
             # ---------------------------------------------------------------------------
 
             # データ定義書ごとに処理
@@ -383,34 +403,41 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
 
                 # -----------------------------------------------------------------------------------------------------------
 
+                # -----------------------------------------------------------------------------------------------------------
+                # 【抽出】地物を国土基本図図郭に振り分ける 全地物を1回で振り分け、図郭ごとの判定は行わない
+                # -----------------------------------------------------------------------------------------------------------
+                # ラインの場合は交差判定を行い図郭内の延長の割合をもって判定する
+                if judge_geometry_type == DDC.LINESTRING_GEOMETRY_TYPE:
+                    unit_feature_index_list\
+                        = WM.calc_func_time(self.logger)(NSP.create_unit_feature_index_list)(judge_coordinates_array[:, 1:3],
+                                                                                            judge_start_index_array,
+                                                                                            judge_end_index_array,
+                                                                                            unit_origin_array,
+                                                                                            mesh_array)
+
+                # ポイントの場合は中心点がどの図郭に存在するかで判定する
+                elif judge_geometry_type == DDC.POINT_GEOMETRY_TYPE:
+                    point_index_array = np.arange(len(judge_coordinates_array))
+                    unit_feature_index_list\
+                        = WM.calc_func_time(self.logger)(NSP.create_unit_feature_index_list)(judge_coordinates_array[:, 1:3],
+                                                                                            point_index_array,
+                                                                                            point_index_array,
+                                                                                            unit_origin_array,
+                                                                                            mesh_array)
+                else:
+                    unit_feature_index_list = [[] for _ in range(len(unit_origin_array))]
+
+                # -----------------------------------------------------------------------------------------------------------
+
                 # 出力対象図郭ごとに処理
                 # ここから1つのメソッドとする
                 for ui in range(len(unit_origin_array)):
 
-                    # -----------------------------------------------------------------------------------------------------------
-                    # 【抽出】国土基本図図郭内に存在するlasの座標を抽出 bool配列なので属性も同様に抽出
-                    # -----------------------------------------------------------------------------------------------------------
-                    # ラインの場合は交差判定を行い図郭内の延長の割合をもって判定する
-                    if judge_geometry_type == DDC.LINESTRING_GEOMETRY_TYPE:
-                        feature_bool\
-                            = WM.calc_func_time(self.logger)(NSP.judge_citygmls)(judge_coordinates_array[:, 1:3],
-                                                                                 judge_start_index_array,
-                                                                                 judge_end_index_array,
-                                                                                 unit_origin_array[ui],
-                                                                                 mesh_array,
-                                                                                 coordinates_id_array)
-
-                    # ポイントの場合は中心点がどの図郭に存在するかで判定する
-                    elif judge_geometry_type == DDC.POINT_GEOMETRY_TYPE:
-                        feature_bool\
-                            = WM.calc_func_time(self.logger)(NSP.judge_point_in_unit)(judge_coordinates_array[:, 1:3],
-                                                                                      unit_origin_array[ui],
-                                                                                      mesh_array)
-                    else:
-                        continue
+                    # 図郭に振り分けられた地物のインデックス
+                    feature_index_array = unit_feature_index_list[ui]
 
                     # 出力対象がなければ次へ
-                    if np.any(feature_bool) == True:
+                    if len(feature_index_array) > 0:
                         pass
                     else:
                         continue
@@ -419,7 +446,7 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
                     target_attribute_dataframe, \
                         target_coordinates_array\
                         = WM.calc_func_time(self.logger)(NSP.extract_output_target)(all_attribute_dataframe,
-                                                                                    feature_bool,
+                                                                                    feature_index_array,
                                                                                     coordinates_id_array,
                                                                                     coordinates_dict)
 
@@ -430,7 +457,8 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
                                                                                                  unit_index_array,
                                                                                                  ui,
                                                                                                  gltf_directory_path,
-                                                                                                 uri_list)
+                                                                                                 uri_list,
+                                                                                                 gltf_extension)
 
                     # 図郭のxy中心点取得（原点とする点のこと）
                     unit_min_x, \
@@ -485,7 +513,8 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
                         target_gltf_object\
                             = WM.calc_func_time(self.logger)(NSP.create_gltf_object)(target_coordinates_array,
                                                                                      target_attribute_dataframe,
-                                                                                     list(matrix_array))
+                                                                                     list(matrix_array),
+                                                                                     binary_flag)
 
                     # ポイントの場合は中心点がどの図郭に存在するかで判定する
                     elif judge_geometry_type == DDC.POINT_GEOMETRY_TYPE:
@@ -493,20 +522,28 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
                         target_gltf_object\
                             = WM.calc_func_time(self.logger)(NSP.create_point_gltf_object)(target_coordinates_array,
                                                                                            target_attribute_dataframe,
-                                                                                           list(matrix_array))
+                                                                                           list(matrix_array),
+                                                                                           binary_flag)
 
-                    # 拡張子をつけて、output_dwh_listに格納
-                    output_dwh_list.append(gltf_file_name + ".gltf")
+                    # GLBの場合はバイナリglTFのバイト列に変換する
+                    if binary_flag:
+                        target_glb_bytes\
+                            = WM.calc_func_time(self.logger)(NSP.convert_gltf_to_glb)(target_gltf_object)
 
-                    # gltf_objectの型をoutput_type_listに格納
-                    output_type_list.append("str")
+                        # 拡張子をつけたファイル名、型、GLBのバイト列をFieldSetFileに書き出す
+                        output_field_set_file_buffer.write_row(gltf_file_name + gltf_extension,
+                                                               "bytes",
+                                                               target_glb_bytes)
 
-                    # glTFを、JSON形式にし、改行文字をwindows用に変換
-                    target_gltf_object_json\
-                        = WM.calc_func_time(self.logger)(NSP.convert_gltf_to_json_and_format_with_windows_newline)(target_gltf_object)
+                    else:
+                        # glTFを、JSON形式にし、改行文字をwindows用に変換
+                        target_gltf_object_json\
+                            = WM.calc_func_time(self.logger)(NSP.convert_gltf_to_json_and_format_with_windows_newline)(target_gltf_object)
 
-                    # JSON形式になったglTFをoutput_value_listに格納。
-                    output_value_list.append(target_gltf_object_json)
+                        # 拡張子をつけたファイル名、型、JSON形式になったglTFをFieldSetFileに書き出す
+                        output_field_set_file_buffer.write_row(gltf_file_name + gltf_extension,
+                                                               "str",
+                                                               target_gltf_object_json)
 
             # 全体の範囲求める
             region_list\
@@ -540,30 +577,17 @@ class ConvertFieldSetFileTo3DTilesByUnitThematic(FlowFileTransform):
                 = WM.calc_func_time(self.logger)(NSP.create_tileset_dict)(region_list,
                                                                           children_list)
 
-            # tileset.jsonのファイル名を、output_dwh_listに格納
-            output_dwh_list.append(DDC.JSON_FILE_NAME)
-
             # tileset_dictをJSON形式の文字列にし、改行文字をwindows用に変換する。
             tileset_json_string = (json.dumps(tileset_dict, ensure_ascii=False,
                                    indent=4, sort_keys=True, separators=(",", ": "))).replace("\n", "\r\n")
 
-            # tileset_json_stringの型とValueをそれぞれのlistに格納
-            output_type_list.append("str")
-            output_value_list.append(tileset_json_string)
-
-            output_field_set_file\
-                = WM.calc_func_time(self.logger)(PBP.set_field_set_file)(output_dwh_list, output_type_list,
-                                                                         output_value_list)
-
-            if output_zip_flag == ZIP_COMPRESSION_ENABLED:
-
-                # CSV形式の文字列をZIP圧縮
-                zip_buffer = io.BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
-                    zip_file.writestr(filename, output_field_set_file)
+            # tileset.jsonのファイル名、型、Valueを最終行として書き出す
+            output_field_set_file_buffer.write_row(DDC.JSON_FILE_NAME,
+                                                   "str",
+                                                   tileset_json_string)
 
-                # ZIPデータを取得
-                output_field_set_file = zip_buffer.getvalue()
+            # 書き出しを終了し、FieldSetFile（ZIP圧縮する場合はZIPデータ）を取得
+            output_field_set_file = output_field_set_file_buffer.getvalue()
 
             return FlowFileTransformResult(relationship="success", contents=output_field_set_file)
 
@@ -73,7 +73,20 @@ class ConvertFieldSetFileToGLTF(FlowFileTransform):
         expression_language_scope=ExpressionLanguageScope.NONE
     )
 
-    property_descriptors = [DATA_DEFINITION_DELIMITER]
+    # glTFの出力形式（glTF：JSON形式　GLB：バイナリ形式）
+    GLTF_OUTPUT_FORMAT = PropertyDescriptor(
+        name="glTF Output Format",
+        description="glTFの出力形式（GLBの場合はバッファをBase64に変換せずバイナリで出力する）",
+        default_value=DDC.GLTF_OUTPUT_FORMAT_GLTF,
+        allowable_values=[DDC.GLTF_OUTPUT_FORMAT_GLTF,
+                          DDC.GLTF_OUTPUT_FORMAT_GLB],
+        required=True,
+        sensitive=False,
+        expression_language_scope=ExpressionLanguageScope.NONE
+    )
+
+    property_descriptors = [DATA_DEFINITION_DELIMITER,
+                            GLTF_OUTPUT_FORMAT]
 
     def __init__(self, **kwargs):
         pass
@@ -91,13 +104,18 @@ class ConvertFieldSetFileToGLTF(FlowFileTransform):
 
         戻り値:
             data_definition_delimiter: データ定義ファイルの区切り文字(例:Comma)
+            gltf_output_format: glTFの出力形式(glTF or GLB)
         """
 
         # データ定義ファイルの区切り文字を、プロパティから取得。
         data_definition_delimiter = context.getProperty(
             self.DATA_DEFINITION_DELIMITER).getValue()
 
-        return data_definition_delimiter
+        # glTFの出力形式を、プロパティから取得。
+        gltf_output_format = context.getProperty(
+            self.GLTF_OUTPUT_FORMAT).getValue()
+
+        return data_definition_delimiter, gltf_output_format
 
     def get_flowfile(self, flowfile):
         """
@@ -183,9 +201,13 @@ class ConvertFieldSetFileToGLTF(FlowFileTransform):
     def transform(self, context, flowfile):
         try:
 
-            # プロパティで入力したdata_definition_delimiter(区切り文字)を取得する。
-            data_definition_delimiter = WM.calc_func_time(
-                self.logger)(self.get_property)(context)
+            # プロパティで入力したdata_definition_delimiter(区切り文字)、glTFの出力形式を取得する。
+            data_definition_delimiter, \
+                gltf_output_format\
+                = WM.calc_func_time(self.logger)(self.get_property)(context)
+
+            # GLB出力かどうか
+            binary_flag = gltf_output_format == DDC.GLTF_OUTPUT_FORMAT_GLB
 
             # flowfileのattributeからデータ定義ファイル、FieldSetFileを取得。
             data_definition_stream, \
@@ -225,9 +247,17 @@ class ConvertFieldSetFileToGLTF(FlowFileTransform):
 
             # glTFオブジェクトの取得
             target_gltf_object = WM.calc_func_time(self.logger)(NSP.create_gltf_object)(coordinates_array,
-                                                                                        all_attribute_dataframe
+                                                                                        all_attribute_dataframe,
+                                                                                        binary_flag=binary_flag
                                                                                         )
 
+            # GLBの場合はバイナリglTFのバイト列をそのまま出力する。
+            if binary_flag:
+                target_glb_bytes = WM.calc_func_time(self.logger)(
+                    NSP.convert_gltf_to_glb)(target_gltf_object)
+
+                return FlowFileTransformResult(relationship="success", contents=target_glb_bytes)
+
             # 出力用にJSON形式の文字列型にし、改行文字をwindowsに対応するように変更。
             target_gltf_object_json_string_windows\
                 = WM.calc_func_time(self.logger)(self.convert_gltf_to_obj_and_format_with_windows_newline)(target_gltf_object)
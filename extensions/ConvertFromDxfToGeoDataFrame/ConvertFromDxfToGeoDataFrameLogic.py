@@ -21,7 +21,6 @@
 # SOFTWARE.
 
 # Python標準ライブラリ
-import pickle
 import os
 from math import radians, cos, sin, pi
 from importlib import import_module
@@ -34,6 +33,7 @@ Point = getattr(import_module("shapely.geometry"), "Point")
 LineString = getattr(import_module("shapely.geometry"), "LineString")
 Polygon = getattr(import_module("shapely.geometry"), "Polygon")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import cad.common.cad_utils as CU
 
 
@@ -380,7 +380,7 @@ class ConvertFromDxfToGeoDataFrameLogic:
             if 'text' in gdf.columns:
                 gdf['text'] = gdf.get('text', '').astype('string')
 
-            output_content = pickle.dumps(gdf)
+            output_content = GCP.serialize_geodataframe(gdf)
 
             attribute = {'MaxLayerIndex': str(max_layer_index),
                          'CoordinateUnit': coordinate_unit
@@ -23,6 +23,7 @@
 import pickle
 import nifiapi.NifiCustomPackage.WrapperModule as WM
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 class ConvertFromGeoDataFrameToGeoNdarrayLogic:
 
@@ -45,7 +46,7 @@ class ConvertFromGeoDataFrameToGeoNdarrayLogic:
         try:
 
             # デシリアライズ
-            geodataframe = pickle.loads(serialize_dataframe)
+            geodataframe = GCP.deserialize_content(serialize_dataframe)
 
             # ジオメトリリストを作成
             geometry_list = list(geodataframe.geometry)
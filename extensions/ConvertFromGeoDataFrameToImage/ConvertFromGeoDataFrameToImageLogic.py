@@ -39,6 +39,7 @@ MultiPolygon = getattr(import_module("shapely.geometry"), "MultiPolygon")
 MultiLineString = getattr(import_module("shapely.geometry"), "MultiLineString")
 box = getattr(import_module("shapely.geometry"), "box")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import cad.common.cad_utils as CU
 
 
@@ -533,7 +534,7 @@ class ConvertFromGeoDataFrameToImageLogic:
         """
         try:
             # コンテンツ、属性、プロパティ読み込み
-            gdf = pickle.loads(byte_data)
+            gdf = GCP.deserialize_content(byte_data)
             clip_bounding_box = attribute.get("BoundingBox", None)
             clip_areas = attribute.get("ClipAreas", None)
             max_clip_areas = int(attribute.get("MaxClipAreas", 1))
@@ -22,13 +22,13 @@
 
 # Python標準ライブラリ
 from io import StringIO
-import pickle
 from importlib import import_module
 
 # 外部ライブラリの動的インポート
 np = import_module("numpy")
 
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 from cad.common import cad_utils as CU
 
 
@@ -133,7 +133,7 @@ class ConvertGeoDataFrameToFieldSetFileMultiLogic:
             all_params = self.get_params(properties, attribute)
 
             # FlowFileのコンテンツをデシリアライズしてGeoDataFrameを取得
-            geodataframe = pickle.loads(byte_data)
+            geodataframe = GCP.deserialize_content(byte_data)
 
             # GeoDataFrameからFieldSetFileを生成
             field_set_file = self.convert_geodataframe_to_field_set_file(geodataframe, all_params)
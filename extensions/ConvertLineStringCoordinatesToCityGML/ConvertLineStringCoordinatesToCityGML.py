@@ -27,7 +27,6 @@
 
 # Python標準ライブラリ
 import io
-import zipfile
 import traceback
 import pickle
 import base64
@@ -40,7 +39,7 @@ from importlib import import_module
 
 # NiFi自作ライブラリ
 import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
-import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
 
@@ -248,13 +247,8 @@ class ConvertLineStringCoordinatesToCityGML(FlowFileTransform):
         geometry_value_coordinates_array = pickle.loads(base64.b64decode(
             field_set_file_data_frame.loc[field_set_file_data_frame["Dwh"] == geometry_dwh_file_name_list[0], "Value"].values[0]))
 
-        # geometry_value_coordinates_array から重複した要素を取り除いた座標IDを取得
-        coordinates_id_array = np.unique(
-            geometry_value_coordinates_array[:, 0])
-
         # coordinates_dict を生成
-        coordinates_dict = {coordinates_id_array[i]: geometry_value_coordinates_array[list(np.where(
-            geometry_value_coordinates_array[:, 0] == coordinates_id_array[i])[0])] for i in range(len(coordinates_id_array))}
+        coordinates_id_array, coordinates_dict = NSP.create_id_array_dict(geometry_value_coordinates_array)
 
         return coordinates_id_array, coordinates_dict
 
@@ -296,9 +290,7 @@ class ConvertLineStringCoordinatesToCityGML(FlowFileTransform):
 
         linestring_array = pickle.loads(base64.b64decode(
             field_set_file_data_frame.loc[field_set_file_data_frame["Dwh"] == center_dwh_name, "Value"].values[0]))
-        linestring_id_array = np.unique(linestring_array[:, 0])
-        linestring_dict = {linestring_id_array[i]: linestring_array[list(np.where(
-            linestring_array[:, 0] == linestring_id_array[i])[0]), 1:4] for i in range(len(linestring_id_array))}
+        linestring_id_array, linestring_dict = NSP.create_id_array_dict(linestring_array, column_slice=slice(1, 4))
 
         return linestring_id_array, linestring_dict
 
@@ -453,14 +445,10 @@ class ConvertLineStringCoordinatesToCityGML(FlowFileTransform):
         # idのみ
         id_array = multipatch_array2[:, 0]
 
-        # unique_id
-        id_unique_array = np.unique(id_array)
-
         # ここで地物idごとのインデックス取得
 
         # IDごとの構成点座標取得（キー：地物ID、値：地物IDの構成点のxyz座標）
-        id_coordinate_dict = {id_unique_array[i]: geometry_array[list(np.where(
-            id_array == id_unique_array[i])[0]), :] for i in range(len(id_unique_array))}
+        id_unique_array, id_coordinate_dict = NSP.create_id_array_dict(geometry_array, id_array=id_array)
 
         return id_coordinate_dict
 
@@ -739,7 +727,7 @@ class ConvertLineStringCoordinatesToCityGML(FlowFileTransform):
 
         try:
 
-            # flowfileの属性からfilenameを取得(writestrに渡すため)
+            # flowfileの属性からfilenameを取得(ZIPエントリ名に使用するため)
             filename = flowfile.getAttribute("filename")
 
             data_definition_delimiter, \
@@ -808,10 +796,16 @@ class ConvertLineStringCoordinatesToCityGML(FlowFileTransform):
                 self.get_gml_id_array_from_field_set_file_data_frame)(field_set_file_data_frame, gml_id_dwh_name)
             # -----------------------------------------------------------------------------------------------------------
 
-            # output用にリストに追加
-            dwh_list = []
-            type_list = []
-            xml_value_list = []
+            # output用のfield_set_fileの書き出し先
+            # 図郭ごとのXML文字列は生成した順に書き出し、全件をメモリ上に保持しない（ZIP圧縮する場合はZIPエントリに直接書き出す）
+            output_field_set_file_buffer = FSP.FieldSetFileBuffer(filename if output_zip_flag == ZIP_COMPRESSION_ENABLED else None)
+
+            # -----------------------------------------------------------------------------------------------------------
+            # 【抽出】全地物を出力対象図郭に1回で振り分ける
+            # -----------------------------------------------------------------------------------------------------------
+            unit_feature_index_list = WM.calc_func_time(self.logger)(NSP.create_unit_feature_index_list_from_unit_code)(
+                [linestring_dict[linestring_id_array[i]][:, :2] for i in range(len(linestring_id_array))], target_unit_code_list)
+            # -----------------------------------------------------------------------------------------------------------
 
             # 出力対象図郭ごとに処理
             for target_unit_code_list_index in range(len(target_unit_code_list)):
@@ -826,8 +820,8 @@ class ConvertLineStringCoordinatesToCityGML(FlowFileTransform):
                 # -----------------------------------------------------------------------------------------------------------
                 # 【抽出】ジオメトリ指定図郭内に存在するかチェック
                 # -----------------------------------------------------------------------------------------------------------
-                feature_bool = [WM.calc_func_time(self.logger)(NSP.judge_citygml)(
-                    linestring_dict[linestring_id_array[i]][:, :2], unit_origin_array, level_mesh_array) for i in range(len(linestring_id_array))]
+                feature_bool = np.zeros(len(linestring_id_array), dtype=np.bool_)
+                feature_bool[unit_feature_index_list[target_unit_code_list_index]] = True
 
                 # 出力対象がなければ次へ
                 if np.any(feature_bool) == True:
@@ -1074,26 +1068,23 @@ class ConvertLineStringCoordinatesToCityGML(FlowFileTransform):
             # -----------------------------------------------------------------------------------------------------------
 
                 dwh_list, type_list, xml_value_list = WM.calc_func_time(self.logger)(self.xml_element_to_string_and_add_list)(output_element_core,
-                                                                                                                              xml_value_list,
-                                                                                                                              type_list,
-                                                                                                                              dwh_list,
+                                                                                                                              [],
+                                                                                                                              [],
+                                                                                                                              [],
                                                                                                                               target_unit_code_list,
                                                                                                                               DDC.TARGET_PREFIX,
                                                                                                                               target_plateau_crs,
                                                                                                                               target_unit_code_list_index)
 
-                output_field_set_file = WM.calc_func_time(self.logger)(
-                    PBP.set_field_set_file)(dwh_list, type_list, xml_value_list)
-
-                if output_zip_flag == ZIP_COMPRESSION_ENABLED:
+                # 図郭のXML文字列をFieldSetFileに書き出す
+                output_field_set_file_buffer.write_rows(dwh_list, type_list, xml_value_list)
 
-                    # CSV形式の文字列をZIP圧縮
-                    zip_buffer = io.BytesIO()
-                    with zipfile.ZipFile(zip_buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
-                        zip_file.writestr(filename, output_field_set_file)
+            # 出力対象図郭が1件もない場合は出力するFieldSetFileがないため失敗とする
+            if output_field_set_file_buffer.row_count == 0:
+                raise ValueError("出力対象の図郭が存在しません")
 
-                    # ZIPデータを取得
-                    output_field_set_file = zip_buffer.getvalue()
+            # 書き出しを終了し、FieldSetFile（ZIP圧縮する場合はZIPデータ）を取得
+            output_field_set_file = output_field_set_file_buffer.getvalue()
 
             return FlowFileTransformResult(relationship="success", contents=output_field_set_file)
 
@@ -36,6 +36,7 @@ from importlib import import_module
 # NiFi自作ライブラリ
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 # NiFiライブラリ
 from nifiapi.flowfiletransform import FlowFileTransform, FlowFileTransformResult
@@ -81,7 +82,7 @@ class ConvertMultipartToSinglepart(FlowFileTransform):
         serialize_dataframe = flowfile.getContentsAsBytes()
 
         # バイトデータからGeoDataFrameを復元する
-        geodataframe = pickle.loads(serialize_dataframe)
+        geodataframe = GCP.deserialize_content(serialize_dataframe)
 
         return geodataframe
 
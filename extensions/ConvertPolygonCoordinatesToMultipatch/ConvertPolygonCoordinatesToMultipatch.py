@@ -33,6 +33,7 @@ import traceback
 from importlib import import_module
 
 # NiFi自作ライブラリ
+import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
 import nifiapi.NifiCustomPackage.NifiComplicationPackage as NCP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
@@ -224,9 +225,7 @@ class ConvertPolygonCoordinatesToMultipatch(FlowFileTransform):
         # 地物ごとにデータを分ける
         # 地物IDarray→抽出済みのIDになる
         # IDごとの構成点座標取得（キー：地物ID、値：地物IDの構成点のxyz座標）
-        id_unique_array = np.unique(coordinates_array[:, 0])
-        id_coordinate_dict = {id_unique_array[i]: coordinates_array[list(np.where(
-            coordinates_array[:, 0] == id_unique_array[i])[0]), 1:4] for i in range(len(id_unique_array))}
+        id_unique_array, id_coordinate_dict = NSP.create_id_array_dict(coordinates_array, column_slice=slice(1, 4))
 
         return id_unique_array, id_coordinate_dict
 
@@ -34,6 +34,7 @@ from importlib import import_module
 
 
 # Nifi自作ライブラリ
+import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
 
@@ -118,12 +119,8 @@ class CreateFieldMaxMinZFromCoordinates(FlowFileTransform):
             target_dict: IDも含むXYZ座標の辞書のタプル
         """
 
-        # 座標のIDを配列に格納。
-        target_id_array = np.unique(geometry_value_coordinates_array[:, 0])
-
-        # 辞書型の座標情報を設定。
-        target_dict = {target_id_array[i]: geometry_value_coordinates_array[list(np.where(
-            geometry_value_coordinates_array[:, 0] == target_id_array[i])[0])] for i in range(len(target_id_array))}
+        # 座標のIDを配列に格納し、辞書型の座標情報を設定。
+        target_id_array, target_dict = NSP.create_id_array_dict(geometry_value_coordinates_array)
 
         return target_id_array, target_dict
 
@@ -31,6 +31,7 @@ import traceback
 from importlib import import_module
 
 # Nifi自作ライブラリ
+import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
 import nifiapi.NifiCustomPackage.NifiComplicationPackage as NCP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
@@ -100,12 +101,8 @@ class CreateGradientFromCoordinates(FlowFileTransform):
             target_dict: IDごとのXYZ座標を含む辞書のタプル
         """
 
-        # ID取得
-        target_id_array = np.unique(geometry_value_coordinates_array[:, 0])
-
-        # IDごとのXYZ座標を含む辞書を作成
-        target_dict = {target_id_array[i]: geometry_value_coordinates_array[list(np.where(
-            geometry_value_coordinates_array[:, 0] == target_id_array[i])[0]), 1:4] for i in range(len(target_id_array))}
+        # ID取得とIDごとのXYZ座標を含む辞書を作成
+        target_id_array, target_dict = NSP.create_id_array_dict(geometry_value_coordinates_array, column_slice=slice(1, 4))
 
         return target_id_array, target_dict
 
@@ -31,6 +31,7 @@ Polygon = getattr(import_module("shapely.geometry"), "Polygon")
 polygonize = getattr(import_module("shapely.ops"), "polygonize")
 
 import cad.common.cad_utils as CU
+import cad.common.cad_topology as CT
 
 
 class CreatePolygonsFromLineStringsLogic:
@@ -38,8 +39,7 @@ class CreatePolygonsFromLineStringsLogic:
         """
         CreatePolygonsFromLineStringsLogic クラスのコンストラクタ。
         """
-        self.kdtree = None
-        self.z_values = None
+        pass
 
     def check_params(self, attribute, properties):
         """
@@ -197,52 +197,33 @@ class CreatePolygonsFromLineStringsLogic:
         except Exception as e:
             raise Exception(f"[unity_geom_types_into_linestring_Exception]: {str(e)}")
         
-    def build_kdtree(self, lines_geo_series):
+    def remove_dangles(self, lines):
         """
-        KDTree を構築し、LineString の頂点座標 (X, Y) をツリーに登録する。
+        ポリゴンの外周にならない行き止まりのLineStringを取り除く。
+        端点のXY座標が一致するLineString同士を接続とみなし、次数が1の端点を持つLineStringを繰り返し取り除く。
 
-        :param lines_geo_series: LineString のリストを含む GeoSeries。
-        :type lines_geo_series: pandas.Series (shapely.geometry.LineString)
+        :param lines: LineStringのリスト。
+        :type lines: list[shapely.geometry.LineString]
 
-        :raises Exception: KDTree の構築に失敗した場合に例外をスローする。
-        """
-        all_coords = []
-        all_z_values = []
-        
-        for line in lines_geo_series:
-            if isinstance(line, LineString):
-                coords = np.array(line.coords)
-                all_coords.extend(coords[:, :2])  # X, Y
-                all_z_values.extend(coords[:, 2])  # Z
-
-        # KDTreeを構築
-        self.kdtree = KDTree(np.array(all_coords))
-        self.z_values = np.array(all_z_values)
+        :return: 行き止まりを取り除いたLineStringのリスト。
+        :rtype: list[shapely.geometry.LineString]
 
-    def apply_z_to_polygons_kdtree(self, polygons):
+        :raises Exception: 処理中にエラーが発生した場合に例外をスローする。
         """
-        生成した2Dポリゴンに KDTree を用いて Z座標を適用し、3Dポリゴンを生成する。
-
-        :param polygons: 2Dポリゴンのリスト。
-        :type polygons: list[shapely.geometry.Polygon]
-
-        :return: Z座標が適用された3Dポリゴンのリスト。
-        :rtype: list[shapely.geometry.Polygon]
-
-        :raises Exception: Z座標の適用処理中にエラーが発生した場合に例外をスローする。
-        """
-        updated_polygons = []
+        try:
+            if len(lines) == 0:
+                return lines
 
-        for polygon in polygons:
-            coords_2d = np.array(polygon.exterior.coords)[:, :2]
+            start_points = [line.coords[0][:2] for line in lines]
+            end_points = [line.coords[-1][:2] for line in lines]
 
-            # KDTree を利用して最近傍のZ座標を取得
-            _, nearest_indices = self.kdtree.query(coords_2d)
-            coords_3d = np.column_stack((coords_2d, self.z_values[nearest_indices]))
+            network = CT.LineNetwork.from_endpoints(start_points, end_points)
+            network.prune_dangles()
 
-            updated_polygons.append(Polygon(coords_3d))
+            return [line for line, is_active in zip(lines, network.edge_active) if is_active]
 
-        return updated_polygons
+        except Exception as e:
+            raise Exception(f"[remove_dangles_Exception]: {str(e)}")
 
     def create_polygons_from_linestrings(self, fsf, props):
         """
@@ -265,18 +246,15 @@ class CreatePolygonsFromLineStringsLogic:
             # GeoDataFrameから全てLineString形式でジオメトリデータを取得
             lines_geo_series = geo_df.geometry.apply(lambda geom: self.unity_geom_types_into_linestring(geom))
 
+            # 行き止まりのLineStringはポリゴンにならないため、事前に取り除く
+            lines = self.remove_dangles(lines_geo_series.tolist())
+
             # LineStringをPolygonに変換
-            polygons = list(polygonize(lines_geo_series.tolist()))
+            polygons = list(polygonize(lines))
 
             if len(polygons) < 1:
                 # ポリゴンが生成されない場合、例外処理を発生させる
                 raise Exception(f"ポリゴンが生成できません")
-    
-            # **KDTree を 1回だけ構築**
-            self.build_kdtree(lines_geo_series)            
-                
-            # **KDTree を用いて Z座標を適用**
-            polygons_3d = self.apply_z_to_polygons_kdtree(polygons)
 
             # Polygonの座標情報を座標配列(GeoNdarray)に変換（※ドーナツ型のPolygonを考慮に入れる）
             polygon_geo_ndarray = self.convert_from_polygons_to_geo_ndarray(
@@ -144,25 +144,29 @@ class DividePipeLineLogic:
             main_geom = None
             main_fid = None
 
+            # FIDからgeometryの位置を引く辞書（FIDが重複する場合は先頭の位置）
+            main_index_dict = {}
+            for index, fid in enumerate(main_dict_list["FID"]):
+                main_index_dict.setdefault(fid, index)
+            sub_index_dict = {}
+            for index, fid in enumerate(sub_dict_list["FID"]):
+                sub_index_dict.setdefault(fid, index)
+
+            # 管路情報のFIDごとに、紐づく旗上げ線のFIDを元の順番でまとめる
+            main_sub_dict = defaultdict(list)
+            for main, sub in zip(target_lines["main"], target_lines["sub"]):
+                main_sub_dict[main].append(sub)
+
             # 管路情報と旗上げ線を紐づけ、各交点を求める
             for set_main_fid in list(set(target_lines["main"])):
                 linked_geometries = []
-                for main, sub in list(zip(target_lines["main"], target_lines["sub"])):
-
-                    # FIDが違う場合は処理をスキップ
-                    if not set_main_fid == main:
-                        continue
-
+                for sub in main_sub_dict[set_main_fid]:
                     # 管路情報のFIDからgeometryを取得
-                    main_geom = main_dict_list["geometry"][
-                        main_dict_list["FID"].index(main)
-                    ]
-                    main_fid = main
+                    main_geom = main_dict_list["geometry"][main_index_dict[set_main_fid]]
+                    main_fid = set_main_fid
 
                     # 旗上げ線のFIDのからgeometryを取得
-                    sub_geom = sub_dict_list["geometry"][
-                        sub_dict_list["FID"].index(sub)
-                    ]
+                    sub_geom = sub_dict_list["geometry"][sub_index_dict[sub]]
 
                     # 交点を取得
                     point_on_main, point_on_sub = nearest_points(main_geom, sub_geom)
@@ -357,16 +361,22 @@ class DividePipeLineLogic:
                 df["Dwh"].index[df["Dwh"].str.contains(attribute_main)].values[0]
             )
             sub_index = df["Dwh"].index[df["Dwh"].str.contains(attribute_sub)].values[0]
+            target_set = set(target_list)
             new_fid_values = [
-                item for item in df.at[main_index, "Value"] if item not in target_list
+                item for item in df.at[main_index, "Value"] if item not in target_set
             ]
 
+            # 値から先頭の位置を引く辞書
+            value_index_dict = {}
+            for index, item in enumerate(df.at[main_index, "Value"]):
+                value_index_dict.setdefault(item, index)
+
             # 削除するインデックスを取得
-            removed_indices = [
-                df.at[main_index, "Value"].index(item)
+            removed_indices = {
+                value_index_dict[item]
                 for item in target_list
-                if item in df.at[main_index, "Value"]
-            ]
+                if item in value_index_dict
+            }
 
             # FIDの行を更新
             df.at[main_index, "Value"] = new_fid_values
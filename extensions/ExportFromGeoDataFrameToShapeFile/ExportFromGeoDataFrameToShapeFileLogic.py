@@ -21,7 +21,9 @@
 # SOFTWARE.
 
 import os
-import pickle
+
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
+
 
 class ExportFromGeoDataFrameToShapeFileLogic:
 
@@ -49,7 +51,7 @@ class ExportFromGeoDataFrameToShapeFileLogic:
             output_directory = properties['OUTPUT_DIRECTORY']
 
             # デシリアライズ
-            geodataframe = pickle.loads(byte_data)
+            geodataframe = GCP.deserialize_content(byte_data)
 
             # ジオメトリタイプを取得
             geometry_type = geodataframe.geometry.geom_type.unique()[0]
@@ -28,6 +28,8 @@ from importlib import import_module
 gpd = import_module("geopandas")
 shapely = import_module("shapely")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
+
 
 class ExtractGeometryFromGeoDataFrameLogic:
     def __call__(self, serialized_contents, attribute, properties):
@@ -61,7 +63,7 @@ class ExtractGeometryFromGeoDataFrameLogic:
                 raise Exception(f'[selected_layer_list]:{selected_layer_list}:{layer_name}')
 
             # FlowFileをデシリアライズしDataFrameを取得
-            geodataframe = pickle.loads(serialized_contents)
+            geodataframe = GCP.deserialize_content(serialized_contents)
 
             # 対象ジオメトリタイプを取得
             geometry_types = geodataframe.geometry.geom_type
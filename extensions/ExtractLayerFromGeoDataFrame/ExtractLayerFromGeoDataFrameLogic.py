@@ -20,7 +20,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import pickle
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 class ExtractLayerFromGeoDataFrameLogic:
     def __call__(self, serialized_contents, attribute, properties):
@@ -40,7 +40,7 @@ class ExtractLayerFromGeoDataFrameLogic:
         :raises Exception: 指定されたレイヤが見つからない場合や、処理中にエラーが発生した場合に例外をスローする。
         """
         try:
-            gdf = pickle.loads(serialized_contents)
+            gdf = GCP.deserialize_content(serialized_contents)
 
             # FlowFileの複製インデックス番号を取得
             layer_index = int(attribute.get('copy.index', 0))
@@ -56,7 +56,7 @@ class ExtractLayerFromGeoDataFrameLogic:
             unique_geom_types = geometry_types.unique()
             max_geometry_index = len(unique_geom_types) - 1
 
-            output_contents = pickle.dumps(sub_gdf)
+            output_contents = GCP.serialize_geodataframe(sub_gdf)
 
             attribute = {
                 'MaxGeometryIndex': str(max_geometry_index),
@@ -23,6 +23,7 @@
 import pickle
 import math
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import cad.common.cad_utils as CU
 from importlib import import_module
 
@@ -128,7 +129,7 @@ class ExtractLineCoordinatesLogic:
 
             if input_data_type == "Geo Data Frame":
                 # バイトデータからGeoDataFrameを復元する
-                dataframe = pickle.loads(byte_data)
+                dataframe = GCP.deserialize_content(byte_data)
                 geometry_list = dataframe["geometry"].tolist()
                 fid_list = [(item, float(idx)) for idx, item in enumerate(dataframe["FID"].tolist())]
             else:
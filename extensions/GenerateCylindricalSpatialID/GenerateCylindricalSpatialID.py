@@ -29,7 +29,6 @@ from importlib import import_module
 
 # 外部ライブラリの動的インポート
 np = import_module("numpy")
-pyproj = import_module("pyproj")
 b1 = getattr(import_module("numba"), "b1")
 f8 = getattr(import_module("numba"), "f8")
 i8 = getattr(import_module("numba"), "i8")
@@ -40,6 +39,7 @@ Dict = getattr(import_module("numba.typed"), "Dict")
 Delaunay = getattr(import_module("scipy.spatial"), "Delaunay")
 
 import cad.common.cad_utils as CU
+import nifiapi.NifiCustomPackage.DigilineCommonPackage as DCP
 import nifiapi.NifiCustomPackage.NifiComplicationPackage as NCP
 
 from nifiapi.properties import (
@@ -512,13 +512,10 @@ class GenerateCylindricalSpatialID(FlowFileTransform):
         # 日本測地系2011（JGD2011）の地理座標系（緯度・経度）に変更
         geo_epsg = 6668  # WGS84のEPSGコード
 
-        # 座標変換オブジェクトを作成
-        transformer = pyproj.Transformer.from_crs(
-            f"EPSG:{org_crs}", f"EPSG:{geo_epsg}", always_xy=True)
-
         # 平面直角座標から経度緯度に変換
-        xyz_array[:, 0], xyz_array[:, 1] = transformer.transform(
-            xyz_array[:, 0], xyz_array[:, 1])
+        # 座標変換オブジェクトはキャッシュしたものを使い、大量の座標は分割して並列に変換する
+        xyz_array[:, 0], xyz_array[:, 1] = DCP.transform_xy_coordinates_array(
+            xyz_array[:, 0], xyz_array[:, 1], f"EPSG:{org_crs}", f"EPSG:{geo_epsg}")
 
     def calc_index(self, xyz_list, zoom_level):
         """
@@ -29,10 +29,10 @@ from importlib import import_module
 
 # 外部ライブラリの動的インポート
 np = import_module("numpy")
-pyproj = import_module("pyproj")
 b1 = getattr(import_module("numba"), "b1")
 f8 = getattr(import_module("numba"), "f8")
 i8 = getattr(import_module("numba"), "i8")
+u1 = getattr(import_module("numba"), "u1")
 jit = getattr(import_module("numba"), "jit")
 prange = getattr(import_module("numba"), "prange")
 types = getattr(import_module("numba.core"), "types")
@@ -40,7 +40,9 @@ Dict = getattr(import_module("numba.typed"), "Dict")
 Delaunay = getattr(import_module("scipy.spatial"), "Delaunay")
 
 import cad.common.cad_utils as CU
+import nifiapi.NifiCustomPackage.DigilineCommonPackage as DCP
 import nifiapi.NifiCustomPackage.NifiComplicationPackage as NCP
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
 
 from nifiapi.properties import (
     PropertyDescriptor,
@@ -309,6 +311,212 @@ def calculate_indices(x_list, lat_rad_list, h_list, n, n_v_ratio, pi_reciprocal)
     return xidx_list, yidx_list, zidx_list
 
 
+# 空間IDのボクセルキーのビット数（符号ビットを除いたint64の範囲）
+VOXEL_KEY_BITS = 63
+
+
+def pack_voxel_indices(x_index_array, y_index_array, f_index_array):
+    """
+    x, y, fインデックスを1つのint64のボクセルキーに詰める。
+    各インデックスは最小値からのオフセットとし、x, y, fの順に上位ビットから配置するため、
+    キーの大小順は(x, y, f)の辞書順と一致する。
+
+    :param x_index_array: Xインデックスの配列。
+    :type x_index_array: numpy.ndarray
+
+    :param y_index_array: Yインデックスの配列。
+    :type y_index_array: numpy.ndarray
+
+    :param f_index_array: Fインデックスの配列。
+    :type f_index_array: numpy.ndarray
+
+    :return: ボクセルキーの配列と、展開に使用するパラメータ(x, y, fの最小値, yのビット数, fのビット数)。
+        ビット数の合計がint64に収まらない場合はNone。
+    :rtype: tuple(numpy.ndarray, tuple) or None
+    """
+    x_min = int(x_index_array.min())
+    y_min = int(y_index_array.min())
+    f_min = int(f_index_array.min())
+
+    x_bits = (int(x_index_array.max()) - x_min).bit_length()
+    y_bits = (int(y_index_array.max()) - y_min).bit_length()
+    f_bits = (int(f_index_array.max()) - f_min).bit_length()
+
+    if x_bits + y_bits + f_bits > VOXEL_KEY_BITS:
+        return None
+
+    voxel_key_array = ((x_index_array - x_min) << (y_bits + f_bits)) \
+        | ((y_index_array - y_min) << f_bits) \
+        | (f_index_array - f_min)
+
+    return voxel_key_array.astype(np.int64), (x_min, y_min, f_min, y_bits, f_bits)
+
+
+def unpack_voxel_indices(voxel_key_array, pack_params):
+    """
+    pack_voxel_indicesで詰めたボクセルキーをx, y, fインデックスに戻す。
+
+    :param voxel_key_array: ボクセルキーの配列。
+    :type voxel_key_array: numpy.ndarray
+
+    :param pack_params: pack_voxel_indicesが返したパラメータ。
+    :type pack_params: tuple
+
+    :return: X, Y, Fインデックスの配列。
+    :rtype: tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    """
+    x_min, y_min, f_min, y_bits, f_bits = pack_params
+
+    x_index_array = (voxel_key_array >> (y_bits + f_bits)) + x_min
+    y_index_array = ((voxel_key_array >> f_bits) & ((1 << y_bits) - 1)) + y_min
+    f_index_array = (voxel_key_array & ((1 << f_bits) - 1)) + f_min
+
+    return x_index_array, y_index_array, f_index_array
+
+
+def unique_voxel_indices(x_index_array, y_index_array, f_index_array):
+    """
+    (x, y, f)インデックスの組の重複を除き、(x, y, f)の辞書順に並べる。
+    int64のボクセルキーに詰めて重複を除き、キーに収まらない範囲の場合は行単位で重複を除く。
+
+    :param x_index_array: Xインデックスの配列。
+    :type x_index_array: numpy.ndarray
+
+    :param y_index_array: Yインデックスの配列。
+    :type y_index_array: numpy.ndarray
+
+    :param f_index_array: Fインデックスの配列。
+    :type f_index_array: numpy.ndarray
+
+    :return: 重複を除いたX, Y, Fインデックスの配列。
+    :rtype: tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    """
+    x_index_array = np.asarray(x_index_array, dtype=np.int64)
+    y_index_array = np.asarray(y_index_array, dtype=np.int64)
+    f_index_array = np.asarray(f_index_array, dtype=np.int64)
+
+    if len(x_index_array) == 0:
+        return x_index_array, y_index_array, f_index_array
+
+    packed = pack_voxel_indices(x_index_array, y_index_array, f_index_array)
+
+    if packed is None:
+        unique_combinations = np.unique(np.stack((x_index_array, y_index_array, f_index_array), axis=1), axis=0)
+        return unique_combinations[:, 0], unique_combinations[:, 1], unique_combinations[:, 2]
+
+    voxel_key_array, pack_params = packed
+
+    return unpack_voxel_indices(np.unique(voxel_key_array), pack_params)
+
+
+@jit("i8(i8)", nopython=True, cache=True, nogil=True)
+def count_digits(value):
+    """
+    整数を10進数の文字列にした場合の文字数（負の場合は符号を含む）を数える。
+
+    :param value: 整数。
+    :type value: int
+
+    :return: 文字数。
+    :rtype: int
+    """
+    length = 1
+    if value < 0:
+        length += 1
+        value = -value
+    while value >= 10:
+        value //= 10
+        length += 1
+    return length
+
+
+@jit("i8(u1[:], i8, i8)", nopython=True, cache=True, nogil=True)
+def write_digits(buffer, position, value):
+    """
+    整数を10進数のASCII文字としてバッファに書き込む。
+
+    :param buffer: 書き込み先のバッファ。
+    :type buffer: numpy.ndarray
+
+    :param position: 書き込み開始位置。
+    :type position: int
+
+    :param value: 整数。
+    :type value: int
+
+    :return: 書き込み終了位置（次の書き込み開始位置）。
+    :rtype: int
+    """
+    end_position = position + count_digits(value)
+    if value < 0:
+        buffer[position] = 45  # '-'
+        value = -value
+
+    cursor = end_position - 1
+    while True:
+        buffer[cursor] = 48 + value % 10  # '0'からの差分
+        value //= 10
+        cursor -= 1
+        if value == 0:
+            break
+    return end_position
+
+
+@jit("u1[:](u1[:], i8[:], i8[:], i8[:], u1[:])", nopython=True, cache=True, nogil=True)
+def format_spatial_id_lines(prefix, f_index_array, x_index_array, y_index_array, suffix):
+    """
+    空間IDの行（prefix + "f/x/y" + suffix）を改行区切りでUTF-8のバイト列に書き出す。
+    最終行の末尾にも改行を付与する。
+
+    :param prefix: 行頭のバイト列（引用符とズームレベル）。
+    :type prefix: numpy.ndarray
+
+    :param f_index_array: Fインデックスの配列。
+    :type f_index_array: numpy.ndarray
+
+    :param x_index_array: Xインデックスの配列。
+    :type x_index_array: numpy.ndarray
+
+    :param y_index_array: Yインデックスの配列。
+    :type y_index_array: numpy.ndarray
+
+    :param suffix: 行末のバイト列（FID、開始日、終了日）。
+    :type suffix: numpy.ndarray
+
+    :return: 書き出したバイト列。
+    :rtype: numpy.ndarray
+    """
+    # 書き出す全体のバイト数を求める（区切りの'/'2つと改行1つを含む）
+    total_length = 0
+    for i in range(len(f_index_array)):
+        total_length += len(prefix) + len(suffix) + 3 \
+            + count_digits(f_index_array[i]) + count_digits(x_index_array[i]) + count_digits(y_index_array[i])
+
+    buffer = np.empty(total_length, dtype=np.uint8)
+    position = 0
+    for i in range(len(f_index_array)):
+        buffer[position:position + len(prefix)] = prefix
+        position += len(prefix)
+
+        position = write_digits(buffer, position, f_index_array[i])
+        buffer[position] = 47  # '/'
+        position += 1
+
+        position = write_digits(buffer, position, x_index_array[i])
+        buffer[position] = 47  # '/'
+        position += 1
+
+        position = write_digits(buffer, position, y_index_array[i])
+
+        buffer[position:position + len(suffix)] = suffix
+        position += len(suffix)
+
+        buffer[position] = 10  # '\n'
+        position += 1
+
+    return buffer
+
+
 @jit("f8[:](f8, f8, f8)", nopython=True, cache=True, nogil=True)
 def generate_z_values(initial_z, max_height, interval):
     """
@@ -1060,13 +1268,10 @@ class GenerateSpatialID(FlowFileTransform):
         # 日本測地系2011（JGD2011）の地理座標系（緯度・経度）に変更
         geo_epsg = 6668  # WGS84のEPSGコード
 
-        # 座標変換オブジェクトを作成
-        transformer = pyproj.Transformer.from_crs(
-            f"EPSG:{org_crs}", f"EPSG:{geo_epsg}", always_xy=True)
-
         # 平面直角座標から経度緯度に変換
-        xyz_array[:, 0], xyz_array[:, 1] = transformer.transform(
-            xyz_array[:, 0], xyz_array[:, 1])
+        # 座標変換オブジェクトはキャッシュしたものを使い、大量の座標は分割して並列に変換する
+        xyz_array[:, 0], xyz_array[:, 1] = DCP.transform_xy_coordinates_array(
+            xyz_array[:, 0], xyz_array[:, 1], f"EPSG:{org_crs}", f"EPSG:{geo_epsg}")
 
     def calc_index(self, xyz_list, zoom_level):
         """
@@ -1097,30 +1302,55 @@ class GenerateSpatialID(FlowFileTransform):
         # x, y, zインデックスを計算（numbaで高速化）
         return calculate_indices(x_list, lat_rad_list, h_list, n, n_v_ratio, pi_reciprocal)
 
-    def generate_spatial_strings(self, zoom_level, x_index_list, y_index_list, f_index_list, fid, df):
+    def get_date_string_array(self, df, day_col, default_date):
         """
-        指定された情報から空間ID文字列を効率的に生成する。
+        開始日または終了日の列から、空間IDの文字列に出力する日付の文字列を取得する。
+
+        :param df: 開始日、終了日を含むDataFrame
+        :type df: pandas.DataFrame
+
+        :param day_col: 開始日または終了日の属性名
+        :type day_col: str
+
+        :param default_date: 属性が存在しない場合の日付
+        :type default_date: str
+
+        :return: 日付の文字列の配列（属性が存在しない場合は既定の日付1件）
+        :rtype: numpy.ndarray
+        """
+        if day_col in df["Dwh"].values:
+            return df[df["Dwh"].str.contains(day_col, na=False)]['Value'].fillna(default_date).astype(str).to_numpy()
+
+        return np.array([default_date], dtype=np.object_)
+
+    def generate_spatial_strings(self, zoom_level, x_index_list, y_index_list, f_index_list, fid,
+                                 start_date_array, end_date_array):
+        """
+        重複を除いた(x, y, f)インデックスから、空間IDの行を改行区切りの文字列として一括で生成する。
 
         :param zoom_level: 固定ズームレベル（intまたはstr）
         :type zoom_level: int or str
 
-        :param x_index_list: X座標のリスト
-        :type x_index_list: list or numpy.ndarray
+        :param x_index_list: X座標のインデックス
+        :type x_index_list: numpy.ndarray
 
-        :param y_index_list: Y座標のリスト
-        :type y_index_list: list or numpy.ndarray
+        :param y_index_list: Y座標のインデックス
+        :type y_index_list: numpy.ndarray
 
-        :param f_index_list: F値のリスト
-        :type f_index_list: list or numpy.ndarray
+        :param f_index_list: F値のインデックス
+        :type f_index_list: numpy.ndarray
 
         :param fid: FIDの値
         :type fid: str or int
 
-        :param df: 開始日、終了日、FIDを含むDataFrame
-        :type df: pandas.DataFrame
+        :param start_date_array: 開始日の文字列の配列
+        :type start_date_array: numpy.ndarray
 
-        :return: 生成された空間ID文字列のリスト
-        :rtype: list[str]
+        :param end_date_array: 終了日の文字列の配列
+        :type end_date_array: numpy.ndarray
+
+        :return: 空間IDの行を改行で連結した文字列
+        :rtype: str
         """
 
         # リスト長の確認
@@ -1128,48 +1358,31 @@ class GenerateSpatialID(FlowFileTransform):
         assert len(x_index_list) == list_len and len(
             y_index_list) == list_len, "リストの長さが一致しません。"
 
-        # (x, y, f)を列方向に結合
-        combined = np.stack((x_index_list, y_index_list, f_index_list), axis=1)
-
-        # ユニークな行を抽出
-        unique_combinations = np.unique(combined, axis=0)
-
-        # リスト長の更新
-        list_len = len(unique_combinations)
-
-        # Zを固定値で埋める
-        z_str_array = np.full(list_len, str(zoom_level), dtype=np.object_)
-
-        # x,y,f文字列に変換
-        f_str_array = unique_combinations[:, 2].astype(str)
-        x_str_array = unique_combinations[:, 0].astype(str)
-        y_str_array = unique_combinations[:, 1].astype(str)
-
-        # 開始日列
-        start_date_array = (
-            df[df["Dwh"].str.contains(self.start_day_col, na=False)]['Value'].fillna(self.default_start_date).astype(
-                str).to_numpy() if self.start_day_col in df["Dwh"].values else np.full(list_len,
-                                                                                       self.default_start_date,
-                                                                                       dtype=np.object_))
+        if len(start_date_array) == 1 and len(end_date_array) == 1:
+            # 行頭（ズームレベル）と行末（FID、開始日、終了日）は全行共通のため、インデックスのみを数値から直接書き出す
+            prefix = np.array(bytearray(f'"{zoom_level}/'.encode("utf-8")), dtype=np.uint8)
+            suffix = np.array(bytearray(f'","{fid}","{start_date_array[0]}","{end_date_array[0]}"'.encode("utf-8")),
+                              dtype=np.uint8)
 
-        # 終了日列
-        end_date_array = (
-            df[df["Dwh"].str.contains(self.end_day_col, na=False)]['Value'].fillna(self.default_end_date).astype(
-                str).to_numpy() if self.end_day_col in df["Dwh"].values else np.full(list_len, self.default_end_date,
-                                                                                     dtype=np.object_))
+            line_bytes = format_spatial_id_lines(prefix,
+                                                 np.ascontiguousarray(f_index_list, dtype=np.int64),
+                                                 np.ascontiguousarray(x_index_list, dtype=np.int64),
+                                                 np.ascontiguousarray(y_index_list, dtype=np.int64),
+                                                 suffix)
 
-        # 空間IDの組み立て
-        spatial_ids = z_str_array + "/" + f_str_array + \
-                      "/" + x_str_array + "/" + y_str_array
+            # 最終行の改行を除いて文字列に変換
+            return line_bytes[:-1].tobytes().decode("utf-8")
 
-        # FID列の作成(同一FIDなのでレコード数分コピーする
-        fid_str_array = [np.array(fid) for _ in range(len(x_str_array))]
+        # 開始日、終了日が行ごとに異なる場合は、行ごとに文字列を組み立てる
+        spatial_ids = (np.full(list_len, f"{zoom_level}/", dtype=np.object_)
+                       + f_index_list.astype(str).astype(np.object_) + "/"
+                       + x_index_list.astype(str).astype(np.object_) + "/"
+                       + y_index_list.astype(str).astype(np.object_))
 
-        # 全体の組み立て
-        results = ('"' + spatial_ids + '","' + fid_str_array + '","' +
+        results = ('"' + spatial_ids + '","' + str(fid) + '","' +
                    start_date_array + '","' + end_date_array + '"')
 
-        return results.tolist()
+        return "\n".join(results.tolist())
 
     def generate_connection_vectors(self, center_line, width, height, tolerance=1e-2):
         """
@@ -1530,8 +1743,8 @@ class GenerateSpatialID(FlowFileTransform):
         :param df: FIDと他の関連情報を含むDataFrame。
         :type df: pandas.DataFrame
 
-        :return: 空間インデックスのリスト。
-        :rtype: list
+        :return: FIDごとの空間IDの行を改行で連結した文字列のリスト。
+        :rtype: list[str]
         """
         # idx列（0列目）を取得
         findex_list = all_points[:, 0]
@@ -1551,24 +1764,29 @@ class GenerateSpatialID(FlowFileTransform):
                 fid_to_positions[fid] = []
             fid_to_positions[fid].append((start, end))
 
+        # 開始日、終了日の文字列（全FID共通）
+        start_date_array = self.get_date_string_array(df, self.start_day_col, self.default_start_date)
+        end_date_array = self.get_date_string_array(df, self.end_day_col, self.default_end_date)
+
         # 各fidごとに処理
         all_index = []
         for fid, ranges in fid_to_positions.items():
-            fid_results = []
-            for start, end in ranges:
-                x_list = x_index_list[start:end]
-                y_list = y_index_list[start:end]
-                f_list = f_index_list[start:end]
-
-                # generate_spatial_stringsを呼び出して結果を収集
-                calc_result = self.generate_spatial_strings(self.all_params[self.zoom_level], x_list, y_list, f_list,
-                                                            fid, df)
-                fid_results.extend(calc_result)
-
-            # FID値の単位で重複を排除してからall_indexに追加
-            # 文字列なので、np.uniqueではなくsetを使用
-            unique_results = list(set(fid_results))
-            all_index.append(unique_results)
+            # fidに属する全範囲のインデックスを結合
+            position_array = np.concatenate([np.arange(start, end) for start, end in ranges])
+
+            # FID値の単位で、ボクセルキーに詰めたインデックスの重複を排除
+            unique_x_list, unique_y_list, unique_f_list = unique_voxel_indices(x_index_list[position_array],
+                                                                               y_index_list[position_array],
+                                                                               f_index_list[position_array])
+
+            # 重複を排除した後のインデックスのみを文字列にしてall_indexに追加
+            all_index.append(self.generate_spatial_strings(self.all_params[self.zoom_level],
+                                                           unique_x_list,
+                                                           unique_y_list,
+                                                           unique_f_list,
+                                                           fid,
+                                                           start_date_array,
+                                                           end_date_array))
 
         return all_index
 
@@ -1643,6 +1861,33 @@ class GenerateSpatialID(FlowFileTransform):
         except IndexError as e:
             raise ValueError(f"fidデータが不正な形式です: {fid_data}") from e
 
+    def get_target_dwh_name_list(self, dwh_name_list):
+        """
+        FieldSetFileのDwh名のうち、空間IDの生成に使用する行のDwh名を取得する。
+        座標、幅、高さ、FIDは属性名が一致するもの、開始日、終了日は属性名を含むものを対象とする。
+
+        :param dwh_name_list: FieldSetFileのDwh名のリスト
+        :type dwh_name_list: list[str]
+
+        :return: 使用する行のDwh名のリスト
+        :rtype: list[str]
+        """
+        exact_name_set = {'coordinates',
+                          self.width_name_col,
+                          self.height_name_col,
+                          self.all_params[self.feature_id_column_name]}
+        partial_name_list = [self.start_day_col, self.end_day_col]
+
+        target_dwh_name_list = []
+        for dwh_name in dwh_name_list:
+            attribute_name = str(dwh_name).split('/')[-1]
+
+            if attribute_name in exact_name_set \
+                    or any(partial_name in attribute_name for partial_name in partial_name_list):
+                target_dwh_name_list.append(dwh_name)
+
+        return target_dwh_name_list
+
     def transform(self, context, flowfile):
         """
         プロセスのエントリーポイントとなる関数。
@@ -1663,8 +1908,10 @@ class GenerateSpatialID(FlowFileTransform):
             # フローファイルのコンテンツを取得
             input_field_set_file = flowfile.getContentsAsBytes()
 
-            # Dataframeとして読込み
-            df = CU.field_set_file_to_dataframe(input_field_set_file)
+            # Dwh、Typeの一覧のみを解析し、使用する属性の行のみをDataframeとして読込み
+            field_set_file_view = FSP.FieldSetFileView(input_field_set_file)
+            df = CU.field_set_file_to_dataframe(
+                field_set_file_view, dwh_name_list=self.get_target_dwh_name_list(field_set_file_view.dwh_list))
 
             # Dwh列をスラッシュで分割し、最後の要素（attribute）を抽出
             df['Dwh'] = df['Dwh'].apply(lambda x: x.split('/')[-1])
@@ -1698,8 +1945,7 @@ class GenerateSpatialID(FlowFileTransform):
                 x_index_list, y_index_list, f_index_list, all_points, df)
 
             # 一つの文字列にマージ
-            flattened_string = "\n".join(
-                ["\n".join(inner_list) for inner_list in all_index])
+            flattened_string = "\n".join(all_index)
             return FlowFileTransformResult(relationship="success", contents=f"{flattened_string}")
 
         except Exception as e:
@@ -32,13 +32,11 @@ LineString = geometry.LineString
 Point = geometry.Point
 Polygon = geometry.Polygon
 MultiPoint = geometry.MultiPoint
-sparse = import_module("scipy.sparse")
-csr_matrix = getattr(sparse, "csr_matrix")
-csgraph = import_module("scipy.sparse.csgraph")
-connected_components = getattr(csgraph, "connected_components")
+KDTree = getattr(import_module("scipy.spatial"), "KDTree")
 
 # Nifiライブラリ
 import cad.common.cad_utils as CU
+import cad.common.cad_topology as CT
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 
 
@@ -102,21 +100,14 @@ class GroupingFlagLineLogic:
                         row.append(node_index[src])
                         col.append(node_index[neighbor])
 
-            # グラフを疎行列（CSR）形式で表現
-            n = len(nodes)
-            adj_matrix = csr_matrix((np.ones(len(row)), (row, col)), shape=(n, n))
-
             # 連結成分を計算
-            n_components, labels = connected_components(
-                csgraph=adj_matrix, directed=False
-            )
+            _, labels = CT.label_components(row, col, len(nodes))
 
             # グループ化した結果
-            fidxs_list = [[] for _ in range(n_components)]
-            for node, label in zip(nodes, labels):
-                fidxs_list[label].append(node)
-
-            return fidxs_list
+            return [
+                [nodes[i] for i in group.tolist()]
+                for group in CT.group_indices(labels)
+            ]
         except Exception as e:
             raise Exception(f"[grouping_tuple_list]: {str(e)}")
 
@@ -316,16 +307,34 @@ class GroupingFlagLineLogic:
 
             pairs = []
 
+            if not main_2endpoints or not sub_2endpoints:
+                return pairs
+
+            # サブの端点をKDTreeに登録し、メインの端点から閾値以内の候補を一括で取得
+            # 閾値ちょうどの候補を取りこぼさないよう半径は僅かに広げ、距離の判定はループ内で行う
+            sub_coords = np.array(
+                [(sub_points[0].x, sub_points[0].y) for _, sub_points in sub_2endpoints]
+            )
+            main_coords = np.array(
+                [(main_points[0].x, main_points[0].y) for _, main_points in main_2endpoints]
+            )
+            candidates_list = KDTree(sub_coords).query_ball_point(
+                main_coords, r=np.nextafter(tolerance, np.inf)
+            )
+
             # メインの2点をループ
-            for main_fidx, main_points in main_2endpoints:
+            for (main_fidx, main_points), candidates in zip(
+                main_2endpoints, candidates_list
+            ):
                 # メインの2点間のベクトル
                 vector_main = calc_vector(main_points[1], main_points[0])
 
                 # メインとメインとサブの間とサブを線分とした角度
                 angles = []
 
-                # サブの2点をループ
-                for sub_fidx, sub_points in sub_2endpoints:
+                # 閾値以内の候補のサブの2点を元の順番でループ
+                for sub_idx in sorted(candidates):
+                    sub_fidx, sub_points = sub_2endpoints[sub_idx]
                     distance_between = main_points[0].distance(sub_points[0])
 
                     # メインとサブの距離が閾値以内であれば
@@ -448,15 +457,13 @@ class GroupingFlagLineLogic:
         """
         try:
             # Main Results Nameの値のtupleの1つ目の値を一意にしたもの
-            main_fidxs_all = list(set(fidx for fidx, _ in suffix_dict[params["main"]]))
+            main_fidxs_all = set(fidx for fidx, _ in suffix_dict[params["main"]])
 
             # Sub Results Nameの値を取得(tupleの1つ目の値を一意にしたもの)
-            sub_fidxs_all = list(
-                set(
-                    fidx
-                    for fidx, pair_fidx in suffix_dict[params["sub"]]
-                    if not pair_fidx or not np.isnan(pair_fidx)
-                )
+            sub_fidxs_all = set(
+                fidx
+                for fidx, pair_fidx in suffix_dict[params["sub"]]
+                if not pair_fidx or not np.isnan(pair_fidx)
             )
 
             # Key:FID Value:geometry
@@ -479,11 +486,11 @@ class GroupingFlagLineLogic:
             ]
 
             # 端部のFindex
-            end_fidxs = [
+            end_fidxs = {
                 fidx
                 for fidx, fidxs in suffix_dict[params["grp"]]
                 if (fidxs is None) or (len(fidxs) < 2)
-            ]
+            }
 
             # Findexをキーにした辞書に変換
             cross_points_dict = self.convert_tuple_to_dict(
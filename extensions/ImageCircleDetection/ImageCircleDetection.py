@@ -124,6 +124,46 @@ class ImageCircleDetection(BaseProcessor):
     - 既存の項目名を指定した場合は上書きされ、新規の項目を指定した場合は項目が追加されます。
     - 初期値はcontentです。
 
+    **Tile Width Division Num**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に画像を横方向へ分割する数を指定します。
+    - 縦横の分割数がいずれも1の場合はタイル分割を行わず、画像全体を1回で処理します。
+    - 初期値は1です。
+
+    **Tile Height Division Num**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に画像を縦方向へ分割する数を指定します。
+    - 縦横の分割数がいずれも1の場合はタイル分割を行わず、画像全体を1回で処理します。
+    - 初期値は1です。
+
+    **Tile Overlap Region**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時の縦横の重なり領域(px)を指定します。
+    - 0も指定できますが、タイル端の円を検出できない可能性があります。
+    - 初期値は0です。
+
+    **Tile Max Workers**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に同時に処理するタイル数を指定します。
+    - 0の場合はCPU数になります。
+    - 初期値は0です。
+
+    **Tile Cluster Epsilon**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に重なり領域で複数検出した円の中心座標と半径から同一の円とみなす距離(px)を指定します。
+    - 0はクラスタリングは行わず、検出されたすべての円を残します。
+    - 初期値は0です。
+
     リレーションシップ
     --------------------------------
     * success: 円検出処理が正常に完了した場合
@@ -247,6 +287,59 @@ class ImageCircleDetection(BaseProcessor):
         expression_language_scope=ExpressionLanguageScope.NONE
     )
 
+    tile_width_division_num = PropertyDescriptor(
+        name="Tile Width Division Num",
+        description="タイル分割実行時に画像を横方向へ分割する数を指定します。\
+                    縦横の分割数がいずれも1の場合はタイル分割を行いません。\
+                    初期値は1です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="1",
+        sensitive=False
+    )
+
+    tile_height_division_num = PropertyDescriptor(
+        name="Tile Height Division Num",
+        description="タイル分割実行時に画像を縦方向へ分割する数を指定します。\
+                    縦横の分割数がいずれも1の場合はタイル分割を行いません。\
+                    初期値は1です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="1",
+        sensitive=False
+    )
+
+    tile_overlap_region = PropertyDescriptor(
+        name="Tile Overlap Region",
+        description="タイル分割実行時の縦横の重なり領域(px)を指定します。\
+                    初期値は0です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="0",
+        sensitive=False
+    )
+
+    tile_max_workers = PropertyDescriptor(
+        name="Tile Max Workers",
+        description="タイル分割実行時に同時に処理するタイル数を指定します。0の場合はCPU数になります。\
+                    初期値は0です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="0",
+        sensitive=False
+    )
+
+    tile_cluster_epsilon = PropertyDescriptor(
+        name="Tile Cluster Epsilon",
+        description="タイル分割実行時に重なり領域で複数検出した円の中心座標と半径から同一の円とみなす距離(px)を指定します。\
+                    0はクラスタリングは行わず、検出されたすべての円を残します。\
+                    初期値は0です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="0",
+        sensitive=False
+    )
+
     # すべてのプロパティをproperty_descriptorsリストに追加
     property_descriptors = [
         circle_detection_algorithm,
@@ -256,7 +349,12 @@ class ImageCircleDetection(BaseProcessor):
         param1,
         param2,
         fsf_image_src,
-        fsf_circle_list
+        fsf_circle_list,
+        tile_width_division_num,
+        tile_height_division_num,
+        tile_overlap_region,
+        tile_max_workers,
+        tile_cluster_epsilon
     ]
 
     def getPropertyDescriptors(self):
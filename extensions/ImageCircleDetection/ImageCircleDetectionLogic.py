@@ -30,9 +30,13 @@ np = import_module("numpy")
 pandas = import_module("pandas")
 
 from raster_to_vector.common.base_raster_vector_logic import FlexibleRasterVectorLogic
+from raster_to_vector.common.image_tile_utils import get_cluster_epsilon, merge_circle_coordinates
 
 
 class ImageCircleDetectionLogic(FlexibleRasterVectorLogic):
+    # merge_tile_resultsを実装しているため、タイル分割実行に対応する
+    supports_tile_execution = True
+
     def input_check(self, byte_data, attribute):
         """
         入力データと属性の妥当性を確認します。
@@ -168,3 +172,36 @@ class ImageCircleDetectionLogic(FlexibleRasterVectorLogic):
 
         return new_byte_data, attribute
 
+
+    def merge_tile_results(self, row, tile_row_list, window_list, properties):
+        """
+        タイルごとに検出した円を分割前の画像の座標に変換して結合し、rowに書き込みます。
+        重なり領域で複数検出した円は、中心座標と半径が tile_cluster_epsilon(px) 以内であれば同一の円とみなします。
+
+        Parameters
+        ----------
+        row : pandas.Series
+            分割前の行です。
+        tile_row_list : list
+            タイルごとの処理後の行のリストです。
+        window_list : list
+            タイルごとの(y1, y2, x1, x2)形式の範囲のリストです。
+        properties : dict
+            プロパティの辞書です。
+
+        Returns
+        -------
+        pandas.Series
+            検出した円を書き込んだ行です。
+        """
+        fsf_circle_list = properties.get('fsf_circle_list', 'content')
+        circle_cluster_epsilon = get_cluster_epsilon(properties, 'tile_cluster_epsilon')
+
+        circle_coordinate_list = [pickle.loads(tile_row[fsf_circle_list]) for tile_row in tile_row_list]
+        offset_x_list = [window[2] for window in window_list]
+        offset_y_list = [window[0] for window in window_list]
+
+        circle_list = merge_circle_coordinates(circle_coordinate_list, offset_x_list, offset_y_list, circle_cluster_epsilon)
+        row[fsf_circle_list] = pickle.dumps(circle_list)
+
+        return row
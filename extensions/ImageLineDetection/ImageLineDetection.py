@@ -136,6 +136,46 @@ class ImageLineDetection(BaseProcessor):
     - 線の太さを検出する際に利用する元画像かGRAYSCALE画像を指定します。
     - 初期値はcontentです。
 
+    **Tile Width Division Num**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に画像を横方向へ分割する数を指定します。
+    - 縦横の分割数がいずれも1の場合はタイル分割を行わず、画像全体を1回で処理します。
+    - 初期値は1です。
+
+    **Tile Height Division Num**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に画像を縦方向へ分割する数を指定します。
+    - 縦横の分割数がいずれも1の場合はタイル分割を行わず、画像全体を1回で処理します。
+    - 初期値は1です。
+
+    **Tile Overlap Region**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時の縦横の重なり領域(px)を指定します。
+    - 0も指定できますが、タイル端の線分を検出できない可能性があります。
+    - 初期値は0です。
+
+    **Tile Max Workers**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に同時に処理するタイル数を指定します。
+    - 0の場合はCPU数になります。
+    - 初期値は0です。
+
+    **Tile Cluster Epsilon**
+
+    **任意入力  直接入力**
+
+    - タイル分割実行時に重なり領域で複数検出した線分の始点、終点、中点から同一の線分とみなす距離(px)を指定します。
+    - 0はクラスタリングは行わず、検出されたすべての線分を残します。
+    - 初期値は0です。
+
     リレーションシップ
     --------------------------------
     * success: 線分検出処理が正常に完了した場合
@@ -268,6 +308,59 @@ class ImageLineDetection(BaseProcessor):
     )
 
     # すべてのプロパティをproperty_descriptorsリストに追加
+    tile_width_division_num = PropertyDescriptor(
+        name="Tile Width Division Num",
+        description="タイル分割実行時に画像を横方向へ分割する数を指定します。\
+                    縦横の分割数がいずれも1の場合はタイル分割を行いません。\
+                    初期値は1です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="1",
+        sensitive=False
+    )
+
+    tile_height_division_num = PropertyDescriptor(
+        name="Tile Height Division Num",
+        description="タイル分割実行時に画像を縦方向へ分割する数を指定します。\
+                    縦横の分割数がいずれも1の場合はタイル分割を行いません。\
+                    初期値は1です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="1",
+        sensitive=False
+    )
+
+    tile_overlap_region = PropertyDescriptor(
+        name="Tile Overlap Region",
+        description="タイル分割実行時の縦横の重なり領域(px)を指定します。\
+                    初期値は0です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="0",
+        sensitive=False
+    )
+
+    tile_max_workers = PropertyDescriptor(
+        name="Tile Max Workers",
+        description="タイル分割実行時に同時に処理するタイル数を指定します。0の場合はCPU数になります。\
+                    初期値は0です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="0",
+        sensitive=False
+    )
+
+    tile_cluster_epsilon = PropertyDescriptor(
+        name="Tile Cluster Epsilon",
+        description="タイル分割実行時に重なり領域で複数検出した線分の始点、終点、中点から同一の線分とみなす距離(px)を指定します。\
+                    0はクラスタリングは行わず、検出されたすべての線分を残します。\
+                    初期値は0です。",
+        expression_language_scope=ExpressionLanguageScope.FLOWFILE_ATTRIBUTES,
+        required=False,
+        default_value="0",
+        sensitive=False
+    )
+
     property_descriptors = [
         line_detection_algorithm,
         threshold,
@@ -277,7 +370,12 @@ class ImageLineDetection(BaseProcessor):
         fsf_line_list,
         fsf_image_org,
         is_measure_thickness,
-        line_thickness_threshold
+        line_thickness_threshold,
+        tile_width_division_num,
+        tile_height_division_num,
+        tile_overlap_region,
+        tile_max_workers,
+        tile_cluster_epsilon
     ]
 
     def getPropertyDescriptors(self):
@@ -30,10 +30,14 @@ np = import_module("numpy")
 pandas = import_module("pandas")
 
 from raster_to_vector.common.base_raster_vector_logic import FlexibleRasterVectorLogic
+from raster_to_vector.common.image_tile_utils import get_cluster_epsilon, merge_line_coordinates
 from raster_to_vector.common.image_utils import *
 
 
 class ImageLineDetectionLogic(FlexibleRasterVectorLogic):
+    # merge_tile_resultsを実装しているため、タイル分割実行に対応する
+    supports_tile_execution = True
+
     def input_check(self, byte_data, attribute):
         """
         入力データと属性の妥当性を確認します。
@@ -203,3 +207,39 @@ class ImageLineDetectionLogic(FlexibleRasterVectorLogic):
 
         return new_byte_data, attribute
 
+
+    def merge_tile_results(self, row, tile_row_list, window_list, properties):
+        """
+        タイルごとに検出した線分を分割前の画像の座標に変換して結合し、rowに書き込みます。
+        重なり領域で複数検出した線分は、始点、終点、中点が tile_cluster_epsilon(px) 以内であれば同一の線分とみなします。
+        線の太さを計測している場合は、同一とみなした線分の太さの平均を出力します。
+
+        Parameters
+        ----------
+        row : pandas.Series
+            分割前の行です。
+        tile_row_list : list
+            タイルごとの処理後の行のリストです。
+        window_list : list
+            タイルごとの(y1, y2, x1, x2)形式の範囲のリストです。
+        properties : dict
+            プロパティの辞書です。
+
+        Returns
+        -------
+        pandas.Series
+            検出した線分を書き込んだ行です。
+        """
+        fsf_line_list = properties.get('fsf_line_list', 'content')
+        is_measure_thickness = properties.get('is_measure_thickness', 'False') == 'True'
+        line_cluster_epsilon = get_cluster_epsilon(properties, 'tile_cluster_epsilon')
+
+        line_coordinate_list = [pickle.loads(tile_row[fsf_line_list]) for tile_row in tile_row_list]
+        offset_x_list = [window[2] for window in window_list]
+        offset_y_list = [window[0] for window in window_list]
+
+        line_list = merge_line_coordinates(line_coordinate_list, offset_x_list, offset_y_list,
+                                           line_cluster_epsilon, keep_thickness=is_measure_thickness)
+        row[fsf_line_list] = pickle.dumps(line_list)
+
+        return row
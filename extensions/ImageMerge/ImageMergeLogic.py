@@ -30,9 +30,9 @@ cv2 = import_module("cv2")
 np = import_module("numpy")
 pandas = import_module("pandas")
 Image = import_module('PIL.Image')
-DBSCAN = import_module("sklearn.cluster").DBSCAN
 
 from raster_to_vector.common.base_raster_vector_logic import FlexibleRasterVectorLogic
+from raster_to_vector.common.image_tile_utils import merge_circle_coordinates, merge_line_coordinates
 
 class ImageMergeLogic(FlexibleRasterVectorLogic):
     def input_check(self, byte_data, attribute):
@@ -225,77 +225,10 @@ class ImageMergeLogic(FlexibleRasterVectorLogic):
 
         return new_byte_data, attribute
     
-    def remove_duplicates_process(self, merged_coordinate_list):
-        seen = set()
-        unique_list = []
-        # 重複を削除しつつ順序を維持
-        for item in merged_coordinate_list:
-            if item not in seen:
-                unique_list.append(item)
-                seen.add(item)
-
-        return np.array(unique_list)
-    
-    def dbscan_process(self, unique_item, eps):
-        dbscan = DBSCAN(eps=eps, min_samples=1)
-        labels = dbscan.fit_predict(unique_item)
-        group_averages = []
-        unique_labels = set(labels)
-        # ラベルが-1の場合、それはノイズなので無視
-        for label in unique_labels:
-            if label != -1:
-                group_points = unique_item[labels == label]
-                # グループ内の平均を計算
-                group_average = np.mean(group_points, axis=0)
-                group_averages.append(group_average.astype(int))
-        
-        return np.array(group_averages)
-    
     def circle_process(self, circle_coordinate_list, offset_x_list, offset_y_list, eps):
-        # それぞれの円の座標を結合後の座標に適用する
-        circle_merged_coordinate_list = []
-        for i, circle_coordinate in enumerate(circle_coordinate_list):
-            for circle in circle_coordinate:
-                x, y = circle[0]
-                radius = circle[1]
-                circle_x = offset_x_list[i] + x
-                circle_y = offset_y_list[i] + y
-                circle_merged_coordinate_list.append((circle_x, circle_y, radius))
-        # 円の重複をなくす
-        unique_circle = self.remove_duplicates_process(circle_merged_coordinate_list)
-
-        # 近い円座標をクラスタリング
-        circle_averages = self.dbscan_process(unique_circle, eps)
-        # 元の形に変形
-        circle_averages = [[(x[0], x[1]), x[2]]for x in circle_averages]
+        # それぞれの円の座標を結合後の座標に適用し、近い円座標をクラスタリングする
+        return merge_circle_coordinates(circle_coordinate_list, offset_x_list, offset_y_list, eps)
 
-        return circle_averages
-    
     def line_process(self, line_coordinate_list, offset_x_list, offset_y_list, eps):
-        # それぞれの線分の座標を結合後の座標に適用する
-        line_merged_coordinate_list = []
-        line_list_tmp = []
-        for i, line_coordinate in enumerate(line_coordinate_list):
-            for line in line_coordinate:
-                for line_point in line:
-                    # 線分の太さ情報は使わない
-                    if isinstance(line_point, tuple):
-                        line_list_tmp.append(line_point)
-
-                x1 = line_list_tmp[0][0] + offset_x_list[i]
-                y1 = line_list_tmp[0][1] + offset_y_list[i]
-                x2 = line_list_tmp[1][0] + offset_x_list[i]
-                y2 = line_list_tmp[1][1] + offset_y_list[i]
-                mid_point_x = (x1 + x2) // 2
-                mid_point_y = (y1 + y2) // 2
-                line_merged_coordinate_list.append((x1, y1, x2, y2, mid_point_x, mid_point_y))
-                line_list_tmp = []
-        # 線分の重複をなくす
-        unique_line = self.remove_duplicates_process(line_merged_coordinate_list)
-
-        # 近い線分座標をクラスタリング
-        line_averages = self.dbscan_process(unique_line, eps)
-        # 元の形に変形
-        line_averages = [[(x[0], x[1]), (x[2], x[3])] for x in line_averages]
-
-        return line_averages
\ No newline at end of file
+        # それぞれの線分の座標を結合後の座標に適用し、近い線分座標をクラスタリングする
+        return merge_line_coordinates(line_coordinate_list, offset_x_list, offset_y_list, eps)
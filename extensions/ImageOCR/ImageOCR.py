@@ -184,3 +184,19 @@ class ImageOCR(BaseProcessor):
     @BaseProcessor.set_logic_class('ImageOCRLogic.ImageOCRLogic')
     def __init__(self, **kwargs):
         pass
+
+    def onScheduled(self, context):
+        """
+        プロセッサの開始時に、EasyOCRのReaderを生成してプロセス内キャッシュに格納します（ウォームアップ）。
+        最初のFlowFileでモデルの読み込みを待たないようにするためのもので、失敗した場合もプロセッサは開始します。
+
+        Parameters
+        ----------
+        context : ProcessContext
+            NiFiプロセッサの実行コンテキストです。
+        """
+        try:
+            if context.getProperty(self.ocr_engine).getValue() == 'EasyOCR':
+                self.logic_instance.get_easyocr_reader()
+        except Exception:
+            self.logger.warn('EasyOCRのReaderのウォームアップに失敗しました。FlowFileの処理時に再度生成します')
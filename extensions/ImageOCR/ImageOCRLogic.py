@@ -24,6 +24,7 @@
 import pickle
 from importlib import import_module
 import math
+import threading
 
 # 外部ライブラリの動的インポート
 Image = import_module("PIL.Image")
@@ -32,8 +33,23 @@ np = import_module("numpy")
 
 from raster_to_vector.common.base_raster_vector_logic import FlexibleRasterVectorLogic
 
+# EasyOCRで認識する言語
+EASYOCR_LANG_LIST = ['ja', 'en']
+
+# prepare_rowsで1度に読み込み、一括認識する行数（読み込んだ画像を同時に保持する上限）
+EASYOCR_BATCH_ROW_COUNT = 16
+
 
 class ImageOCRLogic(FlexibleRasterVectorLogic):
+    # OCRエンジンのプロセス内キャッシュ {(OCRエンジン, 言語のタプル, GPU使用有無): Reader}
+    # Readerの生成はモデルの読み込みとtorchの初期化を伴うため、プロセス内で1度だけ行う
+    ocr_reader_cache = {}
+    ocr_reader_cache_lock = threading.Lock()
+
+    def __init__(self):
+        # prepare_rowsで一括認識したOCR結果 {行のindex: (画像の値, OCR結果)}
+        self.prepared_results = {}
+
     def input_check(self, byte_data, attribute):
         """
         入力データと属性の妥当性を確認します。
@@ -118,6 +134,191 @@ class ImageOCRLogic(FlexibleRasterVectorLogic):
 
         return new_results
 
+    def get_easyocr_reader(self, lang_list=EASYOCR_LANG_LIST):
+        """
+        EasyOCRのReaderをプロセス内キャッシュから取得します。キャッシュに存在しない場合は生成して格納します。
+
+        Parameters
+        ----------
+        lang_list : list[str]
+            認識する言語のリストです。
+
+        Returns
+        -------
+        easyocr.Reader
+            言語とGPU使用有無に対応するReaderです。
+        """
+        easyocr = import_module("easyocr")
+        torch = import_module("torch")
+
+        # GPU使用判定
+        use_gpu = torch.cuda.is_available()
+
+        cache_key = ('EasyOCR', tuple(lang_list), use_gpu)
+
+        with ImageOCRLogic.ocr_reader_cache_lock:
+            reader = ImageOCRLogic.ocr_reader_cache.get(cache_key)
+            if reader is None:
+                reader = easyocr.Reader(list(lang_list), gpu=use_gpu)
+                ImageOCRLogic.ocr_reader_cache[cache_key] = reader
+
+        return reader
+
+    def get_ocr_target_image(self, byte_data, properties):
+        """
+        OCR対象の画像を取得し、旗上げ線がある場合は旗上げ線が水平になるように回転します。
+
+        Parameters
+        ----------
+        byte_data : bytes
+            バイトデータ形式の画像データ、またはバイトデータ形式の画像データを持つFieldSetFileです。
+        properties : dict
+            プロパティ設定を含む辞書です。
+
+        Returns
+        -------
+        tuple
+            image : numpy.ndarray
+                OCR対象の画像です。
+            original_width : int
+                回転前の画像の幅です。
+            original_height : int
+                回転前の画像の高さです。
+            angle : float or None
+                回転角度です。旗上げ線がない場合はNoneです。
+
+        Raises
+        ------
+        ValueError
+            画像データの取得に失敗した場合や、旗上げ線の座標が負の値の場合に発生します。
+        Exception
+            旗上げ線の座標に無効な値が設定されている場合に発生します。
+        """
+        # 入力項目取得
+        fsf_image_src = properties.get('fsf_image_src', 'content')
+
+        try:
+            image = pickle.loads(byte_data[fsf_image_src])
+        except Exception as e:
+            raise ValueError(f'入力画像の読み込みに失敗しました。fsf_image_srcに設定した名称を確認してください: {fsf_image_src}')
+
+        original_height, original_width = image.shape[:2]
+
+        # 旗上げ線座標
+        line_coords = None
+        line_coords_suffix = properties.get('line_coords_suffix', None)
+        if line_coords_suffix is not None and line_coords_suffix != '':
+            try:
+                line_coords = eval(byte_data[line_coords_suffix])
+                line_coords = pickle.loads(line_coords)
+            except Exception as e:
+                raise Exception(f'line_coordsの旗上げ線の座標に無効な値が設定されています: {str(e)}')
+            for xy in line_coords:
+                for num in xy:
+                    if not isinstance(num, int) or num < 0:
+                        raise ValueError("line_coordsの旗上げ線の座標は0以上である必要があります")
+
+        angle = None
+        if line_coords is not None and len(line_coords) == 2:
+            # 旗上げ線がある場合は旗上げ線を水平にするように回転する
+            (x1, y1), (x2, y2) = line_coords
+            # ベクトル (x2 - x1, y2 - y1) の角度を arctan2 で求める
+            angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
+
+            img_pil = Image.fromarray(image)
+
+            # 画像を angle で回転(ベクトルが水平になるよう補正)
+            img_pil_rotated = img_pil.rotate(angle, expand=False)
+
+            image = np.array(img_pil_rotated)
+
+        return image, original_width, original_height, angle
+
+    def readtext_batched(self, image_list):
+        """
+        EasyOCRで複数の画像の文字認識を一括で実行します。
+        検出モデルへの入力は同じサイズの画像ごとにまとめて1回で行います。
+
+        Parameters
+        ----------
+        image_list : list[numpy.ndarray]
+            OCR対象の画像のリストです。
+
+        Returns
+        -------
+        list
+            画像ごとのOCR結果のリストです。各要素は readtext の結果と同形式です。
+        """
+        reader = self.get_easyocr_reader()
+
+        results_list = [None] * len(image_list)
+
+        # 同じサイズの画像ごとにまとめる（サイズが異なる画像はリサイズしないと一括で検出できないため）
+        shape_index_dict = {}
+        for index, image in enumerate(image_list):
+            shape_index_dict.setdefault(image.shape, []).append(index)
+
+        for index_list in shape_index_dict.values():
+            if len(index_list) == 1:
+                results_list[index_list[0]] = reader.readtext(image_list[index_list[0]])
+                continue
+
+            batched_results = reader.readtext_batched([image_list[index] for index in index_list])
+            for index, results in zip(index_list, batched_results):
+                results_list[index] = results
+
+        return results_list
+
+    def prepare_rows(self, df_content, attribute, properties):
+        """
+        EasyOCRの場合、1つの図面の全タイル（行）の画像を一定の行数ごとにまとめて文字認識し、結果を保持します。
+        保持した結果は __call__ で行ごとに使用されます。
+
+        Parameters
+        ----------
+        df_content : pandas.DataFrame
+            FieldSetFileから作成した、処理対象の全行を含むDataFrameです。
+        attribute : dict
+            画像データに関連する属性情報の辞書です。
+        properties : dict
+            プロパティ設定を含む辞書です。
+        """
+        self.prepared_results = {}
+
+        if properties.get('ocr_engine', 'EasyOCR') != 'EasyOCR' or len(df_content) <= 1:
+            return
+
+        # 画像を読み込む前に入力を検証し、不正な入力で全行の読み込みを行わないようにする
+        self.input_check(df_content, attribute)
+
+        fsf_image_src = properties.get('fsf_image_src', 'content')
+
+        # 読み込んだ画像を同時に保持する行数を抑えるため、一定の行数ごとに読み込み、一括認識する
+        for start_index in range(0, len(df_content), EASYOCR_BATCH_ROW_COUNT):
+            df_batch = df_content.iloc[start_index:start_index + EASYOCR_BATCH_ROW_COUNT]
+
+            index_list = []
+            image_info_list = []
+            for index, row in df_batch.iterrows():
+                index_list.append(index)
+                image_info_list.append(self.get_ocr_target_image(row, properties))
+
+            results_list = self.readtext_batched([image_info[0] for image_info in image_info_list])
+
+            for index, image_info, results in zip(index_list, image_info_list, results_list):
+                _, original_width, original_height, angle = image_info
+
+                if angle is not None:
+                    # 回転して水平にしてからOCRを行った後、Bounding Boxの座標を回転して元に戻す
+                    results = self.revert_bboxes_to_original_expand_false(
+                        results,
+                        angle,
+                        original_width=original_width,
+                        original_height=original_height)
+
+                # 画像の値と組にして保持し、__call__で同じ行であることを確認できるようにする
+                self.prepared_results[index] = (df_content.at[index, fsf_image_src], results)
+
     def __call__(self, byte_data, attribute, properties):
         """
         画像に含まれる文字を、指定された OCR エンジン（EasyOCR・Tesseract）で解析し、
@@ -174,54 +375,22 @@ class ImageOCRLogic(FlexibleRasterVectorLogic):
         """
         self.input_check(byte_data, attribute)
 
-        # 入出力項目取得
+        # 出力項目取得
         fsf_image_src = properties.get('fsf_image_src', 'content')
         fsf_output = properties.get('fsf_output', 'content')
 
-        try:
-            image = pickle.loads(byte_data[fsf_image_src])
-        except Exception as e:
-            raise ValueError(f'入力画像の読み込みに失敗しました。fsf_image_srcに設定した名称を確認してください: {fsf_image_src}')
+        # prepare_rowsで一括認識済みの行の場合は、その結果（座標を元に戻した後のもの）を使用する
+        prepared = self.prepared_results.pop(getattr(byte_data, 'name', None), None)
+        if prepared is not None and prepared[0] is byte_data[fsf_image_src]:
+            byte_data[fsf_output] = pickle.dumps(prepared[1])
+            return byte_data, attribute
 
-        original_height, original_width = image.shape[:2]
-
-        # 旗上げ線座標
-        line_coords = None
-        line_coords_suffix = properties.get('line_coords_suffix', None)
-        if line_coords_suffix is not None and line_coords_suffix != '':
-            try:
-                line_coords = eval(byte_data[line_coords_suffix])
-                line_coords = pickle.loads(line_coords)
-            except Exception as e:
-                raise Exception(f'line_coordsの旗上げ線の座標に無効な値が設定されています: {str(e)}')
-            for xy in line_coords:
-                for num in xy:
-                    if not isinstance(num, int) or num < 0:
-                        raise ValueError("line_coordsの旗上げ線の座標は0以上である必要があります")
-
-        if line_coords is not None and len(line_coords) == 2:
-            # 旗上げ線がある場合は旗上げ線を水平にするように回転する
-            (x1, y1), (x2, y2) = line_coords
-            # ベクトル (x2 - x1, y2 - y1) の角度を arctan2 で求める
-            angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
-
-            img_pil = Image.fromarray(image)
-
-            # 画像を angle で回転(ベクトルが水平になるよう補正)
-            img_pil_rotated = img_pil.rotate(angle, expand=False)
-
-            image = np.array(img_pil_rotated)
+        image, original_width, original_height, angle = self.get_ocr_target_image(byte_data, properties)
 
         ocr_engine = properties.get('ocr_engine', 'EasyOCR')
         if ocr_engine == 'EasyOCR':
             # EasyOCR
-            easyocr = import_module("easyocr")
-            torch = import_module("torch")
-
-            # GPU使用判定
-            use_gpu = torch.cuda.is_available()
-
-            reader = easyocr.Reader(['ja', 'en'], gpu=use_gpu)
+            reader = self.get_easyocr_reader()
 
             # 文字認識を実行
             results = reader.readtext(image)
@@ -274,7 +443,7 @@ class ImageOCRLogic(FlexibleRasterVectorLogic):
         else:
             raise ValueError(f'不正なOCRエンジンが指定されています: {ocr_engine}')
 
-        if line_coords is not None and len(line_coords) == 2:
+        if angle is not None:
             # 回転して水平にしてからOCRを行った後、Bounding Boxの座標を回転して元に戻す必要がある
             results = self.revert_bboxes_to_original_expand_false(
                 results,
@@ -31,6 +31,7 @@ pandas = import_module("pandas")
 Image = import_module('PIL.Image')
 
 from raster_to_vector.common.base_raster_vector_logic import FlexibleRasterVectorLogic
+from raster_to_vector.common.image_tile_utils import create_tile_window_list
 
 class ImageSplitLogic(FlexibleRasterVectorLogic):
     def input_check(self, byte_data, attribute):
@@ -134,40 +135,27 @@ class ImageSplitLogic(FlexibleRasterVectorLogic):
         if overlap_region < 0:
             raise ValueError("overlap_regionは0以上である必要があります")
 
-        height = image.shape[0]
-        width = image.shape[1]
-        increase_height = height // height_division_num
-        increase_width = width // width_division_num
-
         split_image_df_list = []
         # 画像を分割
-        for row in range(height_division_num):
-            for column in range(width_division_num):
-                y1 = row * increase_height
-                y2 = (row + 1) * increase_height + overlap_region
-                x1 = column * increase_width
-                x2 = (column + 1) * increase_width + overlap_region
-                if y2 > height:
-                    y2 = height
-                if x2 > width:
-                    x2 = width
-
-                offset_x = column * increase_width
-                offset_y = row * increase_height
-
-                # pandas.Seriesに変換
-                content_series = pandas.Series({'content': pickle.dumps(image[y1 : y2, x1 : x2])})
-                offset_x_series = pandas.Series({offset_coordinate_x: offset_x}, dtype='int64')
-                offset_y_series = pandas.Series({offset_coordinate_y: offset_y}, dtype='int64')
-                # それぞれの pandas.Series を一つの辞書形式で格納
-                combined_series = pandas.Series({'content': content_series['content'],
-                                                'color_space': byte_data['color_space'],
-                                                'layer': byte_data['layer'],
-                                                'Findex': byte_data['Findex'],
-                                                'offset_coordinate_x': offset_x_series['offset_coordinate_x'],
-                                                'offset_coordinate_y': offset_y_series['offset_coordinate_y']
-                                                })
-                split_image_df_list.append(combined_series)
+        window_list = create_tile_window_list(image.shape[0], image.shape[1],
+                                              height_division_num, width_division_num, overlap_region)
+        for y1, y2, x1, x2 in window_list:
+            offset_x = x1
+            offset_y = y1
+
+            # pandas.Seriesに変換
+            content_series = pandas.Series({'content': pickle.dumps(image[y1 : y2, x1 : x2])})
+            offset_x_series = pandas.Series({offset_coordinate_x: offset_x}, dtype='int64')
+            offset_y_series = pandas.Series({offset_coordinate_y: offset_y}, dtype='int64')
+            # それぞれの pandas.Series を一つの辞書形式で格納
+            combined_series = pandas.Series({'content': content_series['content'],
+                                            'color_space': byte_data['color_space'],
+                                            'layer': byte_data['layer'],
+                                            'Findex': byte_data['Findex'],
+                                            'offset_coordinate_x': offset_x_series['offset_coordinate_x'],
+                                            'offset_coordinate_y': offset_y_series['offset_coordinate_y']
+                                            })
+            split_image_df_list.append(combined_series)
 
         # ImageMergelogicで使用する値をattribute追加
         attribute['height_division_num'] = str(height_division_num)
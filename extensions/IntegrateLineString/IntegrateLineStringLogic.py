@@ -32,13 +32,12 @@ Point = getattr(import_module("shapely.geometry"), "Point")
 transform = getattr(import_module("shapely.ops"), "transform")
 polygonize = getattr(import_module("shapely.ops"), "polygonize")
 KDTree = getattr(import_module("scipy.spatial"), "KDTree")
-csr_matrix = getattr(import_module("scipy.sparse"), "csr_matrix")
-dijkstra = getattr(import_module("scipy.sparse.csgraph"), "dijkstra")
 pd = import_module("pandas")
 linemerge = getattr(import_module("shapely.ops"), "linemerge")
 jit = getattr(import_module("numba"), "jit")
 
 import cad.common.cad_utils as CU
+import cad.common.cad_topology as CT
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 
 
@@ -199,90 +198,37 @@ class IntegrateLineStringLogic:
             # 変更前後の座標情報格納先
             point_before_and_after = {}
 
-            kdtree = KDTree(points)
-            unique_points = []
-            processed = set()
-
-            for i, point in enumerate(points):
-                if i in processed:
-                    continue
-                idxs = kdtree.query_ball_point(point, r=threshold)
-                cluster = [points[idx] for idx in idxs]
-                centroid = np.mean(cluster, axis=0)
-                unique_points.append(centroid)
-                processed.update(idxs)
+            # 閾値内の座標の探索は一括で行う
+            unique_points, member_list = CT.greedy_clusters(points, threshold)
 
+            for centroid, idxs in zip(unique_points, member_list):
                 # 変化前と変化後の座標情報を辞書に格納
-                for elem in np.unique(cluster, axis=0):
+                for elem in np.unique(points[idxs], axis=0):
                     if not np.array_equal(elem, centroid):
                         point_before_and_after[tuple(elem)] = centroid
 
-            return np.array(unique_points), point_before_and_after
+            return unique_points, point_before_and_after
 
         except Exception as e:
             raise Exception(f"[reduce_points_within_threshold_Exception]: {str(e)}")
 
-    def remove_edge(self, sp_mtx, start, end, del_dup_flg):
-        """
-        疎行列から対象のエッジを削除する。
-
-        :param sp_mtx: エッジを持つ疎行列。
-        :type sp_mtx: scipy.sparse.csr_matrix
-        :param start: 始点ノードのインデックス。
-        :type start: int
-        :param end: 終点ノードのインデックス。
-        :type end: int
-        :param del_dup_flg: エッジを完全に削除するか、重複エッジを1本だけ削除するかのフラグ。
-        :type del_dup_flg: bool
-
-        :return: 該当エッジが削除された疎行列。
-        :rtype: scipy.sparse.csr_matrix
-
-        :raises Exception:
-            エッジの削除処理中にエラーが発生した場合に例外をスローする。
-        """
-        try:
-            # Delete DuplicatesがTrueの場合
-            if del_dup_flg:
-                # 始点から終点へのエッジを削除
-                sp_mtx[start, end] = 0
-                # 終点から始点へのエッジを削除
-                sp_mtx[end, start] = 0
-            else:
-                # 始点から終点へのエッジを1本分削除
-                if sp_mtx[start, end] != 0:
-                    sp_mtx[start, end] -= 1
-                # 終点から始点へのエッジを1本分削除
-                if sp_mtx[end, start] != 0:
-                    sp_mtx[end, start] -= 1
-
-            # 疎行列の再構成
-            row, col = sp_mtx.nonzero()  # 非ゼロ要素の行と列のインデックスを取得
-            data = sp_mtx.data[sp_mtx.data != 0]
-            sp_mtx = csr_matrix((data, (row, col)), shape=sp_mtx.shape)
-
-            return sp_mtx
-
-        except Exception as e:
-            raise Exception(f"[remove_edge_Exception]: {str(e)}")
-
-    def build_sparse_matrix(self, line_segments, threshold):
+    def build_line_network(self, line_segments, threshold):
         """
-        線分の座標のリストから疎行列を作成する。
+        線分の座標のリストからネットワークを作成する。
 
         :param line_segments: 線分の座標配列を持つリスト。
         :type line_segments: list[numpy.ndarray]
         :param threshold: 同一ノードとみなす距離の閾値。
         :type threshold: float
 
-        :return: 疎行列、ノード別の座標配列を持つ辞書、座標の変化前後情報を持つ辞書のリスト。
-        :rtype: tuple[scipy.sparse.csr_matrix, dict, list[dict[str, Union[numpy.ndarray, numpy.ndarray]]]]
+        :return: ネットワーク、ノード別の座標配列を持つ辞書、座標の変化前後情報を持つ辞書のリスト。
+        :rtype: tuple[cad.common.cad_topology.LineNetwork, dict, list[dict[str, Union[numpy.ndarray, numpy.ndarray]]]]
 
         :raises Exception:
-            疎行列の作成処理中にエラーが発生した場合に例外をスローする。
+            ネットワークの作成処理中にエラーが発生した場合に例外をスローする。
         """
         try:
-            # すべての線分の端点を1つのリストにする
+            # すべての線分の端点を1つの配列にする
             points = np.array([point for segment in line_segments for point in segment])
 
             # 閾値内の座標を同一ノードとしてまとめる
@@ -290,200 +236,141 @@ class IntegrateLineStringLogic:
                 points, threshold
             )
 
-            # KDTreeを再構築して新しいノードを生成
-            kdtree = KDTree(reduced_points)
-
-            unique_nodes = {}  # ノードのインデックスを保持する辞書
-            node_counter = 0  # ノードのインデックスカウンター
-            node_coordinates = (
-                {}
-            )  # ノードの座標を保持する辞書 key=node_counter value=node_counterの座標
-
-            # 隣接行列データ格納用
-            row = []
-            col = []
-            data = []
-
-            # 全ての線分をLoop
-            for start, end in line_segments:
-                # KDTreeを使用して最近傍点を検索し、同一ノードとする
-                start_dist, start_idx = kdtree.query(
-                    start, k=1
-                )  # start点に最も近い点を検索
-                end_dist, end_idx = kdtree.query(end, k=1)  # end点に最も近い点を検索
-
-                if start_idx not in unique_nodes:
-                    unique_nodes[start_idx] = node_counter  # 新しいノードを追加
-                    node_coordinates[node_counter] = reduced_points[
-                        start_idx
-                    ]  # ノードの座標を保存
-                    node_counter += 1  # ノードカウンターをインクリメント
-
-                if end_idx not in unique_nodes:
-                    unique_nodes[end_idx] = node_counter  # 新しいノードを追加
-                    node_coordinates[node_counter] = reduced_points[
-                        end_idx
-                    ]  # ノードの座標を保存
-                    node_counter += 1  # ノードカウンターをインクリメント
-
-                # 始点と終点が同じである場合は追加しない(点のような線分)
-                if unique_nodes[start_idx] != unique_nodes[end_idx]:
-                    start_idx, end_idx = sorted([start_idx, end_idx])
-                    # 後の隣接ノード検出のために、双方向で隣接関係を登録
-                    row.extend([start_idx, end_idx])
-                    col.extend([end_idx, start_idx])
-                    data.extend([1, 1])
-
-            # 隣接行列からCSR形式の疎行列を作成
-            sparse_matrix = csr_matrix((data, (row, col)), shape=(len(row), len(row)))
-
-            return sparse_matrix, node_coordinates, points_bef_aft
+            # 最近傍のまとめた座標を各端点のノードとする
+            _, node_index = KDTree(reduced_points).query(points, k=1)
+
+            # 始点と終点が同じである線分(点のような線分)はエッジとしない
+            network = CT.LineNetwork(
+                np.asarray(node_index).reshape(-1, 2), reduced_points, keep_loops=False
+            )
+
+            # ノードの座標を保持する辞書 key=ノード番号 value=ノードの座標
+            node_coordinates = {
+                node: reduced_points[node]
+                for node in dict.fromkeys(network.edge_nodes.ravel().tolist())
+            }
+
+            return network, node_coordinates, points_bef_aft
 
         except Exception as e:
-            raise Exception(f"[build_sparse_matrix_Exception]: {str(e)}")
+            raise Exception(f"[build_line_network_Exception]: {str(e)}")
 
-    def create_polyline_list(self, sp_mtx, delete_duplicate_flg):
+    def create_polyline_list(self, network, delete_duplicate_flg):
         """
         グラフから分岐のないポリライン別のリストを作成する。
 
-        :param sp_mtx: ノード間の隣接情報を保持する疎行列。
-        :type sp_mtx: scipy.sparse.csr_matrix
+        :param network: ノード間の接続情報を保持するネットワーク。
+        :type network: cad.common.cad_topology.LineNetwork
         :param delete_duplicate_flg: 重複するエッジを削除するかどうかを決定するフラグ。
         :type delete_duplicate_flg: bool
 
-        :return: ポリラインにするノードのリスト、および検出したポリラインノードを削除した疎行列。
-        :rtype: tuple[list[list[int]], scipy.sparse.csr_matrix]
+        :return: ポリラインにするノードのリスト、および検出したポリラインのエッジを削除したネットワーク。
+        :rtype: tuple[list[list[int]], cad.common.cad_topology.LineNetwork]
 
         :raises Exception:
             処理中にエラーが発生した場合に例外をスローする。
         """
         try:
-            # 全ノードを取得
-            # 非ゼロ要素の行と列のインデックスを取得
-            rows, cols = sp_mtx.nonzero()
-            # 全ノードのリストを取得（重複を削除するためにsetを使用）
-            node_list = sorted(set(rows) | set(cols))
+            # ノード間のエッジの本数を持つ隣接行列
+            adjacency = network.adjacency_matrix()
+            neighbor_counts = np.diff(adjacency.indptr)
 
             # 接続ノード数が2以外の有効ノードを取得
-            valid_nodes = [
-                node
-                for node in node_list
-                if (sp_mtx[node].toarray().flatten() != 0).sum() != 2
-            ]
+            valid_nodes = np.flatnonzero(
+                (neighbor_counts > 0) & (neighbor_counts != 2)
+            ).tolist()
 
             if not delete_duplicate_flg:
                 # Delete DuplicatesがFalseのとき重さ（重複数）が2以上のエッジを取得し、構成ノードを有効ノードとする
-                duplicates_node_list = np.array(
-                    [
-                        np.array([rows[i], cols[i]])
-                        for i in range(len(sp_mtx.data))
-                        if sp_mtx[rows[i], cols[i]] >= 2
-                    ]
-                )
-                if len(duplicates_node_list) > 0:
+                rows, cols = adjacency.nonzero()
+                is_duplicate = adjacency.data >= 2
+                if is_duplicate.any():
+                    duplicates_node_list = np.column_stack(
+                        [rows[is_duplicate], cols[is_duplicate]]
+                    )
                     nodes_of_duplicate_edges = np.unique(
                         np.sort(duplicates_node_list, axis=1), axis=0
                     )[0]
                     valid_nodes = list(
-                        set(valid_nodes + list(nodes_of_duplicate_edges))
+                        set(valid_nodes + nodes_of_duplicate_edges.tolist())
                     )
 
+            valid_node_set = set(valid_nodes)
+
             # ポリラインにするnodeのリストのリスト
             node_list_of_list_for_polyline = []
 
             # 有効ノードをLoop
             for start_node in valid_nodes:
-                # 隣接ノードリストを取得
-                neighbor_node_list = sp_mtx[start_node].nonzero()[1]
                 # 有効ノードである隣接ノードを抽出
-                valid_neighbor_node_list = list(
-                    filter(
-                        lambda node: node in valid_nodes,
-                        neighbor_node_list,
+                valid_neighbor_node_list = [
+                    node
+                    for node in network.neighbors(start_node).tolist()
+                    if node in valid_node_set
+                ]
+
+                # 隣接ノードに有効ノードがある場合、経路として登録し、エッジを削除する
+                for neighbor in valid_neighbor_node_list:
+                    # 経路としてポリラインリストに追加
+                    node_list_of_list_for_polyline.append([start_node, neighbor])
+                    # 検出した経路をネットワークから削除
+                    network.remove_edges_between(
+                        start_node, neighbor, delete_duplicate_flg
                     )
-                )
 
-                # 隣接ノードに有効ノードがある場合、経路として登録し、疎行列からエッジを削除する
-                if len(valid_neighbor_node_list) > 0:
-                    for neighbor in valid_neighbor_node_list:
-                        # 経路としてポリラインリストに追加
-                        node_list_of_list_for_polyline.append([start_node, neighbor])
-                        # 検出した経路を疎行列から削除
-                        sp_mtx = self.remove_edge(
-                            sp_mtx,
-                            start_node,
-                            neighbor,
-                            delete_duplicate_flg,
-                        )
+                # 有効ノードではない隣接ノードから、有効ノードに到達するまで分岐のない経路をたどる
+                # 終点ノードごとに、経由するエッジの本数が最も少ない経路を採用する
+                path_dict = {}
+                for end_node, path, weight in network.trace_chains(
+                    start_node, valid_node_set
+                ):
+                    if end_node is None or end_node == start_node:
+                        continue
+                    if end_node not in path_dict or weight < path_dict[end_node][1]:
+                        path_dict[end_node] = (path, weight)
 
-                # 隣接ノードから有効ノード以外を抽出
-                invalid_neighbor_node_list = list(
-                    filter(
-                        lambda node: node not in valid_neighbor_node_list,
-                        neighbor_node_list,
-                    )
+                if not path_dict:
+                    continue
+
+                # 始点から終点までの最短経路の長さ（経路の登録前のネットワークで求める）
+                # 他の有効ノードを経由するより短い経路がある場合は、分岐のない経路を採用しない
+                distance_dict = network.shortest_distances(
+                    start_node, max(weight for _, weight in path_dict.values())
                 )
-                # 有効ノードではない隣接ノードがある場合、最短経路を探索し、疎行列からエッジを削除する
-                if len(invalid_neighbor_node_list) > 0:
-                    # 有効ノードから始点以外を抽出
-                    end_nodes = list(
-                        filter(
-                            lambda node: node != start_node,
-                            valid_nodes,
-                        )
-                    )
-                    # 最短経路の計算
-                    _distances, predecessors = dijkstra(
-                        sp_mtx, return_predecessors=True, indices=start_node
-                    )
 
-                    # 経路の復元
-                    for end_node in end_nodes:
-                        no_path_flg = False  # パス無しフラグ
-                        path = []  # 検出パス格納先
-                        current_node = end_node  # 現在ノード
-                        # 現在ノードが開始ノードではない限りループ
-                        while current_node != start_node:
-                            path.append(current_node)
-                            current_node = predecessors[current_node]
-                            # 前駆ノードが見つからない、もしくは、前駆ノードが始点終点を除く有効ノードの場合
-                            if current_node == -9999 or (
-                                current_node != start_node
-                                and current_node != end_node
-                                and current_node in valid_nodes
-                            ):
-                                no_path_flg = True
-                                break
-                        if not no_path_flg:
-                            path.append(start_node)  # 始点をパスに追加
-                            path.reverse()  # 始点から始まるパスに並び替え
-                            # 経路としてポリラインリストに追加
-                            node_list_of_list_for_polyline.append(path)
-                            # パス登録したエッジを疎行列から削除
-                            for idx in range(len(path) - 1):
-                                sp_mtx = self.remove_edge(
-                                    sp_mtx,
-                                    path[idx],
-                                    path[idx + 1],
-                                    delete_duplicate_flg,
-                                )
+                # 有効ノードの順に経路を登録する
+                for end_node in valid_nodes:
+                    if end_node not in path_dict:
+                        continue
 
-            return node_list_of_list_for_polyline, sp_mtx
+                    path, weight = path_dict[end_node]
+                    if weight > distance_dict.get(end_node, np.inf):
+                        continue
+
+                    # 経路としてポリラインリストに追加
+                    node_list_of_list_for_polyline.append(path)
+                    # パス登録したエッジをネットワークから削除
+                    for idx in range(len(path) - 1):
+                        network.remove_edges_between(
+                            path[idx], path[idx + 1], delete_duplicate_flg
+                        )
+
+            return node_list_of_list_for_polyline, network
 
         except Exception as e:
             raise Exception(f"[create_polyline_list_Exception]: {str(e)}")
 
     def get_unused_edges(
-        self, remove_pl_list, sp_mtx, remove_pl_flg, delete_duplicate_flg
+        self, remove_pl_list, network, remove_pl_flg, delete_duplicate_flg
     ):
         """
-        疎行列からポリラインのノードのリストに含まれていないエッジを抽出する。
+        ネットワークからポリラインのノードのリストに含まれていないエッジを抽出する。
 
         :param remove_pl_list: 削除対象のポリラインのノードのリスト。
         :type remove_pl_list: list[list[int]]
-        :param sp_mtx: グラフのエッジ情報を保持する疎行列。
-        :type sp_mtx: scipy.sparse.csr_matrix
-        :param remove_pl_flg: 検出したポリラインを疎行列から削除するかどうかのフラグ。
+        :param network: グラフのエッジ情報を保持するネットワーク。
+        :type network: cad.common.cad_topology.LineNetwork
+        :param remove_pl_flg: 検出したポリラインをネットワークから削除するかどうかのフラグ。
         :type remove_pl_flg: bool
         :param delete_duplicate_flg: 重複するエッジを削除するかどうかのフラグ。
         :type delete_duplicate_flg: bool
@@ -496,24 +383,15 @@ class IntegrateLineStringLogic:
         """
         try:
             if remove_pl_flg and len(remove_pl_list) > 0:
-                # 疎行列から検出したポリラインのエッジを削除
+                # ネットワークから検出したポリラインのエッジを削除
                 for polyline in remove_pl_list:
-                    # 検出した経路を疎行列から削除
-                    sp_mtx = self.remove_edge(
-                        sp_mtx,
-                        polyline[0],
-                        polyline[1],
-                        delete_duplicate_flg,
+                    network.remove_edges_between(
+                        polyline[0], polyline[1], delete_duplicate_flg
                     )
 
-            # 非ゼロ要素の行と列のインデックスを取得
-            row_indices, col_indices = sp_mtx.nonzero()
-
-            # 未使用のエッジを取得
-            unused_edges = list()
-            for row, col in zip(row_indices, col_indices):
-                if sp_mtx[row, col] > 0:
-                    unused_edges.append(tuple((row, col)))
+            # 未使用のエッジを取得（隣接行列の非ゼロ要素の行と列のインデックス）
+            row_indices, col_indices = network.adjacency_matrix().nonzero()
+            unused_edges = list(zip(row_indices.tolist(), col_indices.tolist()))
 
             # 結果をリストに変換して表示
             if delete_duplicate_flg:
@@ -1120,47 +998,6 @@ class IntegrateLineStringLogic:
         except Exception as e:
             raise Exception(f"[create_fsf_Exception]: {str(e)}")
 
-    def delete_duplicate_edges(self, sp_mtx):
-        """
-        疎行列から、重複しているエッジを削除する。
-
-        :param sp_mtx: 隣接関係を持つ疎行列。
-        :type sp_mtx: scipy.sparse.csr_matrix
-
-        :return: DataFrame。
-        :rtype: pandas.DataFrame
-
-        :raises Exception:
-            処理中にエラーが発生した場合に例外をスローする。
-        """
-        try:
-            # エッジを持つノードリストを取得
-            row, col = sp_mtx.nonzero()
-            data = sp_mtx.data
-
-            # 重複エッジの削除（エッジの重みを合計する）
-            # 行と列のペアをソートして、順番を統一する
-            pairs = np.vstack([row, col]).T
-
-            # 新しい行と列を作成（重複を排除して合計する）
-            unique_pairs, unique_indices = np.unique(pairs, axis=0, return_inverse=True)
-
-            # 各ペアの重みを合計する
-            unique_data = np.zeros(len(unique_pairs))
-            for idx in unique_indices:
-                unique_data[idx] += data[idx]
-
-            # 新しい疎行列を作成
-            new_sparse_matrix = csr_matrix(
-                (unique_data, (unique_pairs[:, 0], unique_pairs[:, 1])),
-                shape=(len(unique_data), len(unique_data)),
-            )
-
-            return new_sparse_matrix
-
-        except Exception as e:
-            raise Exception(f"[delete_duplicate_edges_Exception]: {str(e)}")
-
     def create_findex_pairs(
         self, int_geoms, int_fids, org_geoms, org_fids, dup_del_flg
     ):
@@ -1287,23 +1124,19 @@ class IntegrateLineStringLogic:
             # 線分を２点で構成される線分に再構成
             line_segments = self.decompose_linestrings(coords_list)
 
-            # 全ラインから疎行列を作成し、ノード情報を取得
-            sparse_matrix, node_coordinates, point_before_after = (
-                self.build_sparse_matrix(line_segments, self.THRESHOLD)
+            # 全ラインからネットワークを作成し、ノード情報を取得
+            network, node_coordinates, point_before_after = (
+                self.build_line_network(line_segments, self.THRESHOLD)
             )
 
-            # 重複を許容しない場合、疎行列から重複するエッジを削除する
-            if delete_duplicates_flg:
-                sparse_matrix = self.delete_duplicate_edges(sparse_matrix)
-
             # 分岐のない線分を1つにまとめたリストにする(ポリラインのノードのリストを作成)
-            polyline_list, sparse_matrix = self.create_polyline_list(
-                sparse_matrix, delete_duplicates_flg
+            polyline_list, network = self.create_polyline_list(
+                network, delete_duplicates_flg
             )
 
             # 未使用エッジリストの抽出
             unused_edges = self.get_unused_edges(
-                polyline_list, sparse_matrix, False, delete_duplicates_flg
+                polyline_list, network, False, delete_duplicates_flg
             )
 
             # 未使用エッジからサイクルを形成するノードのリストを取得
@@ -1316,9 +1149,9 @@ class IntegrateLineStringLogic:
             # サイクルのポリラインを追加
             polyline_list = polyline_list + cycle_path_list
 
-            # サイクルを形成するエッジを疎行列から削除し、未使用エッジを取得
+            # サイクルを形成するエッジをネットワークから削除し、未使用エッジを取得
             unused_edges = self.get_unused_edges(
-                cycle_node_list, sparse_matrix, True, delete_duplicates_flg
+                cycle_node_list, network, True, delete_duplicates_flg
             )
 
             # 未使用エッジのポリラインを追加
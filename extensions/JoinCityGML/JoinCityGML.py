@@ -27,22 +27,16 @@
 # Python標準モジュール
 import io
 import zipfile
-import base64
-import pickle
 import traceback
 
-# 外部ライブラリを動的インポート
-from importlib import import_module
-
 # Nifi自作モジュール
+import nifiapi.NifiCustomPackage.FieldSetFilePackage as FSP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
 
 # Nifiライブラリ
 from nifiapi.flowfiletransform import FlowFileTransform, FlowFileTransformResult
 from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
 
-pd = import_module("pandas")
-
 ZIP_COMPRESSION_ENABLED = "圧縮する"
 ZIP_COMPRESSION_DISABLED = "圧縮しない"
 
@@ -136,6 +130,98 @@ class JoinCityGML(FlowFileTransform):
 
         return start_tag, end_tag, filename, output_zip_flag
 
+    def get_tab_indent(self, line):
+        """
+        概要:
+            行頭のタブインデントを取得する関数
+        引数:
+            line: 対象の行
+        戻り値:
+            行頭のタブ文字列（インデントがない場合は空文字）
+        """
+        return line[:len(line) - len(line.lstrip('\t'))]
+
+    def extract_member_string(self, target_string, start_tag, end_tag):
+        """
+        概要:
+            CityGMLから、開始タグの最初の出現位置から終了タグの最後の出現位置までの部分文字列を抽出する関数
+        引数:
+            target_string: CityGMLの文字列
+            start_tag: 結合したい箇所の１行目のタグ
+            end_tag: 結合したい箇所の最終行のタグ
+        戻り値:
+            抽出した部分文字列（タグが見つからない場合は空文字）
+        """
+        # targetの最初と最後の出現位置を取得
+        start_index = target_string.find(start_tag)
+        end_index = target_string.rfind(end_tag)
+
+        # 取得したインデックスを使って部分文字列を抽出
+        if start_index != -1 and end_index != -1:
+            return target_string[start_index:end_index + len(end_tag)]
+
+        return ""
+
+    def write_lines(self, stream, text):
+        """
+        概要:
+            文字列を空行を除き、windows用の改行コードで出力先に書き出す関数
+        引数:
+            stream: 書き込み先のバイナリモードのファイルオブジェクト
+            text: 書き出す文字列
+        戻り値:
+            書き出した行数
+        """
+        line_list = [line for line in text.splitlines() if line.strip()]
+
+        if line_list:
+            stream.write(("\r\n".join(line_list) + "\r\n").encode("utf-8"))
+
+        return len(line_list)
+
+    def write_joined_city_gml(self, stream, field_set_file_view, start_tag, end_tag):
+        """
+        概要:
+            最初のCityGMLのヘッダ、各CityGMLの結合箇所、最初のCityGMLのフッタの順に出力先へ書き出す関数
+            CityGMLは1件ずつデコードして書き出すため、保持するのは1件分のみとなる
+        引数:
+            stream: 書き込み先のバイナリモードのファイルオブジェクト
+            field_set_file_view: CityGMLが格納されたFieldSetFileのビュー
+            start_tag: 結合したい箇所の１行目のタグ
+            end_tag: 結合したい箇所の最終行のタグ
+        戻り値:
+            書き出した行数
+        """
+        # 最初のCityGMLをベースにし、最終行をフッタ、それ以外をヘッダとする
+        base_lines = field_set_file_view.get_value_by_index(0, is_cache=False).strip().splitlines()
+
+        if not base_lines:
+            return 0
+
+        line_count = self.write_lines(stream, "\n".join(base_lines[:-1]))
+
+        # フッタが1行目のみの場合は結合箇所を挿入しない
+        if len(base_lines) >= 2:
+
+            # 最後から2行目のインデントを取得
+            indent = self.get_tab_indent(base_lines[-2])
+
+            # 他のCityGMLを順番に追加
+            for index in range(1, len(field_set_file_view)):
+                target_string = field_set_file_view.get_value_by_index(index, is_cache=False)
+
+                # 直前の行のインデントを適用して書き出す
+                indented_substring = indent + self.extract_member_string(target_string, start_tag, end_tag).strip()
+                line_count += self.write_lines(stream, indented_substring)
+
+                # 次の結合箇所は、書き出した結合箇所の最終行のインデントに合わせる
+                indented_lines = indented_substring.splitlines()
+                indent = self.get_tab_indent(indented_lines[-1] if indented_lines else indented_substring)
+
+        line_count += self.write_lines(stream, base_lines[-1])
+
+        return line_count
+
     # ---------------------------------------------------------------------------------------------------
     # ★メイン処理★
     # ---------------------------------------------------------------------------------------------------
@@ -149,75 +235,36 @@ class JoinCityGML(FlowFileTransform):
                 output_zip_flag\
                 = WM.calc_func_time(self.logger)(self.get_property)(context, flowfile)
 
-            # flowfileから、CSV形式のFieldSetFileを取得
-            input_field_set_file = flowfile.getContentsAsBytes().decode("utf-8")
-
-            # StringIOオブジェクトとしてCSV形式のデータをDataFrameとして読み込む
-            field_set_file_data_frame = pd.read_csv(
-                io.StringIO(input_field_set_file))
+            # flowfileから、FieldSetFileを取得（Valueは1件ずつデコードする）
+            field_set_file_view = FSP.FieldSetFileView(flowfile.getContentsAsBytes())
 
-            value_list = field_set_file_data_frame["Value"].tolist()
+            output_buffer = io.BytesIO()
 
-            # 最初のCityGMLをベースにする
-            base_string = pickle.loads(base64.b64decode(value_list[0]))
+            if output_zip_flag == ZIP_COMPRESSION_ENABLED:
 
-            # 他のCityGMLを順番に追加
-            for value in value_list[1:]:
-                target_string = pickle.loads(base64.b64decode(value))
-
-                # targetの最初と最後の出現位置を取得
-                start_index = target_string.find(start_tag)
-                end_index = target_string.rfind(end_tag)
-
-                # 取得したインデックスを使って部分文字列を抽出
-                if start_index != -1 and end_index != -1:
-                    substring = target_string[start_index:end_index +
-                                              len(end_tag)]
-                else:
-                    substring = ""
-
-                # another_stringを行ごとのリストに分割
-                another_lines = base_string.strip().splitlines()
-
-                # 最後から2行目のインデントを取得
-                if len(another_lines) >= 2:
-                    last_two_indent = another_lines[-2][:len(
-                        another_lines[-2]) - len(another_lines[-2].lstrip('\t'))]
-                else:
-                    last_two_indent = ""  # インデントがない場合は空文字
-
-                # 最後から2番目の行にインデントを適用したsubstringを挿入
-                if len(another_lines) >= 2:
-                    indented_substring = last_two_indent + substring.strip()  # インデントを追加
-                    another_lines.insert(-1, indented_substring)  # 最後から2行目に追加
-
-                # 最終的な結果を再結合
-                base_string = "\n".join(another_lines)
-
-            # 改行文字をwindows用に変換
-            final_string = base_string.replace("\n", "\r\n")
-            final_string = "\r\n".join(
-                [line for line in final_string.splitlines() if line.strip()])
-
-            # 最後の行が改行で終わっていない場合のみ \r\n を追加
-            if not final_string.endswith('\r\n'):
-                final_string += '\r\n'
+                # ZIPエントリに直接書き出し、圧縮前の全体をメモリ上に保持しない
+                with zipfile.ZipFile(output_buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+                    with zip_file.open(filename, 'w', force_zip64=True) as zip_entry:
+                        line_count = WM.calc_func_time(self.logger)(self.write_joined_city_gml)(
+                            zip_entry, field_set_file_view, start_tag, end_tag)
 
-            if output_zip_flag == ZIP_COMPRESSION_ENABLED:
+                        # 出力が空の場合も改行のみを出力する
+                        if line_count == 0:
+                            zip_entry.write(b"\r\n")
 
-                # CSV形式の文字列をZip圧縮
-                zip_buffer = io.BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
-                    zip_file.writestr(filename, final_string)
+            else:
+                line_count = WM.calc_func_time(self.logger)(self.write_joined_city_gml)(
+                    output_buffer, field_set_file_view, start_tag, end_tag)
 
-                # Zipデータを取得
-                final_string = zip_buffer.getvalue()
+                # 出力が空の場合も改行のみを出力する
+                if line_count == 0:
+                    output_buffer.write(b"\r\n")
 
             # ファイルの名前を設定する。
             attribute = {"filename": filename}
 
             return FlowFileTransformResult(relationship="success",
-                                           contents=final_string,
+                                           contents=output_buffer.getvalue(),
                                            attributes=attribute)
 
         except Exception:
@@ -0,0 +1,345 @@
+# MIT License
+# 
+# Copyright (c) 2025 NTT InfraNet
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Python標準ライブラリ
+import os
+import sys
+import json
+import uuid
+from functools import partial
+import importlib.util
+
+from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
+from raster_to_vector.common.base_processor import BaseProcessor
+from raster_to_vector.common.base_raster_vector_logic import BaseRasterVectorLogic
+from raster_to_vector.common.pipeline_processor_executor import PipelineProcessorExecutor
+
+# 各プロセッサのディレクトリを格納しているextensionsディレクトリ
+EXTENSIONS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# パイプラインで実行できるプロセッサ（BaseRasterVectorLogicを継承したロジックを持つラスタベクタ変換のプロセッサ）
+# Pipeline Definitionのプロセッサ名はこの一覧に含まれるもののみ受け付け、任意のファイルを読み込まないようにする
+PIPELINE_PROCESSOR_NAME_LIST = (
+    'CalculateAngleDirectionSymbol',
+    'ConvertImageToBinary',
+    'ConvertImageToGrayScale',
+    'ConvertImageToHLS',
+    'ConvertImageToHSV',
+    'ConvertImageToNumpy',
+    'ConvertImageToRGB',
+    'ExtractGeoTiffInfo',
+    'ImageCircleDetection',
+    'ImageColorExtraction',
+    'ImageConnectedRegionDetection',
+    'ImageContourDetection',
+    'ImageContrastAdjustment',
+    'ImageCrop',
+    'ImageEdgeDetection',
+    'ImageLeaderDetection',
+    'ImageLineApproximation',
+    'ImageLineDetection',
+    'ImageLinkProcessor',
+    'ImageMerge',
+    'ImageMorphology',
+    'ImageOCR',
+    'ImageProcessor',
+    'ImageRectangleRegionDetection',
+    'ImageRegionRemove',
+    'ImageShapeCorrection',
+    'ImageSharpening',
+    'ImageSmoothing',
+    'ImageSplit',
+    'LineContourFiltering',
+)
+
+# パイプラインで読み込むモジュールをsys.modulesに登録する際の名前空間
+# 各プロセッサや他のパイプラインが読み込んだ同名のモジュールと衝突しないよう、パイプラインのインスタンスごとに分ける
+STAGE_MODULE_NAMESPACE = 'raster_vector_pipeline_stage'
+
+
+class RasterVectorPipeline(BaseProcessor):
+    """
+    プロセッサ名
+    --------------------------------
+    RasterVectorPipeline
+
+    バージョン
+    --------------------------------
+    1.0.0
+
+    説明
+    --------------------------------
+    ラスタベクタ変換の複数のプロセッサの処理を、1つのプロセッサ内で続けて実行するプロセッサクラスです。
+
+    **処理概要:**
+
+    - Pipeline Definitionに指定された順に、各プロセッサのロジッククラスを読み込みます。
+    - 入力のFieldSetFileを1度だけ読み込み、各ロジックをメモリ上のDataFrameのまま順に実行します。
+    - 最後のロジックの実行後に1度だけFieldSetFileに変換して出力します。
+
+    **注意事項:**
+
+    - 指定できるのはラスタベクタ変換のプロセッサ（BaseRasterVectorLogicを継承したロジック）のみです。
+    - Pipeline Definitionでは式言語は評価されません。
+    - 各プロセッサのプロパティは、未指定の項目には各プロセッサの初期値が設定されます。
+    - 各プロセッサのプロパティでは式言語は評価されません。
+    - requirements.txtに含まれないライブラリを使用するプロセッサを指定する場合は、requirements.txtに追加してください。
+
+    タグ
+    --------------------------------
+    * image processing
+    * pipeline
+
+    プロパティ
+    --------------------------------
+    **Pipeline Definition**
+
+    **必須入力  直接入力**
+
+    - 実行するプロセッサ名とプロパティをJSON形式のリストで、実行する順に指定します。
+    - プロパティのキーはプロパティ名（例：Kernel Size）か、プロセッサの属性名（例：kernel_size）で指定します。
+    - プロセッサに存在しないプロパティを指定した場合はエラーとなります。
+    - 例：[{"processor": "ConvertImageToGrayScale"}, {"processor": "ImageSmoothing", "properties": {"Kernel Size": "3,3"}}]
+
+    リレーションシップ
+    --------------------------------
+    * success: 全てのプロセッサの処理が正常に完了した場合
+    * failure: 処理中にエラーが発生した場合
+
+    Reads Attributes
+    --------------------------------
+    * ColorSpace: 入力画像のカラースペース。
+
+    Writes Attributes
+    --------------------------------
+    * 各プロセッサが設定する属性。
+
+    State management
+    --------------------------------
+    * なし
+
+    Restricted
+    --------------------------------
+    * なし
+
+    Input requirement
+    --------------------------------
+    * 画像データ、またはバイトデータ形式の画像データを持つFieldSetFileである必要があります。
+
+    System Resource Considerations
+    --------------------------------
+    * 全てのプロセッサの処理をメモリ上で続けて行うため、中間の画像データはFieldSetFileに書き出されません。
+    """
+
+    class Java:
+        implements = ["org.apache.nifi.python.processor.FlowFileTransform"]
+
+    class ProcessorDetails:
+        version = "1.0.0"
+        description = 'RasterVectorPipeline'
+
+    pipeline_definition = PropertyDescriptor(
+        name="Pipeline Definition",
+        description="実行するプロセッサ名とプロパティをJSON形式のリストで、実行する順に指定します。\
+                    例：[{\"processor\": \"ConvertImageToGrayScale\"}, \
+                    {\"processor\": \"ImageSmoothing\", \"properties\": {\"Kernel Size\": \"3,3\"}}]",
+        expression_language_scope=ExpressionLanguageScope.NONE,
+        required=True,
+        sensitive=False
+    )
+
+    property_descriptors = [
+        pipeline_definition
+    ]
+
+    def getPropertyDescriptors(self):
+        return self.property_descriptors
+
+    def __init__(self, **kwargs):
+        # 読み込み済みのロジック {プロセッサ名: (ロジックのインスタンス, プロパティの初期値, プロパティ名と属性名の対応)}
+        self.stage_dict = {}
+
+        # このパイプラインが読み込むモジュールの名前空間
+        self.module_namespace = f'{STAGE_MODULE_NAMESPACE}_{uuid.uuid4().hex}'
+
+    def load_module(self, module_name, module_path):
+        """
+        プロセッサのディレクトリにあるモジュールを読み込みます。
+        sys.modulesにはパイプラインごとの名前空間を付けた名前で登録し、読み込み済みの場合はそのモジュールを返します。
+
+        Parameters
+        ----------
+        module_name : str
+            モジュール名です。
+        module_path : str
+            モジュールのファイルパスです。
+
+        Returns
+        -------
+        module
+            読み込んだモジュールを返します。
+        """
+        qualified_module_name = f'{self.module_namespace}.{module_name}'
+        if qualified_module_name in sys.modules:
+            return sys.modules[qualified_module_name]
+
+        if not os.path.isfile(module_path):
+            raise Exception(f'モジュールが見つかりません: {module_path}')
+
+        spec = importlib.util.spec_from_file_location(qualified_module_name, module_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[qualified_module_name] = module
+        spec.loader.exec_module(module)
+
+        return module
+
+    def get_processor_directory(self, processor_name):
+        """
+        パイプラインで実行するプロセッサのディレクトリを取得します。
+        モジュールを読み込む前に、プロセッサ名が実行可能なプロセッサの一覧に含まれ、
+        extensionsディレクトリ直下のディレクトリを指していることを確認します。
+
+        Parameters
+        ----------
+        processor_name : str
+            プロセッサ名です。
+
+        Returns
+        -------
+        str
+            プロセッサのディレクトリパスを返します。
+
+        Raises
+        ------
+        ValueError
+            パイプラインで実行できないプロセッサ名が指定された場合に発生します。
+        """
+        if not isinstance(processor_name, str) or not processor_name.isidentifier() \
+                or processor_name not in PIPELINE_PROCESSOR_NAME_LIST:
+            raise ValueError(f'パイプラインで実行できないプロセッサが指定されています: {processor_name}')
+
+        processor_directory = os.path.join(EXTENSIONS_DIRECTORY, processor_name)
+        if not os.path.isdir(processor_directory) \
+                or os.path.dirname(os.path.realpath(processor_directory)) != os.path.realpath(EXTENSIONS_DIRECTORY):
+            raise ValueError(f'プロセッサのディレクトリが見つかりません: {processor_name}')
+
+        return processor_directory
+
+    def load_stage(self, processor_name):
+        """
+        プロセッサのロジッククラスとプロパティの初期値を読み込みます。
+
+        Parameters
+        ----------
+        processor_name : str
+            プロセッサ名です。ロジッククラスは<プロセッサ名>Logicとします。
+
+        Returns
+        -------
+        tuple
+            ロジックのインスタンス、プロパティの初期値の辞書、プロパティ名と属性名の対応の辞書を含むタプルを返します。
+        """
+        if processor_name in self.stage_dict:
+            return self.stage_dict[processor_name]
+
+        processor_directory = self.get_processor_directory(processor_name)
+
+        # プロパティの初期値はプロセッサクラスのPropertyDescriptorから取得する
+        processor_module = self.load_module(processor_name,
+                                            os.path.join(processor_directory, f'{processor_name}.py'))
+        processor_class = getattr(processor_module, processor_name)
+
+        default_properties = {}
+        property_name_dict = {}
+        for key, value in processor_class.__dict__.items():
+            if isinstance(value, PropertyDescriptor):
+                default_properties[key] = value.defaultValue
+                property_name_dict[value.name] = key
+
+        logic_module = self.load_module(f'{processor_name}Logic',
+                                        os.path.join(processor_directory, f'{processor_name}Logic.py'))
+        logic_class = getattr(logic_module, f'{processor_name}Logic')
+
+        if not issubclass(logic_class, BaseRasterVectorLogic):
+            raise Exception(f'パイプラインで実行できないプロセッサが指定されています: {processor_name}')
+
+        # 各プロセッサと同じくロジックのメソッドと関数を時間計測でラップする
+        # 読み込み済みのモジュールを再利用した場合に二重にラップしないよう、ラップ済みの印を付ける
+        logic_instance = logic_class()
+        if not getattr(logic_module, '__pipeline_wrapped__', False):
+            self.wrap_methods_in_class(logic_class)
+            self.wrap_functions_in_module(logic_module)
+            logic_module.__pipeline_wrapped__ = True
+
+        self.stage_dict[processor_name] = (logic_instance, default_properties, property_name_dict)
+
+        return self.stage_dict[processor_name]
+
+    def create_stage_list(self, properties):
+        """
+        Pipeline Definitionから、実行するロジックとプロパティのリストを作成します。
+
+        Parameters
+        ----------
+        properties : dict
+            パイプラインのプロパティの辞書です。
+
+        Returns
+        -------
+        list
+            (ロジックのインスタンス, 実行関数, プロパティの辞書)のリストを返します。
+        """
+        try:
+            definition_list = json.loads(properties['pipeline_definition'])
+        except Exception as e:
+            raise ValueError(f'Pipeline Definitionに無効な値が設定されています: {properties.get("pipeline_definition")}') from e
+
+        if not isinstance(definition_list, list) or len(definition_list) == 0:
+            raise ValueError('Pipeline Definitionには1つ以上のプロセッサをリスト形式で指定してください')
+
+        stage_list = []
+        for definition in definition_list:
+            if not isinstance(definition, dict) or 'processor' not in definition:
+                raise ValueError(f'Pipeline Definitionの各要素にはprocessorを指定してください: {definition}')
+
+            logic_instance, default_properties, property_name_dict = self.load_stage(definition['processor'])
+
+            # 未指定のプロパティには各プロセッサの初期値を設定する
+            stage_properties = dict(default_properties)
+            for key, value in definition.get('properties', {}).items():
+                attribute_name = property_name_dict.get(key, key)
+
+                # プロパティ名の誤りを無視しないよう、プロセッサに存在しないプロパティはエラーとする
+                if attribute_name not in default_properties:
+                    raise ValueError(f'{definition["processor"]}に存在しないプロパティが指定されています: {key}'
+                                     f'（指定可能なプロパティ: {", ".join(property_name_dict)}）')
+
+                stage_properties[attribute_name] = value
+
+            stage_list.append((logic_instance,
+                               partial(self.process_content, method=logic_instance.__call__),
+                               stage_properties))
+
+        return stage_list
+
+    def create_executor(self, content, attribute):
+        return PipelineProcessorExecutor(self.create_stage_list)
@@ -27,7 +27,6 @@
 
 # Python標準ライブラリ
 import io
-import pickle
 import traceback
 
 from importlib import import_module
@@ -36,6 +35,7 @@ from importlib import import_module
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
 import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
 import nifiapi.NifiCustomPackage.WrapperModule as WM
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 # NiFiライブラリ
 from nifiapi.flowfiletransform import FlowFileTransform, FlowFileTransformResult
@@ -178,7 +178,7 @@ class ReadGeoDataFrameFromFiles(FlowFileTransform):
             # GeoDataFrameを選択した場合、GeoDataFrameをpickle形式でシリアライズしてcontentに設定する
             if output_type == DDC.CONTENTS_CODE_GEODATAFRAME:
                 output_value\
-                    = pickle.dumps(input_geodataframe)
+                    = GCP.serialize_geodataframe(input_geodataframe)
 
                 # 結果を返す
                 return FlowFileTransformResult(relationship="success",
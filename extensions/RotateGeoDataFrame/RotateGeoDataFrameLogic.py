@@ -30,6 +30,8 @@ LineString = getattr(import_module("shapely.geometry"), "LineString")
 rotate = getattr(import_module("shapely.affinity"), "rotate")
 pd = import_module("geopandas")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
+
 
 class RotateGeoDataFrameLogic:
 
@@ -102,7 +104,7 @@ class RotateGeoDataFrameLogic:
         """
         try:
             # 座標データをデシリアライズ
-            geodataframe = pickle.loads(serialized_coords)
+            geodataframe = GCP.deserialize_content(serialized_coords)
             roll_direction = properties['ROLL_DIRECTION']
             roll_angle = float(properties['ROLL_ANGLE'])
             center_mode = properties['CENTER_MODE']
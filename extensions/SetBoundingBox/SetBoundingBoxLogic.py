@@ -21,13 +21,14 @@
 # SOFTWARE.
 
 # Python標準ライブラリ
-import pickle
 from importlib import import_module
 
 # 外部ライブラリの動的インポート
 np = import_module("numpy")
 gpd = import_module("geopandas")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
+
 
 class SetBoundingBoxLogic:
 
@@ -51,7 +52,7 @@ class SetBoundingBoxLogic:
         """
         try:
             # 入力データの読み込み
-            gdf = pickle.loads(serialize_data)
+            gdf = GCP.deserialize_content(serialize_data)
 
             if not gdf.empty:
                 min_x, min_y, max_x, max_y = gdf.total_bounds
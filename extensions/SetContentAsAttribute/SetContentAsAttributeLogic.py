@@ -20,7 +20,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import pickle
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 
 class SetContentAsAttributeLogic:
@@ -51,7 +51,7 @@ class SetContentAsAttributeLogic:
             attribute_name = properties['ATTRIBUTE_NAME']
 
             # デシリアライズ
-            serialize_data = pickle.loads(byte_data)
+            serialize_data = GCP.deserialize_content(byte_data)
 
             # プロパティで指定された属性名で属性を設定
             attribute = {attribute_name: str(serialize_data)}
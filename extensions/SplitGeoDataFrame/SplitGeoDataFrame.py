@@ -27,7 +27,6 @@
 
 # Python標準ライブラリ
 import traceback
-import pickle
 
 from importlib import import_module
 
@@ -36,6 +35,7 @@ import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
 import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 # NiFiライブラリ
 from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
@@ -177,7 +177,7 @@ class SplitGeoDataFrame(FlowFileTransform):
         serialize_dataframe = flowfile.getContentsAsBytes()
 
         # バイトデータからGeoDataFrameをデシリアライズ
-        geodataframe = pickle.loads(serialize_dataframe)
+        geodataframe = GCP.deserialize_content(serialize_dataframe)
 
         return geodataframe
 
@@ -732,13 +732,8 @@ class SplitGeoDataFrame(FlowFileTransform):
                     coordinates_array = NSP.get_geometries_points_numpy(
                         geom_list)
 
-                    # geometry_value_coordinates_array から重複した要素を取り除いた座標IDを取得
-                    coordinates_id_array = np.unique(
-                        coordinates_array[:, 0])
-
                     # coordinates_dict を生成
-                    linestring_dict = {coordinates_id_array[i]: coordinates_array[list(np.where(
-                        coordinates_array[:, 0] == coordinates_id_array[i])[0]), 1:4] for i in range(len(coordinates_id_array))}
+                    coordinates_id_array, linestring_dict = NSP.create_id_array_dict(coordinates_array, column_slice=slice(1, 4))
 
                     # 分割されたGeoDataFrame格納用リストの設定
                     splitted_geodataframes_list = []
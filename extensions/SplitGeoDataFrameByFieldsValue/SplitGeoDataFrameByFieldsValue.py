@@ -28,13 +28,13 @@
 # Python標準ライブラリ
 import traceback
 import io
-import pickle
 
 from importlib import import_module
 
 # NiFi自作ライブラリ
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
 import nifiapi.NifiCustomPackage.WrapperModule as WM
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 
 # NiFiライブラリ
 from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
@@ -132,7 +132,7 @@ class SplitGeoDataFrameByFieldsValue(FlowFileTransform):
         serialize_dataframe = flowfile.getContentsAsBytes()
 
         # バイトデータからGeoDataFrameをデシリアライズ
-        geodataframe = pickle.loads(serialize_dataframe)
+        geodataframe = GCP.deserialize_content(serialize_dataframe)
 
         return geodataframe
 
@@ -36,6 +36,7 @@ MultiLineString = getattr(import_module("shapely.geometry"), "MultiLineString")
 MultiPolygon = getattr(import_module("shapely.geometry"), "MultiPolygon")
 box = getattr(import_module("shapely.geometry"), "box")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import cad.common.cad_utils as CU
 
 
@@ -304,7 +305,7 @@ class TransformGeoDataFrameToPixelLogic:
             all_params = self.get_params(properties, attributes)
 
             # バイトデータからGeoDataFrameをデシリアライズ
-            gdf = pickle.loads(byte_data)
+            gdf = GCP.deserialize_content(byte_data)
 
             # レイヤ絞り込み
             if all_params["layer_name"] and isinstance(all_params["layer_name"], str):
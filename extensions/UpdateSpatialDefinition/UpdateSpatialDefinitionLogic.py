@@ -29,6 +29,7 @@ gpd = import_module("geopandas")
 translate = getattr(import_module("shapely.affinity"), "translate")
 scale = getattr(import_module("shapely.affinity"), "scale")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import cad.common.cad_utils as CU
 
 
@@ -157,7 +158,7 @@ class UpdateSpatialDefinitionLogic:
         try:
 
             # デシリアライズ
-            gdf = pickle.loads(gdf_bytes)
+            gdf = GCP.deserialize_content(gdf_bytes)
 
             # プロパティ値を取得
             all_params = self.get_params(properties)
@@ -21,7 +21,6 @@
 # SOFTWARE.
 
 # Python標準モジュール
-import pickle
 
 # 外部モジュール
 from importlib import import_module
@@ -32,6 +31,7 @@ from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
 # Nifi自作ライブラリ
 import nifiapi.NifiCustomPackage.DataDistributionConstant as DDC
 import nifiapi.NifiCustomPackage.ProcessorBridgePackage as PBP
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 from common.error_code_list import ErrorCodeList
 from data_processing.common.data_processing_base_validate_processor import DataProcessingBaseValidateProcessor
 
@@ -107,7 +107,7 @@ class ValidateConvertDataFrameToFieldSetFile(DataProcessingBaseValidateProcessor
             try:
                 if data_frame_type == "DataFrame":
                     # バイトデータからGeoDataFrameをデシリアライズ
-                    dataframe = pickle.loads(input_data)
+                    dataframe = GCP.deserialize_content(input_data)
                     result = True
                 else:
                     field_set_file_dataframe, \
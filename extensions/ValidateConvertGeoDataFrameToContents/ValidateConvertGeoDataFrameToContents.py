@@ -21,10 +21,10 @@
 # SOFTWARE.
 
 # Python標準モジュール
-import pickle
 import io
 
 # Nifiライブラリ
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 from data_processing.common.data_processing_base_validate_processor import DataProcessingBaseValidateProcessor
 from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope
 from common.error_code_list import ErrorCodeList
@@ -111,7 +111,7 @@ class ValidateConvertGeoDataFrameToContents(DataProcessingBaseValidateProcessor)
                     return self.RESULT_FAILURE
 
             # バイトデータからGeoDataFrameを復元する
-            geodataframe = pickle.loads(input_data)
+            geodataframe = GCP.deserialize_content(input_data)
 
             # --------------------------------------------------------------------------
             # GeoDataFrameかどうかの検証
@@ -228,9 +228,7 @@ class ValidateConvertLineStringCoordinatesToCityGML(DataProcessingBaseValidatePr
                 if self.mode_value == self.MODE_STOP:
                     return self.RESULT_FAILURE
 
-            linestring_id_array = np.unique(linestring_array[:, 0])
-            linestring_dict = {linestring_id_array[i]: linestring_array[list(np.where(
-                linestring_array[:, 0] == linestring_id_array[i])[0]), 1:4] for i in range(len(linestring_id_array))}
+            linestring_id_array, linestring_dict = NSP.create_id_array_dict(linestring_array, column_slice=slice(1, 4))
 
             # gml_id_dwh_nameが正しい形か検証
             if not self.validate_target_in_fsf(gml_id_dwh_name, field_set_data_frame):
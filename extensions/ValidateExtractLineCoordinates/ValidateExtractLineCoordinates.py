@@ -22,11 +22,11 @@
 
 # Python標準ライブラリ
 from importlib import import_module
-import pickle
 
 # 外部ライブラリの動的インポート
 LineString = getattr(import_module("shapely.geometry"), "LineString")
 
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 import cad.common.cad_utils as CU
 from cad.common.cad_base_validate_processor import CadBaseValidateProcessor
 from nifiapi.properties import PropertyDescriptor, ExpressionLanguageScope, StandardValidators
@@ -77,7 +77,7 @@ class ValidateExtractLineCoordinates(CadBaseValidateProcessor):
             
             # GeoDataFrameがInputの場合、LineStringが含まれていること
             if self.validate_serialized_data(input_data)[0]:
-                gdf = pickle.loads(input_data)
+                gdf = GCP.deserialize_content(input_data)
                 if self.validate_geometry_type(gdf):
                     # ジオメトリ有効チェック
                     if not self.validate_geodataframe_geometry(gdf):
@@ -20,10 +20,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-# Python標準モジュール
-import pickle
-
 # Nifiライブラリ
+import nifiapi.NifiCustomPackage.GeoDataFrameContentPackage as GCP
 from data_processing.common.data_processing_base_validate_processor import DataProcessingBaseValidateProcessor
 
 
@@ -76,7 +74,7 @@ class ValidateGetCoordinatesInGeoDataFrame(DataProcessingBaseValidateProcessor):
                     return self.RESULT_FAILURE
 
             # バイトデータからGeoDataFrameを復元する
-            geodataframe = pickle.loads(input_data)
+            geodataframe = GCP.deserialize_content(input_data)
 
             # --------------------------------------------------------------------------
             # GeoDataFrameかどうかの検証
@@ -0,0 +1,193 @@
+# MIT License
+#
+# Copyright (c) 2025 NTT InfraNet
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# --------------------------------------------------------------------------------------------
+# 【モジュール概要】
+# 座標配列（[ID, x, y]または[ID, x, y, z]）、shapelyのジオメトリ、GeoNdarrayの一括変換の往復テスト。
+# Point、LineString、Polygon（Z値あり・なし、穴あり）について、一括変換の結果が
+# 1ジオメトリずつ変換する従来の処理（NSP.get_geometry_array、各ジオメトリのコンストラクタ）と一致することを確認する。
+# 座標配列はポリゴンの外周のみを保持するため、穴あきポリゴンは外周のみのポリゴンとして復元される。
+# --------------------------------------------------------------------------------------------
+
+import pytest
+
+np = pytest.importorskip("numpy")
+shapely = pytest.importorskip("shapely")
+pytest.importorskip("geopandas")
+pytest.importorskip("pygltflib")
+
+from shapely.geometry import LineString, Point, Polygon
+
+import cad.common.cad_utils as CU
+import nifiapi.NifiCustomPackage.NifiSimplePackage as NSP
+
+SHELL_2D = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0), (0.0, 0.0)]
+HOLE_2D = [(2.0, 2.0), (4.0, 2.0), (4.0, 4.0), (2.0, 4.0), (2.0, 2.0)]
+SHELL_3D = [(x, y, 5.0 + x) for x, y in SHELL_2D]
+HOLE_3D = [(x, y, 1.0) for x, y in HOLE_2D]
+
+# ジオメトリタイプごとのテストデータ {名前: (ジオメトリタイプ, ジオメトリのリスト)}
+GEOMETRY_CASE_DICT = {
+    "point_2d": ("Point", [Point(0.0, 0.0), Point(1.5, -2.5), Point(100.25, 3.0)]),
+    "point_3d": ("Point", [Point(0.0, 0.0, 1.0), Point(1.5, -2.5, -3.0), Point(100.25, 3.0, 0.5)]),
+    "linestring_2d": ("LineString", [LineString([(0.0, 0.0), (1.0, 1.0), (2.0, 0.0)]),
+                                     LineString([(5.0, 5.0), (6.0, 7.5)])]),
+    "linestring_3d": ("LineString", [LineString([(0.0, 0.0, 1.0), (1.0, 1.0, 2.0), (2.0, 0.0, 3.0)]),
+                                     LineString([(5.0, 5.0, -1.0), (6.0, 7.5, -2.0)])]),
+    "polygon_2d": ("Polygon", [Polygon(SHELL_2D),
+                               Polygon([(20.0, 20.0), (22.0, 20.0), (21.0, 23.0), (20.0, 20.0)])]),
+    "polygon_3d": ("Polygon", [Polygon(SHELL_3D),
+                               Polygon([(20.0, 20.0, 1.0), (22.0, 20.0, 2.0), (21.0, 23.0, 3.0), (20.0, 20.0, 1.0)])]),
+    "polygon_with_hole_2d": ("Polygon", [Polygon(SHELL_2D, [HOLE_2D]), Polygon(SHELL_2D)]),
+    "polygon_with_hole_3d": ("Polygon", [Polygon(SHELL_3D, [HOLE_3D]), Polygon(SHELL_3D)]),
+}
+
+GEOMETRY_CASE_NAME_LIST = list(GEOMETRY_CASE_DICT)
+
+
+def get_expected_geometries(geometry_list):
+    # 座標配列から復元されるジオメトリ（ポリゴンは外周のみ）
+    return [Polygon(geometry.exterior) if geometry.geom_type == "Polygon" else geometry
+            for geometry in geometry_list]
+
+
+def get_legacy_coordinates_array(geometry_list, id_list=None):
+    # 従来の1ジオメトリずつの変換で作成した座標配列
+    if id_list is None:
+        id_list = range(len(geometry_list))
+
+    return np.concatenate([NSP.get_geometry_array(geometry, geometry_id)
+                           for geometry, geometry_id in zip(geometry_list, id_list)])
+
+
+def assert_geometries_equal(actual_geometries, expected_geometries):
+    assert len(actual_geometries) == len(expected_geometries)
+
+    for actual, expected in zip(actual_geometries, expected_geometries):
+        assert actual.geom_type == expected.geom_type
+        assert actual.has_z == expected.has_z
+        np.testing.assert_array_equal(shapely.get_coordinates(actual, include_z=actual.has_z),
+                                      shapely.get_coordinates(expected, include_z=expected.has_z))
+        assert shapely.get_num_interior_rings(actual) == shapely.get_num_interior_rings(expected)
+
+
+@pytest.mark.parametrize("case_name", GEOMETRY_CASE_NAME_LIST)
+def test_get_coordinates_array_matches_per_geometry_conversion(case_name):
+    _, geometry_list = GEOMETRY_CASE_DICT[case_name]
+
+    coordinates_array = NSP.get_coordinates_array_from_geometries(np.array(geometry_list, dtype=object))
+
+    np.testing.assert_array_equal(coordinates_array, get_legacy_coordinates_array(geometry_list))
+
+
+@pytest.mark.parametrize("case_name", GEOMETRY_CASE_NAME_LIST)
+def test_get_coordinates_array_uses_given_ids(case_name):
+    _, geometry_list = GEOMETRY_CASE_DICT[case_name]
+    id_list = [10 * i + 7 for i in range(len(geometry_list))]
+
+    coordinates_array = NSP.get_coordinates_array_from_geometries(np.array(geometry_list, dtype=object),
+                                                                  np.array(id_list))
+
+    np.testing.assert_array_equal(coordinates_array, get_legacy_coordinates_array(geometry_list, id_list))
+
+
+@pytest.mark.parametrize("case_name", GEOMETRY_CASE_NAME_LIST)
+def test_coordinates_array_geometries_round_trip(case_name):
+    geometry_type, geometry_list = GEOMETRY_CASE_DICT[case_name]
+    coordinates_array = get_legacy_coordinates_array(geometry_list)
+
+    unique_id_array, geometry_array = NSP.create_geometries_from_coordinates_array(coordinates_array,
+                                                                                   geometry_type)
+
+    np.testing.assert_array_equal(unique_id_array, np.arange(len(geometry_list), dtype=np.float64))
+    assert_geometries_equal(geometry_array, get_expected_geometries(geometry_list))
+
+    # 復元したジオメトリから再度作成した座標配列は元の座標配列と一致する
+    np.testing.assert_array_equal(NSP.get_coordinates_array_from_geometries(geometry_array), coordinates_array)
+
+
+def test_create_geometries_from_coordinates_array_with_geometry_type_list():
+    geometry_list = []
+    geometry_type_list = []
+    for case_name in ("point_2d", "linestring_2d", "polygon_with_hole_2d"):
+        geometry_type, case_geometry_list = GEOMETRY_CASE_DICT[case_name]
+        geometry_list.extend(case_geometry_list)
+        geometry_type_list.extend([geometry_type] * len(case_geometry_list))
+
+    coordinates_array = get_legacy_coordinates_array(geometry_list)
+
+    shapely_dict = NSP.get_shapely_dict_from_coordinates_array(coordinates_array, geometry_type_list)
+
+    assert list(shapely_dict) == list(range(len(geometry_list)))
+    assert_geometries_equal(list(shapely_dict.values()), get_expected_geometries(geometry_list))
+
+
+@pytest.mark.parametrize("case_name", GEOMETRY_CASE_NAME_LIST)
+def test_geo_ndarray_geodataframe_round_trip(case_name):
+    _, geometry_list = GEOMETRY_CASE_DICT[case_name]
+
+    # IDは連番ではなく、構成点の並びはIDの降順とする（GeoDataFrameはIDの昇順で作成される）
+    id_list = [10 * i + 7 for i in range(len(geometry_list))]
+    geo_ndarray = np.concatenate([NSP.get_geometry_array(geometry, geometry_id)
+                                  for geometry, geometry_id in reversed(list(zip(geometry_list, id_list)))])
+
+    geodataframe = CU.geo_ndarray_to_geodataframe(geo_ndarray)
+
+    assert_geometries_equal(geodataframe.geometry.tolist(), get_expected_geometries(geometry_list))
+
+    coordinates_array = NSP.get_coordinates_array_from_geometries(geodataframe.geometry.to_numpy(),
+                                                                  np.array(id_list))
+
+    np.testing.assert_array_equal(coordinates_array, get_legacy_coordinates_array(geometry_list, id_list))
+
+
+@pytest.mark.parametrize("case_name", GEOMETRY_CASE_NAME_LIST)
+def test_convert_dict_to_geometries_matches_constructor(case_name):
+    geometry_type, geometry_list = GEOMETRY_CASE_DICT[case_name]
+
+    geometries_dictionary = {}
+    for i, geometry in enumerate(get_expected_geometries(geometry_list)):
+        coordinates = shapely.get_coordinates(geometry, include_z=geometry.has_z)
+        geometries_dictionary[f"key_{i}"] = coordinates[0] if geometry_type == "Point" else coordinates
+
+    geometries_list = NSP.convert_dict_to_geometries(geometries_dictionary, geometry_type)
+
+    geometry_class = {"Point": Point, "LineString": LineString}.get(geometry_type, Polygon)
+
+    assert [key for key, _ in geometries_list] == list(geometries_dictionary)
+    assert_geometries_equal([geometry for _, geometry in geometries_list],
+                            [geometry_class(value) for value in geometries_dictionary.values()])
+
+
+def test_convert_dict_to_geometries_with_mixed_dimensions_and_none():
+    geometries_dictionary = {
+        "line_2d": np.array([[0.0, 0.0], [1.0, 1.0]]),
+        "line_3d": np.array([[0.0, 0.0, 1.0], [1.0, 1.0, 2.0], [2.0, 0.0, 3.0]]),
+        "line_none": None,
+        "line_2d_second": np.array([[5.0, 5.0], [6.0, 7.0], [8.0, 9.0]]),
+    }
+
+    geometries_list = NSP.convert_dict_to_geometries(geometries_dictionary, "LineString")
+
+    assert [key for key, _ in geometries_list] == list(geometries_dictionary)
+    assert_geometries_equal([geometry for _, geometry in geometries_list],
+                            [LineString(value) for value in geometries_dictionary.values()])